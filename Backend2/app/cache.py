@@ -0,0 +1,302 @@
+"""
+Caché de lecturas para los endpoints consultados por polling.
+
+Los métodos de servicio se decoran con @cache.cached(namespace, ttl); los
+métodos de escritura de SearchService / ContactService invalidan las
+entradas afectadas con cache.invalidate(namespace, *clave). El almacén es
+intercambiable: LRU en memoria con TTL (por defecto, uno por proceso) o
+Redis (CACHE_BACKEND=redis) para compartirlo entre workers de uvicorn.
+
+Los valores cacheados deben ser inmutables para quien los recibe (schemas
+o diccionarios ya armados, nunca instancias ORM de una sesión).
+"""
+
+import functools
+import inspect
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from app.config import settings
+
+# Marca de "sin valor" (None también se cachea: p. ej. un 404)
+_MISSING = object()
+
+
+class CacheBackend:
+    """Interfaz de un almacén de caché."""
+
+    def get(self, key: str) -> Any:
+        """Valor guardado, o _MISSING si no existe o venció."""
+        raise NotImplementedError
+
+    def set(self, key: str, namespace: str, value: Any, ttl: float) -> None:
+        """Guardar un valor por ttl segundos."""
+        raise NotImplementedError
+
+    def delete(self, key: str) -> bool:
+        """Eliminar una clave. Retorna True si existía."""
+        raise NotImplementedError
+
+    def delete_namespace(self, namespace: str) -> int:
+        """Eliminar todas las claves de un namespace. Retorna cuántas eliminó."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Vaciar el almacén."""
+        raise NotImplementedError
+
+    def evictions(self) -> Dict[str, int]:
+        """Entradas desalojadas por falta de espacio, por namespace."""
+        return {}
+
+    def entries(self) -> Dict[str, int]:
+        """Entradas guardadas por namespace (si el almacén lo sabe)."""
+        return {}
+
+
+class MemoryCacheBackend(CacheBackend):
+    """LRU en memoria con TTL por entrada y tope de entradas."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # clave -> (namespace, valor, vencimiento)
+        self._entries: "OrderedDict[str, Tuple[str, Any, float]]" = OrderedDict()
+        self._namespaces: Dict[str, Set[str]] = {}
+        self._evictions: Dict[str, int] = {}
+
+    def _remove(self, key: str) -> None:
+        namespace, _, _ = self._entries.pop(key)
+        keys = self._namespaces.get(namespace)
+        if keys is not None:
+            keys.discard(key)
+
+    def get(self, key: str) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            if entry[2] <= time.monotonic():
+                self._remove(key)
+                return _MISSING
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, namespace: str, value: Any, ttl: float) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (namespace, value, time.monotonic() + ttl)
+            self._namespaces.setdefault(namespace, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                evicted_namespace = self._entries[oldest][0]
+                self._remove(oldest)
+                self._evictions[evicted_namespace] = self._evictions.get(evicted_namespace, 0) + 1
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def delete_namespace(self, namespace: str) -> int:
+        with self._lock:
+            keys = self._namespaces.pop(namespace, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._namespaces.clear()
+
+    def evictions(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._evictions)
+
+    def entries(self) -> Dict[str, int]:
+        with self._lock:
+            return {namespace: len(keys) for namespace, keys in self._namespaces.items() if keys}
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Almacén compartido en Redis (requiere el paquete redis).
+
+    Los valores se serializan con pickle; cada namespace lleva un set con
+    sus claves para poder invalidarlo completo. Redis gestiona el TTL y el
+    desalojo (maxmemory-policy), por lo que no se cuentan desalojos.
+    """
+
+    def __init__(self, url: str, prefix: str = "expert_finder:cache:"):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("CACHE_BACKEND=redis requiere el paquete 'redis' (pip install redis)")
+        self._client = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def _namespace_key(self, namespace: str) -> str:
+        return f"{self._prefix}ns:{namespace}"
+
+    def get(self, key: str) -> Any:
+        raw = self._client.get(self._prefix + key)
+        return _MISSING if raw is None else pickle.loads(raw)
+
+    def set(self, key: str, namespace: str, value: Any, ttl: float) -> None:
+        pipe = self._client.pipeline()
+        pipe.set(self._prefix + key, pickle.dumps(value), px=max(int(ttl * 1000), 1))
+        pipe.sadd(self._namespace_key(namespace), key)
+        pipe.execute()
+
+    def delete(self, key: str) -> bool:
+        return bool(self._client.delete(self._prefix + key))
+
+    def delete_namespace(self, namespace: str) -> int:
+        keys = [key.decode() for key in self._client.smembers(self._namespace_key(namespace))]
+        if keys:
+            self._client.delete(*[self._prefix + key for key in keys])
+        self._client.delete(self._namespace_key(namespace))
+        return len(keys)
+
+    def clear(self) -> None:
+        for key in self._client.scan_iter(match=f"{self._prefix}*"):
+            self._client.delete(key)
+
+
+def _make_key(namespace: str, parts: Tuple[Any, ...]) -> str:
+    return ":".join([namespace] + [str(part) for part in parts])
+
+
+class CacheLayer:
+    """Decorador de caché para métodos de servicio, con contadores por namespace."""
+
+    def __init__(self, backend: CacheBackend, enabled: bool = True, default_ttl: float = 10.0):
+        self.backend = backend
+        self.enabled = enabled
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, namespace: str, counter: str, amount: int = 1) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(namespace, {"hits": 0, "misses": 0, "invalidations": 0})
+            stats[counter] += amount
+
+    def cached(
+        self,
+        namespace: str,
+        ttl: Optional[float] = None,
+        key: Optional[Callable[..., Tuple[Any, ...]]] = None
+    ) -> Callable:
+        """
+        Cachear el resultado de un método de servicio (síncrono o async).
+
+        Args:
+            namespace: Nombre de la caché (usado para invalidar y en las métricas)
+            ttl: Segundos de validez (por defecto CACHE_DEFAULT_TTL_SECONDS)
+            key: Obtiene la clave a partir de los argumentos; por defecto, todos
+                los argumentos salvo el primero (la sesión de base de datos)
+
+        Returns:
+            Decorador
+        """
+        def decorator(fn: Callable) -> Callable:
+            def lookup(args, kwargs) -> Tuple[str, Any]:
+                parts = key(*args, **kwargs) if key else args[1:] + tuple(sorted(kwargs.items()))
+                cache_key = _make_key(namespace, parts)
+                value = self.backend.get(cache_key)
+                self._count(namespace, "misses" if value is _MISSING else "hits")
+                return cache_key, value
+
+            def store(cache_key: str, value: Any) -> None:
+                self.backend.set(cache_key, namespace, value, self.default_ttl if ttl is None else ttl)
+
+            if inspect.iscoroutinefunction(fn):
+                # Variante async (sesión AsyncSession): misma clave y namespace
+                @functools.wraps(fn)
+                async def wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return await fn(*args, **kwargs)
+                    cache_key, value = lookup(args, kwargs)
+                    if value is _MISSING:
+                        value = await fn(*args, **kwargs)
+                        store(cache_key, value)
+                    return value
+            else:
+                @functools.wraps(fn)
+                def wrapper(*args, **kwargs):
+                    if not self.enabled:
+                        return fn(*args, **kwargs)
+                    cache_key, value = lookup(args, kwargs)
+                    if value is _MISSING:
+                        value = fn(*args, **kwargs)
+                        store(cache_key, value)
+                    return value
+
+            wrapper.cache_namespace = namespace
+            return wrapper
+
+        return decorator
+
+    def invalidate(self, namespace: str, *parts: Any) -> None:
+        """
+        Invalidar una entrada (si se indica la clave) o el namespace completo.
+
+        Args:
+            namespace: Nombre de la caché
+            parts: Clave de la entrada (los mismos argumentos del método cacheado)
+        """
+        if not self.enabled:
+            return
+        if parts:
+            removed = int(self.backend.delete(_make_key(namespace, parts)))
+        else:
+            removed = self.backend.delete_namespace(namespace)
+        self._count(namespace, "invalidations", removed)
+
+    def clear(self) -> None:
+        """Vaciar la caché (no reinicia los contadores)."""
+        self.backend.clear()
+
+    def get_stats(self) -> dict:
+        """Contadores por namespace (hits, misses, hit_ratio, invalidaciones, desalojos, entradas)."""
+        evictions = self.backend.evictions()
+        entries = self.backend.entries()
+        with self._lock:
+            namespaces = {name: dict(stats) for name, stats in self._stats.items()}
+
+        for name in set(evictions) | set(entries):
+            namespaces.setdefault(name, {"hits": 0, "misses": 0, "invalidations": 0})
+        for name, stats in namespaces.items():
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_ratio"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+            stats["evictions"] = evictions.get(name, 0)
+            stats["entries"] = entries.get(name, 0)
+
+        return {
+            "enabled": self.enabled,
+            "backend": type(self.backend).__name__,
+            "namespaces": namespaces,
+        }
+
+
+def build_backend() -> CacheBackend:
+    """Crear el almacén según CACHE_BACKEND."""
+    if settings.CACHE_BACKEND == "redis":
+        return RedisCacheBackend(settings.CACHE_REDIS_URL)
+    return MemoryCacheBackend(max_entries=settings.CACHE_MAX_ENTRIES)
+
+
+# Caché global (una por proceso; compartida entre procesos con Redis)
+cache = CacheLayer(
+    build_backend(),
+    enabled=settings.CACHE_ENABLED,
+    default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS
+)
@@ -16,6 +16,21 @@ class Settings(BaseSettings):
     DB_USER: str = "root"
     DB_PASSWORD: str = "Unab.2026"
     DB_NAME: str = "expert_finder_db"
+    DB_ASYNC_DRIVER: str = "aiomysql"  # Driver de las rutas async (aiomysql o asyncmy)
+    # False: las rutas async usan la sesión síncrona en el threadpool en lugar
+    # de AsyncSession (comparación A/B de benchmarks/load.py)
+    DB_ASYNC_SESSIONS: bool = True
+    # Si se define, reemplaza a DB_* (p. ej. sqlite:///bench.db para benchmarks/)
+    DATABASE_URL: str = ""
+    
+    # Pool de conexiones (por worker y por motor; ver GET /stats/pool)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Segundos de espera por una conexión libre
+    DB_POOL_RECYCLE: int = 3600  # Debe ser menor que wait_timeout de MySQL
+    # False: sin SELECT 1 por checkout; una conexión caída falla su consulta y se
+    # invalida junto con las más antiguas del pool
+    DB_POOL_PRE_PING: bool = True
     
     # API
     API_TITLE: str = "Expert Finder API"
@@ -38,6 +53,94 @@ class Settings(BaseSettings):
     N8N_WEBHOOK_URL: str = "http://localhost:5678/webhook/search"
     N8N_API_KEY: str = "your-super-secret-n8n-key-12345"
     
+    # Cliente HTTP compartido (webhooks salientes)
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_CONNECT_TIMEOUT: float = 5.0
+    HTTP_READ_TIMEOUT: float = 30.0
+    HTTP_WRITE_TIMEOUT: float = 10.0
+    HTTP_POOL_TIMEOUT: float = 10.0
+    HTTP2_ENABLED: bool = False  # Requiere httpx[http2]
+    
+    # Cola de disparos (outbox) hacia n8n
+    DISPATCH_WORKER_ENABLED: bool = True
+    DISPATCH_MAX_IN_FLIGHT: int = 10
+    DISPATCH_POLL_INTERVAL: float = 1.0
+    DISPATCH_MAX_ATTEMPTS: int = 5
+    DISPATCH_BACKOFF_BASE: float = 2.0
+    DISPATCH_BACKOFF_MAX: float = 300.0
+    DISPATCH_LOCK_TIMEOUT: int = 300
+    DISPATCH_DEFAULT_RATE_LIMIT: int = 60  # Peticiones por minuto si no hay api_sources
+    
+    # Backend de scraping: "n8n" (webhook), "native" (app/pipeline) o "demo" (datos sintéticos, requiere DEMO_MODE)
+    SCRAPER_BACKEND: str = "n8n"
+    SERPAPI_API_KEY: str = ""
+    SERPAPI_URL: str = "https://serpapi.com/search"
+    PIPELINE_FETCH_WORKERS: int = 10
+    PIPELINE_PER_HOST_CONCURRENCY: int = 2
+    PIPELINE_FETCH_TIMEOUT: float = 10.0
+    PIPELINE_MAX_PAGE_BYTES: int = 2 * 1024 * 1024
+    PIPELINE_BATCH_SIZE: int = 50
+    # Cada ejecución ocupa un disparo 'in_flight': debe ser menor que DISPATCH_LOCK_TIMEOUT
+    PIPELINE_RUN_TIMEOUT: float = 240.0
+    PIPELINE_FIXTURES_DIR: str = ""  # Si se define, usa searches.json/pages.json grabados (sin red)
+    
+    # Caché en disco de páginas descargadas
+    PAGE_CACHE_ENABLED: bool = True
+    PAGE_CACHE_DIR: str = "cache/pages"
+    PAGE_CACHE_MAX_BYTES: int = 512 * 1024 * 1024
+    PAGE_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    
+    # Reutilizar resultados de búsquedas recientes con los mismos criterios
+    SEARCH_CACHE_ENABLED: bool = True
+    SEARCH_CACHE_TTL_SECONDS: int = 24 * 3600
+    
+    # Totales de los listados paginados (total_mode=estimated)
+    COUNT_CACHE_TTL_SECONDS: int = 30
+    COUNT_CACHE_MAX_ENTRIES: int = 1024
+    
+    # Caché de lecturas (app/cache.py): "memory" (por proceso) o "redis" (compartida)
+    CACHE_ENABLED: bool = True
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_MAX_ENTRIES: int = 2048
+    CACHE_DEFAULT_TTL_SECONDS: float = 10.0
+    
+    # Eventos en vivo de búsquedas (GET /searches/{id}/events, SSE)
+    SSE_MAX_STREAMS_PER_WORKER: int = 500
+    SSE_HEARTBEAT_SECONDS: float = 15.0  # También revisa la DB (cambios hechos en otro worker)
+    SSE_RETRY_MS: int = 3000
+    SSE_HISTORY_SIZE: int = 100  # Eventos por búsqueda para reanudar con Last-Event-ID
+    SSE_MAX_TRACKED_SEARCHES: int = 1000
+    SSE_QUEUE_SIZE: int = 256
+    
+    # Métricas de peticiones y consultas (GET /metrics, GET /stats/queries)
+    METRICS_ENABLED: bool = True
+    METRICS_SERVER_TIMING: bool = True  # Cabecera Server-Timing (app, db)
+    METRICS_SLOW_QUERY_TOP: int = 20  # Sentencias más lentas que se conservan
+    METRICS_SLOW_QUERY_MIN_MS: float = 5.0  # Más rápidas que esto no se consideran
+    
+    # Presupuesto de consultas por ruta (debug y pruebas; ver app/query_guard.py)
+    QUERY_GUARD_MODE: str = "off"  # off, log o raise
+    QUERY_BUDGET_DEFAULT: int = 25  # Para rutas sin @query_budget
+    QUERY_GUARD_REPEAT_THRESHOLD: int = 5  # Misma sentencia N veces en una petición: posible N+1
+    
+    # Exportación en streaming (GET /contacts/export, GET /searches/{id}/export)
+    EXPORT_BATCH_SIZE: int = 2000  # Filas por lectura del cursor y por bloque enviado
+    EXPORT_PARQUET_ROW_GROUP_SIZE: int = 50000
+    
+    # Tablas de resumen de /stats (recálculo periódico)
+    STATS_RECONCILE_ENABLED: bool = True
+    STATS_RECONCILE_INTERVAL_SECONDS: int = 900
+
+    # Recálculo masivo de validation_score (POST /contacts/rescore)
+    RESCORING_CHUNK_SIZE: int = 5000  # Contactos por transacción
+
+    # Ingesta de resultados (NDJSON)
+    INGEST_BATCH_SIZE: int = 100
+    INGEST_MAX_LINE_BYTES: int = 65536
+    
     # Demo Mode
     DEMO_MODE: bool = True
     
@@ -47,8 +150,20 @@ class Settings(BaseSettings):
     @property
     def database_url(self) -> str:
         """Construye la URL de conexión a la base de datos."""
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return f"mysql+pymysql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
     
+    @property
+    def async_database_url(self) -> str:
+        """URL de conexión para el motor asíncrono (rutas async)."""
+        if self.DATABASE_URL:
+            # Mismo destino con el driver async del dialecto
+            dialect = self.DATABASE_URL.split(":", 1)[0].split("+", 1)[0]
+            driver = "aiosqlite" if dialect == "sqlite" else self.DB_ASYNC_DRIVER
+            return f"{dialect}+{driver}:{self.DATABASE_URL.split(':', 1)[1]}"
+        return f"mysql+{self.DB_ASYNC_DRIVER}://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+    
     @property
     def cors_origins_list(self) -> List[str]:
         """Convierte CORS_ORIGINS en lista."""
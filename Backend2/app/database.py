@@ -1,27 +1,144 @@
 """
 Configuración de la conexión a la base de datos.
+
+Hay dos motores sobre la misma base: el síncrono (pymysql), usado por las
+rutas sync en el threadpool, los workers y los scripts, y el asíncrono
+(aiomysql/asyncmy; aiosqlite en pruebas), usado por las rutas async para
+no bloquear el event loop. Con DB_ASYNC_SESSIONS=false las rutas async
+usan en cambio la sesión síncrona desde el threadpool (ThreadpoolSession).
 """
 
+import asyncio
+
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.config import settings
+from app.metrics import metrics
+from app.query_guard import query_guard
+from app.pool_metrics import TimedAsyncQueuePool, TimedQueuePool, pool_metrics
+
+# Parámetros comunes de los pools (ver DB_POOL_* en Settings)
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+)
+# SQLite (DATABASE_URL de benchmarks): las conexiones pasan entre hilos del pool
+if settings.database_url.startswith("sqlite"):
+    POOL_OPTIONS["connect_args"] = {"check_same_thread": False, "timeout": 30}
 
 # Motor de base de datos
 engine = create_engine(
     settings.database_url,
     echo=False,
-    pool_pre_ping=True,
-    pool_recycle=3600,
+    poolclass=TimedQueuePool,
+    pool_logging_name="sync",
+    **POOL_OPTIONS,
 )
+pool_metrics.instrument(engine, "sync")
+if settings.METRICS_ENABLED:
+    metrics.instrument(engine)
+if query_guard.enabled:
+    query_guard.instrument(engine)
 
 # Sesión de base de datos
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Motor asíncrono (rutas async)
+async_engine = create_async_engine(
+    settings.async_database_url,
+    echo=False,
+    poolclass=TimedAsyncQueuePool,
+    pool_logging_name="async",
+    **POOL_OPTIONS,
+)
+pool_metrics.instrument(async_engine.sync_engine, "async")
+if settings.METRICS_ENABLED:
+    metrics.instrument(async_engine.sync_engine)
+if query_guard.enabled:
+    query_guard.instrument(async_engine.sync_engine)
+
+# Sesión asíncrona. expire_on_commit=False: después del commit los objetos se
+# siguen leyendo sin volver a la base (en async no hay carga perezosa implícita)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+# Sesión síncrona de ThreadpoolSession (mismo comportamiento tras el commit
+# que AsyncSessionLocal)
+ThreadpoolSessionLocal = sessionmaker(autoflush=False, expire_on_commit=False, bind=engine)
+
 # Base para modelos
 Base = declarative_base()
 
 
+class ThreadpoolSession:
+    """
+    Sesión síncrona con la parte de la interfaz de AsyncSession que usan las
+    rutas async (add, execute, run_sync, commit, refresh, rollback): cada
+    llamada a la base corre en el threadpool, como las rutas sync.
+    """
+
+    # Sesiones abiertas a la vez: a lo sumo las conexiones del pool. Sin el
+    # límite, los hilos esperando una conexión ocupan el threadpool que
+    # necesitan las sesiones que las tienen para terminar
+    slots = asyncio.Semaphore(settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW)
+
+    def __init__(self):
+        self.sync_session = ThreadpoolSessionLocal()
+
+    async def __aenter__(self) -> "ThreadpoolSession":
+        await self.slots.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        try:
+            await self.close()
+        finally:
+            self.slots.release()
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    async def execute(self, statement, *args, **kwargs):
+        # Resultado ya leído, igual que AsyncSession.execute
+        frozen = await run_in_threadpool(lambda: self.sync_session.execute(statement, *args, **kwargs).freeze())
+        return frozen()
+
+    async def run_sync(self, fn, *args, **kwargs):
+        return await run_in_threadpool(fn, self.sync_session, *args, **kwargs)
+
+    async def commit(self) -> None:
+        await run_in_threadpool(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await run_in_threadpool(self.sync_session.rollback)
+
+    async def refresh(self, instance) -> None:
+        await run_in_threadpool(self.sync_session.refresh, instance)
+
+    async def close(self) -> None:
+        await run_in_threadpool(self.sync_session.close)
+
+
+def async_session():
+    """
+    Nueva sesión para código async (usar con async with): AsyncSession o,
+    con DB_ASYNC_SESSIONS=false, ThreadpoolSession.
+    """
+    if settings.DB_ASYNC_SESSIONS:
+        return AsyncSessionLocal()
+    return ThreadpoolSession()
+
+
 def get_db():
     """
     Generador de dependencia para obtener sesión de base de datos.
@@ -31,3 +148,12 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Generador de dependencia para obtener sesión asíncrona de base de datos
+    (rutas async def).
+    """
+    async with async_session() as db:
+        yield db
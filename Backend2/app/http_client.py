@@ -0,0 +1,85 @@
+"""
+Cliente HTTP asíncrono compartido por toda la aplicación.
+
+Se crea una sola vez en el lifespan de FastAPI y se reutiliza en todas las
+llamadas salientes (webhooks de n8n), de modo que las conexiones keep-alive
+evitan pagar DNS, handshake TCP/TLS y setup en cada búsqueda.
+"""
+
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+# Cliente global (uno por proceso/worker)
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _http2_available() -> bool:
+    """Indica si está instalado el paquete h2 (httpx[http2])."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def build_http_client() -> httpx.AsyncClient:
+    """
+    Construir un cliente HTTP con los límites y timeouts de la configuración.
+
+    Returns:
+        Cliente httpx asíncrono
+    """
+    http2 = settings.HTTP2_ENABLED
+    if http2 and not _http2_available():
+        print("⚠️ HTTP2_ENABLED=True pero falta el paquete h2 (pip install httpx[http2]); se usa HTTP/1.1")
+        http2 = False
+
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=settings.HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            read=settings.HTTP_READ_TIMEOUT,
+            write=settings.HTTP_WRITE_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT,
+        ),
+        http2=http2,
+    )
+
+
+async def start_http_client() -> httpx.AsyncClient:
+    """Crear el cliente compartido (llamado al iniciar la aplicación)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = build_http_client()
+    return _client
+
+
+async def close_http_client() -> None:
+    """Cerrar el cliente compartido (llamado al detener la aplicación)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    Obtener el cliente compartido.
+
+    Si la aplicación no pasó por el lifespan (scripts, pruebas), se crea
+    de forma perezosa.
+
+    Returns:
+        Cliente httpx asíncrono
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        _client = build_http_client()
+    return _client
@@ -2,12 +2,38 @@
 Aplicación principal FastAPI - VERSIÓN LIMPIA
 """
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.config import settings
+from app.metrics import MetricsMiddleware, metrics
+from app.query_guard import QueryGuardMiddleware, query_guard
+from app.http_client import start_http_client, close_http_client
+from app.services.dispatch_worker import dispatch_worker
+from app.services.stats_reconciler import stats_reconciler
+from app.pipeline.runner import send_native_pipeline, stop_native_pipelines
 from app.routers import searches, contacts, stats
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Recursos compartidos durante la vida de la aplicación."""
+    await start_http_client()
+    dispatch_worker.register_sender("native", send_native_pipeline)
+    if settings.DISPATCH_WORKER_ENABLED:
+        await dispatch_worker.start()
+    if settings.STATS_RECONCILE_ENABLED:
+        await stats_reconciler.start()
+    yield
+    await stats_reconciler.stop()
+    await dispatch_worker.stop()
+    await stop_native_pipelines()
+    await close_http_client()
+
+
 # Crear instancia de FastAPI
 app = FastAPI(
     title=settings.API_TITLE,
@@ -15,6 +41,7 @@ app = FastAPI(
     description="API Backend para el sistema de búsqueda automática de expertos",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Configurar CORS
@@ -26,6 +53,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Métricas por petición (latencia, consultas, Server-Timing)
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware, registry=metrics, server_timing=settings.METRICS_SERVER_TIMING)
+
+# Presupuesto de consultas por ruta (solo en debug / pruebas)
+if query_guard.enabled:
+    app.add_middleware(QueryGuardMiddleware, guard=query_guard)
+
 # Incluir routers
 app.include_router(searches.router, prefix=settings.API_PREFIX)
 app.include_router(contacts.router, prefix=settings.API_PREFIX)
@@ -53,6 +88,13 @@ async def health_check():
     }
 
 
+# Métricas para Prometheus
+@app.get("/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Métricas en formato de texto de Prometheus (rutas, consultas, pools y caché)."""
+    return PlainTextResponse(metrics.render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
 if __name__ == "__main__":
     import uvicorn
     
@@ -0,0 +1,383 @@
+"""
+Métricas de latencia por ruta y de consultas a la base de datos.
+
+MetricsMiddleware mide cada petición HTTP (latencia, status, consultas y
+tiempo en la base) y agrega la cabecera Server-Timing. Los hooks
+before/after_cursor_execute que registra instrument(engine) atribuyen cada
+sentencia a la petición en curso (contextvar; también en el threadpool y en
+las sesiones async) y guardan las sentencias más lentas con la forma de sus
+parámetros, nunca sus valores.
+
+Se exponen en GET /metrics (formato de texto de Prometheus, junto con los
+pools y la caché) y en GET /stats/queries (sentencias lentas).
+"""
+
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+# Límites superiores (segundos) del histograma de latencia por ruta
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Parámetros que se describen en la forma de una sentencia (el resto solo se cuenta)
+MAX_SHAPE_PARAMETERS = 20
+
+_WHITESPACE = re.compile(r"\s+")
+_PLACEHOLDER_LIST = re.compile(r"\((?:\s*(?:%s|\?|%\(\w+\)s|:\w+)\s*,)+\s*(?:%s|\?|%\(\w+\)s|:\w+)\s*\)")
+_REPEATED_LIST = re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+")
+
+
+class RequestStats:
+    """Consultas y tiempo en la base de la petición en curso."""
+
+    __slots__ = ("queries", "db_seconds", "scope")
+
+    def __init__(self, scope: Optional[dict] = None):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.scope = scope
+
+    @property
+    def route(self) -> Optional[str]:
+        """Plantilla de la ruta (FastAPI la agrega al scope al enrutar)."""
+        route = self.scope.get("route") if self.scope else None
+        return getattr(route, "path", None)
+
+
+_current_request: ContextVar[Optional[RequestStats]] = ContextVar("current_request", default=None)
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """Estadísticas de la petición en curso (None fuera de una petición)."""
+    return _current_request.get()
+
+
+def statement_shape(statement: str) -> str:
+    """
+    Forma normalizada de una sentencia: espacios colapsados y listas de
+    placeholders (IN, VALUES de varias filas) reducidas a (...).
+
+    Args:
+        statement: SQL enviado al driver (ya con placeholders)
+
+    Returns:
+        Sentencia normalizada
+    """
+    shape = _PLACEHOLDER_LIST.sub("(...)", _WHITESPACE.sub(" ", statement).strip())
+    return _REPEATED_LIST.sub("(...)", shape)
+
+
+def parameters_shape(parameters: Any, executemany: bool) -> str:
+    """
+    Forma de los parámetros (tipos y cantidad de filas, sin valores).
+
+    Args:
+        parameters: Parámetros enviados al driver
+        executemany: Si la sentencia se ejecutó para varias filas
+
+    Returns:
+        Descripción, p. ej. "(int, str)" o "500 x (int, str)"
+    """
+    def one(params: Any) -> str:
+        if isinstance(params, dict):
+            items = [f"{key}: {type(value).__name__}" for key, value in list(params.items())[:MAX_SHAPE_PARAMETERS]]
+            opening, closing = "{", "}"
+        elif isinstance(params, (list, tuple)):
+            items = [type(value).__name__ for value in params[:MAX_SHAPE_PARAMETERS]]
+            opening, closing = "(", ")"
+        else:
+            return type(params).__name__
+        if len(params) > MAX_SHAPE_PARAMETERS:
+            items.append(f"... {len(params)} en total")
+        return opening + ", ".join(items) + closing
+
+    if executemany and isinstance(parameters, (list, tuple)):
+        return f"{len(parameters)} x {one(parameters[0]) if parameters else '()'}"
+    return one(parameters)
+
+
+class _Histogram:
+    """Histograma acumulable con los límites de LATENCY_BUCKETS."""
+
+    __slots__ = ("buckets", "count", "total")
+
+    def __init__(self):
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+                break
+
+
+class RouteStats:
+    """Contadores de una ruta (método + plantilla de path)."""
+
+    __slots__ = ("latency", "statuses", "queries", "db_seconds", "max_queries")
+
+    def __init__(self):
+        self.latency = _Histogram()
+        self.statuses: Dict[int, int] = {}
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.max_queries = 0
+
+
+class Metrics:
+    """Registro de métricas de peticiones y consultas (uno por proceso)."""
+
+    def __init__(self, slow_query_top: int, slow_query_min_seconds: float):
+        self.slow_query_top = slow_query_top
+        self.slow_query_min_seconds = slow_query_min_seconds
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteStats] = {}
+        # Consultas fuera de una petición (workers, tareas de fondo)
+        self.background_queries = 0
+        self.background_db_seconds = 0.0
+        # forma de la sentencia -> datos de las ejecuciones lentas
+        self._slow: Dict[str, Dict[str, Any]] = {}
+        self._slow_floor = 0.0
+
+    def observe_request(self, method: str, route: str, status_code: int, seconds: float, stats: RequestStats) -> None:
+        """Registrar una petición terminada."""
+        with self._lock:
+            route_stats = self._routes.get((method, route))
+            if route_stats is None:
+                route_stats = self._routes.setdefault((method, route), RouteStats())
+            route_stats.latency.observe(seconds)
+            route_stats.statuses[status_code] = route_stats.statuses.get(status_code, 0) + 1
+            route_stats.queries += stats.queries
+            route_stats.db_seconds += stats.db_seconds
+            route_stats.max_queries = max(route_stats.max_queries, stats.queries)
+
+    def observe_query(self, statement: str, parameters: Any, executemany: bool, seconds: float) -> None:
+        """Registrar una sentencia ejecutada (hook after_cursor_execute)."""
+        stats = _current_request.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += seconds
+        else:
+            with self._lock:
+                self.background_queries += 1
+                self.background_db_seconds += seconds
+
+        # Normalizar solo las candidatas a "más lentas" (el resto no paga nada)
+        if seconds < self.slow_query_min_seconds or seconds < self._slow_floor:
+            return
+        shape = statement_shape(statement)
+        params = parameters_shape(parameters, executemany)
+        route = stats.route if stats is not None else None
+        with self._lock:
+            entry = self._slow.get(shape)
+            if entry is None:
+                entry = self._slow[shape] = {"statement": shape, "slow_executions": 0, "total_seconds": 0.0, "max_seconds": 0.0}
+            entry["slow_executions"] += 1
+            entry["total_seconds"] += seconds
+            if seconds >= entry["max_seconds"]:
+                entry.update(max_seconds=seconds, parameters=params, route=route)
+            if len(self._slow) > self.slow_query_top:
+                slowest = sorted(self._slow.values(), key=lambda item: item["max_seconds"], reverse=True)
+                self._slow = {item["statement"]: item for item in slowest[:self.slow_query_top]}
+                self._slow_floor = slowest[self.slow_query_top - 1]["max_seconds"]
+
+    def instrument(self, engine: Engine) -> None:
+        """
+        Medir las sentencias de un motor.
+
+        Args:
+            engine: Motor síncrono (para AsyncEngine, su sync_engine)
+        """
+        @event.listens_for(engine, "before_cursor_execute")
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            context._metrics_start = time.perf_counter()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            self.observe_query(statement, parameters, executemany, time.perf_counter() - context._metrics_start)
+
+    def get_slow_queries(self) -> List[dict]:
+        """
+        Sentencias más lentas (por tiempo máximo), con la forma de sus
+        parámetros. Los contadores cubren solo las ejecuciones que superaron
+        METRICS_SLOW_QUERY_MIN_MS.
+        """
+        with self._lock:
+            entries = [dict(entry) for entry in self._slow.values()]
+        entries.sort(key=lambda item: item["max_seconds"], reverse=True)
+        for entry in entries:
+            entry["avg_seconds"] = round(entry["total_seconds"] / entry["slow_executions"], 6)
+            entry["total_seconds"] = round(entry["total_seconds"], 6)
+            entry["max_seconds"] = round(entry["max_seconds"], 6)
+        return entries
+
+    def get_route_stats(self) -> List[dict]:
+        """Resumen por ruta (peticiones, latencia media, consultas y tiempo en la base)."""
+        with self._lock:
+            routes = list(self._routes.items())
+            result = []
+            for (method, route), stats in routes:
+                count = stats.latency.count
+                result.append({
+                    "method": method,
+                    "route": route,
+                    "requests": count,
+                    "avg_seconds": round(stats.latency.total / count, 6) if count else 0.0,
+                    "avg_queries": round(stats.queries / count, 2) if count else 0.0,
+                    "max_queries": stats.max_queries,
+                    "avg_db_seconds": round(stats.db_seconds / count, 6) if count else 0.0,
+                    "statuses": dict(stats.statuses),
+                })
+        result.sort(key=lambda item: item["avg_seconds"] * item["requests"], reverse=True)
+        return result
+
+    def render_prometheus(self) -> str:
+        """Métricas en el formato de texto de Prometheus (rutas, pools y caché)."""
+        lines = [
+            "# HELP http_request_duration_seconds Latencia de las peticiones por ruta.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        requests_total, queries_total, db_seconds = [], [], []
+        with self._lock:
+            for (method, route), stats in sorted(self._routes.items()):
+                labels = f'method="{method}",route="{_escape(route)}"'
+                running = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.latency.buckets):
+                    running += count
+                    lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {running}')
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {stats.latency.count}')
+                lines.append(f"http_request_duration_seconds_sum{{{labels}}} {stats.latency.total:.6f}")
+                lines.append(f"http_request_duration_seconds_count{{{labels}}} {stats.latency.count}")
+                for status_code, count in sorted(stats.statuses.items()):
+                    requests_total.append(f'http_requests_total{{{labels},status="{status_code}"}} {count}')
+                queries_total.append(f"http_request_db_queries_total{{{labels}}} {stats.queries}")
+                db_seconds.append(f"http_request_db_seconds_total{{{labels}}} {stats.db_seconds:.6f}")
+            background = (self.background_queries, self.background_db_seconds)
+
+        lines += ["# HELP http_requests_total Peticiones por ruta y status.", "# TYPE http_requests_total counter"]
+        lines += requests_total
+        lines += ["# HELP http_request_db_queries_total Sentencias SQL ejecutadas por ruta.", "# TYPE http_request_db_queries_total counter"]
+        lines += queries_total
+        lines += ["# HELP http_request_db_seconds_total Tiempo en la base de datos por ruta.", "# TYPE http_request_db_seconds_total counter"]
+        lines += db_seconds
+        lines += [
+            "# HELP db_background_queries_total Sentencias SQL fuera de una petición (workers).",
+            "# TYPE db_background_queries_total counter",
+            f"db_background_queries_total {background[0]}",
+            "# HELP db_background_seconds_total Tiempo en la base de datos fuera de una petición.",
+            "# TYPE db_background_seconds_total counter",
+            f"db_background_seconds_total {background[1]:.6f}",
+        ]
+        lines += _render_pools()
+        lines += _render_cache()
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_pools() -> List[str]:
+    from app.pool_metrics import pool_metrics
+
+    gauges = {"in_use": "Conexiones en uso.", "idle": "Conexiones libres en el pool.", "overflow": "Conexiones abiertas por encima de pool_size."}
+    counters = {
+        "checkouts": "Conexiones entregadas.",
+        "overflow_checkouts": "Conexiones entregadas por encima de pool_size.",
+        "timeouts": "Esperas que agotaron DB_POOL_TIMEOUT.",
+        "connections_opened": "Conexiones abiertas.",
+        "connections_closed": "Conexiones cerradas.",
+        "invalidations": "Conexiones invalidadas.",
+        "disconnects": "Errores de desconexión.",
+    }
+    pools = pool_metrics.get_stats()["pools"]
+    lines = []
+    for key, help_text in gauges.items():
+        lines += [f"# HELP db_pool_{key} {help_text}", f"# TYPE db_pool_{key} gauge"]
+        lines += [f'db_pool_{key}{{pool="{name}"}} {data[key]}' for name, data in pools.items() if key in data]
+    for key, help_text in counters.items():
+        lines += [f"# HELP db_pool_{key}_total {help_text}", f"# TYPE db_pool_{key}_total counter"]
+        lines += [f'db_pool_{key}_total{{pool="{name}"}} {data[key]}' for name, data in pools.items()]
+    lines += ["# HELP db_pool_wait_seconds Espera por una conexión del pool.", "# TYPE db_pool_wait_seconds histogram"]
+    for name, data in pools.items():
+        wait = data["wait_seconds"]
+        lines += [f'db_pool_wait_seconds_bucket{{pool="{name}",le="{bound}"}} {count}' for bound, count in wait["buckets"].items()]
+        lines.append(f'db_pool_wait_seconds_sum{{pool="{name}"}} {wait["sum"]}')
+        lines.append(f'db_pool_wait_seconds_count{{pool="{name}"}} {wait["count"]}')
+    return lines
+
+
+def _render_cache() -> List[str]:
+    from app.cache import cache
+
+    namespaces = cache.get_stats()["namespaces"]
+    lines = []
+    for key in ("hits", "misses", "invalidations", "evictions"):
+        lines += [f"# HELP cache_{key}_total Caché de lecturas: {key} por namespace.", f"# TYPE cache_{key}_total counter"]
+        lines += [f'cache_{key}_total{{namespace="{name}"}} {data[key]}' for name, data in namespaces.items()]
+    return lines
+
+
+class MetricsMiddleware:
+    """
+    Middleware ASGI: mide cada petición HTTP y agrega Server-Timing
+    (app = tiempo hasta enviar las cabeceras, db = tiempo en la base).
+    """
+
+    def __init__(self, app, registry: "Metrics", server_timing: bool = True):
+        self.app = app
+        self.registry = registry
+        self.server_timing = server_timing
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats(scope)
+        token = _current_request.set(stats)
+        start = time.perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.server_timing:
+                    elapsed = (time.perf_counter() - start) * 1000
+                    value = (
+                        f'app;dur={elapsed:.1f}, '
+                        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                    )
+                    message["headers"] = list(message.get("headers", [])) + [(b"server-timing", value.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            self.registry.observe_request(
+                scope["method"],
+                stats.route or "unmatched",
+                status_code,
+                time.perf_counter() - start,
+                stats,
+            )
+            _current_request.reset(token)
+
+
+# Métricas globales del proceso
+metrics = Metrics(
+    slow_query_top=settings.METRICS_SLOW_QUERY_TOP,
+    slow_query_min_seconds=settings.METRICS_SLOW_QUERY_MIN_MS / 1000,
+)
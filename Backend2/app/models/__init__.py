@@ -8,6 +8,8 @@ from app.models.search_result import SearchResult
 from app.models.search_log import SearchLog
 from app.models.api_source import APISource
 from app.models.system_config import SystemConfig
+from app.models.search_dispatch import SearchDispatch
+from app.models.stats_rollup import StatsCounter, StatsRegionArea
 
 __all__ = [
     "Search",
@@ -16,4 +18,7 @@ __all__ = [
     "SearchLog",
     "APISource",
     "SystemConfig",
+    "SearchDispatch",
+    "StatsCounter",
+    "StatsRegionArea",
 ]
@@ -3,16 +3,28 @@ Modelo SQLAlchemy para la tabla 'contacts'.
 Representa los contactos encontrados en las búsquedas.
 """
 
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, JSON, DECIMAL, Boolean
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, JSON, DECIMAL, Boolean, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.utils.sql import PreciseTimestamp, current_timestamp_precise
 
 
 class Contact(Base):
     """Modelo de contacto."""
     
     __tablename__ = "contacts"
+    __table_args__ = (
+        Index("idx_contacts_name_norm_org", "name_norm", "org_norm"),
+        Index("idx_contacts_org_position_region", "org_norm", "position_norm", "region_norm"),
+        Index("idx_contacts_position_norm", "position_norm"),
+        Index("idx_contacts_region_norm", "region_norm"),
+        Index("idx_contacts_phone_norm", "phone_norm"),
+        Index("idx_contacts_source_url", "source_url"),
+        Index("idx_contacts_valid_score_created", "is_valid", "validation_score", "created_at", "id"),
+        Index("idx_contacts_updated_at", "updated_at"),
+        Index("ft_contacts_search_document", "search_document", mysql_prefix="FULLTEXT", mysql_with_parser="ngram"),
+    )
     
     # Columnas
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -27,13 +39,25 @@ class Contact(Base):
     research_lines = Column(JSON, nullable=True)
     is_valid = Column(Boolean, default=True, index=True)
     validation_score = Column(DECIMAL(3, 2), default=1.00)
+    # validation_score asignado a mano (PUT /contacts/{id}); el recálculo no lo toca
+    manual_score = Column(Boolean, nullable=False, default=False, server_default="0")
     created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
     updated_at = Column(
-        TIMESTAMP,
-        server_default=func.current_timestamp(),
-        onupdate=func.current_timestamp()
+        PreciseTimestamp,
+        server_default=current_timestamp_precise(),
+        onupdate=current_timestamp_precise()
     )
     
+    # Claves normalizadas para detección de duplicados (ver scoring_engine)
+    name_norm = Column(String(200), nullable=True)
+    org_norm = Column(String(200), nullable=True)
+    position_norm = Column(String(200), nullable=True)
+    region_norm = Column(String(100), nullable=True)
+    phone_norm = Column(String(50), nullable=True)
+    
+    # Texto normalizado para la búsqueda FULLTEXT (ver contact_search)
+    search_document = Column(Text, nullable=True)
+    
     # Relaciones
     search_results = relationship("SearchResult", back_populates="contact", cascade="all, delete-orphan")
     
@@ -3,7 +3,7 @@ Modelo SQLAlchemy para la tabla 'searches'.
 Representa las búsquedas realizadas por los usuarios.
 """
 
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, JSON
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -13,6 +13,12 @@ class Search(Base):
     """Modelo de búsqueda."""
     
     __tablename__ = "searches"
+    __table_args__ = (
+        Index("idx_searches_criteria", "criteria_hash", "status", "finished_at"),
+        Index("idx_searches_created_id", "created_at", "id"),
+        Index("idx_searches_session_created", "session_id", "created_at", "id"),
+        Index("idx_searches_status_created", "status", "created_at", "id"),
+    )
     
     # Columnas
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
@@ -30,6 +36,7 @@ class Search(Base):
     ip_hash = Column(String(64), nullable=True)
     user_agent = Column(Text, nullable=True)
     search_config = Column(JSON, nullable=True)
+    criteria_hash = Column(String(64), nullable=True)  # sha256 de keywords|area|region normalizados
     
     # Relaciones
     search_results = relationship("SearchResult", back_populates="search", cascade="all, delete-orphan")
@@ -0,0 +1,42 @@
+"""
+Modelo SQLAlchemy para la tabla 'search_dispatches'.
+Outbox de disparos pendientes del workflow de scraping (n8n).
+"""
+
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, JSON, ForeignKey, Index
+from sqlalchemy.sql import func
+from sqlalchemy.orm import relationship
+from app.database import Base
+
+
+class SearchDispatch(Base):
+    """Modelo de disparo pendiente de una búsqueda."""
+
+    __tablename__ = "search_dispatches"
+    __table_args__ = (
+        Index("idx_dispatches_status_next", "status", "next_attempt_at"),
+    )
+
+    # Columnas
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    search_id = Column(Integer, ForeignKey("searches.id", ondelete="CASCADE"), nullable=False, index=True)
+    upstream = Column(String(100), nullable=False, default="n8n")
+    status = Column(String(20), nullable=False, default="pending")
+    payload = Column(JSON, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    next_attempt_at = Column(TIMESTAMP, nullable=False, server_default=func.current_timestamp())
+    locked_at = Column(TIMESTAMP, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp()
+    )
+
+    # Relaciones
+    search = relationship("Search")
+
+    def __repr__(self):
+        return f"<SearchDispatch(id={self.id}, search_id={self.search_id}, status='{self.status}', attempts={self.attempts})>"
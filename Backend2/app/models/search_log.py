@@ -3,7 +3,7 @@ Modelo SQLAlchemy para la tabla 'search_logs'.
 Registra logs detallados de cada búsqueda.
 """
 
-from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, TIMESTAMP, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -13,6 +13,10 @@ class SearchLog(Base):
     """Modelo de log de búsqueda."""
     
     __tablename__ = "search_logs"
+    __table_args__ = (
+        Index("idx_logs_created_id", "created_at", "id"),
+        Index("idx_logs_search_created", "search_id", "created_at", "id"),
+    )
     
     # Columnas
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
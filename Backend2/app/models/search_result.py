@@ -3,22 +3,29 @@ Modelo SQLAlchemy para la tabla 'search_results'.
 Relación N:M entre búsquedas y contactos.
 """
 
-from sqlalchemy import Column, Integer, ForeignKey, TIMESTAMP, DECIMAL
-from sqlalchemy.sql import func
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, DECIMAL, DDL, FetchedValue, Index, event
 from sqlalchemy.orm import relationship
 from app.database import Base
+from app.utils.sql import PreciseTimestamp, current_timestamp_precise
 
 
 class SearchResult(Base):
     """Modelo de resultado de búsqueda (relación N:M)."""
     
     __tablename__ = "search_results"
+    __table_args__ = (
+        # Resultados incrementales (?since=) y ETag de /searches/{id}/results
+        Index("idx_search_results_search_seq", "search_id", "seq"),
+    )
     
     # Columnas (clave compuesta)
     search_id = Column(Integer, ForeignKey("searches.id", ondelete="CASCADE"), primary_key=True, index=True)
     contact_id = Column(Integer, ForeignKey("contacts.id", ondelete="CASCADE"), primary_key=True, index=True)
-    found_at = Column(TIMESTAMP, server_default=func.current_timestamp())
+    found_at = Column(PreciseTimestamp, server_default=current_timestamp_precise())
     relevance_score = Column(DECIMAL(3, 2), default=1.00, index=True)
+    # Orden de llegada (marca de agua de ?since=): AUTO_INCREMENT en MySQL,
+    # el rowid en SQLite; lo asigna la base (ver HU 2.12)
+    seq = Column(BigInteger, unique=True, server_default=FetchedValue())
     
     # Relaciones
     search = relationship("Search", back_populates="search_results")
@@ -26,3 +33,19 @@ class SearchResult(Base):
     
     def __repr__(self):
         return f"<SearchResult(search_id={self.search_id}, contact_id={self.contact_id}, relevance={self.relevance_score})>"
+
+
+# Tablas creadas con create_all (pruebas y benchmarks): la base asigna seq
+event.listen(
+    SearchResult.__table__,
+    "after_create",
+    DDL("ALTER TABLE search_results MODIFY seq BIGINT NOT NULL AUTO_INCREMENT").execute_if(dialect="mysql")
+)
+event.listen(
+    SearchResult.__table__,
+    "after_create",
+    DDL(
+        "CREATE TRIGGER search_results_seq AFTER INSERT ON search_results "
+        "BEGIN UPDATE search_results SET seq = NEW.rowid WHERE rowid = NEW.rowid; END"
+    ).execute_if(dialect="sqlite")
+)
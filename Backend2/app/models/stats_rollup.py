@@ -0,0 +1,50 @@
+"""
+Modelos SQLAlchemy para las tablas de resumen de estadísticas
+('stats_counters' y 'stats_region_area').
+
+Los triggers de la HU 2.11 las mantienen al escribir contactos, búsquedas
+y resultados, y StatsService.reconcile corrige periódicamente sus desviaciones.
+Cada celda se reparte en franjas (shard) para que las escrituras
+concurrentes no compitan por la misma fila; el valor es la suma.
+"""
+
+from sqlalchemy import Column, String, BigInteger, SmallInteger, DECIMAL, TIMESTAMP
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class StatsCounter(Base):
+    """Contador de una métrica, opcionalmente por dimensión (estado, región, rango de calidad)."""
+
+    __tablename__ = "stats_counters"
+
+    # Columnas
+    metric = Column(String(50), primary_key=True)
+    dimension = Column(String(200), primary_key=True, default="")  # '' = sin dimensión
+    shard = Column(SmallInteger, primary_key=True, default=0)  # CONNECTION_ID() % 16 en los triggers
+    value = Column(BigInteger, nullable=False, default=0)
+    updated_at = Column(
+        TIMESTAMP,
+        server_default=func.current_timestamp(),
+        onupdate=func.current_timestamp()
+    )
+
+    def __repr__(self):
+        return f"<StatsCounter(metric='{self.metric}', dimension='{self.dimension}', value={self.value})>"
+
+
+class StatsRegionArea(Base):
+    """Contactos válidos encontrados por región (del contacto) y área (de la búsqueda)."""
+
+    __tablename__ = "stats_region_area"
+
+    # Columnas ('' = sin región / sin área)
+    region = Column(String(100), primary_key=True, default="")
+    area = Column(String(100), primary_key=True, default="")
+    shard = Column(SmallInteger, primary_key=True, default=0)
+    total_contacts = Column(BigInteger, nullable=False, default=0)
+    score_sum = Column(DECIMAL(14, 2), nullable=False, default=0)
+    last_updated = Column(TIMESTAMP, nullable=True)
+
+    def __repr__(self):
+        return f"<StatsRegionArea(region='{self.region}', area='{self.area}', total={self.total_contacts})>"
@@ -0,0 +1,25 @@
+"""
+Pipeline nativo de scraping (alternativa al workflow de n8n).
+"""
+
+from app.pipeline.cache import CachingPageFetcher, PageCache, get_page_cache, normalize_url
+from app.pipeline.engine import PipelineStats, ScrapingPipeline
+from app.pipeline.fetchers import FetchResult, FixturePageFetcher, HttpPageFetcher, PageFetcher
+from app.pipeline.providers import FixtureSearchProvider, SearchProvider, SearchProviderError, SerpAPIProvider
+
+__all__ = [
+    "CachingPageFetcher",
+    "PageCache",
+    "get_page_cache",
+    "normalize_url",
+    "PipelineStats",
+    "ScrapingPipeline",
+    "FetchResult",
+    "PageFetcher",
+    "HttpPageFetcher",
+    "FixturePageFetcher",
+    "SearchProvider",
+    "SearchProviderError",
+    "SerpAPIProvider",
+    "FixtureSearchProvider",
+]
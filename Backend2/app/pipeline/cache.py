@@ -0,0 +1,296 @@
+"""
+Caché en disco de páginas descargadas por el pipeline de scraping.
+
+Las páginas se guardan comprimidas (gzip) en un archivo por URL, con la
+URL normalizada como clave (sha256). La caché tiene un tope de tamaño
+(se eliminan primero las entradas usadas hace más tiempo) y un TTL;
+las entradas vencidas se revalidan con If-None-Match / If-Modified-Since
+y, si el servidor responde 304, se reutiliza el cuerpo guardado.
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.pipeline.fetchers import FetchResult, PageFetcher
+
+# Parámetros de seguimiento que no cambian el contenido de la página
+TRACKING_PARAMS_PREFIXES = ("utm_",)
+TRACKING_PARAMS = {"gclid", "fbclid", "trk", "trkinfo", "originalsubdomain"}
+
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """
+    Normalizar una URL para usarla como clave de caché.
+
+    Pasa esquema y host a minúsculas, quita el puerto por defecto, el
+    fragmento y los parámetros de seguimiento, y ordena la query.
+
+    Args:
+        url: URL original
+
+    Returns:
+        URL normalizada
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PARAMS_PREFIXES)
+    )
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+def cache_key(url: str) -> str:
+    """Clave de caché (sha256 de la URL normalizada)."""
+    return hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+
+class PageCache:
+    """Almacén de páginas en disco con tope de tamaño (LRU) y TTL."""
+
+    def __init__(self, directory: Union[str, Path], max_bytes: int, ttl_seconds: int):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # clave -> tamaño en disco, ordenado del menos al más recientemente usado
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._size = 0
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "misses": 0,
+            "revalidated": 0,
+            "stores": 0,
+            "evictions": 0,
+            "bytes_saved": 0,
+        }
+        self._load_index()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json.gz"
+
+    def _load_index(self) -> None:
+        """Reconstruir el índice LRU a partir de los archivos (mtime = último uso)."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entries = []
+        for path in self.directory.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path.name[:-len(".json.gz")], stat.st_size))
+        for _, key, size in sorted(entries):
+            self._index[key] = size
+            self._size += size
+
+    @property
+    def size(self) -> int:
+        """Bytes ocupados en disco."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def get(self, url: str) -> Optional[dict]:
+        """
+        Leer una entrada (vigente o vencida).
+
+        Args:
+            url: URL de la página
+
+        Returns:
+            Entrada (url, body, etag, last_modified, stored_at, encoded_size) o None
+        """
+        key = cache_key(url)
+        with self._lock:
+            if key not in self._index:
+                return None
+            self._index.move_to_end(key)
+
+        path = self._path(key)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self._forget(key)
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        """Indica si la entrada aún no supera el TTL."""
+        return time.time() - entry.get("stored_at", 0) < self.ttl_seconds
+
+    def put(self, url: str, body: str, etag: Optional[str] = None, last_modified: Optional[str] = None) -> None:
+        """
+        Guardar (o reemplazar) una página.
+
+        Args:
+            url: URL de la página
+            body: Contenido de la página
+            etag: Cabecera ETag de la respuesta
+            last_modified: Cabecera Last-Modified de la respuesta
+        """
+        key = cache_key(url)
+        entry = {
+            "url": normalize_url(url),
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": time.time(),
+            "encoded_size": len(body.encode("utf-8")),
+        }
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".tmp{threading.get_ident()}")
+        with gzip.open(tmp_path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        size = path.stat().st_size
+
+        with self._lock:
+            self._size += size - self._index.pop(key, 0)
+            self._index[key] = size
+            self.stats["stores"] += 1
+        self._evict()
+
+    def touch(self, url: str) -> None:
+        """Renovar el TTL de una entrada revalidada (304)."""
+        entry = self.get(url)
+        if entry is not None:
+            self.put(url, entry["body"], entry.get("etag"), entry.get("last_modified"))
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._size -= self._index.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Eliminar las entradas menos usadas hasta respetar el tope de tamaño."""
+        while True:
+            with self._lock:
+                if self._size <= self.max_bytes or not self._index:
+                    return
+                key, size = self._index.popitem(last=False)
+                self._size -= size
+                self.stats["evictions"] += 1
+            try:
+                self._path(key).unlink()
+            except OSError:
+                pass
+
+    def get_stats(self) -> dict:
+        """Contadores de la caché."""
+        lookups = self.stats["hits"] + self.stats["revalidated"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._index),
+            "size_bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "hit_ratio": round((self.stats["hits"] + self.stats["revalidated"]) / lookups, 4) if lookups else 0.0,
+        }
+
+
+class CachingPageFetcher(PageFetcher):
+    """Envuelve un PageFetcher y sirve las páginas desde la caché en disco."""
+
+    def __init__(self, inner: PageFetcher, cache: PageCache):
+        self.inner = inner
+        self.cache = cache
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        # Una sola descarga por URL aunque varias etapas la pidan a la vez
+        key = cache_key(url)
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            result = await self._fetch(url, headers)
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evitar "exception was never retrieved" si nadie más esperaba
+            future.exception()
+            raise
+        finally:
+            del self._pending[key]
+
+    async def _fetch(self, url: str, headers: Optional[Dict[str, str]]) -> FetchResult:
+        entry = await run_in_threadpool(self.cache.get, url)
+
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.stats["hits"] += 1
+            self.cache.stats["bytes_saved"] += entry.get("encoded_size", 0)
+            return FetchResult(url=url, status_code=200, body=entry["body"], headers={"x-cache": "hit"})
+
+        conditional = dict(headers or {})
+        if entry is not None:
+            if entry.get("etag"):
+                conditional["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                conditional["If-Modified-Since"] = entry["last_modified"]
+
+        result = await self.inner.fetch(url, headers=conditional or None)
+
+        if result.status_code == 304 and entry is not None:
+            self.cache.stats["revalidated"] += 1
+            self.cache.stats["bytes_saved"] += entry.get("encoded_size", 0)
+            await run_in_threadpool(self.cache.touch, url)
+            return FetchResult(url=url, status_code=200, body=entry["body"], headers={"x-cache": "revalidated"})
+
+        self.cache.stats["misses"] += 1
+        if result.success:
+            etag, last_modified = _validators(result)
+            await run_in_threadpool(self.cache.put, url, result.body, etag, last_modified)
+        return result
+
+
+def _validators(result: FetchResult) -> Tuple[Optional[str], Optional[str]]:
+    headers = {name.lower(): value for name, value in (result.headers or {}).items()}
+    return headers.get("etag"), headers.get("last-modified")
+
+
+# Caché global (una por proceso)
+_page_cache: Optional[PageCache] = None
+
+
+def get_page_cache() -> PageCache:
+    """Obtener (creando si hace falta) la caché de páginas de la aplicación."""
+    global _page_cache
+    if _page_cache is None:
+        _page_cache = PageCache(
+            settings.PAGE_CACHE_DIR,
+            max_bytes=settings.PAGE_CACHE_MAX_BYTES,
+            ttl_seconds=settings.PAGE_CACHE_TTL_SECONDS
+        )
+    return _page_cache
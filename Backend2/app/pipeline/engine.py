@@ -0,0 +1,225 @@
+"""
+Motor asíncrono del pipeline de scraping.
+
+Ejecuta las mismas etapas que el workflow de n8n, conectadas por colas
+asyncio para que cada etapa empiece a trabajar apenas llega el primer
+elemento:
+
+    consultas ─► buscador ─► parser/clasificador ─┬─► LinkedIn (sin descarga) ─┐
+                                                  └─► descarga de páginas ─────┴─► extracción ─► sink
+
+Las consultas al buscador se ejecutan en paralelo; las descargas las hace
+un pool de workers (la concurrencia por host la limita el fetcher) y los
+contactos se entregan al sink en micro-lotes.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, asdict
+from typing import Awaitable, Callable, List, Optional
+
+from app.pipeline.extraction import (
+    build_search_queries,
+    classify_link,
+    correct_region,
+    extract_linkedin_contact,
+    extract_page_contact,
+    finalize_contact,
+    parse_search_results,
+)
+from app.pipeline.fetchers import PageFetcher
+from app.pipeline.providers import SearchProvider
+
+# Recibe un micro-lote de contactos ya depurados
+ContactSink = Callable[[List[dict]], Awaitable[None]]
+
+# Marca de fin de cola
+_DONE = object()
+
+
+@dataclass
+class PipelineStats:
+    """Contadores de una ejecución del pipeline."""
+
+    queries: int = 0
+    failed_queries: int = 0
+    results: int = 0
+    ignored: int = 0
+    duplicated_links: int = 0
+    pages_fetched: int = 0
+    fetch_errors: int = 0
+    contacts: int = 0
+    valid_contacts: int = 0
+    batches: int = 0
+    elapsed_ms: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class ScrapingPipeline:
+    """Pipeline de scraping con etapas concurrentes."""
+
+    def __init__(
+        self,
+        provider: SearchProvider,
+        fetcher: PageFetcher,
+        fetch_workers: int = 10,
+        batch_size: int = 50,
+        flush_interval: float = 1.0,
+        queue_size: int = 200
+    ):
+        self.provider = provider
+        self.fetcher = fetcher
+        self.fetch_workers = max(fetch_workers, 1)
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+
+    async def run(
+        self,
+        keywords: str,
+        area: Optional[str],
+        region: Optional[str],
+        sink: ContactSink
+    ) -> PipelineStats:
+        """
+        Ejecutar el pipeline completo para una búsqueda.
+
+        Args:
+            keywords: Palabras clave
+            area: Área profesional
+            region: Región
+            sink: Corrutina que recibe cada micro-lote de contactos
+
+        Returns:
+            Contadores de la ejecución
+        """
+        started = time.perf_counter()
+        stats = PipelineStats()
+        fetch_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        contact_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        queries = build_search_queries(keywords, area, region)
+        stats.queries = len(queries)
+
+        fetch_tasks = [
+            asyncio.create_task(self._fetch_worker(fetch_queue, contact_queue, stats))
+            for _ in range(self.fetch_workers)
+        ]
+        sink_task = asyncio.create_task(self._sink_worker(contact_queue, sink, stats))
+
+        try:
+            await self._search_stage(queries, fetch_queue, contact_queue, stats)
+
+            for _ in fetch_tasks:
+                await fetch_queue.put(_DONE)
+            await asyncio.gather(*fetch_tasks)
+
+            await contact_queue.put(_DONE)
+            await sink_task
+        except BaseException:
+            for task in fetch_tasks + [sink_task]:
+                task.cancel()
+            await asyncio.gather(*fetch_tasks, sink_task, return_exceptions=True)
+            raise
+
+        stats.elapsed_ms = int((time.perf_counter() - started) * 1000)
+        return stats
+
+    async def _search_stage(
+        self,
+        queries: List[dict],
+        fetch_queue: asyncio.Queue,
+        contact_queue: asyncio.Queue,
+        stats: PipelineStats
+    ) -> None:
+        """Consultar el buscador en paralelo y repartir los resultados a medida que llegan."""
+        seen_links = set()
+        searches = [asyncio.create_task(self.provider.search(query["query"])) for query in queries]
+
+        for next_done in asyncio.as_completed(searches):
+            try:
+                organic_results = await next_done
+            except Exception as e:
+                stats.failed_queries += 1
+                print(f"⚠️ Consulta al buscador fallida: {e}")
+                continue
+
+            for item in parse_search_results(organic_results):
+                stats.results += 1
+                classification = classify_link(item)
+                if not classification["should_process"]:
+                    stats.ignored += 1
+                    continue
+
+                # El mismo enlace suele aparecer en varias consultas
+                link = item["metadata"]["link"]
+                if link in seen_links:
+                    stats.duplicated_links += 1
+                    continue
+                seen_links.add(link)
+
+                if classification["is_linkedin"]:
+                    await contact_queue.put((item, extract_linkedin_contact(item)))
+                else:
+                    await fetch_queue.put(item)
+
+    async def _fetch_worker(
+        self,
+        fetch_queue: asyncio.Queue,
+        contact_queue: asyncio.Queue,
+        stats: PipelineStats
+    ) -> None:
+        """Descargar páginas y extraer el contacto de cada una."""
+        while True:
+            item = await fetch_queue.get()
+            if item is _DONE:
+                return
+
+            result = await self.fetcher.fetch(item["metadata"]["link"])
+            if result.success:
+                stats.pages_fetched += 1
+            else:
+                stats.fetch_errors += 1
+
+            contact = extract_page_contact(item, result.body if result.success else None)
+            await contact_queue.put((item, contact))
+
+    async def _sink_worker(self, contact_queue: asyncio.Queue, sink: ContactSink, stats: PipelineStats) -> None:
+        """Depurar los contactos y entregarlos al sink en micro-lotes."""
+        loop = asyncio.get_running_loop()
+        batch: List[dict] = []
+        deadline = None
+
+        async def flush():
+            nonlocal batch, deadline
+            if batch:
+                stats.batches += 1
+                await sink(batch)
+            batch = []
+            deadline = None
+
+        while True:
+            timeout = None if deadline is None else max(deadline - loop.time(), 0)
+            try:
+                entry = await asyncio.wait_for(contact_queue.get(), timeout=timeout)
+            except asyncio.TimeoutError:
+                await flush()
+                continue
+
+            if entry is _DONE:
+                await flush()
+                return
+
+            item, contact = entry
+            contact = correct_region(item, finalize_contact(item, contact))
+            stats.contacts += 1
+            if contact["is_valid"]:
+                stats.valid_contacts += 1
+
+            batch.append(contact)
+            if deadline is None:
+                deadline = loop.time() + self.flush_interval
+            if len(batch) >= self.batch_size:
+                await flush()
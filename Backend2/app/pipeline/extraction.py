@@ -0,0 +1,519 @@
+"""
+Etapas de transformación del pipeline de scraping.
+
+Port a Python de los nodos de código del workflow de n8n
+(n8n-workflows/n8nworkflow.json): Build Search Query, Parser1,
+Link Classifier, Code in JavaScript6 (LinkedIn), Code in JavaScript8
+(páginas), Contact Final Validation y Region Correction.
+
+Todas las funciones son puras (sin E/S) para poder probarlas sin red.
+"""
+
+import re
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+
+# ==================== BUILD SEARCH QUERY ====================
+
+CONTACT_TERMS = [
+    "email contacto",
+    "directorio profesionales",
+    "perfil profesional",
+    "curriculum vitae",
+]
+
+
+def build_search_queries(keywords: str, area: Optional[str] = None, region: Optional[str] = None) -> List[dict]:
+    """
+    Generar las consultas al buscador para una búsqueda (nodo Build Search Query).
+
+    Args:
+        keywords: Palabras clave de la búsqueda
+        area: Área profesional
+        region: Región
+
+    Returns:
+        Lista de consultas (query, query_type)
+    """
+    area = area or ""
+    region = region or ""
+
+    queries = [
+        {
+            "query": f"{keywords} {region} {term} site:.cl OR site:linkedin.com OR site:researchgate.net",
+            "query_type": term,
+        }
+        for term in CONTACT_TERMS
+    ]
+
+    # Query específica para colegios profesionales
+    if area and "salud" in area.lower():
+        queries.append({
+            "query": f"{keywords} {region} site:colegiomedicochile.cl OR site:minsal.cl contacto",
+            "query_type": "colegio_profesional",
+        })
+
+    return queries
+
+
+# ==================== REGIONES ====================
+
+# Palabras clave del nodo Parser1 (primera inferencia a partir del snippet)
+PARSER_REGION_KEYWORDS = [
+    ("Arica y Parinacota", ["arica y parinacota", "arica", "parinacota"]),
+    ("Tarapacá", ["tarapacá", "tarapaca", "iquique"]),
+    ("Antofagasta", ["antofagasta"]),
+    ("Atacama", ["atacama", "copiapó", "copiapo"]),
+    ("Coquimbo", ["coquimbo", "la serena"]),
+    ("Valparaíso", ["valparaíso", "valparaiso", "viña", "quilpué", "concón"]),
+    ("Santiago", ["santiago", "metropolitana", "rm", "ñuñoa"]),
+    ("O'Higgins", ["o'higgins", "ohiggins", "rancagua"]),
+    ("Maule", ["maule", "talca"]),
+    ("Ñuble", ["ñuble", "nuble", "chillán", "chillan"]),
+    ("Biobío", ["biobío", "biobio", "bío bío", "bio bio", "concepción", "concepcion"]),
+    ("La Araucanía", ["la araucanía", "la araucania", "araucanía", "araucania", "temuco"]),
+    ("Los Ríos", ["los ríos", "los rios", "valdivia"]),
+    ("Los Lagos", ["los lagos", "puerto montt"]),
+    ("Aysén", ["aysén", "aysen", "coihaique", "coyhaique"]),
+    ("Magallanes", ["magallanes", "punta arenas"]),
+]
+
+# Reglas del nodo Region Correction (corrección final sobre el contacto)
+CORRECTION_REGION_KEYWORDS = [
+    ("Arica y Parinacota", ["arica y parinacota", "arica", "parinacota"]),
+    ("Tarapacá", ["tarapacá", "tarapaca", "iquique"]),
+    ("Antofagasta", ["antofagasta"]),
+    ("Atacama", ["atacama", "copiapó", "copiapo"]),
+    ("Coquimbo", ["coquimbo", "la serena"]),
+    ("Valparaíso", ["valparaíso", "valparaiso", "viña del mar", "vina del mar", "quilpué", "quilpue", "concón", "concon"]),
+    ("Santiago", ["santiago", "metropolitana", "rm", "providencia", "las condes", "ñuñoa", "nunoa"]),
+    ("O'Higgins", ["o'higgins", "ohiggins", "rancagua"]),
+    ("Maule", ["maule", "talca"]),
+    ("Ñuble", ["ñuble", "nuble", "chillán", "chillan"]),
+    ("Biobío", ["biobío", "biobio", "bío bío", "bio bio", "concepción", "concepcion"]),
+    ("La Araucanía", ["la araucanía", "la araucania", "araucanía", "araucania", "temuco"]),
+    ("Los Ríos", ["los ríos", "los rios", "valdivia"]),
+    ("Los Lagos", ["los lagos", "puerto montt"]),
+    ("Aysén", ["aysén", "aysen", "coihaique", "coyhaique"]),
+    ("Magallanes", ["magallanes", "punta arenas"]),
+]
+
+
+def _infer_region(text: str, rules) -> Optional[str]:
+    for region, keys in rules:
+        if any(key in text for key in keys):
+            return region
+    return None
+
+
+# ==================== PARSER ====================
+
+def parse_search_results(organic_results: List[dict]) -> List[dict]:
+    """
+    Convertir resultados orgánicos del buscador en items del pipeline (nodo Parser1).
+
+    Args:
+        organic_results: Resultados con title, link, snippet, source, position
+
+    Returns:
+        Items con metadata y región inferida
+    """
+    items = []
+    for result in organic_results or []:
+        if not result.get("link") and not result.get("title"):
+            continue
+
+        search_text = " ".join([
+            result.get("snippet") or "",
+            result.get("title") or "",
+            result.get("link") or "",
+        ]).lower()
+
+        items.append({
+            "metadata": {
+                "title": result.get("title"),
+                "link": result.get("link"),
+                "snippet": result.get("snippet"),
+                "source": result.get("source"),
+                "position": result.get("position"),
+            },
+            "region": _infer_region(search_text, PARSER_REGION_KEYWORDS) or "Sin especificar",
+        })
+    return items
+
+
+# ==================== LINK CLASSIFIER ====================
+
+IGNORE_PATTERNS = [
+    ("marketplace", ["cronoshare.cl", "starofservice.cl", "uber.com", "airbnb.com", "fiverr.com", "upwork.com", "freelancer.com"]),
+    ("jobsites", ["computrabajo.cl", "linkedin.com/jobs", "trabajos.com", "buscojob.com", "indeed.com", "infojobs.com"]),
+    ("education", ["culinary.cl", ".edu.cl", "universidad", "escuela", "curso", "clase en línea", "diplomado"]),
+    ("other", ["google.com", "facebook.com", "instagram.com", "tiktok.com", "youtube.com", "wikipedia.org", "wix.com", "squarespace.com"]),
+]
+
+VALID_SOURCES = ["linkedin.com", "superprof.cl", "doctoralia.cl", "topdoctors.es", ".cl"]
+
+
+def classify_link(item: dict) -> dict:
+    """
+    Clasificar un item según su enlace (nodo Link Classifier).
+
+    Args:
+        item: Item con metadata
+
+    Returns:
+        Clasificación (should_process, ignore_reason, is_linkedin, source_type)
+    """
+    metadata = item.get("metadata") or {}
+    link = metadata.get("link")
+    title = metadata.get("title")
+    if link is None or title is None:
+        return {"should_process": False, "ignore_reason": "error", "is_linkedin": False, "source_type": "error"}
+
+    link = link.lower()
+    title = title.lower()
+
+    should_ignore = False
+    ignore_reason = None
+
+    # Ofertas de trabajo (los perfiles de LinkedIn sí son válidos)
+    if any(word in title for word in ("oferta", "trabajo", "empleo")) and "linkedin.com" not in link:
+        should_ignore = True
+        ignore_reason = "job_listing"
+
+    for category, patterns in IGNORE_PATTERNS:
+        if any(pattern in link for pattern in patterns):
+            should_ignore = True
+            ignore_reason = category
+            break
+
+    is_valid_source = any(source in link for source in VALID_SOURCES)
+    should_ignore = should_ignore or not is_valid_source
+
+    return {
+        "should_process": not should_ignore,
+        "ignore_reason": ignore_reason,
+        "is_linkedin": "linkedin.com" in link,
+        "source_type": ignore_reason or "professional",
+    }
+
+
+# ==================== EXTRACCIÓN ====================
+
+EMAIL_REGEX = re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}")
+PHONE_REGEX = re.compile(r"(?:\+?56|0)?\s?9\s?\d{4}\s?\d{4}|(?:\+?56|0)?\s?2\s?\d{4}\s?\d{4}")
+PERSON_REGEX = re.compile(r"\b([A-ZÁÉÍÓÚÑ][a-záéíóúñ]+(?:\s+[A-ZÁÉÍÓÚÑ][a-záéíóúñ]+){1,3})\b")
+LINKEDIN_NAME_REGEX = re.compile(r"^([A-Za-záéíóúÁÉÍÓÚñÑ\s]+?)(?:\s*-|$)")
+LINKEDIN_POSITION_REGEX = re.compile(r"\s*-\s*([^,]+)")
+DOMAIN_SUFFIX_REGEX = re.compile(r"\.(cl|com|net|org|io|app|co|es)$", re.IGNORECASE)
+
+GENERIC_NAME_TERMS = {
+    "contacto", "inicio", "nombre empresa", "empresa", "servicios", "servicio",
+    "masajes", "masajes providencia", "masajes corporales", "home", "about",
+}
+GENERIC_REGEX = re.compile(r"^(contacto|inicio|servicios?|home|masajes?)$")
+
+POSITION_KEYWORDS = [
+    "chef", "cocinero", "pastelero", "panadero", "sommelier",
+    "profesor", "instructor", "tutor", "capacitador", "consultor",
+    "médico", "doctor", "ingeniero", "arquitecto", "abogado", "contador",
+    "electricista", "plomero", "carpintero", "pintor", "mecánico",
+    "gerente", "director", "administrador", "coordinador", "supervisor",
+    "diseñador", "desarrollador", "programador", "analista", "técnico",
+]
+POSITION_REGEXES = [(keyword, re.compile(rf"\b{keyword}\b", re.IGNORECASE)) for keyword in POSITION_KEYWORDS]
+
+
+def _first_match(regex: re.Pattern, text: str) -> Optional[str]:
+    match = regex.search(text or "")
+    return match.group(0) if match else None
+
+
+def _title_case(value: str) -> str:
+    return " ".join(word[:1].upper() + word[1:].lower() for word in value.split(" ") if word)
+
+
+def _clean_candidate(value: Optional[str]) -> str:
+    value = re.sub(r"\s*[-|•]\s*.*", "", value or "", count=1)
+    value = re.sub(r"[\d()]", "", value)
+    return re.sub(r"\s+", " ", value).strip()
+
+
+def _is_generic_candidate(value: Optional[str]) -> bool:
+    normalized = (value or "").lower().strip()
+    if not normalized or len(normalized) < 3:
+        return True
+    return normalized in GENERIC_NAME_TERMS or bool(GENERIC_REGEX.match(normalized))
+
+
+def _hostname(url: Optional[str]) -> Optional[str]:
+    try:
+        return urlparse(url or "").hostname
+    except ValueError:
+        return None
+
+
+def _domain_to_name(host: str) -> str:
+    host = re.sub(r"^https?://", "", host or "", flags=re.IGNORECASE)
+    host = re.sub(r"^www\.", "", host, flags=re.IGNORECASE).split("/")[0]
+    host = DOMAIN_SUFFIX_REGEX.sub("", host)
+    return _title_case(re.sub(r"[-_]+", " ", host).strip())
+
+
+def _normalize_organization(source: Optional[str], link: Optional[str], title: Optional[str]) -> Optional[str]:
+    org = re.sub(r"^LinkedIn\s*·\s*", "", source or "", flags=re.IGNORECASE).strip()
+
+    if not org or "." in org:
+        host = _hostname(link)
+        if host:
+            org = _domain_to_name(host)
+    else:
+        org = _clean_candidate(org)
+
+    if (not org or _is_generic_candidate(org)) and title:
+        title_org = _clean_candidate(title)
+        if not _is_generic_candidate(title_org):
+            org = _title_case(title_org)
+
+    return org if org and not _is_generic_candidate(org) else None
+
+
+def normalize_chilean_phone(phone: str) -> str:
+    """Normalizar un teléfono chileno al formato +56XXXXXXXXX."""
+    phone = re.sub(r"[\s\-().]", "", phone)
+    if not phone.startswith("+56"):
+        if phone.startswith("0"):
+            phone = "+56" + phone[1:]
+        elif not phone.startswith("56"):
+            phone = "+56" + phone
+        else:
+            phone = "+" + phone
+    return phone
+
+
+def extract_linkedin_contact(item: dict) -> dict:
+    """
+    Extraer el contacto de un resultado de LinkedIn a partir del título y
+    snippet (nodo Code in JavaScript6). No requiere descargar la página.
+
+    Args:
+        item: Item con metadata y región
+
+    Returns:
+        Datos del contacto
+    """
+    metadata = item["metadata"]
+    title = metadata.get("title") or ""
+    snippet = metadata.get("snippet") or ""
+
+    name = None
+    name_match = LINKEDIN_NAME_REGEX.match(title)
+    if name_match:
+        name = name_match.group(1).strip()
+        if len(name) < 3 or "error" in name.lower():
+            name = None
+
+    position = None
+    position_match = LINKEDIN_POSITION_REGEX.search(title)
+    if position_match:
+        position = re.split(r"[,·]", position_match.group(1).strip())[0].strip()
+        if len(position) > 50:
+            position = " ".join(position.split()[:3])
+
+    email = _first_match(EMAIL_REGEX, snippet)
+    phone = _first_match(PHONE_REGEX, snippet)
+
+    is_valid = bool(name and (position or email or phone))
+
+    return {
+        "name": name or "Desconocido",
+        "email": email,
+        "phone": phone,
+        "position": position,
+        "organization": "LinkedIn",
+        "region": item.get("region"),
+        "source_url": metadata.get("link"),
+        "source_type": "LinkedIn",
+        "is_valid": is_valid,
+        "validation_score": 1 if is_valid else 0,
+    }
+
+
+def extract_page_contact(item: dict, html: Optional[str]) -> dict:
+    """
+    Extraer el contacto de una página descargada, o del snippet si la
+    descarga falló (nodo Code in JavaScript8).
+
+    Args:
+        item: Item con metadata y región
+        html: Contenido HTML de la página (None si no se pudo descargar)
+
+    Returns:
+        Datos del contacto
+    """
+    metadata = item["metadata"]
+    text = html or metadata.get("snippet") or ""
+
+    name = _clean_candidate(metadata.get("title"))
+    person_match = PERSON_REGEX.search(metadata.get("title") or "")
+    if person_match:
+        name = person_match.group(1).strip()
+    if _is_generic_candidate(name):
+        name = None
+
+    position = None
+    for keyword, regex in POSITION_REGEXES:
+        if regex.search(text):
+            position = keyword[:1].upper() + keyword[1:]
+            break
+
+    email = _first_match(EMAIL_REGEX, text)
+    phone = _first_match(PHONE_REGEX, text)
+    if phone:
+        phone = normalize_chilean_phone(phone)
+
+    organization = _normalize_organization(metadata.get("source"), metadata.get("link"), metadata.get("title"))
+    if not name and organization:
+        name = organization
+
+    is_valid = bool(name and (email or phone))
+
+    return {
+        "name": name or "Desconocido",
+        "email": email,
+        "phone": phone,
+        "position": position,
+        "organization": organization,
+        "region": item.get("region"),
+        "source_url": metadata.get("link"),
+        "source_type": metadata.get("source"),
+        "is_valid": is_valid,
+        "validation_score": 1 if is_valid else 0,
+    }
+
+
+# ==================== CONTACT FINAL VALIDATION ====================
+
+FINAL_GENERIC_TERMS = {
+    "contacto", "inicio", "empresa", "servicio", "servicios", "home", "about",
+    "nosotros", "quienes somos", "sitio oficial",
+}
+COMPANY_TERMS = {
+    "spa", "ltda", "limitada", "sa", "s.a", "eirl", "sociedad", "empresa", "group",
+    "grupo", "holding", "consultora", "consultores", "clinica", "clínica",
+}
+CONNECTOR_WORDS = {"de", "del", "la", "las", "los", "y"}
+PERSON_WORD_REGEX = re.compile(r"^[A-ZÁÉÍÓÚÑ][a-záéíóúñ'’-]+$")
+
+
+def _final_clean(value) -> str:
+    value = re.sub(r"\s+", " ", str(value or ""))
+    return re.sub(r"\s*[-|•]\s*.*", "", value, count=1).strip()
+
+
+def _final_title_case(value) -> str:
+    return _title_case(_final_clean(value))
+
+
+def _final_is_generic(value) -> bool:
+    v = _final_clean(value).lower()
+    return not v or len(v) < 3 or v in FINAL_GENERIC_TERMS or bool(GENERIC_REGEX.match(v))
+
+
+def _org_from_url(url: Optional[str]) -> Optional[str]:
+    host = _hostname(url)
+    if not host:
+        return None
+    host = re.sub(r"^www\.", "", host, flags=re.IGNORECASE)
+    return _final_title_case(re.sub(r"[-_]+", " ", DOMAIN_SUFFIX_REGEX.sub("", host)))
+
+
+def is_likely_person(value) -> bool:
+    """Indica si un texto parece el nombre de una persona (2 a 4 palabras capitalizadas)."""
+    candidate = _final_clean(value)
+    if _final_is_generic(candidate) or re.search(r"\d", candidate):
+        return False
+    core = [word for word in candidate.split() if word.lower() not in CONNECTOR_WORDS]
+    if len(core) < 2 or len(core) > 4:
+        return False
+    return all(
+        PERSON_WORD_REGEX.match(word) and word.lower().replace(".", "") not in COMPANY_TERMS
+        for word in core
+    )
+
+
+def finalize_contact(item: dict, contact: dict) -> dict:
+    """
+    Depurar nombre y organización y ajustar el puntaje (nodo Contact Final Validation).
+
+    Args:
+        item: Item con metadata
+        contact: Contacto extraído
+
+    Returns:
+        Contacto depurado (se modifica y retorna el mismo diccionario)
+    """
+    metadata = item.get("metadata") or {}
+    title = _final_clean(metadata.get("title") or "")
+    source = _final_clean(metadata.get("source") or contact.get("source_type") or "")
+    url = contact.get("source_url") or metadata.get("link") or ""
+
+    name = _final_clean(contact.get("name"))
+    organization = _final_clean(contact.get("organization"))
+
+    if not is_likely_person(name):
+        match = PERSON_REGEX.search(title)
+        title_person = _final_clean(match.group(1)) if match else ""
+        name = title_person if is_likely_person(title_person) else None
+
+    if not organization or _final_is_generic(organization) or is_likely_person(organization) or "." in organization:
+        if source and not _final_is_generic(source) and not is_likely_person(source) and "." not in source:
+            organization = _final_title_case(source)
+
+    if not organization or _final_is_generic(organization) or is_likely_person(organization):
+        domain_org = _org_from_url(url)
+        if domain_org and not _final_is_generic(domain_org) and not is_likely_person(domain_org):
+            organization = domain_org
+
+    if not name and organization:
+        name = organization
+
+    is_valid = bool(contact.get("is_valid"))
+    try:
+        score = float(contact.get("validation_score"))
+    except (TypeError, ValueError):
+        score = 1.0 if is_valid else 0.3
+    if not is_valid and score < 0.3:
+        score = 0.3
+
+    contact["name"] = name or contact.get("name") or organization or "Desconocido"
+    contact["organization"] = organization or None
+    contact["is_valid"] = is_valid
+    contact["validation_score"] = score
+    return contact
+
+
+def correct_region(item: dict, contact: dict) -> dict:
+    """
+    Corregir la región del contacto con reglas más amplias (nodo Region Correction).
+
+    Args:
+        item: Item con metadata
+        contact: Contacto depurado
+
+    Returns:
+        Contacto con la región corregida
+    """
+    metadata = item.get("metadata") or {}
+    text = " ".join([
+        contact.get("source_url") or "",
+        contact.get("organization") or "",
+        metadata.get("title") or "",
+        metadata.get("snippet") or "",
+    ]).lower()
+
+    inferred = _infer_region(text, CORRECTION_REGION_KEYWORDS)
+    if inferred:
+        contact["region"] = inferred
+    return contact
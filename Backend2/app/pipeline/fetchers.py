@@ -0,0 +1,166 @@
+"""
+Descarga de páginas para el pipeline de scraping.
+
+- HttpPageFetcher: descarga con el cliente HTTP compartido (pool de
+  conexiones keep-alive) y limita las descargas simultáneas por host.
+- FixturePageFetcher: responde con páginas grabadas en disco, para
+  ejecutar el pipeline sin red.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Union
+from urllib.parse import urlparse
+
+import httpx
+
+from app.http_client import get_http_client
+
+# Cabeceras del nodo "HTTP Request3" del workflow de n8n
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+    "Accept-Language": "es-ES,es;q=0.9",
+    "Referer": "https://www.google.com/",
+}
+
+
+@dataclass
+class FetchResult:
+    """Resultado de la descarga de una página."""
+
+    url: str
+    status_code: Optional[int] = None
+    body: Optional[str] = None
+    error: Optional[str] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def success(self) -> bool:
+        return self.status_code == 200 and bool(self.body)
+
+
+def fetch_error_message(status_code: Optional[int]) -> str:
+    """Mensaje de error de una descarga fallida (igual que el nodo Combine Data)."""
+    if status_code == 403:
+        return "CAPTCHA/Blocked (403)"
+    if status_code is not None and status_code >= 500:
+        return f"Server error ({status_code})"
+    if status_code is not None:
+        return f"HTTP {status_code}"
+    return "Unknown error"
+
+
+class PageFetcher:
+    """Interfaz de un descargador de páginas."""
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        """
+        Descargar una página.
+
+        Args:
+            url: URL de la página
+            headers: Cabeceras adicionales de la petición
+
+        Returns:
+            Resultado de la descarga (nunca lanza excepción por errores HTTP)
+        """
+        raise NotImplementedError
+
+
+class HttpPageFetcher(PageFetcher):
+    """Descargador HTTP con concurrencia acotada por host."""
+
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        per_host_limit: int = 2,
+        timeout: float = 10.0,
+        max_bytes: int = 2 * 1024 * 1024,
+        headers: Optional[Dict[str, str]] = None
+    ):
+        self._client = client
+        self.per_host_limit = max(per_host_limit, 1)
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.headers = headers or DEFAULT_HEADERS
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = (urlparse(url).hostname or "").lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.per_host_limit)
+        return self._host_limits[host]
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        client = self._client or get_http_client()
+        request_headers = {**self.headers, **(headers or {})}
+
+        async with self._host_limit(url):
+            try:
+                async with client.stream(
+                    "GET", url, headers=request_headers, timeout=self.timeout, follow_redirects=True
+                ) as response:
+                    chunks = []
+                    size = 0
+                    async for chunk in response.aiter_bytes():
+                        chunks.append(chunk)
+                        size += len(chunk)
+                        if size >= self.max_bytes:
+                            break
+                    raw = b"".join(chunks)[:self.max_bytes]
+                    encoding = response.encoding or "utf-8"
+                    status_code = response.status_code
+                    response_headers = dict(response.headers)
+            except (httpx.HTTPError, ValueError) as e:
+                return FetchResult(url=url, error=f"{type(e).__name__}: {e}")
+
+        body = raw.decode(encoding, errors="replace") if raw else None
+        if status_code != 200:
+            return FetchResult(
+                url=url,
+                status_code=status_code,
+                error=fetch_error_message(status_code),
+                headers=response_headers
+            )
+        return FetchResult(url=url, status_code=status_code, body=body, headers=response_headers)
+
+
+class FixturePageFetcher(PageFetcher):
+    """
+    Descargador que lee páginas grabadas.
+
+    El fixture es un diccionario {url: {"status": 200, "body": "..."}}
+    o {url: {"status": 200, "file": "pagina.html"}} (o un archivo JSON con ese
+    contenido; las rutas "file" son relativas a ese archivo). Las URL sin
+    fixture devuelven 404.
+    """
+
+    def __init__(self, fixtures: Union[str, Path, Dict[str, dict]], base_dir: Optional[Union[str, Path]] = None):
+        if isinstance(fixtures, (str, Path)):
+            base_dir = base_dir or Path(fixtures).parent
+            with open(fixtures, encoding="utf-8") as f:
+                fixtures = json.load(f)
+        self._fixtures = fixtures
+        self._base_dir = Path(base_dir) if base_dir else None
+        self.requested: Dict[str, int] = {}
+
+    async def fetch(self, url: str, headers: Optional[Dict[str, str]] = None) -> FetchResult:
+        self.requested[url] = self.requested.get(url, 0) + 1
+        fixture = self._fixtures.get(url)
+        if fixture is None:
+            return FetchResult(url=url, status_code=404, error=fetch_error_message(404))
+
+        status_code = fixture.get("status", 200)
+        body = fixture.get("body")
+        if body is None and fixture.get("file"):
+            path = Path(fixture["file"])
+            if self._base_dir and not path.is_absolute():
+                path = self._base_dir / path
+            body = path.read_text(encoding="utf-8")
+
+        if status_code != 200:
+            return FetchResult(url=url, status_code=status_code, error=fetch_error_message(status_code))
+        return FetchResult(url=url, status_code=status_code, body=body, headers=fixture.get("headers") or {})
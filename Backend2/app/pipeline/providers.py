@@ -0,0 +1,103 @@
+"""
+Proveedores de resultados de búsqueda web para el pipeline de scraping.
+
+- SerpAPIProvider: consulta SerpAPI (mismo request que el nodo
+  "Google Custom Search API" del workflow de n8n).
+- FixtureSearchProvider: responde con resultados grabados en disco, para
+  ejecutar el pipeline sin red.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+import httpx
+
+from app.http_client import get_http_client
+
+
+class SearchProviderError(Exception):
+    """Error al consultar el proveedor de búsqueda."""
+
+
+class SearchProvider:
+    """Interfaz de un proveedor de búsqueda."""
+
+    name = "base"
+
+    async def search(self, query: str) -> List[dict]:
+        """
+        Ejecutar una consulta.
+
+        Args:
+            query: Texto de la consulta
+
+        Returns:
+            Resultados orgánicos (title, link, snippet, source, position)
+        """
+        raise NotImplementedError
+
+
+class SerpAPIProvider(SearchProvider):
+    """Proveedor basado en SerpAPI (Google, Chile)."""
+
+    name = "serpapi"
+
+    def __init__(
+        self,
+        api_key: str,
+        url: str = "https://serpapi.com/search",
+        client: Optional[httpx.AsyncClient] = None,
+        timeout: float = 10.0
+    ):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout
+        self._client = client
+
+    async def search(self, query: str) -> List[dict]:
+        client = self._client or get_http_client()
+        try:
+            response = await client.get(
+                self.url,
+                params={
+                    "q": query,
+                    "api_key": self.api_key,
+                    "location": "chile",
+                    "gl": "cl",
+                    "hl": "es",
+                },
+                timeout=self.timeout
+            )
+            response.raise_for_status()
+            data = response.json()
+        except (httpx.HTTPError, ValueError) as e:
+            raise SearchProviderError(f"SerpAPI: {type(e).__name__}: {e}")
+
+        return data.get("organic_results") or []
+
+
+class FixtureSearchProvider(SearchProvider):
+    """
+    Proveedor que lee resultados grabados.
+
+    El fixture es un diccionario {consulta: [resultados]} (o un archivo
+    JSON con ese contenido). La clave "default" se usa para las consultas
+    que no tienen resultados propios.
+    """
+
+    name = "fixture"
+
+    def __init__(self, fixtures: Union[str, Path, Dict[str, List[dict]]]):
+        if isinstance(fixtures, (str, Path)):
+            with open(fixtures, encoding="utf-8") as f:
+                fixtures = json.load(f)
+        self._fixtures = fixtures
+        self.queries: List[str] = []
+
+    async def search(self, query: str) -> List[dict]:
+        self.queries.append(query)
+        results = self._fixtures.get(query, self._fixtures.get("default", []))
+        if isinstance(results, dict):
+            results = results.get("organic_results") or []
+        return list(results)
@@ -0,0 +1,202 @@
+"""
+Ejecución del pipeline nativo para una búsqueda.
+
+Construye el pipeline según la configuración, guarda los contactos en
+micro-lotes (igual que la ingesta NDJSON) y cierra la búsqueda al
+terminar, como lo hace el callback de n8n.
+"""
+
+import asyncio
+from pathlib import Path
+from typing import Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import SearchLog
+from app.pipeline.cache import CachingPageFetcher, get_page_cache
+from app.pipeline.engine import PipelineStats, ScrapingPipeline
+from app.pipeline.fetchers import FixturePageFetcher, HttpPageFetcher, PageFetcher
+from app.pipeline.providers import FixtureSearchProvider, SearchProvider, SerpAPIProvider
+from app.services.contact_service import ContactService
+from app.services.dispatch_worker import DispatchError
+from app.services.search_service import SearchService
+
+# Campos del contacto que se guardan (el resto es metadata del pipeline)
+CONTACT_FIELDS = ("name", "email", "phone", "position", "organization", "region", "source_url", "source_type")
+
+# Ejecuciones en curso (para cancelarlas al detener la aplicación)
+_running: Set[asyncio.Task] = set()
+
+
+def build_provider() -> SearchProvider:
+    """Crear el proveedor de búsqueda según la configuración."""
+    if settings.PIPELINE_FIXTURES_DIR:
+        return FixtureSearchProvider(Path(settings.PIPELINE_FIXTURES_DIR) / "searches.json")
+    return SerpAPIProvider(
+        api_key=settings.SERPAPI_API_KEY,
+        url=settings.SERPAPI_URL,
+        timeout=settings.PIPELINE_FETCH_TIMEOUT
+    )
+
+
+def build_fetcher() -> PageFetcher:
+    """Crear el descargador de páginas según la configuración (con caché en disco si está activa)."""
+    if settings.PIPELINE_FIXTURES_DIR:
+        fetcher = FixturePageFetcher(Path(settings.PIPELINE_FIXTURES_DIR) / "pages.json")
+    else:
+        fetcher = HttpPageFetcher(
+            per_host_limit=settings.PIPELINE_PER_HOST_CONCURRENCY,
+            timeout=settings.PIPELINE_FETCH_TIMEOUT,
+            max_bytes=settings.PIPELINE_MAX_PAGE_BYTES
+        )
+    if settings.PAGE_CACHE_ENABLED:
+        return CachingPageFetcher(fetcher, get_page_cache())
+    return fetcher
+
+
+def build_pipeline(
+    provider: Optional[SearchProvider] = None,
+    fetcher: Optional[PageFetcher] = None
+) -> ScrapingPipeline:
+    """
+    Crear un pipeline con la configuración de la aplicación.
+
+    Args:
+        provider: Proveedor de búsqueda (por defecto según configuración)
+        fetcher: Descargador de páginas (por defecto según configuración)
+
+    Returns:
+        Pipeline listo para ejecutar
+    """
+    return ScrapingPipeline(
+        provider=provider or build_provider(),
+        fetcher=fetcher or build_fetcher(),
+        fetch_workers=settings.PIPELINE_FETCH_WORKERS,
+        batch_size=settings.PIPELINE_BATCH_SIZE
+    )
+
+
+def _save_batch(search_id: int, contacts: list) -> None:
+    db = SessionLocal()
+    try:
+        ContactService.bulk_create_contacts(
+            db,
+            [{field: contact.get(field) for field in CONTACT_FIELDS} for contact in contacts],
+            search_id=search_id
+        )
+        SearchService.refresh_result_counts(db, search_id)
+    finally:
+        db.close()
+
+
+def _start_search(search_id: int) -> None:
+    db = SessionLocal()
+    try:
+        search = SearchService.get_search(db, search_id)
+        if search and search.status == "pending":
+            SearchService.mark_as_running(db, search_id)
+    finally:
+        db.close()
+
+
+def _finish_search(search_id: int, stats: PipelineStats) -> None:
+    db = SessionLocal()
+    try:
+        search = SearchService.refresh_result_counts(db, search_id)
+        if not search:
+            return
+        SearchService.mark_as_completed(db, search_id, search.results_count)
+        db.add(SearchLog(
+            search_id=search_id,
+            source_url="native_pipeline",
+            source_type="pipeline",
+            status="info",
+            contacts_found=stats.contacts,
+            error_message=(
+                f"Pipeline nativo: {stats.contacts} contactos ({stats.valid_contacts} válidos), "
+                f"{stats.pages_fetched} páginas, {stats.fetch_errors} descargas fallidas, "
+                f"{stats.failed_queries}/{stats.queries} consultas fallidas"
+            ),
+            response_time_ms=stats.elapsed_ms
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _fail_search(search_id: int, error_message: str) -> None:
+    db = SessionLocal()
+    try:
+        SearchService.mark_as_error(db, search_id, error_message)
+    finally:
+        db.close()
+
+
+async def run_native_search(payload: dict, pipeline: Optional[ScrapingPipeline] = None) -> Optional[PipelineStats]:
+    """
+    Ejecutar el pipeline nativo para una búsqueda y guardar sus resultados.
+
+    Args:
+        payload: Datos del disparo (search_id, keywords, area, region)
+        pipeline: Pipeline a usar (por defecto según configuración)
+
+    Returns:
+        Contadores de la ejecución, o None si falló
+    """
+    search_id = payload["search_id"]
+    pipeline = pipeline or build_pipeline()
+
+    async def sink(contacts: list) -> None:
+        await run_in_threadpool(_save_batch, search_id, contacts)
+
+    try:
+        await run_in_threadpool(_start_search, search_id)
+        stats = await pipeline.run(payload.get("keywords") or "", payload.get("area"), payload.get("region"), sink)
+        await run_in_threadpool(_finish_search, search_id, stats)
+        print(f"✅ Pipeline nativo search_id={search_id}: {stats.to_dict()}")
+        return stats
+    except asyncio.CancelledError:
+        await run_in_threadpool(_fail_search, search_id, "Pipeline nativo interrumpido")
+        raise
+    except Exception as e:
+        print(f"❌ Pipeline nativo search_id={search_id} fallido: {e}")
+        await run_in_threadpool(_fail_search, search_id, f"Pipeline nativo fallido: {e}")
+        return None
+
+
+async def send_native_pipeline(payload: dict) -> Optional[str]:
+    """
+    Sender de la cola de disparos para el destino "native".
+
+    A diferencia del webhook de n8n, la ejecución completa corre dentro del
+    disparo: cuenta en DISPATCH_MAX_IN_FLIGHT y, si el proceso se cae, el
+    disparo queda 'in_flight' y se reintenta al expirar su bloqueo.
+    PIPELINE_RUN_TIMEOUT la corta antes de que otro worker pueda reclamarlo.
+
+    Raises:
+        DispatchError: Si la ejecución falla o excede PIPELINE_RUN_TIMEOUT
+            (la búsqueda ya quedó en 'error', no se reintenta)
+    """
+    task = asyncio.create_task(run_native_search(payload))
+    _running.add(task)
+    task.add_done_callback(_running.discard)
+
+    try:
+        stats = await asyncio.wait_for(task, timeout=settings.PIPELINE_RUN_TIMEOUT)
+    except asyncio.TimeoutError:
+        raise DispatchError(f"Pipeline nativo excedió {settings.PIPELINE_RUN_TIMEOUT:.0f}s", retryable=False)
+
+    if stats is None:
+        raise DispatchError("Pipeline nativo fallido", retryable=False)
+    return f"Pipeline nativo: {stats.contacts} contactos, {stats.pages_fetched} páginas"
+
+
+async def stop_native_pipelines(timeout: float = 10.0) -> None:
+    """Cancelar las ejecuciones en curso (llamado al detener la aplicación)."""
+    if not _running:
+        return
+    for task in list(_running):
+        task.cancel()
+    await asyncio.wait(list(_running), timeout=timeout)
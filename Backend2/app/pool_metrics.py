@@ -0,0 +1,210 @@
+"""
+Métricas del pool de conexiones a la base de datos.
+
+Los motores de app.database usan pools con tiempo de espera medido
+(TimedQueuePool / TimedAsyncQueuePool) y se registran con
+pool_metrics.instrument(engine, nombre), que escucha los eventos del pool:
+checkouts, conexiones en uso y libres, checkouts en overflow, conexiones
+abiertas / cerradas (rotación) e invalidaciones. Se consultan en
+GET /stats/pool para dimensionar el pool por worker con datos.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Límites superiores (segundos) del histograma de espera por una conexión
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolStats:
+    """Contadores de un pool."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.checkins = 0
+        self.overflow_checkouts = 0
+        self.timeouts = 0
+        self.connects = 0
+        self.closes = 0
+        self.invalidations = 0
+        self.disconnects = 0
+        self.peak_in_use = 0
+        self.wait_count = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self.wait_buckets = [0] * len(WAIT_BUCKETS)
+
+
+class PoolMetrics:
+    """Registro de métricas de los pools instrumentados (uno por proceso)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, PoolStats] = {}
+        self._pools: Dict[str, Pool] = {}
+
+    def _get(self, name: str) -> PoolStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats.setdefault(name, PoolStats())
+        return stats
+
+    def record_wait(self, name: str, seconds: float, timed_out: bool = False) -> None:
+        """
+        Registrar el tiempo de espera por una conexión.
+
+        Args:
+            name: Nombre del pool
+            seconds: Segundos hasta obtener la conexión (o hasta el timeout)
+            timed_out: Si se agotó DB_POOL_TIMEOUT sin obtenerla
+        """
+        with self._lock:
+            stats = self._get(name)
+            if timed_out:
+                stats.timeouts += 1
+            stats.wait_count += 1
+            stats.wait_sum += seconds
+            stats.wait_max = max(stats.wait_max, seconds)
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if seconds <= bound:
+                    stats.wait_buckets[index] += 1
+                    break
+
+    def _increment(self, name: str, counter: str) -> None:
+        with self._lock:
+            stats = self._get(name)
+            setattr(stats, counter, getattr(stats, counter) + 1)
+
+    def instrument(self, engine: Engine, name: str) -> None:
+        """
+        Escuchar los eventos del pool de un motor.
+
+        Args:
+            engine: Motor síncrono (para AsyncEngine, su sync_engine)
+            name: Nombre del pool en las métricas
+        """
+        self._pools[name] = engine.pool
+        self._get(name)
+
+        @event.listens_for(engine, "connect")
+        def on_connect(dbapi_connection, connection_record):
+            self._increment(name, "connects")
+
+        @event.listens_for(engine, "close")
+        def on_close(dbapi_connection, connection_record):
+            self._increment(name, "closes")
+
+        @event.listens_for(engine, "close_detached")
+        def on_close_detached(dbapi_connection):
+            self._increment(name, "closes")
+
+        @event.listens_for(engine, "invalidate")
+        def on_invalidate(dbapi_connection, connection_record, exception):
+            self._increment(name, "invalidations")
+
+        @event.listens_for(engine, "checkout")
+        def on_checkout(dbapi_connection, connection_record, connection_proxy):
+            pool = self._pools[name]
+            with self._lock:
+                stats = self._get(name)
+                stats.checkouts += 1
+                if isinstance(pool, QueuePool):
+                    in_use = pool.checkedout()
+                    if in_use > pool.size():
+                        stats.overflow_checkouts += 1
+                    stats.peak_in_use = max(stats.peak_in_use, in_use)
+
+        @event.listens_for(engine, "checkin")
+        def on_checkin(dbapi_connection, connection_record):
+            self._increment(name, "checkins")
+
+        @event.listens_for(engine, "handle_error")
+        def on_error(context):
+            if context.is_disconnect:
+                # La conexión (y las más antiguas del pool) se invalidan; sin
+                # pre-ping, así se detectan las conexiones caídas
+                self._increment(name, "disconnects")
+
+        # engine.dispose() reemplaza el pool; los eventos se conservan
+        @event.listens_for(engine, "engine_disposed")
+        def on_dispose(engine_):
+            self._pools[name] = engine_.pool
+
+    def get_stats(self) -> dict:
+        """Estado y contadores por pool (tamaño, en uso, libres, overflow, esperas, rotación)."""
+        pools = {}
+        with self._lock:
+            for name, stats in self._stats.items():
+                pool = self._pools.get(name)
+                data = {"pool_class": type(pool).__name__ if pool else None}
+                if isinstance(pool, QueuePool):
+                    data.update({
+                        "size": pool.size(),
+                        "max_overflow": pool._max_overflow,
+                        "in_use": pool.checkedout(),
+                        "idle": pool.checkedin(),
+                        "overflow": max(pool.overflow(), 0),
+                    })
+                data.update({
+                    "peak_in_use": stats.peak_in_use,
+                    "checkouts": stats.checkouts,
+                    "checkins": stats.checkins,
+                    "overflow_checkouts": stats.overflow_checkouts,
+                    "timeouts": stats.timeouts,
+                    "connections_opened": stats.connects,
+                    "connections_closed": stats.closes,
+                    "invalidations": stats.invalidations,
+                    "disconnects": stats.disconnects,
+                    "wait_seconds": {
+                        "count": stats.wait_count,
+                        "sum": round(stats.wait_sum, 6),
+                        "avg": round(stats.wait_sum / stats.wait_count, 6) if stats.wait_count else 0.0,
+                        "max": round(stats.wait_max, 6),
+                        "buckets": self._cumulative(stats.wait_buckets, stats.wait_count),
+                    },
+                })
+                pools[name] = data
+        return {"pools": pools}
+
+    @staticmethod
+    def _cumulative(buckets: List[int], total: int) -> Dict[str, int]:
+        """Histograma acumulado (le -> cantidad), como los de Prometheus."""
+        result, running = {}, 0
+        for bound, count in zip(WAIT_BUCKETS, buckets):
+            running += count
+            result[str(bound)] = running
+        result["+Inf"] = total
+        return result
+
+
+# Métricas globales de los pools del proceso
+pool_metrics = PoolMetrics()
+
+
+class _TimedGetMixin:
+    """Mide cuánto espera cada checkout por una conexión (incluye abrir una nueva)."""
+
+    def _do_get(self):
+        name: Optional[str] = self._orig_logging_name or "default"
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            pool_metrics.record_wait(name, time.perf_counter() - start, timed_out=True)
+            raise
+        pool_metrics.record_wait(name, time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedGetMixin, QueuePool):
+    """QueuePool con tiempo de espera medido (motor síncrono)."""
+
+
+class TimedAsyncQueuePool(_TimedGetMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool con tiempo de espera medido (motor asíncrono)."""
@@ -0,0 +1,175 @@
+"""
+Presupuesto de consultas por ruta (modo debug y pruebas).
+
+Cada ruta puede declarar cuántas sentencias SQL ejecuta como máximo:
+
+    @router.get("/{search_id}")
+    @query_budget(2)
+    async def get_search(...): ...
+
+Con QUERY_GUARD_MODE = "log" o "raise", QueryGuardMiddleware sigue cada
+petición y los hooks del motor cuentan sus sentencias. Si una ruta supera su
+presupuesto (o QUERY_BUDGET_DEFAULT si no declara uno) se informa, y en modo
+"raise" la sentencia que lo excede lanza QueryBudgetExceeded. Las sentencias
+con la misma forma repetidas QUERY_GUARD_REPEAT_THRESHOLD veces en una
+petición se informan como posible N+1.
+
+Con "off" (por defecto) no se registra nada y no hay costo. Para pruebas,
+ver el fixture query_guard de tests/conftest.py.
+"""
+
+from collections import Counter
+from contextvars import ContextVar
+from typing import Callable, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+from app.metrics import statement_shape
+
+GUARD_MODES = ("off", "log", "raise")
+
+
+class QueryBudgetExceeded(RuntimeError):
+    """Una ruta ejecutó más sentencias que su presupuesto."""
+
+
+def query_budget(max_queries: int) -> Callable:
+    """
+    Declarar el máximo de sentencias SQL de una ruta (aplicar debajo de @router.*).
+
+    Args:
+        max_queries: Sentencias permitidas por petición; None = sin límite
+            (rutas que por diseño crecen con la entrada, como la ingesta por lotes)
+
+    Returns:
+        Decorador (devuelve la misma función)
+    """
+    def decorator(endpoint: Callable) -> Callable:
+        endpoint.query_budget = max_queries
+        return endpoint
+
+    return decorator
+
+
+class RequestQueries:
+    """Sentencias de la petición en curso."""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.shapes: Counter = Counter()
+        self.exceeded = False
+
+    @property
+    def route(self) -> str:
+        route = self.scope.get("route")
+        return f"{self.scope.get('method')} {getattr(route, 'path', None) or self.scope.get('path')}"
+
+    @property
+    def budget(self) -> Optional[int]:
+        """Presupuesto de la ruta (None antes de enrutar)."""
+        route = self.scope.get("route")
+        if route is None:
+            return None
+        return getattr(getattr(route, "endpoint", None), "query_budget", settings.QUERY_BUDGET_DEFAULT)
+
+
+_current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+class QueryGuard:
+    """Cuenta sentencias por petición y controla los presupuestos."""
+
+    def __init__(self, mode: str, repeat_threshold: int):
+        if mode not in GUARD_MODES:
+            raise ValueError(f"QUERY_GUARD_MODE inválido: {mode}. Use uno de: {', '.join(GUARD_MODES)}")
+        self.mode = mode
+        self.repeat_threshold = repeat_threshold
+        # Informes de la ejecución actual (los consulta el plugin de pytest)
+        self.violations: List[dict] = []
+        self.repeated: List[dict] = []
+        self.requests: List[dict] = []
+        self.repeated_allowed = False
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def reset(self) -> None:
+        """Olvidar los informes anteriores."""
+        self.violations.clear()
+        self.repeated.clear()
+        self.requests.clear()
+        self.repeated_allowed = False
+
+    def allow_repeated(self) -> None:
+        """No tratar las sentencias repetidas como error (hasta el próximo reset)."""
+        self.repeated_allowed = True
+
+    def instrument(self, engine: Engine) -> None:
+        """
+        Contar las sentencias de un motor.
+
+        Args:
+            engine: Motor síncrono (para AsyncEngine, su sync_engine)
+        """
+        @event.listens_for(engine, "after_cursor_execute")
+        def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            current = _current_queries.get()
+            if current is not None:
+                self._on_statement(current, statement)
+
+    def _on_statement(self, current: RequestQueries, statement: str) -> None:
+        current.count += 1
+        shape = statement_shape(statement)
+        current.shapes[shape] += 1
+        if current.shapes[shape] == self.repeat_threshold:
+            self.repeated.append({"route": current.route, "statement": shape})
+            print(f"⚠️ Posible N+1 en {current.route}: {self.repeat_threshold} ejecuciones de: {shape[:200]}")
+
+        budget = current.budget
+        if budget is not None and current.count > budget and not current.exceeded:
+            current.exceeded = True
+            message = f"{current.route} superó su presupuesto de {budget} consultas"
+            self.violations.append({"route": current.route, "budget": budget, "statement": shape})
+            print(f"❌ {message} (sentencia {current.count}: {shape[:200]})")
+            if self.mode == "raise":
+                raise QueryBudgetExceeded(message)
+
+    def finish(self, current: RequestQueries) -> None:
+        """Registrar el total de una petición terminada."""
+        self.requests.append({
+            "route": current.route,
+            "queries": current.count,
+            "budget": current.budget,
+            "repeated": [shape for shape, count in current.shapes.items() if count >= self.repeat_threshold],
+        })
+        # Solo las últimas peticiones (el guard también puede correr en debug)
+        del self.requests[:-100]
+
+
+class QueryGuardMiddleware:
+    """Middleware ASGI que sigue las sentencias de cada petición HTTP."""
+
+    def __init__(self, app, guard: "QueryGuard"):
+        self.app = app
+        self.guard = guard
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not self.guard.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        current = RequestQueries(scope)
+        token = _current_queries.set(current)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_queries.reset(token)
+            self.guard.finish(current)
+
+
+# Guard global del proceso
+query_guard = QueryGuard(mode=settings.QUERY_GUARD_MODE, repeat_threshold=settings.QUERY_GUARD_REPEAT_THRESHOLD)
@@ -4,18 +4,26 @@ Router para endpoints relacionados con contactos.
 
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.database import get_db
+from app.database import get_async_db, get_db
 from app.schemas.contact import (
     ContactCreate,
     ContactUpdate,
     ContactResponse,
     ContactWithStats,
     DuplicateContactResponse,
+    ContactBulkCreate,
+    ContactBulkResponse,
 )
 from app.schemas.common import PaginatedResponse, StatusResponse
 from app.services.contact_service import ContactService
+from app.services.export_service import ExportService
+from app.services.rescoring_service import rescoring_job
+from app.query_guard import query_budget
+from app.services.search_service import SearchService
 
 router = APIRouter(prefix="/contacts", tags=["Contactos"])
 
@@ -52,37 +60,90 @@ def create_contact(
         )
 
 
+@router.post(
+    "/bulk",
+    response_model=ContactBulkResponse,
+    summary="Crear contactos en lote",
+    description="""Crea un lote de contactos en una sola transacción.
+    
+    Cada contacto se valida por separado y el lote se puntúa en una pasada
+    (contra la base de datos y contra los contactos anteriores del mismo lote).
+    Si se indica search_id, los contactos creados o duplicados se vinculan a esa búsqueda.
+    Cada elemento de la respuesta indica si fue created, duplicate o rejected.
+    """
+)
+@query_budget(12)
+def bulk_create_contacts(
+    payload: ContactBulkCreate,
+    db: Session = Depends(get_db)
+):
+    """Crear contactos en lote."""
+    if payload.search_id is not None and not SearchService.get_search(db, payload.search_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Búsqueda con ID {payload.search_id} no encontrada"
+        )
+    
+    outcomes = ContactService.bulk_create_contacts(
+        db,
+        payload.contacts,
+        search_id=payload.search_id,
+        relevance_score=payload.relevance_score
+    )
+    
+    return ContactBulkResponse(
+        search_id=payload.search_id,
+        created=sum(1 for o in outcomes if o["status"] == "created"),
+        duplicates=sum(1 for o in outcomes if o["status"] == "duplicate"),
+        rejected=sum(1 for o in outcomes if o["status"] == "rejected"),
+        items=outcomes
+    )
+
+
 @router.get(
     "/",
     response_model=PaginatedResponse[ContactResponse],
     summary="Listar contactos",
     description="Obtiene una lista paginada de contactos con filtros opcionales. Por defecto solo muestra contactos con validation_score > 0.6 (no duplicados)."
 )
-def list_contacts(
+@query_budget(3)
+async def list_contacts(
     skip: int = Query(0, ge=0, description="Registros a saltar"),
     limit: int = Query(100, ge=1, le=1000, description="Límite de registros"),
     only_valid: bool = Query(True, description="Solo contactos válidos"),
     region: Optional[str] = Query(None, description="Filtrar por región"),
     organization: Optional[str] = Query(None, description="Filtrar por organización"),
     min_validation_score: Optional[float] = Query(0.6, ge=0.0, le=1.0, description="Puntuación mínima (> 0.6 = válido, <= 0.6 = duplicado)"),
-    db: Session = Depends(get_db)
+    cursor: Optional[str] = Query(None, description="Cursor (next_cursor de la página anterior); si se indica, se ignora skip"),
+    total_mode: str = Query("exact", description="Cálculo del total: exact (COUNT), estimated (aproximado, más barato) o none (sin total)"),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Listar contactos con paginación y filtros. Por defecto excluye duplicados (score <= 0.6)."""
-    contacts, total = ContactService.get_contacts(
-        db,
-        skip=skip,
-        limit=limit,
-        only_valid=only_valid,
-        region=region,
-        organization=organization,
-        min_validation_score=min_validation_score
-    )
+    try:
+        contacts, total, next_cursor = await ContactService.get_contacts_async(
+            db,
+            skip=skip,
+            limit=limit,
+            only_valid=only_valid,
+            region=region,
+            organization=organization,
+            min_validation_score=min_validation_score,
+            cursor=cursor,
+            total_mode=total_mode
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return PaginatedResponse(
         items=contacts,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor,
+        total_mode=total_mode
     )
 
 
@@ -90,27 +151,44 @@ def list_contacts(
     "/search",
     response_model=PaginatedResponse[ContactResponse],
     summary="Buscar contactos",
-    description="Busca contactos por nombre, email u organización."
+    description="""Busca contactos por nombre, email, organización, cargo o líneas de investigación.
+    
+    No distingue tildes ni mayúsculas ("Martinez" encuentra "Martínez") y coincide
+    con partes de palabras. Los resultados se ordenan por relevancia.
+    """
 )
+@query_budget(4)
 def search_contacts(
     q: str = Query(..., min_length=2, description="Término de búsqueda"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description="Cursor (next_cursor de la página anterior); si se indica, se ignora skip"),
+    total_mode: str = Query("exact", description="Cálculo del total: exact (COUNT), estimated (aproximado, más barato) o none (sin total)"),
     db: Session = Depends(get_db)
 ):
     """Buscar contactos por término."""
-    contacts, total = ContactService.search_contacts(
-        db,
-        search_term=q,
-        skip=skip,
-        limit=limit
-    )
+    try:
+        contacts, total, next_cursor = ContactService.search_contacts(
+            db,
+            search_term=q,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            total_mode=total_mode
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return PaginatedResponse(
         items=contacts,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor,
+        total_mode=total_mode
     )
 
 
@@ -129,40 +207,125 @@ def search_contacts(
     - 0.3: URL duplicada (muy sospechoso)
     """
 )
+@query_budget(3)
 def list_duplicates(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     max_score: float = Query(0.99, ge=0.0, le=1.0, description="Score máximo para considerar como posible duplicado"),
+    cursor: Optional[str] = Query(None, description="Cursor (next_cursor de la página anterior); si se indica, se ignora skip"),
+    total_mode: str = Query("exact", description="Cálculo del total: exact (COUNT), estimated (aproximado, más barato) o none (sin total)"),
     db: Session = Depends(get_db)
 ):
     """Listar contactos con score reducido (posibles duplicados o similares)."""
-    duplicates, total = ContactService.get_duplicate_contacts(
-        db,
-        skip=skip,
-        limit=limit,
-        max_score=max_score
-    )
+    try:
+        duplicates, total, next_cursor = ContactService.get_duplicate_contacts(
+            db,
+            skip=skip,
+            limit=limit,
+            max_score=max_score,
+            cursor=cursor,
+            total_mode=total_mode
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     
     return PaginatedResponse(
         items=duplicates,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor,
+        total_mode=total_mode
+    )
+
+
+@router.get(
+    "/export",
+    summary="Exportar contactos",
+    description="""Descarga los contactos en CSV, NDJSON o Parquet, con los mismos filtros que el listado.
+    
+    Se transmite por lotes desde un cursor del lado del servidor, sin cargar todos los contactos en memoria.
+    Con compress=gzip la salida se comprime al vuelo (CSV y NDJSON). Parquet requiere pyarrow en el servidor."""
+)
+@query_budget(3)
+def export_contacts(
+    format: str = Query("csv", description="Formato: csv, ndjson o parquet"),
+    compress: Optional[str] = Query(None, description="gzip para comprimir la descarga"),
+    only_valid: bool = Query(True, description="Solo contactos válidos"),
+    region: Optional[str] = Query(None, description="Filtrar por región"),
+    organization: Optional[str] = Query(None, description="Filtrar por organización"),
+    min_validation_score: Optional[float] = Query(0.6, ge=0.0, le=1.0, description="Puntuación mínima (> 0.6 = válido, <= 0.6 = duplicado)")
+):
+    """Exportar contactos en streaming."""
+    try:
+        ExportService.validate_format(format, compress)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    
+    filename = ExportService.filename("contactos", format, compress)
+    return StreamingResponse(
+        ExportService.stream_with_session(
+            lambda db: ExportService.contact_rows(db, only_valid, region, organization, min_validation_score),
+            format,
+            compress
+        ),
+        media_type=ExportService.media_type(format, compress),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
     )
 
 
+@router.post(
+    "/rescore",
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Recalcular scores de validación",
+    description="""Inicia en segundo plano el recálculo de validation_score de los contactos (incluidos los insertados por n8n sin scoring).
+
+    Con incremental=true solo se recalculan los contactos escritos desde la última ejecución y los que comparten con ellos nombre, teléfono o URL.
+    El avance se consulta con GET /contacts/rescore."""
+)
+@query_budget(0)
+async def start_rescoring(
+    incremental: bool = Query(True, description="Solo los contactos escritos desde la última ejecución")
+):
+    """Iniciar el recálculo de scores."""
+    if not await rescoring_job.start(incremental=incremental):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Ya hay un recálculo de scores en curso"
+        )
+    return rescoring_job.status()
+
+
+@router.get(
+    "/rescore",
+    summary="Estado del recálculo de scores",
+    description="Avance (contactos procesados y actualizados) del recálculo en curso o resultado del último."
+)
+@query_budget(0)
+async def get_rescoring_status():
+    """Obtener el estado del recálculo de scores."""
+    return rescoring_job.status()
+
+
 @router.get(
     "/{contact_id}",
     response_model=ContactWithStats,
     summary="Obtener contacto",
     description="Obtiene los detalles de un contacto específico con estadísticas."
 )
-def get_contact(
+@query_budget(2)
+async def get_contact(
     contact_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obtener un contacto específico con estadísticas."""
-    contact = ContactService.get_contact_with_stats(db, contact_id)
+    contact = await ContactService.get_contact_with_stats_async(db, contact_id)
     
     if not contact:
         raise HTTPException(
@@ -2,29 +2,38 @@
 Router para endpoints relacionados con búsquedas.
 """
 
-from typing import Optional, List
-import httpx
+from typing import Optional, List, AsyncIterator
 import asyncio
+import json
 from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, Query, status, BackgroundTasks, Header
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
 
-from app.database import get_db
+from app.database import async_session, get_async_db, get_db
 from app.schemas.search import (
     SearchCreate,
     SearchUpdate,
     SearchResponse,
     SearchWithResults,
-    SearchResultItem,
     N8NCallback,
     SearchLogItem,
 )
 from app.schemas.common import PaginatedResponse, StatusResponse
+from app.schemas.contact import ContactCreate
 from app.services.search_service import SearchService
+from app.services.contact_service import ContactService
+from app.services.dispatch_service import DispatchService
+from app.services.export_service import ExportService
+from app.query_guard import query_budget
+from app.services.dispatch_worker import DispatchError, dispatch_worker, send_n8n_webhook
+from app.services.search_events import TERMINAL_STATUSES, StreamLimitError, search_events
 from app.config import Settings
 from app.models.search_log import SearchLog
-from app.models.search import Search
+from app.utils.serialization import FastJSONResponse
 
 # Cargar configuración
 settings = Settings()
@@ -37,17 +46,29 @@ router = APIRouter(prefix="/searches", tags=["Búsquedas"])
     response_model=SearchResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Crear nueva búsqueda",
-    description="Crea una nueva búsqueda y dispara el workflow de n8n."
+    description="""Crea una nueva búsqueda y encola el disparo del scraping (workflow de n8n, pipeline nativo o datos sintéticos en modo demo, según SCRAPER_BACKEND).
+    
+    Si una búsqueda con los mismos criterios (keywords, area, region normalizados) se completó dentro de
+    SEARCH_CACHE_TTL_SECONDS, se reutilizan sus resultados y la búsqueda se devuelve ya 'completed'.
+    Use search_config = {"force_refresh": true} para forzar un scraping nuevo."""
 )
+@query_budget(10)
 async def create_search(
     search: SearchCreate,
-    background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Crear una nueva búsqueda y disparar workflow de n8n."""
+    """Crear una nueva búsqueda y encolar el disparo del workflow de n8n."""
     try:
-        # 1. Crear registro en base de datos
-        new_search = SearchService.create_search(db, search)
+        # 1. Crear registro en base de datos (reutiliza resultados recientes si los hay).
+        #    Sin commit: búsqueda, log y disparo se confirman juntos en el paso 3
+        new_search = await SearchService.create_search_async(db, search, commit=False)
+        
+        if new_search.status == "completed":
+            await db.commit()
+            await db.refresh(new_search)
+            SearchService.notify_created(new_search)
+            print(f"♻️ search_id={new_search.id} resuelta con resultados en caché ({new_search.results_count} contactos)")
+            return new_search
         
         # 2. Log inicial
         log = SearchLog(
@@ -60,18 +81,15 @@ async def create_search(
             response_time_ms=0
         )
         db.add(log)
-        db.commit()
         
-        print(f"🔥 Agregando tarea de n8n a background_tasks para search_id={new_search.id}")
+        # 3. Encolar el disparo del workflow (outbox) en la misma transacción
+        dispatch = await db.run_sync(DispatchService.enqueue, new_search)
+        await db.commit()
+        await db.refresh(new_search)
+        SearchService.notify_created(new_search)
         
-        # 3. Disparar workflow n8n usando BackgroundTasks
-        background_tasks.add_task(
-            trigger_n8n_workflow,
-            search_id=new_search.id,
-            keywords=search.keywords,
-            area=search.area,
-            region=search.region
-        )
+        print(f"🔥 Disparo de {dispatch.upstream} encolado para search_id={new_search.id}")
+        dispatch_worker.notify()
         
         # 4. Retornar inmediatamente al frontend
         return SearchResponse(
@@ -91,7 +109,7 @@ async def create_search(
         )
         
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error al crear búsqueda: {str(e)}"
@@ -104,38 +122,26 @@ async def trigger_n8n_workflow(
     area: Optional[str],
     region: Optional[str]
 ):
-    """Dispara el workflow de n8n mediante webhook."""
+    """
+    Dispara el workflow de n8n mediante webhook, sin pasar por la cola.
+    El flujo normal usa la cola de disparos (ver DispatchWorker).
+    """
     try:
         print(f"🚀 Disparando n8n workflow para search_id={search_id}")
         print(f"   URL: {settings.N8N_WEBHOOK_URL}")
         print(f"   Payload: search_id={search_id}, keywords={keywords}, area={area}, region={region}")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                settings.N8N_WEBHOOK_URL,
-                json={
-                    "search_id": search_id,
-                    "keywords": keywords,
-                    "area": area or "",
-                    "region": region or ""
-                },
-                headers={
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0  # Timeout más largo para esperar respuesta
-            )
-            
-            print(f"✅ n8n respondió: {response.status_code}")
-            print(f"   Response: {response.text[:200]}")
-            
-            if response.status_code != 200:
-                # Log del error pero no fallar
-                print(f"❌ Error al disparar n8n: {response.status_code} - {response.text}")
-            else:
-                print(f"✅ Workflow disparado exitosamente")
+        note = await send_n8n_webhook({
+            "search_id": search_id,
+            "keywords": keywords,
+            "area": area or "",
+            "region": region or ""
+        })
+        
+        print(f"✅ {note or 'Workflow disparado exitosamente'}")
                 
-    except httpx.TimeoutException:
-        print("⏱️ Timeout - el workflow tardó más de 30 segundos")
+    except DispatchError as e:
+        print(f"❌ Error al disparar n8n: {e}")
     except Exception as e:
         print(f"❌ Error inesperado al disparar n8n: {str(e)}")
 
@@ -146,27 +152,40 @@ async def trigger_n8n_workflow(
     summary="Listar búsquedas",
     description="Obtiene una lista paginada de búsquedas con filtros opcionales."
 )
+@query_budget(3)
 def list_searches(
     skip: int = Query(0, ge=0, description="Registros a saltar"),
     limit: int = Query(100, ge=1, le=1000, description="Límite de registros"),
     session_id: Optional[str] = Query(None, description="Filtrar por ID de sesión"),
     status: Optional[str] = Query(None, description="Filtrar por estado"),
+    cursor: Optional[str] = Query(None, description="Cursor (next_cursor de la página anterior); si se indica, se ignora skip"),
+    total_mode: str = Query("exact", description="Cálculo del total: exact (COUNT), estimated (aproximado, más barato) o none (sin total)"),
     db: Session = Depends(get_db)
 ):
     """Listar búsquedas con paginación y filtros."""
-    searches, total = SearchService.get_searches(
-        db,
-        skip=skip,
-        limit=limit,
-        session_id=session_id,
-        status=status
-    )
+    try:
+        searches, total, next_cursor = SearchService.get_searches(
+            db,
+            skip=skip,
+            limit=limit,
+            session_id=session_id,
+            status=status,
+            cursor=cursor,
+            total_mode=total_mode
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,
+            detail=str(e)
+        )
     
     return PaginatedResponse(
         items=searches,
         total=total,
         skip=skip,
-        limit=limit
+        limit=limit,
+        next_cursor=next_cursor,
+        total_mode=total_mode
     )
 
 
@@ -180,16 +199,25 @@ def list_recent_logs(
     skip: int = Query(0, ge=0, description="Registros a saltar"),
     limit: int = Query(30, ge=1, le=200, description="Límite de logs"),
     search_id: Optional[int] = Query(None, description="Filtrar por búsqueda específica"),
+    cursor: Optional[str] = Query(None, description="Cursor (next_cursor de la página anterior); si se indica, se ignora skip"),
+    total_mode: str = Query("exact", description="Cálculo del total: exact (COUNT), estimated (aproximado, más barato) o none (sin total)"),
     db: Session = Depends(get_db)
 ):
     """Listar logs recientes del flujo."""
-    query = db.query(SearchLog, Search).join(Search, Search.id == SearchLog.search_id)
-
-    if search_id is not None:
-        query = query.filter(SearchLog.search_id == search_id)
-
-    total = query.count()
-    rows = query.order_by(desc(SearchLog.created_at)).offset(skip).limit(limit).all()
+    try:
+        rows, total, next_cursor = SearchService.get_recent_logs(
+            db,
+            skip=skip,
+            limit=limit,
+            search_id=search_id,
+            cursor=cursor,
+            total_mode=total_mode
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
 
     items = [
         SearchLogItem(
@@ -213,6 +241,8 @@ def list_recent_logs(
         total=total,
         skip=skip,
         limit=limit,
+        next_cursor=next_cursor,
+        total_mode=total_mode,
     )
 
 
@@ -222,12 +252,13 @@ def list_recent_logs(
     summary="Obtener búsqueda",
     description="Obtiene los detalles de una búsqueda específica por su ID."
 )
-def get_search(
+@query_budget(2)
+async def get_search(
     search_id: int,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Obtener una búsqueda específica."""
-    search = SearchService.get_search(db, search_id)
+    search = await SearchService.get_search_response_async(db, search_id)
     
     if not search:
         raise HTTPException(
@@ -261,32 +292,225 @@ def update_search(
     return search
 
 
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Comparación débil de If-None-Match (admite lista y "*")."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+
 @router.get(
     "/{search_id}/results",
     response_model=SearchWithResults,
+    response_class=FastJSONResponse,
     summary="Obtener resultados de búsqueda",
-    description="Obtiene los contactos encontrados en una búsqueda específica."
+    description="""Obtiene los contactos encontrados en una búsqueda específica.
+    
+    Con fields= (nombres separados por coma) cada resultado incluye solo esos campos y se consultan solo
+    sus columnas; por defecto se devuelven todos, incluidos los alias de compatibilidad.
+    
+    La respuesta incluye next_since: al enviarlo como ?since= solo se devuelven los resultados vinculados
+    después de esa lectura (en orden de llegada). La respuesta lleva ETag; con If-None-Match se responde
+    304 sin consultar los contactos si nada cambió."""
 )
+@query_budget(4)
 def get_search_results(
     search_id: int,
     only_valid: bool = Query(True, description="Solo contactos válidos"),
+    since: Optional[str] = Query(None, description="next_since de la respuesta anterior (solo resultados nuevos)"),
+    fields: Optional[str] = Query(None, description="Campos de cada resultado, separados por coma (por defecto todos)"),
+    if_none_match: Optional[str] = Header(None, alias="If-None-Match"),
     db: Session = Depends(get_db)
 ):
     """Obtener resultados de una búsqueda con información de contactos."""
-    search = SearchService.get_search(db, search_id)
+    try:
+        result_fields = SearchService.parse_result_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     
-    if not search:
+    etag = SearchService.get_results_etag(db, search_id, only_valid, since, result_fields)
+    
+    if etag is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Búsqueda con ID {search_id} no encontrada"
+        )
+    
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    
+    search = SearchService.get_search_response(db, search_id)
+    try:
+        results, next_since = SearchService.get_search_results(db, search_id, only_valid, since, result_fields)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Serialización directa (mismo formato que SearchWithResults, sin validar cada resultado)
+    return FastJSONResponse(
+        {**search.model_dump(mode="json"), "results": results, "next_since": next_since},
+        headers=headers
+    )
+
+
+
+@router.get(
+    "/{search_id}/export",
+    summary="Exportar resultados de búsqueda",
+    description="""Descarga los resultados de una búsqueda (por relevancia) en CSV, NDJSON o Parquet.
+    
+    Se transmite por lotes desde un cursor del lado del servidor, sin cargar todos los resultados en memoria.
+    Con compress=gzip la salida se comprime al vuelo (CSV y NDJSON). Parquet requiere pyarrow en el servidor."""
+)
+@query_budget(3)
+def export_search_results(
+    search_id: int,
+    format: str = Query("csv", description="Formato: csv, ndjson o parquet"),
+    compress: Optional[str] = Query(None, description="gzip para comprimir la descarga"),
+    only_valid: bool = Query(True, description="Solo contactos válidos"),
+    fields: Optional[str] = Query(None, description="Campos a exportar, separados por coma (por defecto todos sin alias)"),
+    db: Session = Depends(get_db)
+):
+    """Exportar resultados de una búsqueda en streaming."""
+    try:
+        ExportService.validate_format(format, compress)
+        result_fields = SearchService.parse_result_fields(fields) if fields else None
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    if not SearchService.get_search(db, search_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Búsqueda con ID {search_id} no encontrada"
+        )
+    
+    filename = ExportService.filename(f"busqueda-{search_id}", format, compress)
+    return StreamingResponse(
+        ExportService.stream_with_session(
+            lambda export_db: ExportService.search_result_rows(export_db, search_id, only_valid, result_fields),
+            format,
+            compress
+        ),
+        media_type=ExportService.media_type(format, compress),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+def _sse_message(event: str, data, event_id: Optional[str] = None) -> str:
+    """Formatea un evento SSE (id opcional, tipo y datos JSON en una línea)."""
+    lines = [f"id: {event_id}"] if event_id else []
+    lines.append(f"event: {event}")
+    lines.append(f"data: {json.dumps(data, default=str)}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def _search_snapshot(search_id: int) -> Optional[dict]:
+    """Estado actual de una búsqueda (sesión propia: el stream dura más que la petición)."""
+    async with async_session() as db:
+        search = await SearchService.get_search_response_async(db, search_id)
+        return search.model_dump(mode="json") if search else None
+
+
+def _search_state(data: dict) -> tuple:
+    return (data["status"], data["results_count"], data["valid_results_count"])
+
+
+@router.get(
+    "/{search_id}/events",
+    summary="Eventos en vivo de una búsqueda (SSE)",
+    description="""Stream text/event-stream con los cambios de una búsqueda, en lugar de hacer polling a GET /searches/{id}.
+    
+    Eventos: 'status' (cambio de estado, con la búsqueda completa), 'progress' (nuevos results_count /
+    valid_results_count), 'contacts' (contactos recién vinculados) y 'end' (la búsqueda terminó; el cliente
+    debe cerrar el EventSource). Cada SSE_HEARTBEAT_SECONDS se envía un comentario de heartbeat y se revisa
+    el estado en la base de datos (cambios procesados por otro worker).
+    
+    Al reconectar con Last-Event-ID se reenvían los eventos perdidos; si no es posible, se envía el estado actual.
+    Responde 503 si el worker ya tiene SSE_MAX_STREAMS_PER_WORKER streams abiertos."""
+)
+async def stream_search_events(
+    search_id: int,
+    request: Request,
+    last_event_id: Optional[str] = Header(None, alias="Last-Event-ID")
+):
+    """Stream SSE de estado, contadores y contactos de una búsqueda."""
+    try:
+        subscription, replay = search_events.subscribe(search_id, last_event_id)
+    except StreamLimitError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": str(max(settings.SSE_RETRY_MS // 1000, 1))}
+        )
+    
+    try:
+        snapshot = await _search_snapshot(search_id)
+    except Exception:
+        search_events.unsubscribe(subscription)
+        raise
+    if snapshot is None:
+        search_events.unsubscribe(subscription)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Búsqueda con ID {search_id} no encontrada"
         )
     
-    results = SearchService.get_search_results(db, search_id, only_valid)
+    async def event_stream() -> AsyncIterator[str]:
+        try:
+            yield f"retry: {settings.SSE_RETRY_MS}\n\n"
+            
+            state = _search_state(snapshot)
+            if replay is None:
+                yield _sse_message("status", snapshot)
+            else:
+                for event in replay:
+                    yield _sse_message(event.event, event.data, event.event_id)
+                    if event.event in ("status", "progress"):
+                        state = _search_state(event.data)
+                if _search_state(snapshot) != state:
+                    state = _search_state(snapshot)
+                    yield _sse_message("status", snapshot)
+            
+            while state[0] not in TERMINAL_STATUSES:
+                try:
+                    event = await asyncio.wait_for(subscription.queue.get(), timeout=settings.SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": heartbeat\n\n"
+                    current = await _search_snapshot(search_id)
+                    if current and _search_state(current) != state:
+                        event_name = "status" if current["status"] != state[0] else "progress"
+                        state = _search_state(current)
+                        yield _sse_message(event_name, current)
+                    continue
+                
+                if subscription.overflowed:
+                    # El cliente no alcanzó a leer: descartar lo encolado y enviar el estado actual
+                    subscription.overflowed = False
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    current = await _search_snapshot(search_id)
+                    if current:
+                        state = _search_state(current)
+                        yield _sse_message("status", current)
+                    continue
+                
+                yield _sse_message(event.event, event.data, event.event_id)
+                if event.event in ("status", "progress"):
+                    state = _search_state(event.data)
+            
+            yield _sse_message("end", {"search_id": search_id, "status": state[0]})
+        finally:
+            search_events.unsubscribe(subscription)
     
-    # Convertir a SearchWithResults
-    return SearchWithResults(
-        **search.__dict__,
-        results=[SearchResultItem(**r) for r in results]
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+        }
     )
 
 
@@ -364,10 +588,11 @@ def mark_search_error(
     summary="Callback de n8n",
     description="Endpoint para que n8n notifique cuando termine el scraping."
 )
+@query_budget(6)
 async def n8n_callback(
     search_id: int,
     callback: N8NCallback,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     api_key: str = Header(None, alias="X-N8N-API-KEY")
 ):
     """Endpoint para que n8n notifique cuando termine el scraping."""
@@ -379,7 +604,7 @@ async def n8n_callback(
         )
     
     # Buscar registro
-    search = SearchService.get_search(db, search_id)
+    search = await SearchService.get_search_async(db, search_id)
     if not search:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -392,7 +617,7 @@ async def n8n_callback(
         results_count=callback.results_count,
         finished_at=datetime.utcnow()
     )
-    SearchService.update_search(db, search_id, search_update)
+    await SearchService.update_search_async(db, search_id, search_update)
     
     # Log del callback
     log = SearchLog(
@@ -405,10 +630,153 @@ async def n8n_callback(
         response_time_ms=callback.execution_time_ms or 0
     )
     db.add(log)
-    db.commit()
+    await db.commit()
     
     return {
         "status": "acknowledged",
         "search_id": search_id,
         "message": "Callback procesado exitosamente"
     }
+
+
+# Máximo de errores de línea que se devuelven en la respuesta de ingesta
+MAX_INGEST_ERRORS = 50
+
+
+async def _iter_ndjson_lines(request: Request, max_line_bytes: int) -> AsyncIterator[bytes]:
+    """
+    Lee el cuerpo de la petición por partes y entrega una línea a la vez.
+    
+    Los saltos de línea se buscan solo en la parte recién llegada (lo anterior
+    del búfer ya se revisó) y cada línea, completa o a medio llegar, se limita
+    a max_line_bytes.
+    
+    Raises:
+        HTTPException: 413 si una línea supera max_line_bytes
+    """
+    def check(size: int) -> None:
+        if size > max_line_bytes:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail=f"Línea NDJSON supera {max_line_bytes} bytes"
+            )
+    
+    buffer = bytearray()
+    async for chunk in request.stream():
+        scan_from = len(buffer)
+        buffer += chunk
+        start = 0
+        end = buffer.find(b"\n", scan_from)
+        while end >= 0:
+            check(end - start)
+            yield bytes(buffer[start:end])
+            start = end + 1
+            end = buffer.find(b"\n", start)
+        del buffer[:start]
+        check(len(buffer))
+    if buffer:
+        yield bytes(buffer)
+
+
+def _flush_ingest_batch(db: Session, search_id: int, batch: List[ContactCreate]) -> List[dict]:
+    """Inserta un micro-lote y actualiza los contadores de la búsqueda."""
+    outcomes = ContactService.bulk_create_contacts(db, batch, search_id=search_id)
+    SearchService.refresh_result_counts(db, search_id)
+    return outcomes
+
+
+@router.post(
+    "/{search_id}/ingest",
+    summary="Ingesta NDJSON de resultados",
+    description="""Recibe los contactos de una búsqueda como application/x-ndjson (un ContactCreate por línea).
+    
+    El cuerpo se procesa a medida que llega: cada línea se valida por separado y los contactos
+    se insertan en micro-lotes de INGEST_BATCH_SIZE, actualizando results_count y
+    valid_results_count tras cada lote para que el frontend vea los resultados antes de que termine la carga.
+    """
+)
+@query_budget(None)
+async def ingest_search_results(
+    search_id: int,
+    request: Request,
+    db: Session = Depends(get_db),
+    api_key: str = Header(None, alias="X-N8N-API-KEY")
+):
+    """Ingesta incremental de resultados en formato NDJSON."""
+    if api_key != settings.N8N_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid API key"
+        )
+    
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type not in ("application/x-ndjson", "application/jsonl"):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Se espera Content-Type application/x-ndjson"
+        )
+    
+    search = await run_in_threadpool(SearchService.get_search, db, search_id)
+    if not search:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Búsqueda con ID {search_id} no encontrada"
+        )
+    
+    if search.status == "pending":
+        await run_in_threadpool(SearchService.mark_as_running, db, search_id)
+    
+    summary = {"lines": 0, "created": 0, "duplicates": 0, "rejected": 0, "batches": 0}
+    errors = []
+    batch: List[ContactCreate] = []
+    
+    def reject(line_number: int, detail: str):
+        summary["rejected"] += 1
+        if len(errors) < MAX_INGEST_ERRORS:
+            errors.append({"line": line_number, "detail": detail})
+    
+    async def flush():
+        outcomes = await run_in_threadpool(_flush_ingest_batch, db, search_id, list(batch))
+        batch.clear()
+        summary["batches"] += 1
+        for outcome in outcomes:
+            if outcome["status"] == "created":
+                summary["created"] += 1
+            elif outcome["status"] == "duplicate":
+                summary["duplicates"] += 1
+    
+    async for raw_line in _iter_ndjson_lines(request, settings.INGEST_MAX_LINE_BYTES):
+        line = raw_line.strip()
+        if not line:
+            continue
+        
+        summary["lines"] += 1
+        try:
+            payload = json.loads(line)
+            if not isinstance(payload, dict):
+                raise ValueError("Se esperaba un objeto JSON")
+            batch.append(ContactCreate(**payload))
+        except ValidationError as e:
+            error = e.errors()[0]
+            field = ".".join(str(part) for part in error.get("loc", ()))
+            reject(summary["lines"], f"{field}: {error['msg']}" if field else error["msg"])
+            continue
+        except ValueError as e:
+            reject(summary["lines"], str(e))
+            continue
+        
+        if len(batch) >= settings.INGEST_BATCH_SIZE:
+            await flush()
+    
+    if batch:
+        await flush()
+    
+    search = await run_in_threadpool(SearchService.refresh_result_counts, db, search_id)
+    
+    return {
+        "search_id": search_id,
+        **summary,
+        "results_count": search.results_count,
+        "valid_results_count": search.valid_results_count,
+        "errors": errors
+    }
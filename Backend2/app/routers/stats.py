@@ -10,7 +10,7 @@ from app.database import get_db
 from app.schemas.search import SearchStatsResponse
 from app.schemas.contact import ContactByRegionStats
 from app.services.search_service import SearchService
-from app.services.contact_service import ContactService
+from app.services.stats_service import StatsService
 
 router = APIRouter(prefix="/stats", tags=["Estadísticas"])
 
@@ -18,66 +18,11 @@ router = APIRouter(prefix="/stats", tags=["Estadísticas"])
 @router.get(
     "/summary",
     summary="Resumen general",
-    description="Obtiene un resumen general del sistema con estadísticas clave."
+    description="Obtiene un resumen general del sistema con estadísticas clave (desde las tablas de resumen)."
 )
 def get_summary(db: Session = Depends(get_db)):
     """Obtener resumen general del sistema."""
-    from app.models import Search, Contact, SearchResult
-    from sqlalchemy import func
-    
-    # Estadísticas generales
-    total_searches = db.query(func.count(Search.id)).scalar()
-    total_contacts = db.query(func.count(Contact.id)).filter(Contact.is_valid == 1).scalar()
-    total_results = db.query(func.count(SearchResult.search_id)).scalar()
-    
-    # Búsquedas por estado
-    searches_by_status = db.query(
-        Search.status,
-        func.count(Search.id).label('count')
-    ).group_by(Search.status).all()
-    
-    # Contactos de alta calidad
-    high_quality_contacts = db.query(
-        func.count(Contact.id)
-    ).filter(
-        Contact.is_valid == 1,
-        Contact.validation_score >= 0.8
-    ).scalar()
-    
-    # Duplicados detectados
-    duplicates_detected = db.query(
-        func.count(Contact.id)
-    ).filter(
-        Contact.is_valid == 0
-    ).scalar()
-    
-    # Regiones más activas
-    top_regions = db.query(
-        Contact.region,
-        func.count(Contact.id).label('count')
-    ).filter(
-        Contact.is_valid == 1,
-        Contact.region.isnot(None)
-    ).group_by(
-        Contact.region
-    ).order_by(
-        func.count(Contact.id).desc()
-    ).limit(5).all()
-    
-    return {
-        "total_searches": total_searches or 0,
-        "total_contacts": total_contacts or 0,
-        "total_results": total_results or 0,
-        "high_quality_contacts": high_quality_contacts or 0,
-        "duplicates_detected": duplicates_detected or 0,
-        "searches_by_status": {
-            status: count for status, count in searches_by_status
-        },
-        "top_regions": [
-            {"region": region, "count": count}
-            for region, count in top_regions
-        ]
-    }
+    return StatsService.get_summary(db)
 
 
 @router.get(
@@ -110,7 +55,7 @@ def get_session_stats(
 )
 def get_stats_by_region(db: Session = Depends(get_db)):
     """Obtener estadísticas por región."""
-    return ContactService.get_contacts_by_region(db)
+    return StatsService.get_contacts_by_region(db)
 
 
 @router.get(
@@ -120,30 +65,17 @@ def get_stats_by_region(db: Session = Depends(get_db)):
 )
 def get_quality_distribution(db: Session = Depends(get_db)):
     """Obtener distribución de calidad de contactos."""
-    from app.models import Contact
-    from sqlalchemy import func, case
-    
-    # Agrupar por rangos de validation_score
-    distribution = db.query(
-        case(
-            (Contact.validation_score >= 0.9, "Excelente (0.9-1.0)"),
-            (Contact.validation_score >= 0.7, "Bueno (0.7-0.89)"),
-            (Contact.validation_score >= 0.5, "Regular (0.5-0.69)"),
-            else_="Bajo (<0.5)"
-        ).label('quality_range'),
-        func.count(Contact.id).label('count')
-    ).filter(
-        Contact.is_valid == 1
-    ).group_by(
-        'quality_range'
-    ).all()
-    
-    return {
-        "distribution": [
-            {"quality_range": qr, "count": count}
-            for qr, count in distribution
-        ]
-    }
+    return StatsService.get_quality_distribution(db)
+
+
+@router.post(
+    "/reconcile",
+    summary="Recalcular estadísticas",
+    description="Recalcula las tablas de resumen desde las tablas base (lo hace también un job periódico). Útil tras cargas masivas."
+)
+def reconcile_stats(db: Session = Depends(get_db)):
+    """Recalcular las tablas de resumen."""
+    return {"rows": StatsService.reconcile(db)}
 
 
 @router.get(
@@ -153,47 +85,72 @@ def get_quality_distribution(db: Session = Depends(get_db)):
 )
 def get_recent_activity(db: Session = Depends(get_db)):
     """Obtener actividad reciente."""
-    from app.models import Search, Contact
-    from sqlalchemy import func, desc
-    from datetime import datetime, timedelta
-    
-    # Últimas 24 horas
-    last_24h = datetime.now() - timedelta(hours=24)
+    return StatsService.get_recent_activity(db)
+
+
+@router.get(
+    "/page-cache",
+    summary="Caché de páginas",
+    description="Obtiene los contadores de la caché en disco de páginas del pipeline nativo (hits, misses, revalidaciones, bytes ahorrados)."
+)
+def get_page_cache_stats():
+    """Obtener los contadores de la caché de páginas."""
+    from app.pipeline.cache import get_page_cache
+    from app.config import settings
     
-    # Búsquedas recientes
-    recent_searches = db.query(func.count(Search.id)).filter(
-        Search.created_at >= last_24h
-    ).scalar()
+    return {
+        "enabled": settings.PAGE_CACHE_ENABLED,
+        "ttl_seconds": settings.PAGE_CACHE_TTL_SECONDS,
+        **get_page_cache().get_stats()
+    }
+
+
+@router.get(
+    "/cache",
+    summary="Caché de lecturas",
+    description="Obtiene los contadores de la caché de lecturas por namespace (hits, misses, hit_ratio, invalidaciones, desalojos)."
+)
+def get_cache_stats():
+    """Obtener los contadores de la caché de lecturas."""
+    from app.cache import cache
     
-    # Contactos agregados recientemente
-    recent_contacts = db.query(func.count(Contact.id)).filter(
-        Contact.created_at >= last_24h,
-        Contact.is_valid == 1
-    ).scalar()
+    return cache.get_stats()
+
+
+@router.get(
+    "/queries",
+    summary="Consultas por ruta",
+    description="""Obtiene, por ruta, peticiones, latencia media, consultas SQL y tiempo en la base por petición,
+    y las sentencias más lentas del worker (forma normalizada, forma de los parámetros y ruta que las ejecutó)."""
+)
+def get_query_stats():
+    """Obtener las métricas de rutas y las sentencias más lentas."""
+    from app.metrics import metrics
     
-    # Última búsqueda
-    last_search = db.query(Search).order_by(desc(Search.created_at)).first()
+    return {
+        "routes": metrics.get_route_stats(),
+        "slow_queries": metrics.get_slow_queries()
+    }
+
+
+@router.get(
+    "/pool",
+    summary="Pool de conexiones",
+    description="""Obtiene el estado y los contadores de los pools de conexiones del worker (sync y async).
     
-    # Último contacto
-    last_contact = db.query(Contact).filter(
-        Contact.is_valid == 1
-    ).order_by(desc(Contact.created_at)).first()
+    Incluye conexiones en uso y libres, pico de uso, checkouts en overflow, timeouts, histograma del tiempo
+    de espera por una conexión, conexiones abiertas y cerradas (rotación), invalidaciones y desconexiones."""
+)
+def get_pool_stats():
+    """Obtener las métricas de los pools de conexiones."""
+    from app.config import settings
+    from app.pool_metrics import pool_metrics
     
     return {
-        "last_24_hours": {
-            "searches": recent_searches or 0,
-            "contacts": recent_contacts or 0
-        },
-        "last_search": {
-            "id": last_search.id,
-            "keywords": last_search.keywords,
-            "created_at": last_search.created_at,
-            "status": last_search.status
-        } if last_search else None,
-        "last_contact": {
-            "id": last_contact.id,
-            "name": last_contact.name,
-            "organization": last_contact.organization,
-            "created_at": last_contact.created_at
-        } if last_contact else None
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT,
+        "recycle_seconds": settings.DB_POOL_RECYCLE,
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        **pool_metrics.get_stats()
     }
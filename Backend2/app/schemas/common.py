@@ -17,9 +17,11 @@ class PaginationParams(BaseModel):
 class PaginatedResponse(BaseModel, Generic[T]):
     """Respuesta paginada genérica."""
     items: List[T]
-    total: int
+    total: Optional[int] = Field(None, description="Total de registros (None con total_mode=none)")
     skip: int
     limit: int
+    next_cursor: Optional[str] = Field(None, description="Cursor para pedir la página siguiente (None si es la última)")
+    total_mode: str = Field("exact", description="Cómo se calculó el total: exact, estimated o none")
     
     class Config:
         from_attributes = True
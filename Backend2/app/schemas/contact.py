@@ -2,7 +2,7 @@
 Schemas Pydantic para contactos (contacts).
 """
 
-from typing import Optional, List, Any
+from typing import Optional, List, Any, Dict
 from datetime import datetime
 from decimal import Decimal
 from pydantic import BaseModel, Field, EmailStr, validator
@@ -116,3 +116,33 @@ class DuplicateContactResponse(BaseModel):
     
     class Config:
         from_attributes = True
+
+
+class ContactBulkCreate(BaseModel):
+    """Schema para ingesta masiva de contactos."""
+    search_id: Optional[int] = Field(None, description="Búsqueda a la que se vinculan los contactos")
+    relevance_score: Decimal = Field(Decimal("1.00"), ge=0.0, le=1.0, description="Relevancia de los vínculos con la búsqueda")
+    contacts: List[Dict[str, Any]] = Field(
+        ...,
+        min_length=1,
+        max_length=1000,
+        description="Contactos a insertar (cada uno se valida como ContactCreate)"
+    )
+
+
+class ContactBulkItemResult(BaseModel):
+    """Resultado de un contacto dentro de una ingesta masiva."""
+    index: int = Field(..., description="Posición del contacto en el lote")
+    status: str = Field(..., description="created, duplicate o rejected")
+    contact_id: Optional[int] = None
+    validation_score: Optional[Decimal] = None
+    detail: Optional[str] = None
+
+
+class ContactBulkResponse(BaseModel):
+    """Schema de respuesta de una ingesta masiva."""
+    search_id: Optional[int] = None
+    created: int = 0
+    duplicates: int = 0
+    rejected: int = 0
+    items: List[ContactBulkItemResult] = []
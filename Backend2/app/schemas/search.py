@@ -86,6 +86,10 @@ class SearchResultItem(BaseModel):
 class SearchWithResults(SearchResponse):
     """Schema de búsqueda con sus resultados."""
     results: List[SearchResultItem] = []
+    next_since: Optional[str] = Field(
+        None,
+        description="Marca de agua para pedir solo los resultados agregados después (?since=)"
+    )
     
     class Config:
         from_attributes = True
@@ -4,8 +4,14 @@ Paquete de servicios (lógica de negocio).
 
 from app.services.search_service import SearchService
 from app.services.contact_service import ContactService
+from app.services.dispatch_service import DispatchService
+from app.services.stats_service import StatsService
+from app.services.export_service import ExportService
 
 __all__ = [
     "SearchService",
     "ContactService",
+    "DispatchService",
+    "StatsService",
+    "ExportService",
 ]
@@ -0,0 +1,252 @@
+"""
+Búsqueda de contactos por texto.
+
+Cada contacto guarda en search_document su nombre, email, organización,
+cargo y líneas de investigación en minúsculas y sin tildes ("Martínez" y
+"Martinez" producen el mismo documento). En MySQL la búsqueda usa un índice
+FULLTEXT con el parser ngram (coincide con partes de palabras y ordena por
+relevancia); en SQLite (perfil de pruebas) se usa un índice invertido en
+memoria con la misma semántica.
+"""
+
+import re
+import threading
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from sqlalchemy import func, literal
+from sqlalchemy.orm import Session
+
+from app.models import Contact
+from app.utils.counting import count_total, validate_total_mode
+from app.utils.pagination import decode_cursor, encode_cursor, paginate
+from app.utils.sql import dialect_name
+
+# Largo de los n-gramas (igual que ngram_token_size por defecto en MySQL)
+NGRAM_SIZE = 2
+
+_WORD_RE = re.compile(r"\w+")
+
+# Resultado de una búsqueda: (contactos, total, cursor de la página siguiente)
+SearchPage = Tuple[List[Contact], Optional[int], Optional[str]]
+
+
+def fold_accents(value: Optional[str]) -> str:
+    """Pasar un texto a minúsculas y quitarle tildes y diacríticos."""
+    if not value:
+        return ""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def build_search_document(
+    name: Optional[str],
+    email: Optional[str],
+    organization: Optional[str],
+    position: Optional[str],
+    research_lines: Optional[Union[List[str], str]] = None
+) -> Optional[str]:
+    """
+    Construir el documento de búsqueda de un contacto.
+
+    Args:
+        name: Nombre
+        email: Email
+        organization: Organización
+        position: Cargo
+        research_lines: Líneas de investigación (lista o texto)
+
+    Returns:
+        Texto normalizado, o None si el contacto no tiene ninguno de esos campos
+    """
+    if isinstance(research_lines, (list, tuple)):
+        research_lines = " ".join(str(line) for line in research_lines if line)
+    parts = [fold_accents(part) for part in (name, email, organization, position, research_lines) if part]
+    return " ".join(part for part in parts if part) or None
+
+
+def search_terms(search_term: str) -> List[str]:
+    """
+    Términos de una búsqueda (normalizados, sin repetir).
+
+    Los términos más cortos que un n-grama no están en el índice: cada
+    backend los filtra como subcadena del documento.
+    """
+    terms = []
+    for word in _WORD_RE.findall(fold_accents(search_term)):
+        if word not in terms:
+            terms.append(word)
+    return terms
+
+
+def _ngrams(word: str) -> Iterable[str]:
+    return (word[i:i + NGRAM_SIZE] for i in range(len(word) - NGRAM_SIZE + 1))
+
+
+class FulltextContactSearch:
+    """Búsqueda con MATCH ... AGAINST sobre el índice FULLTEXT (ngram) de MySQL."""
+
+    def search(
+        self,
+        db: Session,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> SearchPage:
+        validate_total_mode(total_mode)
+        terms = search_terms(search_term)
+        if not terms:
+            return [], 0 if total_mode != "none" else None, None
+
+        # Modo booleano: todos los términos deben aparecer; con el parser ngram
+        # cada término se busca como frase de n-gramas (coincidencia parcial)
+        indexed = [term for term in terms if len(term) >= NGRAM_SIZE]
+        query = db.query(Contact).filter(Contact.is_valid == 1)
+        if indexed:
+            relevance = Contact.search_document.match(" ".join(f'+"{term}"' for term in indexed))
+            query = query.filter(relevance)
+        else:
+            relevance = literal(0)
+        # Términos de una letra: sin n-gramas, se filtran con LIKE (si no hay
+        # otros términos, recorre la tabla)
+        for term in terms:
+            if len(term) < NGRAM_SIZE:
+                query = query.filter(Contact.search_document.contains(term, autoescape=True))
+
+        total = count_total(db, query, Contact.id, total_mode, cache_key=("contact_search", tuple(terms)))
+        rows, next_cursor = paginate(
+            query.add_columns(relevance.label("relevance")),
+            [(relevance, True), (Contact.id, True)],
+            limit,
+            skip=skip,
+            cursor=cursor,
+            row_values=lambda row: [row[1], row[0].id]
+        )
+        return [row[0] for row in rows], total, next_cursor
+
+
+class InvertedIndexContactSearch:
+    """
+    Índice invertido en memoria (n-grama -> contactos) para motores sin FULLTEXT.
+
+    El índice se reconstruye cuando cambia la tabla (cantidad de filas y de
+    válidas, último ID, última actualización o largo total de los documentos;
+    este último detecta ediciones en el mismo segundo que la anterior).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._signature: Optional[tuple] = None
+        self._documents: Dict[int, str] = {}
+        self._postings: Dict[str, Set[int]] = defaultdict(set)
+
+    def _table_signature(self, db: Session) -> tuple:
+        row = db.query(
+            func.count(Contact.id),
+            func.sum(Contact.is_valid),
+            func.max(Contact.id),
+            func.max(Contact.updated_at),
+            func.sum(func.length(Contact.search_document))
+        ).one()
+        return (str(db.get_bind().url),) + tuple(row)
+
+    def _refresh(self, db: Session) -> None:
+        signature = self._table_signature(db)
+        if signature == self._signature:
+            return
+
+        documents: Dict[int, str] = {}
+        postings: Dict[str, Set[int]] = defaultdict(set)
+        rows = db.query(
+            Contact.id, Contact.name, Contact.email, Contact.organization, Contact.position, Contact.research_lines
+        ).filter(Contact.is_valid == 1)
+        for contact_id, name, email, organization, position, research_lines in rows:
+            document = build_search_document(name, email, organization, position, research_lines)
+            if not document:
+                continue
+            documents[contact_id] = document
+            for word in _WORD_RE.findall(document):
+                for gram in _ngrams(word):
+                    postings[gram].add(contact_id)
+
+        self._documents, self._postings, self._signature = documents, postings, signature
+
+    def _rank(self, terms: List[str]) -> List[Tuple[float, int]]:
+        candidates: Optional[Set[int]] = None
+        for term in terms:
+            for gram in _ngrams(term):
+                ids = self._postings.get(gram, set())
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    return []
+        if candidates is None:
+            # Solo términos de una letra: se revisan todos los documentos
+            candidates = set(self._documents)
+
+        ranked = []
+        for contact_id in candidates or ():
+            document = self._documents[contact_id]
+            score = 0.0
+            for term in terms:
+                occurrences = document.count(term)
+                if not occurrences:
+                    break
+                # Coincidir al inicio de una palabra pesa más que en medio
+                prefix = len(re.findall(rf"\b{re.escape(term)}", document))
+                score += occurrences + prefix
+            else:
+                ranked.append((score, contact_id))
+
+        ranked.sort(key=lambda item: (-item[0], -item[1]))
+        return ranked
+
+    def search(
+        self,
+        db: Session,
+        search_term: str,
+        skip: int = 0,
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> SearchPage:
+        validate_total_mode(total_mode)
+
+        terms = search_terms(search_term)
+        with self._lock:
+            self._refresh(db)
+            ranked = self._rank(terms) if terms else []
+        total = len(ranked) if total_mode != "none" else None
+
+        if cursor:
+            last_score, last_id = decode_cursor(cursor, 2)
+            if not isinstance(last_score, (int, float)) or not isinstance(last_id, int):
+                raise ValueError("Cursor inválido")
+            ranked = [
+                (score, contact_id) for score, contact_id in ranked
+                if score < last_score or (score == last_score and contact_id < last_id)
+            ]
+        else:
+            ranked = ranked[skip:]
+
+        page = ranked[:limit]
+        next_cursor = encode_cursor(list(page[-1])) if len(ranked) > limit else None
+
+        contacts = {
+            contact.id: contact
+            for contact in db.query(Contact).filter(Contact.id.in_([contact_id for _, contact_id in page]))
+        } if page else {}
+        return [contacts[contact_id] for _, contact_id in page if contact_id in contacts], total, next_cursor
+
+
+fulltext_search = FulltextContactSearch()
+inverted_index_search = InvertedIndexContactSearch()
+
+
+def get_contact_search(db: Session) -> Union[FulltextContactSearch, InvertedIndexContactSearch]:
+    """Backend de búsqueda adecuado para el motor de la sesión."""
+    if dialect_name(db) == "mysql":
+        return fulltext_search
+    return inverted_index_search
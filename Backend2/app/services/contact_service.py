@@ -3,26 +3,212 @@ Servicio para gestión de contactos.
 Contiene la lógica de negocio relacionada con contacts.
 """
 
-from typing import List, Optional, Tuple
+from typing import Iterable, List, Optional, Tuple, Union
+from decimal import Decimal
+from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_, or_
+from sqlalchemy import func, desc, and_, or_, select
 from app.models import Contact, SearchResult, Search
 from app.schemas.contact import ContactCreate, ContactUpdate, ContactByRegionStats
+from app.services.scoring_engine import (
+    MatchKeys,
+    ScoringEngine,
+    SECONDARY_FIELDS,
+    build_match_keys,
+    match_keys_from_columns,
+    normalized_columns,
+)
+from app.services.contact_search import build_search_document, get_contact_search
+from app.utils.sql import exact_equals, exact_text, insert_ignore_duplicates
+from app.cache import cache
+from app.services.search_events import search_events
+from app.services.stats_service import CONTACTS_LISTED, LISTED_MIN_SCORE
+from app.utils.pagination import paginate
+from app.utils.counting import count_cache, count_total
 from sqlalchemy.exc import IntegrityError
 
+# Orden de los listados de contactos (la última columna desempata)
+CONTACT_ORDER = [(Contact.validation_score, True), (Contact.created_at, True), (Contact.id, True)]
+# Posibles duplicados: los de menor score primero
+DUPLICATE_ORDER = [(Contact.validation_score, False), (Contact.created_at, True), (Contact.id, True)]
+
 
 class ContactService:
     """Servicio para operaciones de contactos."""
     
+    @staticmethod
+    def _match_key_columns() -> dict:
+        """
+        Columnas persistidas equivalentes a las claves normalizadas de MatchKeys.
+        
+        Returns:
+            Diccionario campo -> columna
+        """
+        return {
+            "name": Contact.name_norm,
+            "organization": Contact.org_norm,
+            "position": Contact.position_norm,
+            "region": Contact.region_norm,
+            "phone": Contact.phone_norm,
+            "source_url": Contact.source_url,
+        }
+    
+    @staticmethod
+    def _load_scoring_candidates(db: Session, keys_list: List[MatchKeys]) -> ScoringEngine:
+        """
+        Cargar en un motor de scoring los contactos que comparten nombre,
+        teléfono o URL con alguna de las claves recibidas.
+        
+        Args:
+            db: Sesión de base de datos
+            keys_list: Claves normalizadas de los contactos a evaluar
+            
+        Returns:
+            Motor de scoring con los candidatos indexados
+        """
+        engine = ScoringEngine()
+        columns = ContactService._match_key_columns()
+        
+        conditions = []
+        for field in ("name", "phone", "source_url"):
+            values = {getattr(keys, field) for keys in keys_list if getattr(keys, field)}
+            if values:
+                conditions.append(columns[field].in_(values))
+        
+        if not conditions:
+            return engine
+        
+        rows = db.query(
+            Contact.id,
+            Contact.name_norm,
+            Contact.org_norm,
+            Contact.position_norm,
+            Contact.region_norm,
+            Contact.phone_norm,
+            Contact.source_url
+        ).filter(or_(*conditions)).all()
+        
+        for row in rows:
+            engine.add(
+                row.id,
+                match_keys_from_columns(
+                    row.name_norm, row.org_norm, row.position_norm,
+                    row.region_norm, row.phone_norm, row.source_url
+                ),
+                count_secondary=False
+            )
+        
+        return engine
+    
+    @staticmethod
+    def _has_secondary_match(db: Session, keys: MatchKeys, exclude_ids) -> bool:
+        """
+        Verificar si existe un contacto (fuera de los candidatos) que coincida
+        en organización, cargo o región.
+        
+        Args:
+            db: Sesión de base de datos
+            keys: Claves normalizadas del contacto a evaluar
+            exclude_ids: IDs de candidatos ya comparados
+            
+        Returns:
+            True si existe al menos una coincidencia
+        """
+        columns = ContactService._match_key_columns()
+        conditions = [
+            exact_equals(db, columns[field], getattr(keys, field))
+            for field in SECONDARY_FIELDS
+            if getattr(keys, field)
+        ]
+        
+        if not conditions:
+            return False
+        
+        query = db.query(Contact.id).filter(or_(*conditions))
+        if exclude_ids:
+            query = query.filter(Contact.id.notin_(exclude_ids))
+        
+        return query.first() is not None
+    
+    @staticmethod
+    def _contact_match_keys(contact_data) -> MatchKeys:
+        """
+        Claves normalizadas de un contacto (schema o modelo).
+        
+        Args:
+            contact_data: ContactCreate o Contact
+            
+        Returns:
+            Claves normalizadas
+        """
+        return build_match_keys(
+            contact_data.name,
+            contact_data.organization,
+            contact_data.position,
+            contact_data.region,
+            contact_data.phone,
+            contact_data.source_url
+        )
+    
+    @staticmethod
+    def _search_document(contact_data) -> Optional[str]:
+        """
+        Documento de búsqueda de un contacto (schema o modelo).
+        
+        Args:
+            contact_data: ContactCreate o Contact
+            
+        Returns:
+            Texto normalizado para la búsqueda FULLTEXT
+        """
+        return build_search_document(
+            contact_data.name,
+            contact_data.email,
+            contact_data.organization,
+            contact_data.position,
+            contact_data.research_lines
+        )
+    
+    @staticmethod
+    def invalidate_cache(
+        contact_ids: Iterable[int],
+        search_id: Optional[int] = None,
+        affects_sessions: bool = False
+    ) -> None:
+        """
+        Invalidar las lecturas cacheadas que dependen de unos contactos y los
+        totales cacheados de los listados de contactos. Se llama después de
+        cada escritura que los crea o modifica.
+        
+        Args:
+            contact_ids: IDs de los contactos escritos
+            search_id: Búsqueda a la que se vincularon (si corresponde)
+            affects_sessions: Si cambian las estadísticas por sesión
+                (vínculos nuevos, validez o score)
+        """
+        for contact_id in contact_ids:
+            cache.invalidate("contact", contact_id)
+        if search_id is not None:
+            cache.invalidate("search", search_id)
+        if affects_sessions or search_id is not None:
+            cache.invalidate("session_stats")
+        cache.invalidate("recent_activity")
+        count_cache.invalidate("contacts", "contact_search", "duplicates")
+    
     @staticmethod
     def calculate_validation_score(db: Session, contact_data: ContactCreate) -> float:
         """
         Calcular score de validación basado en similitudes con contactos existentes.
         
+        Solo se comparan los contactos que comparten nombre, teléfono o URL
+        (ver ScoringEngine); las coincidencias únicamente en
+        organización/cargo/región se resuelven con una consulta de existencia.
+        
         Reglas de scoring:
         - 1.0: Único sin similitudes
         - 0.9: Solo 1 dato duplicado (excepto phone/email/url) O 2-3 datos de org/position/region
-        - 0.7: Solo URL duplicado O Name + 1 dato de org/position/region
+        - 0.7: Solo URL duplicado
         - 0.6: Solo phone duplicado
         - 0.5: Solo email duplicado (no aplica, rechazado por DB)
         - 0.4: 2-3 datos de org/position/region + name
@@ -36,92 +222,15 @@ class ContactService:
         Returns:
             Score de validación (0.0 - 1.0)
         """
-        from sqlalchemy import func
+        keys = ContactService._contact_match_keys(contact_data)
         
-        # Normalizar datos para comparación
-        name_lower = contact_data.name.lower().strip() if contact_data.name else ""
-        org_lower = contact_data.organization.lower().strip() if contact_data.organization else ""
-        position_lower = contact_data.position.lower().strip() if contact_data.position else ""
-        region_lower = contact_data.region.lower().strip() if contact_data.region else ""
-        phone_clean = contact_data.phone.replace(" ", "").replace("-", "") if contact_data.phone else ""
-        url = contact_data.source_url
+        engine = ContactService._load_scoring_candidates(db, [keys])
+        score = engine.score(keys)
         
-        # Obtener todos los contactos existentes para comparar
-        existing_contacts = db.query(Contact).all()
+        if score > 0.9 and ContactService._has_secondary_match(db, keys, engine.candidates(keys)):
+            score = 0.9
         
-        if not existing_contacts:
-            return 1.0  # Primer contacto, único
-        
-        min_score = 1.0
-        
-        # Comparar con cada contacto existente
-        for contact in existing_contacts:
-            matches = []
-            match_count = 0
-            
-            # Normalizar datos del contacto existente
-            ex_name = contact.name.lower().strip() if contact.name else ""
-            ex_org = contact.organization.lower().strip() if contact.organization else ""
-            ex_position = contact.position.lower().strip() if contact.position else ""
-            ex_region = contact.region.lower().strip() if contact.region else ""
-            ex_phone = contact.phone.replace(" ", "").replace("-", "") if contact.phone else ""
-            ex_url = contact.source_url
-            
-            # Verificar coincidencias
-            name_match = (name_lower == ex_name) if name_lower and ex_name else False
-            org_match = (org_lower == ex_org) if org_lower and ex_org else False
-            position_match = (position_lower == ex_position) if position_lower and ex_position else False
-            region_match = (region_lower == ex_region) if region_lower and ex_region else False
-            phone_match = (phone_clean == ex_phone) if phone_clean and ex_phone else False
-            url_match = (url == ex_url) if url and ex_url else False
-            
-            # Contar coincidencias de org/position/region
-            secondary_matches = sum([org_match, position_match, region_match])
-            
-            # Aplicar reglas de scoring
-            current_score = 1.0
-            
-            # CASO 1: Solo URL duplicado (0.7) - mismo origen pero diferente contacto
-            if url_match and not name_match and not phone_match and secondary_matches == 0:
-                current_score = min(current_score, 0.7)
-            
-            # CASO 2: URL + otros datos duplicados (0.3) - muy sospechoso
-            # Nota: email duplicado ya es rechazado por UNIQUE constraint de DB
-            elif url_match and (name_match or phone_match or secondary_matches > 0):
-                current_score = min(current_score, 0.3)
-            
-            # CASO 3: Name + 2-3 datos secundarios (0.4)
-            if name_match and secondary_matches >= 2:
-                current_score = min(current_score, 0.4)
-            
-            # CASO 4: Solo phone duplicado (0.6)
-            elif phone_match and not name_match and secondary_matches == 0 and not url_match:
-                current_score = min(current_score, 0.6)
-            
-            # CASO 6: Solo 1 dato duplicado (0.9) O 2-3 datos secundarios sin name
-            elif not name_match and not url_match:
-                if secondary_matches >= 2:
-                    # 2-3 datos de org/position/region sin name
-                    current_score = min(current_score, 0.9)
-                elif secondary_matches == 1:
-                    # Solo 1 dato secundario
-                    current_score = min(current_score, 0.9)
-            
-            # CASO 7: Solo name duplicado (0.9)
-            elif name_match and secondary_matches == 0 and not phone_match and not url_match:
-                current_score = min(current_score, 0.9)
-            
-            # Casos con múltiples coincidencias (muy sospechosos)
-            total_matches = sum([name_match, org_match, position_match, region_match, phone_match, url_match])
-            if total_matches >= 4:
-                current_score = min(current_score, 0.2)
-            elif total_matches >= 3 and name_match:
-                current_score = min(current_score, 0.3)
-            
-            # Tomar el score más bajo encontrado
-            min_score = min(min_score, current_score)
-        
-        return min_score
+        return score
     
     @staticmethod
     def create_contact(db: Session, contact_data: ContactCreate) -> Optional[Contact]:
@@ -154,12 +263,15 @@ class ContactService:
                 source_type=contact_data.source_type,
                 research_lines=research_lines_json,
                 validation_score=validation_score,  # Usar score calculado
-                is_valid=True  # Mantener como válido, pero con score bajo si es sospechoso
+                is_valid=True,  # Mantener como válido, pero con score bajo si es sospechoso
+                search_document=ContactService._search_document(contact_data),
+                **normalized_columns(ContactService._contact_match_keys(contact_data))
             )
             
             db.add(contact)
             db.commit()
             db.refresh(contact)
+            ContactService.invalidate_cache([contact.id])
             
             return contact
             
@@ -171,6 +283,259 @@ class ContactService:
                 return existing
             return None
     
+    @staticmethod
+    def _load_secondary_counts(db: Session, engine: ScoringEngine, keys_list: List[MatchKeys]) -> None:
+        """
+        Cargar en el motor de scoring cuántos contactos existentes comparten
+        cada valor de organización, cargo y región del lote.
+        
+        Args:
+            db: Sesión de base de datos
+            engine: Motor de scoring a completar
+            keys_list: Claves normalizadas del lote
+        """
+        columns = ContactService._match_key_columns()
+        
+        for field in SECONDARY_FIELDS:
+            values = {getattr(keys, field) for keys in keys_list if getattr(keys, field)}
+            if not values:
+                continue
+            column = columns[field]
+            # Filtro con la collation de la columna (índice); agrupación exacta
+            # para que cada variante cuente aparte, igual que score_pair
+            exact = exact_text(db, column)
+            counts = db.query(exact, func.count(Contact.id)).filter(
+                column.in_(values)
+            ).group_by(exact).all()
+            engine.add_secondary_counts(field, counts)
+    
+    @staticmethod
+    def _ids_by_unique_key(db: Session, rows: List[dict]) -> dict:
+        """
+        IDs de los contactos guardados que coinciden con filas del lote.
+        
+        La clave de cada fila es su email (único) o, sin email, la URL de
+        origen con las claves normalizadas de scoring.
+        
+        Args:
+            db: Sesión de base de datos
+            rows: Filas del INSERT multi-fila
+            
+        Returns:
+            Diccionario clave -> IDs en orden de inserción
+        """
+        emails = {row["email"].lower() for row in rows if row["email"]}
+        urls = {row["source_url"] for row in rows if not row["email"]}
+        conditions = []
+        if emails:
+            conditions.append(Contact.email.in_(emails))
+        if urls:
+            conditions.append(and_(Contact.email.is_(None), Contact.source_url.in_(urls)))
+        if not conditions:
+            return {}
+        
+        ids = {}
+        for contact in db.query(
+            Contact.id, Contact.email, Contact.source_url, Contact.name_norm, Contact.org_norm,
+            Contact.position_norm, Contact.region_norm, Contact.phone_norm
+        ).filter(or_(*conditions)).order_by(Contact.id):
+            ids.setdefault(ContactService._unique_key(contact._mapping), []).append(contact.id)
+        return ids
+    
+    @staticmethod
+    def _unique_key(row) -> tuple:
+        """Clave con la que bulk_create_contacts identifica una fila insertada."""
+        if row["email"]:
+            return ("email", row["email"].lower())
+        return (
+            "identity", row["source_url"], row["name_norm"], row["org_norm"],
+            row["position_norm"], row["region_norm"], row["phone_norm"]
+        )
+    
+    @staticmethod
+    def bulk_create_contacts(
+        db: Session,
+        contacts: List[Union[ContactCreate, dict]],
+        search_id: Optional[int] = None,
+        relevance_score: float = 1.0
+    ) -> List[dict]:
+        """
+        Crear un lote de contactos en una sola transacción.
+        
+        El lote se puntúa en una pasada contra la base de datos y contra sí
+        mismo (cada contacto se compara con los anteriores del lote, igual que
+        si se insertaran uno a uno), se inserta con un INSERT multi-fila y se
+        vincula opcionalmente a una búsqueda en search_results.
+        
+        Args:
+            db: Sesión de base de datos
+            contacts: Contactos a crear (ContactCreate o diccionarios sin validar)
+            search_id: ID de la búsqueda a vincular (opcional)
+            relevance_score: Relevancia de los vínculos con la búsqueda
+            
+        Returns:
+            Lista de resultados por contacto (index, status, contact_id,
+            validation_score, detail) en el mismo orden del lote
+        """
+        outcomes = [
+            {"index": index, "status": "rejected", "contact_id": None, "validation_score": None, "detail": None}
+            for index in range(len(contacts))
+        ]
+        
+        # 1. Validar cada contacto por separado
+        valid_items = []
+        for index, item in enumerate(contacts):
+            if isinstance(item, ContactCreate):
+                valid_items.append((index, item))
+                continue
+            try:
+                valid_items.append((index, ContactCreate(**item)))
+            except ValidationError as e:
+                error = e.errors()[0]
+                field = ".".join(str(part) for part in error.get("loc", ()))
+                outcomes[index]["detail"] = f"{field}: {error['msg']}" if field else error["msg"]
+            except TypeError:
+                outcomes[index]["detail"] = "Formato de contacto inválido"
+        
+        # 2. Duplicados por email (existentes en DB o repetidos en el lote)
+        emails = {item.email.lower() for _, item in valid_items if item.email}
+        existing_by_email = {}
+        if emails:
+            existing_by_email = {
+                email.lower(): (contact_id, score)
+                for contact_id, email, score in db.query(
+                    Contact.id, Contact.email, Contact.validation_score
+                ).filter(Contact.email.in_(emails)).all()
+            }
+        
+        to_insert = []
+        batch_duplicates = []
+        seen_emails = set()
+        for index, item in valid_items:
+            email = item.email.lower() if item.email else None
+            if email and email in existing_by_email:
+                contact_id, score = existing_by_email[email]
+                outcomes[index].update(status="duplicate", contact_id=contact_id, validation_score=score)
+            elif email and email in seen_emails:
+                batch_duplicates.append((index, email))
+            else:
+                if email:
+                    seen_emails.add(email)
+                to_insert.append((index, item))
+        
+        # 3. Scoring del lote en una pasada
+        keys_list = [ContactService._contact_match_keys(item) for _, item in to_insert]
+        engine = ContactService._load_scoring_candidates(db, keys_list)
+        ContactService._load_secondary_counts(db, engine, keys_list)
+        
+        rows = []
+        for (index, item), keys in zip(to_insert, keys_list):
+            score = engine.score(keys)
+            engine.add(("batch", index), keys)
+            outcomes[index]["validation_score"] = Decimal(str(score))
+            rows.append({
+                "name": item.name,
+                "organization": item.organization,
+                "position": item.position,
+                "email": item.email,
+                "phone": item.phone,
+                "region": item.region,
+                "source_url": item.source_url,
+                "source_type": item.source_type,
+                "research_lines": item.research_lines if item.research_lines else None,
+                "validation_score": score,
+                "is_valid": True,
+                "search_document": ContactService._search_document(item),
+                **normalized_columns(keys),
+            })
+        
+        try:
+            # 4. INSERT multi-fila y resolución de IDs por clave única en la
+            # misma transacción: las filas que ya coincidían antes del INSERT
+            # no son de este lote
+            if rows:
+                existing_ids = {
+                    key: set(ids) for key, ids in ContactService._ids_by_unique_key(db, rows).items()
+                }
+                # executemany: la sentencia compilada se reutiliza entre lotes y
+                # el driver la envía como un INSERT multi-fila
+                db.execute(insert_ignore_duplicates(db, Contact.__table__), rows)
+                
+                inserted = {
+                    key: [contact_id for contact_id in ids if contact_id not in existing_ids.get(key, ())]
+                    for key, ids in ContactService._ids_by_unique_key(db, rows).items()
+                }
+                for (index, item), row in zip(to_insert, rows):
+                    ids = inserted.get(ContactService._unique_key(row))
+                    contact_id = ids.pop(0) if ids else None
+                    
+                    if contact_id is None:
+                        # Insertado en paralelo por otra transacción
+                        outcomes[index].update(status="duplicate", validation_score=None)
+                    else:
+                        outcomes[index].update(status="created", contact_id=contact_id)
+            
+            # Duplicados dentro del mismo lote apuntan al contacto creado
+            created_by_email = {
+                item.email.lower(): outcomes[index]["contact_id"]
+                for index, item in to_insert
+                if item.email
+            }
+            for index, email in batch_duplicates:
+                outcomes[index].update(status="duplicate", contact_id=created_by_email.get(email))
+            
+            # 5. Vincular con la búsqueda
+            newly_linked = set()
+            if search_id is not None:
+                contact_ids = []
+                for outcome in outcomes:
+                    if outcome["contact_id"] is not None and outcome["contact_id"] not in contact_ids:
+                        contact_ids.append(outcome["contact_id"])
+                if contact_ids:
+                    already_linked = {
+                        contact_id for (contact_id,) in db.query(SearchResult.contact_id).filter(
+                            SearchResult.search_id == search_id,
+                            SearchResult.contact_id.in_(contact_ids)
+                        )
+                    }
+                    newly_linked = set(contact_ids) - already_linked
+                    db.execute(
+                        insert_ignore_duplicates(db, SearchResult.__table__).values([
+                            {"search_id": search_id, "contact_id": contact_id, "relevance_score": relevance_score}
+                            for contact_id in contact_ids
+                        ])
+                    )
+            
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        ContactService.invalidate_cache(
+            {outcome["contact_id"] for outcome in outcomes if outcome["contact_id"] is not None},
+            search_id=search_id
+        )
+        
+        if newly_linked:
+            # Contactos nuevos de la búsqueda para los streams SSE
+            linked = []
+            for index, item in valid_items:
+                outcome = outcomes[index]
+                if outcome["contact_id"] in newly_linked:
+                    newly_linked.discard(outcome["contact_id"])
+                    linked.append({
+                        "contact_id": outcome["contact_id"],
+                        "status": outcome["status"],
+                        "name": item.name,
+                        "organization": item.organization,
+                        "position": item.position,
+                        "region": item.region,
+                        "validation_score": float(outcome["validation_score"]) if outcome["validation_score"] is not None else None,
+                    })
+            search_events.publish(search_id, "contacts", {"search_id": search_id, "contacts": linked})
+        
+        return outcomes
+    
     @staticmethod
     def get_contact(db: Session, contact_id: int) -> Optional[Contact]:
         """
@@ -185,6 +550,41 @@ class ContactService:
         """
         return db.query(Contact).filter(Contact.id == contact_id).first()
     
+    @staticmethod
+    def contact_filters(
+        only_valid: bool = True,
+        region: Optional[str] = None,
+        organization: Optional[str] = None,
+        min_validation_score: Optional[float] = None
+    ) -> list:
+        """
+        Condiciones del listado de contactos (compartidas con la exportación).
+        
+        Args:
+            only_valid: Si True, solo contactos válidos
+            region: Filtrar por región
+            organization: Filtrar por organización (contiene)
+            min_validation_score: Puntuación mínima de validación
+            
+        Returns:
+            Lista de condiciones SQLAlchemy
+        """
+        conditions = []
+        
+        if only_valid:
+            conditions.append(Contact.is_valid == 1)
+        
+        if region:
+            conditions.append(Contact.region == region)
+        
+        if organization:
+            conditions.append(Contact.organization.ilike(f"%{organization}%"))
+        
+        if min_validation_score is not None:
+            conditions.append(Contact.validation_score >= min_validation_score)
+        
+        return conditions
+    
     @staticmethod
     def get_contacts(
         db: Session,
@@ -193,44 +593,68 @@ class ContactService:
         only_valid: bool = True,
         region: Optional[str] = None,
         organization: Optional[str] = None,
-        min_validation_score: Optional[float] = None
-    ) -> Tuple[List[Contact], int]:
+        min_validation_score: Optional[float] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[Contact], Optional[int], Optional[str]]:
         """
         Obtener lista de contactos con filtros opcionales.
         
         Args:
             db: Sesión de base de datos
-            skip: Registros a saltar
+            skip: Registros a saltar (se ignora si se indica cursor)
             limit: Límite de registros
             only_valid: Si True, solo contactos válidos
             region: Filtrar por región
             organization: Filtrar por organización
             min_validation_score: Puntuación mínima de validación
+            cursor: Cursor de la página anterior (paginación keyset)
+            total_mode: Cálculo del total ("exact", "estimated" o "none")
             
         Returns:
-            Tupla (lista de contactos, total)
-        """
-        query = db.query(Contact)
-        
-        if only_valid:
-            query = query.filter(Contact.is_valid == 1)
+            Tupla (lista de contactos, total, cursor de la página siguiente)
         
-        if region:
-            query = query.filter(Contact.region == region)
+        Raises:
+            ValueError: Si el cursor o total_mode no son válidos
+        """
+        query = db.query(Contact).filter(
+            *ContactService.contact_filters(only_valid, region, organization, min_validation_score)
+        )
         
-        if organization:
-            query = query.filter(Contact.organization.ilike(f"%{organization}%"))
+        filters = (only_valid, region, organization, min_validation_score)
+        total = count_total(
+            db, query, Contact.id, total_mode,
+            cache_key=("contacts",) + filters,
+            estimate_table=None if any(value is not None and value is not False for value in filters) else "contacts",
+            # El listado por defecto tiene su propio contador en stats_counters
+            estimate_counter=CONTACTS_LISTED if filters == (True, None, None, LISTED_MIN_SCORE) else None
+        )
+        contacts, next_cursor = paginate(
+            query, CONTACT_ORDER, limit, skip=skip, cursor=cursor
+        )
         
-        if min_validation_score is not None:
-            query = query.filter(Contact.validation_score >= min_validation_score)
+        return contacts, total, next_cursor
+    
+    @staticmethod
+    async def get_contacts_async(
+        db: AsyncSession,
+        **filters
+    ) -> Tuple[List[Contact], Optional[int], Optional[str]]:
+        """
+        Variante async de get_contacts (misma lógica vía run_sync: la E/S va
+        por el driver asíncrono, sin ocupar un hilo del threadpool).
         
-        total = query.count()
-        contacts = query.order_by(
-            desc(Contact.validation_score),
-            desc(Contact.created_at)
-        ).offset(skip).limit(limit).all()
+        Args:
+            db: Sesión asíncrona de base de datos
+            **filters: Mismos argumentos que get_contacts
+            
+        Returns:
+            Tupla (lista de contactos, total, cursor de la página siguiente)
         
-        return contacts, total
+        Raises:
+            ValueError: Si el cursor o total_mode no son válidos
+        """
+        return await db.run_sync(lambda session: ContactService.get_contacts(session, **filters))
     
     @staticmethod
     def update_contact(db: Session, contact_id: int, contact_update: ContactUpdate) -> Optional[Contact]:
@@ -255,15 +679,49 @@ class ContactService:
         for field, value in update_data.items():
             setattr(contact, field, value)
         
+        # Un score asignado a mano no se recalcula (ver rescoring_service)
+        if update_data.get("validation_score") is not None:
+            contact.manual_score = True
+        
+        # Mantener sincronizadas las claves normalizadas
+        for column, value in normalized_columns(ContactService._contact_match_keys(contact)).items():
+            setattr(contact, column, value)
+        contact.search_document = ContactService._search_document(contact)
+        
         db.commit()
         db.refresh(contact)
+        ContactService.invalidate_cache([contact.id], affects_sessions=True)
         
         return contact
     
     @staticmethod
+    def _contact_stats_query(contact_id: int):
+        """Consulta de estadísticas de búsquedas de un contacto."""
+        return select(
+            func.count(SearchResult.search_id).label('times_found'),
+            func.count(func.distinct(SearchResult.search_id)).label('searches_involved'),
+            func.avg(SearchResult.relevance_score).label('avg_relevance'),
+            func.max(SearchResult.found_at).label('last_found_at')
+        ).where(
+            SearchResult.contact_id == contact_id
+        )
+    
+    @staticmethod
+    def _contact_with_stats(contact: Contact, stats) -> dict:
+        """Diccionario de contacto con estadísticas."""
+        return {
+            **{column.key: getattr(contact, column.key) for column in Contact.__table__.columns},
+            "times_found": stats.times_found or 0,
+            "searches_involved": stats.searches_involved or 0,
+            "avg_relevance": float(stats.avg_relevance) if stats.avg_relevance else None,
+            "last_found_at": stats.last_found_at
+        }
+    
+    @staticmethod
+    @cache.cached("contact", ttl=30, key=lambda db, contact_id: (contact_id,))
     def get_contact_with_stats(db: Session, contact_id: int) -> Optional[dict]:
         """
-        Obtener contacto con estadísticas adicionales.
+        Obtener contacto con estadísticas adicionales (cacheado).
         
         Args:
             db: Sesión de base de datos
@@ -277,23 +735,30 @@ class ContactService:
         if not contact:
             return None
         
-        # Estadísticas de búsquedas
-        stats = db.query(
-            func.count(SearchResult.search_id).label('times_found'),
-            func.count(func.distinct(SearchResult.search_id)).label('searches_involved'),
-            func.avg(SearchResult.relevance_score).label('avg_relevance'),
-            func.max(SearchResult.found_at).label('last_found_at')
-        ).filter(
-            SearchResult.contact_id == contact_id
-        ).first()
+        stats = db.execute(ContactService._contact_stats_query(contact_id)).one()
+        return ContactService._contact_with_stats(contact, stats)
+    
+    @staticmethod
+    @cache.cached("contact", ttl=30, key=lambda db, contact_id: (contact_id,))
+    async def get_contact_with_stats_async(db: AsyncSession, contact_id: int) -> Optional[dict]:
+        """
+        Variante async de get_contact_with_stats (comparte la entrada de caché).
         
-        return {
-            **contact.__dict__,
-            "times_found": stats.times_found or 0,
-            "searches_involved": stats.searches_involved or 0,
-            "avg_relevance": float(stats.avg_relevance) if stats.avg_relevance else None,
-            "last_found_at": stats.last_found_at
-        }
+        Args:
+            db: Sesión asíncrona de base de datos
+            contact_id: ID del contacto
+            
+        Returns:
+            Diccionario con contacto y estadísticas
+        """
+        result = await db.execute(select(Contact).where(Contact.id == contact_id))
+        contact = result.scalar_one_or_none()
+        
+        if not contact:
+            return None
+        
+        stats = (await db.execute(ContactService._contact_stats_query(contact_id))).one()
+        return ContactService._contact_with_stats(contact, stats)
     
     @staticmethod
     def get_contacts_by_region(db: Session) -> List[ContactByRegionStats]:
@@ -342,19 +807,26 @@ class ContactService:
         db: Session, 
         skip: int = 0, 
         limit: int = 100,
-        max_score: float = 0.99
-    ) -> Tuple[List[Contact], int]:
+        max_score: float = 0.99,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[Contact], Optional[int], Optional[str]]:
         """
         Obtener contactos con score reducido (posibles duplicados o similares).
         
         Args:
             db: Sesión de base de datos
-            skip: Registros a saltar
+            skip: Registros a saltar (se ignora si se indica cursor)
             limit: Límite de registros
             max_score: Score máximo para considerar como posible duplicado
+            cursor: Cursor de la página anterior (paginación keyset)
+            total_mode: Cálculo del total ("exact", "estimated" o "none")
             
         Returns:
-            Tupla (lista de posibles duplicados, total)
+            Tupla (lista de posibles duplicados, total, cursor de la página siguiente)
+        
+        Raises:
+            ValueError: Si el cursor o total_mode no son válidos
         """
         query = db.query(Contact).filter(
             and_(
@@ -363,52 +835,51 @@ class ContactService:
             )
         )
         
-        total = query.count()
-        duplicates = query.order_by(
-            Contact.validation_score,  # Los de menor score primero
-            desc(Contact.created_at)
-        ).offset(skip).limit(limit).all()
+        total = count_total(db, query, Contact.id, total_mode, cache_key=("duplicates", max_score))
+        duplicates, next_cursor = paginate(
+            query, DUPLICATE_ORDER, limit, skip=skip, cursor=cursor
+        )
         
-        return duplicates, total
+        return duplicates, total, next_cursor
     
     @staticmethod
     def search_contacts(
         db: Session,
         search_term: str,
         skip: int = 0,
-        limit: int = 100
-    ) -> Tuple[List[Contact], int]:
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[Contact], Optional[int], Optional[str]]:
         """
-        Buscar contactos por término de búsqueda (nombre, email, organización).
+        Buscar contactos por término (nombre, email, organización, cargo y
+        líneas de investigación), ordenados por relevancia.
+        
+        No distingue tildes ni mayúsculas y coincide con partes de palabras;
+        si el término tiene varias palabras, deben aparecer todas.
         
         Args:
             db: Sesión de base de datos
             search_term: Término de búsqueda
-            skip: Registros a saltar
+            skip: Registros a saltar (se ignora si se indica cursor)
             limit: Límite de registros
+            cursor: Cursor de la página anterior (paginación keyset)
+            total_mode: Cálculo del total ("exact", "estimated" o "none")
             
         Returns:
-            Tupla (lista de contactos, total)
-        """
-        search_pattern = f"%{search_term}%"
+            Tupla (lista de contactos, total, cursor de la página siguiente)
         
-        query = db.query(Contact).filter(
-            and_(
-                Contact.is_valid == 1,
-                or_(
-                    Contact.name.ilike(search_pattern),
-                    Contact.email.ilike(search_pattern),
-                    Contact.organization.ilike(search_pattern)
-                )
-            )
+        Raises:
+            ValueError: Si el cursor o total_mode no son válidos
+        """
+        return get_contact_search(db).search(
+            db,
+            search_term,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+            total_mode=total_mode
         )
-        
-        total = query.count()
-        contacts = query.order_by(
-            desc(Contact.validation_score)
-        ).offset(skip).limit(limit).all()
-        
-        return contacts, total
     
     @staticmethod
     def mark_as_invalid(db: Session, contact_id: int, reason: str = "Duplicado") -> Optional[Contact]:
@@ -433,5 +904,6 @@ class ContactService:
         
         db.commit()
         db.refresh(contact)
+        ContactService.invalidate_cache([contact.id], affects_sessions=True)
         
         return contact
@@ -0,0 +1,306 @@
+"""
+Servicio para la cola de disparos (outbox) de búsquedas.
+Los disparos pendientes se guardan en MySQL en la misma transacción que la
+búsqueda, de modo que no se pierden si el worker se reinicia.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import APISource, Search, SearchDispatch, SearchLog
+from app.services.search_service import SearchService
+from app.utils.sql import dialect_name
+
+
+class DispatchService:
+    """Servicio para operaciones de la cola de disparos."""
+
+    @staticmethod
+    def enqueue(db: Session, search: Search, upstream: Optional[str] = None) -> SearchDispatch:
+        """
+        Agregar un disparo pendiente para una búsqueda (sin hacer commit).
+
+        Args:
+            db: Sesión de base de datos
+            search: Búsqueda a disparar
+            upstream: Nombre del destino (coincide con api_sources.name). Por
+                defecto search_config["scraper_backend"] o SCRAPER_BACKEND.
+
+        Returns:
+            Disparo creado
+        """
+        if upstream is None:
+            config = search.search_config if isinstance(search.search_config, dict) else {}
+            upstream = config.get("scraper_backend") or settings.SCRAPER_BACKEND
+
+        dispatch = SearchDispatch(
+            search_id=search.id,
+            upstream=upstream,
+            status="pending",
+            payload={
+                "search_id": search.id,
+                "keywords": search.keywords,
+                "area": search.area or "",
+                "region": search.region or ""
+            },
+            attempts=0,
+            max_attempts=settings.DISPATCH_MAX_ATTEMPTS,
+            next_attempt_at=datetime.now()
+        )
+        db.add(dispatch)
+        return dispatch
+
+    @staticmethod
+    def _due(now: datetime):
+        """Condición de los disparos que ya deben ejecutarse (incluye bloqueos expirados)."""
+        stale = now - timedelta(seconds=settings.DISPATCH_LOCK_TIMEOUT)
+        return or_(
+            and_(SearchDispatch.status == "pending", SearchDispatch.next_attempt_at <= now),
+            and_(SearchDispatch.status == "in_flight", SearchDispatch.locked_at < stale)
+        )
+
+    @staticmethod
+    def due_upstreams(db: Session) -> List[str]:
+        """
+        Destinos con disparos que ya deben ejecutarse.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Nombres de los destinos
+        """
+        return [
+            upstream for (upstream,) in
+            db.query(SearchDispatch.upstream).filter(DispatchService._due(datetime.now())).distinct()
+        ]
+
+    @staticmethod
+    def claim_due(db: Session, limit: int, upstream: Optional[str] = None) -> List[dict]:
+        """
+        Reservar los disparos que ya deben ejecutarse.
+
+        Incluye disparos 'in_flight' cuyo bloqueo expiró (worker caído).
+        En MySQL usa SELECT ... FOR UPDATE SKIP LOCKED para que varios
+        workers puedan drenar la cola sin tomar el mismo disparo.
+
+        Cada reserva incrementa attempts, que identifica al dueño del
+        disparo: mark_done y mark_retry solo aplican si sigue siendo el mismo.
+
+        Args:
+            db: Sesión de base de datos
+            limit: Máximo de disparos a reservar
+            upstream: Reservar solo los de este destino (None = todos)
+
+        Returns:
+            Lista de disparos reservados (id, search_id, upstream, payload, attempts, max_attempts)
+        """
+        if limit <= 0:
+            return []
+
+        now = datetime.now()
+        query = db.query(SearchDispatch).filter(DispatchService._due(now))
+        if upstream is not None:
+            query = query.filter(SearchDispatch.upstream == upstream)
+        query = query.order_by(SearchDispatch.next_attempt_at, SearchDispatch.id).limit(limit)
+
+        if dialect_name(db) == "mysql":
+            query = query.with_for_update(skip_locked=True)
+
+        dispatches = query.all()
+        claimed = []
+        for dispatch in dispatches:
+            dispatch.status = "in_flight"
+            dispatch.locked_at = now
+            dispatch.attempts = (dispatch.attempts or 0) + 1
+            claimed.append({
+                "id": dispatch.id,
+                "search_id": dispatch.search_id,
+                "upstream": dispatch.upstream,
+                "payload": dispatch.payload,
+                "attempts": dispatch.attempts,
+                "max_attempts": dispatch.max_attempts,
+            })
+
+        db.commit()
+        return claimed
+
+    @staticmethod
+    def _owned(db: Session, dispatch_id: int, attempt: int) -> Optional[SearchDispatch]:
+        """
+        Disparo en vuelo de la reserva número attempt, bloqueado para actualizarlo.
+
+        Si el bloqueo expiró y otro worker lo reservó de nuevo (attempts
+        distinto) o ya se resolvió, devuelve None: el resultado de esta
+        reserva ya no manda.
+        """
+        query = db.query(SearchDispatch).filter(
+            SearchDispatch.id == dispatch_id,
+            SearchDispatch.status == "in_flight",
+            SearchDispatch.attempts == attempt
+        )
+        if dialect_name(db) == "mysql":
+            query = query.with_for_update()
+        dispatch = query.first()
+        if dispatch is None:
+            print(f"⚠️ Disparo {dispatch_id} (intento {attempt}) reservado por otro worker; se descarta el resultado")
+        return dispatch
+
+    @staticmethod
+    def _log(db: Session, search_id: int, status: str, message: str, response_time_ms: int = 0) -> None:
+        """Registrar una transición del disparo en search_logs."""
+        db.add(SearchLog(
+            search_id=search_id,
+            source_url="dispatch_queue",
+            source_type="dispatch",
+            status=status,
+            contacts_found=0,
+            error_message=message,
+            response_time_ms=max(response_time_ms, 0)
+        ))
+
+    @staticmethod
+    def mark_done(db: Session, dispatch_id: int, attempt: int, response_time_ms: int, note: Optional[str] = None) -> None:
+        """
+        Marcar un disparo como entregado y la búsqueda como en ejecución.
+
+        Args:
+            db: Sesión de base de datos
+            dispatch_id: ID del disparo
+            attempt: attempts de la reserva (ver claim_due)
+            response_time_ms: Tiempo de respuesta del destino
+            note: Detalle adicional para el log
+        """
+        dispatch = DispatchService._owned(db, dispatch_id, attempt)
+        if not dispatch:
+            db.rollback()
+            return
+
+        dispatch.status = "done"
+        dispatch.locked_at = None
+        dispatch.last_error = None
+
+        search = db.query(Search).filter(Search.id == dispatch.search_id).first()
+        if search and search.status == "pending":
+            search.status = "running"
+            search.started_at = datetime.now()
+
+        DispatchService._log(
+            db,
+            dispatch.search_id,
+            "info",
+            note or f"Workflow {dispatch.upstream} disparado (intento {dispatch.attempts})",
+            response_time_ms
+        )
+        db.commit()
+        if search:
+            SearchService.notify_change(search)
+
+    @staticmethod
+    def mark_retry(
+        db: Session,
+        dispatch_id: int,
+        attempt: int,
+        error_message: str,
+        retryable: bool = True
+    ) -> Optional[str]:
+        """
+        Registrar un intento fallido: reprogramar con backoff exponencial o
+        marcar como fallido (y la búsqueda como error) si no quedan intentos.
+
+        Args:
+            db: Sesión de base de datos
+            dispatch_id: ID del disparo
+            attempt: attempts de la reserva (ver claim_due)
+            error_message: Error del intento
+            retryable: Si False, el disparo falla sin reintentos
+
+        Returns:
+            Nuevo estado del disparo ('pending' o 'failed'), o None si la
+            reserva ya no es de este worker
+        """
+        dispatch = DispatchService._owned(db, dispatch_id, attempt)
+        if not dispatch:
+            db.rollback()
+            return None
+
+        dispatch.locked_at = None
+        dispatch.last_error = error_message
+        search = None
+
+        if retryable and dispatch.attempts < dispatch.max_attempts:
+            delay = min(
+                settings.DISPATCH_BACKOFF_MAX,
+                settings.DISPATCH_BACKOFF_BASE * (2 ** max(dispatch.attempts - 1, 0))
+            )
+            delay += random.uniform(0, settings.DISPATCH_BACKOFF_BASE)
+            dispatch.status = "pending"
+            dispatch.next_attempt_at = datetime.now() + timedelta(seconds=delay)
+            DispatchService._log(
+                db,
+                dispatch.search_id,
+                "warning",
+                f"Intento {dispatch.attempts}/{dispatch.max_attempts} fallido: {error_message}. "
+                f"Reintento en {delay:.0f}s"
+            )
+        else:
+            dispatch.status = "failed"
+            search = db.query(Search).filter(Search.id == dispatch.search_id).first()
+            if search and search.status in ("pending", "running"):
+                search.status = "error"
+                search.finished_at = datetime.now()
+                search.error_message = f"No se pudo disparar el workflow: {error_message}"
+            DispatchService._log(
+                db,
+                dispatch.search_id,
+                "error",
+                f"Disparo fallido tras {dispatch.attempts} intentos: {error_message}"
+            )
+
+        db.commit()
+        if dispatch.status == "failed" and search:
+            SearchService.notify_change(search)
+        return dispatch.status
+
+    @staticmethod
+    def get_rate_limit(db: Session, upstream: str) -> int:
+        """
+        Obtener el límite de peticiones por minuto de un destino desde api_sources.
+
+        Args:
+            db: Sesión de base de datos
+            upstream: Nombre del destino
+
+        Returns:
+            Peticiones por minuto permitidas
+        """
+        source = db.query(APISource).filter(
+            func.lower(APISource.name) == upstream.lower(),
+            APISource.is_active == 1
+        ).first()
+
+        if source and source.rate_limit:
+            return source.rate_limit
+        return settings.DISPATCH_DEFAULT_RATE_LIMIT
+
+    @staticmethod
+    def get_queue_stats(db: Session) -> dict:
+        """
+        Obtener el número de disparos por estado.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Diccionario estado -> cantidad
+        """
+        rows = db.query(
+            SearchDispatch.status,
+            func.count(SearchDispatch.id)
+        ).group_by(SearchDispatch.status).all()
+        return {status: count for status, count in rows}
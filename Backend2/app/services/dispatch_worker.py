@@ -0,0 +1,298 @@
+"""
+Worker asíncrono que drena la cola de disparos (search_dispatches).
+
+- Limita los disparos concurrentes (DISPATCH_MAX_IN_FLIGHT).
+- Aplica un token bucket por destino usando api_sources.rate_limit
+  (peticiones por minuto). El token se toma antes de reservar el disparo.
+- Reintenta con backoff exponencial los errores transitorios.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.http_client import get_http_client
+from app.services.dispatch_service import DispatchService
+from app.services.search_service import SearchService
+
+# Un sender recibe el payload del disparo y devuelve una nota opcional para el log
+Sender = Callable[[dict], Awaitable[Optional[str]]]
+
+# Segundos entre recargas del rate limit desde api_sources
+RATE_LIMIT_REFRESH_SECONDS = 60
+
+
+class DispatchError(Exception):
+    """Error al disparar un workflow."""
+
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+async def send_n8n_webhook(payload: dict) -> Optional[str]:
+    """
+    Enviar el disparo al webhook de n8n usando el cliente HTTP compartido.
+
+    Args:
+        payload: Datos de la búsqueda (search_id, keywords, area, region)
+
+    Returns:
+        Nota para el log si la entrega no pudo confirmarse
+
+    Raises:
+        DispatchError: Si el webhook falla (retryable indica si conviene reintentar)
+    """
+    client = get_http_client()
+    try:
+        response = await client.post(
+            settings.N8N_WEBHOOK_URL,
+            json=payload,
+            headers={"Content-Type": "application/json"}
+        )
+    except httpx.ReadTimeout:
+        # La petición llegó a n8n; reintentar podría duplicar el scraping
+        return "Workflow disparado sin confirmación (timeout de lectura)"
+    except httpx.HTTPError as e:
+        raise DispatchError(f"{type(e).__name__}: {e}", retryable=True)
+
+    if response.status_code == 429 or response.status_code >= 500:
+        raise DispatchError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=True)
+    if response.status_code >= 400:
+        raise DispatchError(f"HTTP {response.status_code}: {response.text[:200]}", retryable=False)
+
+    return None
+
+
+async def send_demo_search(payload: dict) -> Optional[str]:
+    """
+    Sender del destino "demo": completa la búsqueda con contactos sintéticos
+    (SearchService.process_demo_search) sin llamar a ningún scraper.
+
+    Raises:
+        DispatchError: Si DEMO_MODE está desactivado (no se reintenta)
+    """
+    if not settings.DEMO_MODE:
+        raise DispatchError("El destino demo requiere DEMO_MODE=true", retryable=False)
+    await run_in_threadpool(SearchService.process_demo_search, payload["search_id"])
+    return "Búsqueda demo completada con datos sintéticos"
+
+
+class TokenBucket:
+    """
+    Token bucket (peticiones por minuto, ráfaga de 10 segundos).
+
+    No espera: el worker toma los tokens antes de reservar disparos, así un
+    disparo reservado (con su bloqueo corriendo) nunca queda esperando turno.
+    """
+
+    def __init__(self, rate_per_minute: int):
+        self.set_rate(rate_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def set_rate(self, rate_per_minute: int) -> None:
+        """Actualizar la tasa permitida."""
+        self.rate = max(rate_per_minute, 1) / 60.0
+        self.capacity = max(1.0, self.rate * 10)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self, count: int = 1) -> int:
+        """
+        Tomar hasta count tokens disponibles ahora.
+
+        Returns:
+            Tokens tomados (0 si no hay ninguno)
+        """
+        self._refill()
+        taken = min(count, int(self._tokens))
+        self._tokens -= taken
+        return max(taken, 0)
+
+    def refund(self, count: int) -> None:
+        """Devolver tokens tomados y no usados."""
+        if count > 0:
+            self._tokens = min(self.capacity, self._tokens + count)
+
+    def wait_time(self) -> float:
+        """Segundos hasta que haya un token."""
+        self._refill()
+        return max(0.0, (1 - self._tokens) / self.rate)
+
+
+class DispatchWorker:
+    """Pool de tareas asyncio que drena la cola de disparos."""
+
+    def __init__(
+        self,
+        session_factory=SessionLocal,
+        senders: Optional[Dict[str, Sender]] = None,
+        max_in_flight: Optional[int] = None,
+        poll_interval: Optional[float] = None
+    ):
+        self._session_factory = session_factory
+        self._senders: Dict[str, Sender] = senders or {"n8n": send_n8n_webhook, "demo": send_demo_search}
+        self._max_in_flight = max_in_flight or settings.DISPATCH_MAX_IN_FLIGHT
+        self._poll_interval = poll_interval or settings.DISPATCH_POLL_INTERVAL
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._bucket_refreshed: Dict[str, float] = {}
+        self._in_flight: Set[asyncio.Task] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register_sender(self, upstream: str, sender: Sender) -> None:
+        """Registrar (o reemplazar) el sender de un destino."""
+        self._senders[upstream] = sender
+
+    @property
+    def in_flight(self) -> int:
+        """Disparos en ejecución en este worker."""
+        return len(self._in_flight)
+
+    async def start(self) -> None:
+        """Iniciar el loop del worker."""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """
+        Detener el worker esperando a los disparos en curso.
+        Los que no terminen quedan 'in_flight' y se recuperan al expirar el bloqueo.
+        """
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        if self._in_flight:
+            await asyncio.wait(self._in_flight, timeout=timeout)
+
+    def notify(self) -> None:
+        """Despertar el worker (p. ej. al encolar una búsqueda nueva). Seguro desde cualquier hilo."""
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def _with_session(self, fn, *args):
+        db = self._session_factory()
+        try:
+            return fn(db, *args)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            free = self._max_in_flight - len(self._in_flight)
+            claimed, wait = [], self._poll_interval
+            if free > 0:
+                try:
+                    claimed, wait = await self._claim(free)
+                except Exception as e:
+                    print(f"❌ Error leyendo la cola de disparos: {e}")
+
+            for dispatch in claimed:
+                task = asyncio.create_task(self._process(dispatch))
+                self._in_flight.add(task)
+                task.add_done_callback(self._on_task_done)
+
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=wait)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim(self, free: int) -> Tuple[List[dict], float]:
+        """
+        Reservar hasta free disparos, solo tantos por destino como tokens
+        tenga su bucket en este momento.
+
+        Returns:
+            Tupla (disparos reservados, segundos hasta el próximo intento)
+        """
+        upstreams = await run_in_threadpool(self._with_session, DispatchService.due_upstreams)
+        claimed: List[dict] = []
+        wait = self._poll_interval
+        for upstream in upstreams:
+            if free <= 0:
+                break
+            bucket = await self._get_bucket(upstream)
+            tokens = bucket.try_acquire(free)
+            if not tokens:
+                wait = min(wait, bucket.wait_time())
+                continue
+            try:
+                batch = await run_in_threadpool(self._with_session, DispatchService.claim_due, tokens, upstream)
+            except Exception:
+                bucket.refund(tokens)
+                raise
+            bucket.refund(tokens - len(batch))
+            claimed += batch
+            free -= len(batch)
+        return claimed, wait
+
+    def _on_task_done(self, task: asyncio.Task) -> None:
+        self._in_flight.discard(task)
+        # Hay capacidad libre: revisar la cola sin esperar al siguiente poll
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _get_bucket(self, upstream: str) -> TokenBucket:
+        now = time.monotonic()
+        if now - self._bucket_refreshed.get(upstream, 0) > RATE_LIMIT_REFRESH_SECONDS:
+            rate = await run_in_threadpool(self._with_session, DispatchService.get_rate_limit, upstream)
+            if upstream in self._buckets:
+                self._buckets[upstream].set_rate(rate)
+            else:
+                self._buckets[upstream] = TokenBucket(rate)
+            self._bucket_refreshed[upstream] = now
+        return self._buckets[upstream]
+
+    async def _process(self, dispatch: dict) -> None:
+        dispatch_id, attempt = dispatch["id"], dispatch["attempts"]
+        sender = self._senders.get(dispatch["upstream"])
+
+        try:
+            if sender is None:
+                raise DispatchError(f"Destino desconocido: {dispatch['upstream']}", retryable=False)
+
+            print(f"🚀 Disparando {dispatch['upstream']} para search_id={dispatch['search_id']} (intento {dispatch['attempts']})")
+            started = time.perf_counter()
+            note = await sender(dispatch["payload"] or {})
+            elapsed_ms = int((time.perf_counter() - started) * 1000)
+        except DispatchError as e:
+            print(f"❌ Disparo {dispatch_id} fallido: {e}")
+            await self._record(DispatchService.mark_retry, dispatch_id, attempt, str(e), e.retryable)
+        except Exception as e:
+            print(f"❌ Error inesperado en disparo {dispatch_id}: {e}")
+            await self._record(DispatchService.mark_retry, dispatch_id, attempt, str(e), True)
+        else:
+            await self._record(DispatchService.mark_done, dispatch_id, attempt, elapsed_ms, note)
+
+    async def _record(self, fn, dispatch_id: int, *args) -> None:
+        """
+        Guardar el resultado de un disparo. Si falla, el disparo queda
+        'in_flight' y se recupera cuando expira el bloqueo.
+        """
+        try:
+            await run_in_threadpool(self._with_session, fn, dispatch_id, *args)
+        except Exception as e:
+            print(f"❌ Error guardando el estado del disparo {dispatch_id}: {e}")
+
+
+# Instancia global (una por proceso/worker de uvicorn)
+dispatch_worker = DispatchWorker()
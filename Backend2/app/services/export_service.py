@@ -0,0 +1,355 @@
+"""
+Exportación en streaming de contactos y resultados de búsqueda.
+
+Las filas se leen con un cursor del lado del servidor (yield_per) y se
+escriben por lotes en CSV, NDJSON o Parquet, opcionalmente comprimidas con
+gzip al vuelo, de modo que la memoria del worker no depende del tamaño de
+la exportación. Parquet usa pyarrow (en requirements.txt; si falta, ese formato responde 400).
+"""
+
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Contact, SearchResult
+from app.services.contact_service import ContactService
+from app.services.search_service import RESULT_FIELDS
+from app.utils.serialization import dumps_json
+
+# Formato -> (media type, extensión)
+EXPORT_FORMATS = {
+    "csv": ("text/csv", "csv"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "parquet": ("application/vnd.apache.parquet", "parquet"),
+}
+
+# Columna exportada: (nombre, tipo) con tipo int, float, bool, str, datetime o json
+ExportColumn = Tuple[str, str]
+
+CONTACT_EXPORT_COLUMNS: List[Tuple[str, str, Any]] = [
+    ("id", "int", Contact.id),
+    ("name", "str", Contact.name),
+    ("organization", "str", Contact.organization),
+    ("position", "str", Contact.position),
+    ("email", "str", Contact.email),
+    ("phone", "str", Contact.phone),
+    ("region", "str", Contact.region),
+    ("source_url", "str", Contact.source_url),
+    ("source_type", "str", Contact.source_type),
+    ("research_lines", "json", Contact.research_lines),
+    ("validation_score", "float", Contact.validation_score),
+    ("is_valid", "bool", Contact.is_valid),
+    ("created_at", "datetime", Contact.created_at),
+    ("updated_at", "datetime", Contact.updated_at),
+]
+
+# Campos de resultados exportados por defecto (sin los alias de compatibilidad)
+RESULT_EXPORT_FIELDS = [
+    "contact_id",
+    "contact_name",
+    "contact_email",
+    "contact_organization",
+    "contact_position",
+    "contact_region",
+    "contact_phone",
+    "source_url",
+    "source_type",
+    "relevance_score",
+    "validation_score",
+    "found_at",
+]
+
+
+def _result_field_kind(field: str) -> str:
+    if field == "contact_id":
+        return "int"
+    if field.endswith("_score"):
+        return "float"
+    if field == "found_at":
+        return "datetime"
+    return "str"
+
+
+def _normalize(value: Any, kind: str) -> Any:
+    """Valor de una celda según su tipo (Decimal a float, bool de MySQL a bool)."""
+    if value is None:
+        return None
+    if kind == "float":
+        return float(value)
+    if kind == "bool":
+        return bool(value)
+    return value
+
+
+def _csv_value(value: Any, kind: str) -> Any:
+    if value is None:
+        return ""
+    if kind == "json":
+        return json.dumps(value, ensure_ascii=False)
+    if kind == "datetime" and isinstance(value, datetime):
+        return value.isoformat()
+    if kind == "bool":
+        return "true" if value else "false"
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+class _ChunkSink(io.RawIOBase):
+    """Archivo de solo escritura que acumula lo escrito hasta drain()."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class ExportService:
+    """Servicio de exportación en streaming."""
+
+    @staticmethod
+    def validate_format(export_format: str, compress: Optional[str]) -> None:
+        """
+        Validar formato y compresión de una exportación.
+
+        Raises:
+            ValueError: Si el formato o la compresión no son válidos, o si
+                Parquet no está disponible
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Formato inválido: {export_format}. Use uno de: {', '.join(EXPORT_FORMATS)}")
+        if compress not in (None, "gzip"):
+            raise ValueError("compress solo admite 'gzip'")
+        if export_format == "parquet":
+            if compress:
+                raise ValueError("Parquet ya va comprimido internamente; no use compress")
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                raise ValueError("El formato parquet requiere el paquete 'pyarrow' (pip install pyarrow)")
+
+    @staticmethod
+    def media_type(export_format: str, compress: Optional[str]) -> str:
+        """Media type de la respuesta."""
+        return "application/gzip" if compress else EXPORT_FORMATS[export_format][0]
+
+    @staticmethod
+    def filename(base: str, export_format: str, compress: Optional[str]) -> str:
+        """Nombre del archivo descargado (base-AAAAMMDD-HHMMSS.ext[.gz])."""
+        name = f"{base}-{datetime.now().strftime('%Y%m%d-%H%M%S')}.{EXPORT_FORMATS[export_format][1]}"
+        return name + ".gz" if compress else name
+
+    @staticmethod
+    def contact_rows(
+        db: Session,
+        only_valid: bool = True,
+        region: Optional[str] = None,
+        organization: Optional[str] = None,
+        min_validation_score: Optional[float] = None
+    ) -> Tuple[List[ExportColumn], Iterable[tuple]]:
+        """
+        Columnas y filas de la exportación de contactos (mismos filtros que el listado).
+
+        Returns:
+            Tupla (columnas, filas leídas por lotes de EXPORT_BATCH_SIZE)
+        """
+        columns = [(name, kind) for name, kind, _ in CONTACT_EXPORT_COLUMNS]
+        rows = db.query(
+            *[column for _, _, column in CONTACT_EXPORT_COLUMNS]
+        ).filter(
+            *ContactService.contact_filters(only_valid, region, organization, min_validation_score)
+        ).order_by(Contact.id).yield_per(settings.EXPORT_BATCH_SIZE)
+        return columns, rows
+
+    @staticmethod
+    def search_result_rows(
+        db: Session,
+        search_id: int,
+        only_valid: bool = True,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[ExportColumn], Iterable[tuple]]:
+        """
+        Columnas y filas de la exportación de resultados de una búsqueda, por relevancia.
+
+        Args:
+            fields: Campos a exportar (ver SearchService.parse_result_fields);
+                por defecto RESULT_EXPORT_FIELDS
+
+        Returns:
+            Tupla (columnas, filas leídas por lotes de EXPORT_BATCH_SIZE)
+        """
+        fields = fields or RESULT_EXPORT_FIELDS
+        query = db.query(*[RESULT_FIELDS[field] for field in fields]).filter(
+            SearchResult.search_id == search_id
+        )
+        if only_valid or any(RESULT_FIELDS[field].class_ is Contact for field in fields):
+            query = query.join(Contact, SearchResult.contact_id == Contact.id)
+        if only_valid:
+            query = query.filter(Contact.is_valid == 1)
+
+        rows = query.order_by(
+            SearchResult.relevance_score.desc(), SearchResult.contact_id
+        ).yield_per(settings.EXPORT_BATCH_SIZE)
+        return [(field, _result_field_kind(field)) for field in fields], rows
+
+    @staticmethod
+    def _batches(rows: Iterable[tuple], size: int) -> Iterator[List[tuple]]:
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _csv_chunks(columns: List[ExportColumn], rows: Iterable[tuple]) -> Iterator[bytes]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        # BOM para que Excel detecte UTF-8 (igual que la exportación del frontend)
+        buffer.write("\ufeff")
+        writer.writerow([name for name, _ in columns])
+        for batch in ExportService._batches(rows, settings.EXPORT_BATCH_SIZE):
+            writer.writerows(
+                [_csv_value(value, kind) for value, (_, kind) in zip(row, columns)]
+                for row in batch
+            )
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+
+    @staticmethod
+    def _ndjson_chunks(columns: List[ExportColumn], rows: Iterable[tuple]) -> Iterator[bytes]:
+        names = [name for name, _ in columns]
+        for batch in ExportService._batches(rows, settings.EXPORT_BATCH_SIZE):
+            yield b"".join(
+                dumps_json({
+                    name: _normalize(value, kind)
+                    for name, value, (_, kind) in zip(names, row, columns)
+                }) + b"\n"
+                for row in batch
+            )
+
+    @staticmethod
+    def _parquet_chunks(columns: List[ExportColumn], rows: Iterable[tuple]) -> Iterator[bytes]:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {
+            "int": pa.int64(),
+            "float": pa.float64(),
+            "bool": pa.bool_(),
+            "str": pa.string(),
+            "json": pa.string(),
+            "datetime": pa.timestamp("us"),
+        }
+        schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        sink = _ChunkSink()
+        writer = pq.ParquetWriter(sink, schema, compression="snappy")
+        try:
+            for batch in ExportService._batches(rows, settings.EXPORT_PARQUET_ROW_GROUP_SIZE):
+                data = {
+                    name: [
+                        json.dumps(row[index], ensure_ascii=False) if kind == "json" and row[index] is not None
+                        else _normalize(row[index], kind)
+                        for row in batch
+                    ]
+                    for index, (name, kind) in enumerate(columns)
+                }
+                writer.write_table(pa.Table.from_pydict(data, schema=schema))
+                yield sink.drain()
+        finally:
+            writer.close()
+        yield sink.drain()
+
+    @staticmethod
+    def stream(
+        columns: List[ExportColumn],
+        rows: Iterable[tuple],
+        export_format: str,
+        compress: Optional[str] = None
+    ) -> Iterator[bytes]:
+        """
+        Serializar filas por lotes en el formato pedido.
+
+        Args:
+            columns: Nombre y tipo de cada columna
+            rows: Filas (tuplas en el orden de columns)
+            export_format: csv, ndjson o parquet
+            compress: None o "gzip"
+
+        Returns:
+            Iterador de bloques de bytes
+        """
+        writers = {
+            "csv": ExportService._csv_chunks,
+            "ndjson": ExportService._ndjson_chunks,
+            "parquet": ExportService._parquet_chunks,
+        }
+        chunks = writers[export_format](columns, rows)
+
+        if compress != "gzip":
+            yield from chunks
+            return
+
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits=31: formato gzip
+        for chunk in chunks:
+            compressed = compressor.compress(chunk)
+            if compressed:
+                yield compressed
+        yield compressor.flush()
+
+    @staticmethod
+    def stream_with_session(
+        build_rows: Callable[[Session], Tuple[List[ExportColumn], Iterable[tuple]]],
+        export_format: str,
+        compress: Optional[str] = None,
+        session_factory: Callable[[], Session] = SessionLocal
+    ) -> Iterator[bytes]:
+        """
+        Exportar con una sesión propia, abierta mientras dura el stream
+        (la sesión de la petición se cierra antes de enviar la respuesta).
+
+        Args:
+            build_rows: Recibe la sesión y retorna (columnas, filas)
+            export_format: csv, ndjson o parquet
+            compress: None o "gzip"
+            session_factory: Fábrica de sesiones
+
+        Returns:
+            Iterador de bloques de bytes
+        """
+        db = session_factory()
+        try:
+            columns, rows = build_rows(db)
+            yield from ExportService.stream(columns, rows, export_format, compress)
+        finally:
+            db.close()
@@ -0,0 +1,477 @@
+"""
+Recálculo masivo de validation_score.
+
+Los contactos que inserta el nodo "Insert Valid Contacts" de n8n conservan
+el score que trae n8n (sin claves normalizadas ni scoring), y el resto
+tiene el score calculado contra la base del momento de su inserción. Este
+servicio recalcula todos los scores como si cada contacto se hubiera
+insertado en orden de ID con ContactService.calculate_validation_score:
+contra los contactos de ID menor y con las mismas reglas (score_pair).
+Los contactos invalidados (is_valid = 0) y los de score asignado a mano
+(manual_score) cuentan como existentes para los demás, pero su score no se
+modifica. Solo se escriben los scores que cambian (updated_at mueve los ETag).
+
+En lugar de una búsqueda por contacto se recorre la tabla una vez en orden
+de ID con un ScoringEngine. Solo se indexan los contactos cuyo nombre,
+teléfono o URL se repite (grupos de GROUP BY ... HAVING COUNT(*) > 1); el
+resto solo suma a los conteos de organización/cargo/región.
+
+Modos:
+- Completo: todos los contactos.
+- Incremental: los contactos creados o modificados desde la última
+  ejecución (marca en system_config) y los de ID mayor que comparten con
+  ellos nombre, teléfono o URL. Los contactos afectados solo por los
+  valores anteriores de un contacto editado se corrigen en la siguiente
+  ejecución completa. Los que actualizó la ejecución anterior (su
+  updated_at cambia) se revisan otra vez, sin cambios.
+
+Cada lote de RESCORING_CHUNK_SIZE contactos se escribe en su propia
+transacción. Se ejecuta con POST /contacts/rescore (en segundo plano, ver
+RescoringJob) o desde la línea de comandos (desde Backend2/):
+
+    python -m app.services.rescoring_service           # incremental
+    python -m app.services.rescoring_service --full
+"""
+
+import argparse
+import asyncio
+import contextvars
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Contact, SystemConfig
+from app.services.contact_service import ContactService
+from app.services.scoring_engine import (
+    SECONDARY_FIELDS,
+    MatchKeys,
+    ScoringEngine,
+    build_match_keys,
+    match_keys_from_columns,
+    normalized_columns,
+)
+from app.utils.sql import current_timestamp_precise, exact_text
+
+# Clave de system_config con el inicio de la última ejecución
+RESCORING_CONFIG_KEY = "rescoring_last_run"
+
+# Margen de la marca incremental: volver a puntuar un contacto es inocuo,
+# perder uno escrito en el mismo segundo que la marca no
+INCREMENTAL_OVERLAP = timedelta(seconds=1)
+
+# Campos que agrupan candidatos (ver ScoringEngine.candidates)
+BLOCKING_FIELDS = ("name", "phone", "source_url")
+
+# Informa (procesados, total, actualizados)
+Progress = Callable[[int, int, int], None]
+
+# Columnas del score actual de cada contacto (ver _is_locked)
+_SCORE_COLUMNS = (Contact.id, Contact.validation_score, Contact.is_valid, Contact.manual_score)
+
+# Columnas con las que se puntúa (claves persistidas, ver match_keys_from_columns)
+_KEY_COLUMNS = (
+    Contact.name_norm,
+    Contact.org_norm,
+    Contact.position_norm,
+    Contact.region_norm,
+    Contact.phone_norm,
+    Contact.source_url,
+)
+
+
+class RescoringService:
+    """Servicio de recálculo de validation_score."""
+
+    @staticmethod
+    def last_run(db: Session) -> Optional[datetime]:
+        """
+        Inicio de la última ejecución terminada.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Fecha de la marca o None si nunca se ejecutó
+        """
+        value = db.query(SystemConfig.config_value).filter(
+            SystemConfig.config_key == RESCORING_CONFIG_KEY
+        ).scalar()
+        return datetime.fromisoformat(value) if value else None
+
+    @staticmethod
+    def rescore(
+        db: Session,
+        incremental: bool = True,
+        chunk_size: Optional[int] = None,
+        progress: Optional[Progress] = None
+    ) -> dict:
+        """
+        Recalcular validation_score (antes se corrigen las claves normalizadas).
+
+        Args:
+            db: Sesión de base de datos
+            incremental: Solo los contactos escritos desde la última ejecución
+                (sin ejecución previa se recalcula todo)
+            chunk_size: Contactos por transacción (por defecto RESCORING_CHUNK_SIZE)
+            progress: Función opcional (procesados, total, actualizados)
+
+        Returns:
+            Resumen: modo, desde, contactos normalizados, procesados,
+            actualizados y segundos
+        """
+        chunk_size = chunk_size or settings.RESCORING_CHUNK_SIZE
+        start = time.perf_counter()
+        started_at = db.execute(select(current_timestamp_precise())).scalar()
+        last_run = RescoringService.last_run(db) if incremental else None
+        since = last_run - INCREMENTAL_OVERLAP if last_run else None
+
+        normalized = RescoringService._sync_normalized_columns(db, chunk_size, since)
+        if since is None:
+            processed, updated = RescoringService._rescore_all(db, chunk_size, progress)
+        else:
+            processed, updated = RescoringService._rescore_since(db, since, chunk_size, progress)
+
+        RescoringService._save_last_run(db, started_at)
+        return {
+            "mode": "incremental" if since is not None else "full",
+            "since": last_run.isoformat() if last_run else None,
+            "normalized": normalized,
+            "processed": processed,
+            "updated": updated,
+            "seconds": round(time.perf_counter() - start, 2),
+        }
+
+    @staticmethod
+    def _sync_normalized_columns(db: Session, chunk_size: int, since: Optional[datetime]) -> int:
+        """
+        Recalcular las claves normalizadas desde los datos originales y
+        escribir las que difieren. Los contactos insertados fuera de la API no
+        las tienen, y los grupos de candidatos se arman con ellas.
+
+        Args:
+            db: Sesión de base de datos
+            chunk_size: Contactos por transacción
+            since: Solo los contactos escritos desde esta fecha y los que no
+                tienen claves (None = todos)
+
+        Returns:
+            Contactos actualizados
+        """
+        condition = None
+        if since is not None:
+            condition = or_(Contact.updated_at >= since, Contact.name_norm.is_(None))
+        total = 0
+        last_id = 0
+        while True:
+            query = select(
+                Contact.id, Contact.name, Contact.organization, Contact.position, Contact.region,
+                Contact.phone, Contact.source_url, *_KEY_COLUMNS[:-1]
+            ).where(Contact.id > last_id)
+            if condition is not None:
+                query = query.where(condition)
+            rows = db.execute(query.order_by(Contact.id).limit(chunk_size)).all()
+            if not rows:
+                return total
+            changes = []
+            for row in rows:
+                columns = normalized_columns(build_match_keys(
+                    row.name, row.organization, row.position, row.region, row.phone, row.source_url
+                ))
+                if any(getattr(row, column) != value for column, value in columns.items()):
+                    changes.append({"id": row.id, **columns})
+            if changes:
+                db.execute(update(Contact), changes)
+            db.commit()
+            total += len(changes)
+            last_id = rows[-1].id
+
+    @staticmethod
+    def _duplicated_values(db: Session) -> Dict[str, Set[str]]:
+        """
+        Valores de nombre, teléfono y URL compartidos por más de un contacto.
+        Se agrupa byte a byte (exact_text): el motor compara como score_pair.
+        """
+        columns = ContactService._match_key_columns()
+        result = {}
+        for field in BLOCKING_FIELDS:
+            column = exact_text(db, columns[field])
+            result[field] = set(db.execute(
+                select(column).where(columns[field].isnot(None)).group_by(column).having(func.count() > 1)
+            ).scalars())
+        return result
+
+    @staticmethod
+    def _rescore_all(db: Session, chunk_size: int, progress: Optional[Progress]) -> tuple:
+        """
+        Recorrer todos los contactos en orden de ID.
+
+        El motor contiene en cada momento solo contactos de ID menor: el score
+        que devuelve es el que habría dado calculate_validation_score al
+        insertar el contacto.
+        """
+        duplicated = RescoringService._duplicated_values(db)
+        total = db.query(func.count(Contact.id)).scalar() or 0
+        engine = ScoringEngine()
+        processed = updated = 0
+        last_id = 0
+
+        while True:
+            rows = db.execute(
+                select(*_SCORE_COLUMNS, *_KEY_COLUMNS).where(
+                    Contact.id > last_id
+                ).order_by(Contact.id).limit(chunk_size)
+            ).all()
+            if not rows:
+                return processed, updated
+
+            scored = []
+            for row in rows:
+                keys = match_keys_from_columns(*row[len(_SCORE_COLUMNS):])
+                if not RescoringService._is_locked(row):
+                    scored.append((row.id, row.validation_score, engine.score(keys)))
+                if any(getattr(keys, field) in duplicated[field] for field in BLOCKING_FIELDS):
+                    engine.add(row.id, keys)
+                else:
+                    for field in SECONDARY_FIELDS:
+                        engine.add_secondary_counts(field, [(getattr(keys, field), 1)])
+
+            updated += RescoringService._apply(db, scored)
+            processed += len(rows)
+            last_id = rows[-1].id
+            if progress:
+                progress(processed, total, updated)
+
+    @staticmethod
+    def _rescore_since(
+        db: Session,
+        since: datetime,
+        chunk_size: int,
+        progress: Optional[Progress]
+    ) -> tuple:
+        """
+        Recalcular los contactos escritos desde `since` y los posteriores que
+        comparten con ellos nombre, teléfono o URL.
+
+        Por lote se cargan los candidatos de todos esos contactos y se
+        recorren en orden de ID, igual que en la pasada completa; el caso 0.9
+        se resuelve con el primer ID de cada organización/cargo/región.
+        """
+        # IDs fijados antes de escribir: las actualizaciones propias también
+        # mueven updated_at
+        touched = list(db.execute(
+            select(Contact.id).where(Contact.updated_at >= since).order_by(Contact.id)
+        ).scalars())
+        columns = ContactService._match_key_columns()
+        row_columns = (*_SCORE_COLUMNS, *_KEY_COLUMNS)
+        processed = updated = 0
+
+        for start in range(0, len(touched), chunk_size):
+            ids = touched[start:start + chunk_size]
+            targets = {row.id: row for row in db.execute(select(*row_columns).where(Contact.id.in_(ids))).all()}
+            target_keys = {row_id: match_keys_from_columns(*row[len(_SCORE_COLUMNS):]) for row_id, row in targets.items()}
+
+            later = RescoringService._blocking_conditions(columns, target_keys.values())
+            if later:
+                for row in db.execute(select(*row_columns).where(Contact.id > ids[0], or_(*later))).all():
+                    if row.id not in targets:
+                        targets[row.id] = row
+                        target_keys[row.id] = match_keys_from_columns(*row[len(_SCORE_COLUMNS):])
+
+            candidates = {}
+            conditions = RescoringService._blocking_conditions(columns, target_keys.values())
+            if conditions:
+                for row in db.execute(select(Contact.id, *_KEY_COLUMNS).where(or_(*conditions))).all():
+                    candidates[row.id] = match_keys_from_columns(*row[1:])
+
+            first_ids = {}
+            for field in SECONDARY_FIELDS:
+                values = {getattr(keys, field) for keys in target_keys.values() if getattr(keys, field)}
+                exact = exact_text(db, columns[field])
+                first_ids[field] = dict(db.execute(
+                    select(exact, func.min(Contact.id)).where(
+                        columns[field].in_(values)
+                    ).group_by(exact)
+                ).all()) if values else {}
+
+            engine = ScoringEngine()
+            scored = []
+            for row_id in sorted(candidates.keys() | target_keys.keys()):
+                keys = target_keys.get(row_id)
+                if keys is None:
+                    engine.add(row_id, candidates[row_id], count_secondary=False)
+                    continue
+                if RescoringService._is_locked(targets[row_id]):
+                    engine.add(row_id, keys, count_secondary=False)
+                    continue
+                score = engine.score(keys)
+                if score > 0.9 and any(
+                    first_ids[field].get(getattr(keys, field), row_id) < row_id for field in SECONDARY_FIELDS
+                ):
+                    score = 0.9
+                scored.append((row_id, targets[row_id].validation_score, score))
+                engine.add(row_id, keys, count_secondary=False)
+
+            updated += RescoringService._apply(db, scored)
+            processed += len(ids)
+            if progress:
+                progress(processed, len(touched), updated)
+
+        return processed, updated
+
+    @staticmethod
+    def _is_locked(row) -> bool:
+        """Contacto cuyo score no se recalcula: invalidado o asignado a mano."""
+        return row.is_valid is False or bool(row.manual_score)
+
+    @staticmethod
+    def _blocking_conditions(columns: dict, keys_list: Iterable[MatchKeys]) -> list:
+        """Condiciones IN sobre nombre, teléfono y URL de unas claves."""
+        keys_list = list(keys_list)
+        conditions = []
+        for field in BLOCKING_FIELDS:
+            values = {getattr(keys, field) for keys in keys_list if getattr(keys, field)}
+            if values:
+                conditions.append(columns[field].in_(values))
+        return conditions
+
+    @staticmethod
+    def _apply(db: Session, scored: List[tuple]) -> int:
+        """
+        Escribir los scores que cambiaron y confirmar el lote.
+
+        Args:
+            db: Sesión de base de datos
+            scored: Tuplas (ID, score actual, score nuevo)
+
+        Returns:
+            Contactos actualizados
+        """
+        changes = [
+            {"id": contact_id, "validation_score": score}
+            for contact_id, current, score in scored
+            if current is None or Decimal(str(score)) != current
+        ]
+        if changes:
+            db.execute(update(Contact), changes)
+        db.commit()
+        if changes:
+            ContactService.invalidate_cache([change["id"] for change in changes], affects_sessions=True)
+        return len(changes)
+
+    @staticmethod
+    def _save_last_run(db: Session, started_at: datetime) -> None:
+        """Guardar el inicio de la ejecución como marca de la siguiente."""
+        config = db.query(SystemConfig).filter(SystemConfig.config_key == RESCORING_CONFIG_KEY).first()
+        if config is None:
+            config = SystemConfig(
+                config_key=RESCORING_CONFIG_KEY,
+                description="Inicio del último recálculo de validation_score (modo incremental)",
+            )
+            db.add(config)
+        config.config_value = started_at.isoformat()
+        db.commit()
+
+
+class RescoringJob:
+    """Ejecución en segundo plano del recálculo (POST /contacts/rescore) con su avance."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._task: Optional[asyncio.Task] = None
+        self._state: dict = {"running": False}
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> dict:
+        """Estado de la ejecución actual o de la última."""
+        return dict(self._state)
+
+    async def start(self, incremental: bool = True) -> bool:
+        """
+        Iniciar un recálculo.
+
+        Args:
+            incremental: Ver RescoringService.rescore
+
+        Returns:
+            False si ya hay uno en curso en este proceso
+        """
+        if self.running:
+            return False
+        self._state = {
+            "running": True,
+            "incremental": incremental,
+            "started_at": datetime.now().isoformat(),
+            "finished_at": None,
+            "processed": 0,
+            "total": None,
+            "updated": 0,
+            "result": None,
+            "error": None,
+        }
+        # Contexto propio: la tarea no debe contar en las métricas ni en el
+        # presupuesto de consultas de la petición que la inicia
+        self._task = asyncio.create_task(self._run(incremental), context=contextvars.Context())
+        return True
+
+    def _progress(self, processed: int, total: int, updated: int) -> None:
+        self._state.update(processed=processed, total=total, updated=updated)
+
+    def _rescore(self, incremental: bool) -> dict:
+        db = self._session_factory()
+        try:
+            return RescoringService.rescore(db, incremental=incremental, progress=self._progress)
+        finally:
+            db.close()
+
+    async def _run(self, incremental: bool) -> None:
+        try:
+            result = await run_in_threadpool(self._rescore, incremental)
+            self._state["result"] = result
+            print(f"🔁 Scores recalculados: {result}")
+        except Exception as e:
+            self._state["error"] = str(e)
+            print(f"❌ Error recalculando scores: {e}")
+        finally:
+            self._state.update(running=False, finished_at=datetime.now().isoformat())
+
+
+# Instancia global (una por proceso/worker de uvicorn)
+rescoring_job = RescoringJob()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.services.rescoring_service",
+        description="Recalcular validation_score de los contactos"
+    )
+    parser.add_argument("--full", action="store_true", help="Recalcular todos los contactos (no solo los escritos desde la última ejecución)")
+    parser.add_argument("--chunk-size", type=int, default=None, help="Contactos por transacción (por defecto RESCORING_CHUNK_SIZE)")
+    args = parser.parse_args(argv)
+
+    def progress(processed: int, total: int, updated: int) -> None:
+        print(f"   {processed}/{total} contactos, {updated} actualizados")
+
+    db = SessionLocal()
+    try:
+        result = RescoringService.rescore(
+            db, incremental=not args.full, chunk_size=args.chunk_size, progress=progress
+        )
+    finally:
+        db.close()
+    print(f"✅ Scores recalculados: {result}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
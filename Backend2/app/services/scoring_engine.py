@@ -0,0 +1,307 @@
+"""
+Motor de scoring de validación basado en índices de bloqueo.
+
+En lugar de comparar un contacto nuevo contra toda la tabla, se indexan las
+claves normalizadas (nombre, teléfono y URL de origen) y solo se comparan los
+candidatos que comparten al menos una de ellas. Las coincidencias que solo
+involucran organización/cargo/región siempre producen 0.9, por lo que para
+ellas basta con un conteo por valor en lugar de una comparación completa.
+"""
+
+from collections import defaultdict
+from typing import Dict, Iterable, NamedTuple, Optional, Set, Tuple
+
+
+# Campos secundarios (organización / cargo / región)
+SECONDARY_FIELDS = ("organization", "position", "region")
+
+
+class MatchKeys(NamedTuple):
+    """Claves normalizadas de un contacto usadas para comparar similitudes."""
+    name: str
+    organization: str
+    position: str
+    region: str
+    phone: str
+    source_url: str
+
+
+def normalize_text(value: Optional[str]) -> str:
+    """
+    Normaliza un texto para comparación (minúsculas y sin espacio en blanco
+    en los extremos). En MySQL la replica fn_normalize_text (HU 2.6).
+    """
+    return value.lower().strip() if value else ""
+
+
+def normalize_phone(value: Optional[str]) -> str:
+    """Normaliza un teléfono eliminando espacios y guiones."""
+    return value.replace(" ", "").replace("-", "") if value else ""
+
+
+def build_match_keys(
+    name: Optional[str],
+    organization: Optional[str],
+    position: Optional[str],
+    region: Optional[str],
+    phone: Optional[str],
+    source_url: Optional[str]
+) -> MatchKeys:
+    """
+    Construir las claves normalizadas de un contacto.
+
+    Args:
+        name: Nombre del contacto
+        organization: Organización
+        position: Cargo
+        region: Región
+        phone: Teléfono
+        source_url: URL de origen (se compara sin normalizar)
+
+    Returns:
+        Claves normalizadas
+    """
+    return MatchKeys(
+        name=normalize_text(name),
+        organization=normalize_text(organization),
+        position=normalize_text(position),
+        region=normalize_text(region),
+        phone=normalize_phone(phone),
+        source_url=source_url or "",
+    )
+
+
+def match_keys_from_columns(
+    name_norm: Optional[str],
+    org_norm: Optional[str],
+    position_norm: Optional[str],
+    region_norm: Optional[str],
+    phone_norm: Optional[str],
+    source_url: Optional[str]
+) -> MatchKeys:
+    """
+    Construir las claves a partir de las columnas normalizadas persistidas.
+
+    Args:
+        name_norm: Columna contacts.name_norm
+        org_norm: Columna contacts.org_norm
+        position_norm: Columna contacts.position_norm
+        region_norm: Columna contacts.region_norm
+        phone_norm: Columna contacts.phone_norm
+        source_url: Columna contacts.source_url
+
+    Returns:
+        Claves normalizadas
+    """
+    return MatchKeys(
+        name=name_norm or "",
+        organization=org_norm or "",
+        position=position_norm or "",
+        region=region_norm or "",
+        phone=phone_norm or "",
+        source_url=source_url or "",
+    )
+
+
+def normalized_columns(keys: MatchKeys) -> Dict[str, Optional[str]]:
+    """
+    Valores de las columnas normalizadas de contacts para unas claves.
+    Los valores vacíos se guardan como NULL.
+
+    Args:
+        keys: Claves normalizadas
+
+    Returns:
+        Diccionario columna -> valor
+    """
+    return {
+        "name_norm": keys.name or None,
+        "org_norm": keys.organization or None,
+        "position_norm": keys.position or None,
+        "region_norm": keys.region or None,
+        "phone_norm": keys.phone or None,
+    }
+
+
+def score_pair(new: MatchKeys, existing: MatchKeys) -> float:
+    """
+    Calcular el score de un contacto nuevo frente a un contacto existente.
+
+    Reglas de scoring:
+    - 1.0: Único sin similitudes
+    - 0.9: Solo 1 dato duplicado (excepto phone/email/url) O 2-3 datos de org/position/region
+    - 0.7: Solo URL duplicado
+    - 0.6: Solo phone duplicado
+    - 0.4: 2-3 datos de org/position/region + name
+    - 0.3: URL + otros datos duplicados (combinación sospechosa)
+    - 0.2: 4 o más datos duplicados
+
+    Args:
+        new: Claves del contacto nuevo
+        existing: Claves del contacto existente
+
+    Returns:
+        Score de validación (0.0 - 1.0)
+    """
+    # Verificar coincidencias (un valor vacío nunca coincide)
+    name_match = bool(new.name) and new.name == existing.name
+    org_match = bool(new.organization) and new.organization == existing.organization
+    position_match = bool(new.position) and new.position == existing.position
+    region_match = bool(new.region) and new.region == existing.region
+    phone_match = bool(new.phone) and new.phone == existing.phone
+    url_match = bool(new.source_url) and new.source_url == existing.source_url
+
+    # Contar coincidencias de org/position/region
+    secondary_matches = sum([org_match, position_match, region_match])
+
+    current_score = 1.0
+
+    # CASO 1: Solo URL duplicado (0.7) - mismo origen pero diferente contacto
+    if url_match and not name_match and not phone_match and secondary_matches == 0:
+        current_score = min(current_score, 0.7)
+
+    # CASO 2: URL + otros datos duplicados (0.3) - muy sospechoso
+    elif url_match and (name_match or phone_match or secondary_matches > 0):
+        current_score = min(current_score, 0.3)
+
+    # CASO 3: Name + 2-3 datos secundarios (0.4)
+    if name_match and secondary_matches >= 2:
+        current_score = min(current_score, 0.4)
+
+    # CASO 4: Solo phone duplicado (0.6)
+    elif phone_match and not name_match and secondary_matches == 0 and not url_match:
+        current_score = min(current_score, 0.6)
+
+    # CASO 6: 1-3 datos secundarios sin name (0.9)
+    elif not name_match and not url_match:
+        if secondary_matches >= 1:
+            current_score = min(current_score, 0.9)
+
+    # CASO 7: Solo name duplicado (0.9)
+    elif name_match and secondary_matches == 0 and not phone_match and not url_match:
+        current_score = min(current_score, 0.9)
+
+    # Casos con múltiples coincidencias (muy sospechosos)
+    total_matches = sum([name_match, org_match, position_match, region_match, phone_match, url_match])
+    if total_matches >= 4:
+        current_score = min(current_score, 0.2)
+    elif total_matches >= 3 and name_match:
+        current_score = min(current_score, 0.3)
+
+    return current_score
+
+
+class ScoringEngine:
+    """
+    Índice de bloqueo en memoria para calcular scores de validación.
+
+    Mantiene tres índices de bloqueo (nombre, teléfono y URL) con las claves
+    completas de cada contacto indexado, y un conteo por valor de los campos
+    secundarios. El conteo puede incluir contactos que no están indexados
+    (por ejemplo, contactos de la base de datos que no son candidatos), lo que
+    permite detectar el caso 0.9 sin cargarlos en memoria.
+    """
+
+    def __init__(self):
+        self._rows: Dict[object, MatchKeys] = {}
+        self._by_name: Dict[str, Set[object]] = defaultdict(set)
+        self._by_phone: Dict[str, Set[object]] = defaultdict(set)
+        self._by_url: Dict[str, Set[object]] = defaultdict(set)
+        self._secondary_counts: Dict[str, Dict[str, int]] = {
+            field: defaultdict(int) for field in SECONDARY_FIELDS
+        }
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def add(self, key_id: object, keys: MatchKeys, count_secondary: bool = True) -> None:
+        """
+        Indexar un contacto.
+
+        Args:
+            key_id: Identificador del contacto (ID de base de datos o temporal)
+            keys: Claves normalizadas del contacto
+            count_secondary: Si False, no suma el contacto a los conteos
+                secundarios (porque ya fueron cargados con add_secondary_counts)
+        """
+        self._rows[key_id] = keys
+        if keys.name:
+            self._by_name[keys.name].add(key_id)
+        if keys.phone:
+            self._by_phone[keys.phone].add(key_id)
+        if keys.source_url:
+            self._by_url[keys.source_url].add(key_id)
+        if count_secondary:
+            for field in SECONDARY_FIELDS:
+                value = getattr(keys, field)
+                if value:
+                    self._secondary_counts[field][value] += 1
+
+    def add_secondary_counts(self, field: str, counts: Iterable[Tuple[str, int]]) -> None:
+        """
+        Sumar conteos externos de un campo secundario.
+
+        Args:
+            field: Campo secundario (organization, position o region)
+            counts: Pares (valor normalizado, cantidad de contactos)
+        """
+        for value, count in counts:
+            if value:
+                self._secondary_counts[field][value] += count
+
+    def candidates(self, keys: MatchKeys) -> Set[object]:
+        """
+        Obtener los contactos que comparten nombre, teléfono o URL.
+
+        Args:
+            keys: Claves normalizadas del contacto a evaluar
+
+        Returns:
+            Conjunto de identificadores candidatos
+        """
+        result: Set[object] = set()
+        if keys.name:
+            result |= self._by_name.get(keys.name, set())
+        if keys.phone:
+            result |= self._by_phone.get(keys.phone, set())
+        if keys.source_url:
+            result |= self._by_url.get(keys.source_url, set())
+        return result
+
+    def score(self, keys: MatchKeys) -> float:
+        """
+        Calcular el score de validación contra todos los contactos indexados.
+
+        Produce exactamente el mismo resultado que comparar contra cada contacto
+        con score_pair y tomar el mínimo.
+
+        Args:
+            keys: Claves normalizadas del contacto a evaluar
+
+        Returns:
+            Score de validación (0.0 - 1.0)
+        """
+        candidate_ids = self.candidates(keys)
+
+        min_score = 1.0
+        for key_id in candidate_ids:
+            min_score = min(min_score, score_pair(keys, self._rows[key_id]))
+
+        if min_score <= 0.9:
+            return min_score
+
+        # Un contacto que no es candidato y coincide en algún dato secundario
+        # siempre produce 0.9 (CASO 6)
+        for field in SECONDARY_FIELDS:
+            value = getattr(keys, field)
+            if not value:
+                continue
+            total = self._secondary_counts[field].get(value, 0)
+            among_candidates = sum(
+                1 for key_id in candidate_ids
+                if getattr(self._rows[key_id], field) == value
+            )
+            if total > among_candidates:
+                return 0.9
+
+        return min_score
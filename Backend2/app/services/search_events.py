@@ -0,0 +1,221 @@
+"""
+Eventos en vivo de las búsquedas (pub/sub en proceso para el endpoint SSE).
+
+Las escrituras de SearchService (cambios de estado y de contadores) y de
+ContactService (contactos vinculados a una búsqueda) publican aquí; cada
+stream GET /searches/{id}/events se suscribe a su búsqueda. Se publica
+desde hilos del threadpool y se entrega a colas asyncio del event loop.
+
+Cada evento lleva un ID "<época>.<n>" (época aleatoria por proceso, n
+creciente) y se guarda un historial corto por búsqueda para reanudar con
+Last-Event-ID. Si el ID no se puede reanudar (otro worker, reinicio,
+historial rotado) el stream envía el estado actual en su lugar.
+"""
+
+import asyncio
+import itertools
+import secrets
+import threading
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from app.config import settings
+
+# Estados en los que la búsqueda ya no cambia (el stream se cierra)
+TERMINAL_STATUSES = ("completed", "error", "failed")
+
+
+class StreamLimitError(Exception):
+    """Se alcanzó SSE_MAX_STREAMS_PER_WORKER."""
+
+
+class SearchEvent:
+    """Evento publicado para una búsqueda."""
+
+    __slots__ = ("id", "search_id", "event", "data", "event_id")
+
+    def __init__(self, id: int, search_id: int, event: str, data: Any, epoch: str):
+        self.id = id
+        self.search_id = search_id
+        self.event = event
+        self.data = data
+        # ID enviado en el campo "id:" del stream
+        self.event_id = f"{epoch}.{id}"
+
+
+class Subscription:
+    """Suscripción de un stream a los eventos de una búsqueda."""
+
+    def __init__(self, search_id: int, loop: asyncio.AbstractEventLoop, queue_size: int):
+        self.search_id = search_id
+        self.loop = loop
+        self.queue: "asyncio.Queue[SearchEvent]" = asyncio.Queue(maxsize=queue_size)
+        # True si se descartaron eventos por cola llena (el stream reenvía el estado)
+        self.overflowed = False
+
+    def _deliver(self, event: SearchEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class SearchEventBroker:
+    """Pub/sub en memoria de eventos de búsquedas, con historial para reanudar."""
+
+    def __init__(
+        self,
+        max_streams: int,
+        history_size: int,
+        max_tracked_searches: int,
+        queue_size: int
+    ):
+        self.max_streams = max_streams
+        self.history_size = history_size
+        self.max_tracked_searches = max_tracked_searches
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._epoch = secrets.token_hex(4)
+        self._ids = itertools.count(1)
+        self._subscribers: Dict[int, Set[Subscription]] = {}
+        # search_id -> eventos recientes (LRU de búsquedas)
+        self._history: "OrderedDict[int, Deque[SearchEvent]]" = OrderedDict()
+        # search_id -> ID del último evento descartado del historial
+        self._dropped: Dict[int, int] = {}
+        # search_id -> (status, results_count, valid_results_count) del último evento publicado
+        self._last_state: Dict[int, Tuple] = {}
+        self._open_streams = 0
+        self._published = 0
+        self._rejected_streams = 0
+
+    def publish(self, search_id: int, event: str, data: Any) -> SearchEvent:
+        """
+        Publicar un evento (seguro desde cualquier hilo).
+
+        Args:
+            search_id: ID de la búsqueda
+            event: Tipo de evento SSE
+            data: Contenido serializable a JSON
+
+        Returns:
+            Evento publicado
+        """
+        with self._lock:
+            published = SearchEvent(next(self._ids), search_id, event, data, self._epoch)
+            history = self._history.get(search_id)
+            if history is None:
+                history = self._history[search_id] = deque(maxlen=self.history_size)
+                while len(self._history) > self.max_tracked_searches:
+                    evicted, _ = self._history.popitem(last=False)
+                    self._last_state.pop(evicted, None)
+                    self._dropped.pop(evicted, None)
+            else:
+                self._history.move_to_end(search_id)
+            if len(history) == history.maxlen:
+                self._dropped[search_id] = history[0].id
+            history.append(published)
+            self._published += 1
+            subscribers = list(self._subscribers.get(search_id, ()))
+
+        for subscription in subscribers:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, published)
+            except RuntimeError:
+                # Event loop cerrado (apagado del worker)
+                pass
+        return published
+
+    def publish_search(self, search) -> Optional[SearchEvent]:
+        """
+        Publicar el estado de una búsqueda si cambió desde el último evento:
+        'status' si cambió el estado, 'progress' si solo cambiaron los contadores.
+
+        Args:
+            search: Búsqueda (modelo ORM) recién escrita
+
+        Returns:
+            Evento publicado o None si no hubo cambios
+        """
+        from app.schemas.search import SearchResponse
+
+        state = (search.status, search.results_count, search.valid_results_count)
+        with self._lock:
+            previous = self._last_state.get(search.id)
+            if previous == state:
+                return None
+            self._last_state[search.id] = state
+
+        event = "status" if previous is None or previous[0] != state[0] else "progress"
+        return self.publish(search.id, event, SearchResponse.model_validate(search).model_dump(mode="json"))
+
+    def _parse_event_id(self, event_id: Optional[str]) -> Optional[int]:
+        """Número de un ID de evento de este proceso, o None."""
+        if not event_id:
+            return None
+        epoch, _, number = event_id.strip().partition(".")
+        if epoch != self._epoch or not number.isdigit():
+            return None
+        return int(number)
+
+    def subscribe(self, search_id: int, last_event_id: Optional[str] = None) -> Tuple[Subscription, Optional[List[SearchEvent]]]:
+        """
+        Suscribir un stream (desde el event loop).
+
+        Args:
+            search_id: ID de la búsqueda
+            last_event_id: Último evento recibido por el cliente (Last-Event-ID)
+
+        Returns:
+            (suscripción, eventos a reenviar). Los eventos son None si no
+            hay last_event_id o no se puede reanudar desde él (el stream debe
+            enviar el estado actual)
+
+        Raises:
+            StreamLimitError: Si el worker ya tiene SSE_MAX_STREAMS_PER_WORKER streams
+        """
+        subscription = Subscription(search_id, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            if self._open_streams >= self.max_streams:
+                self._rejected_streams += 1
+                raise StreamLimitError(f"Máximo de {self.max_streams} streams abiertos por worker")
+            self._subscribers.setdefault(search_id, set()).add(subscription)
+            self._open_streams += 1
+
+            replay = None
+            last_id = self._parse_event_id(last_event_id)
+            history = self._history.get(search_id)
+            # Reanudable si no se descartó del historial ningún evento posterior al último recibido
+            if last_id is not None and history is not None and last_id >= self._dropped.get(search_id, 0):
+                replay = [event for event in history if event.id > last_id]
+
+        return subscription, replay
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Eliminar una suscripción."""
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.search_id)
+            if subscribers is not None and subscription in subscribers:
+                subscribers.discard(subscription)
+                self._open_streams -= 1
+                if not subscribers:
+                    del self._subscribers[subscription.search_id]
+
+    def get_stats(self) -> dict:
+        """Streams abiertos, eventos publicados y streams rechazados por el tope."""
+        with self._lock:
+            return {
+                "open_streams": self._open_streams,
+                "max_streams": self.max_streams,
+                "rejected_streams": self._rejected_streams,
+                "events_published": self._published,
+                "tracked_searches": len(self._history),
+            }
+
+
+# Broker global (uno por proceso/worker de uvicorn)
+search_events = SearchEventBroker(
+    max_streams=settings.SSE_MAX_STREAMS_PER_WORKER,
+    history_size=settings.SSE_HISTORY_SIZE,
+    max_tracked_searches=settings.SSE_MAX_TRACKED_SEARCHES,
+    queue_size=settings.SSE_QUEUE_SIZE
+)
@@ -4,138 +4,122 @@ Contiene la lógica de negocio relacionada con searches.
 """
 
 from typing import List, Optional, Tuple
-from datetime import datetime
-import random
+from datetime import datetime, timedelta
+import hashlib
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import func, desc, and_
-from app.models import Search, SearchResult, Contact
-from app.schemas.search import SearchCreate, SearchUpdate, SearchStatsResponse
+from sqlalchemy import func, desc, and_, insert, literal, select
+from app.models import Search, SearchResult, Contact, SearchLog
+from app.schemas.search import SearchCreate, SearchUpdate, SearchResponse, SearchStatsResponse
 from app.config import settings
+from app.cache import cache
+from app.services.search_events import search_events
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter, keyset_order_by, paginate
+from app.utils.counting import count_total
+from app.utils.sql import dialect_name
+
+# Orden de los listados (la última columna desempata)
+SEARCH_ORDER = [(Search.created_at, True), (Search.id, True)]
+LOG_ORDER = [(SearchLog.created_at, True), (SearchLog.id, True)]
+# Marca de agua de los resultados incrementales (?since=): orden de llegada
+# (seq crece en el orden de confirmación de cada búsqueda; found_at no, dos
+# transacciones pueden confirmar en orden inverso a sus marcas de tiempo)
+RESULTS_WATERMARK = [(SearchResult.seq, False)]
+
+# Campos de cada resultado (?fields=) y su columna; el orden es el de la respuesta.
+# Los nombres sin prefijo son alias de compatibilidad de los contact_*.
+RESULT_FIELDS = {
+    "contact_id": SearchResult.contact_id,
+    "contact_name": Contact.name,
+    "contact_email": Contact.email,
+    "contact_organization": Contact.organization,
+    "organization": Contact.organization,
+    "contact_position": Contact.position,
+    "position": Contact.position,
+    "contact_region": Contact.region,
+    "region": Contact.region,
+    "contact_phone": Contact.phone,
+    "phone": Contact.phone,
+    "source_url": Contact.source_url,
+    "source_type": Contact.source_type,
+    "relevance_score": SearchResult.relevance_score,
+    "validation_score": Contact.validation_score,
+    "found_at": SearchResult.found_at,
+}
+
+
+def normalize_criterion(value: Optional[str]) -> str:
+    """Normaliza un criterio de búsqueda (minúsculas y espacios colapsados)."""
+    return " ".join(value.lower().split()) if value else ""
+
+
+def search_criteria_hash(keywords: Optional[str], area: Optional[str], region: Optional[str]) -> str:
+    """
+    Calcular la huella de los criterios de una búsqueda.
+    
+    Debe coincidir con el backfill de database/2.8SQL.sql.
+    
+    Args:
+        keywords: Palabras clave
+        area: Área
+        region: Región
+        
+    Returns:
+        sha256 hexadecimal de "keywords|area|region" normalizados
+    """
+    raw = "|".join(normalize_criterion(value) for value in (keywords, area, region))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
 class SearchService:
     """Servicio para operaciones de búsqueda."""
     
     @staticmethod
-    def process_demo_search(search_id: int) -> None:
+    def process_demo_search(search_id: int, seed: Optional[int] = None) -> None:
         """
-        Procesa una búsqueda en modo DEMO creando contactos de prueba.
-        NOTA: Esta función se debe desactivar cuando se implemente n8n real.
+        Procesa una búsqueda en modo DEMO con contactos sintéticos.
+        
+        Los contactos salen de app.services.synthetic_data (áreas y regiones
+        de la búsqueda) y se insertan con ContactService.bulk_create_contacts,
+        que calcula el score real contra la base.
         
         Args:
             search_id: ID de la búsqueda a procesar
+            seed: Semilla del generador (None = aleatoria)
         """
         if not settings.DEMO_MODE:
             return
         
-        # Crear nueva sesión de DB para la tarea en background
+        # Imports locales: ambos módulos importan search_service
         from app.database import SessionLocal
+        from app.services.contact_service import ContactService
+        from app.services.synthetic_data import SyntheticDataGenerator
         db = SessionLocal()
         
         try:
-            # Obtener la búsqueda
             search = db.query(Search).filter(Search.id == search_id).first()
             if not search:
                 return
-        
-            # Datos de prueba basados en keywords
-            nombres = ["María", "Juan", "Ana", "Pedro", "Carmen", "Luis", "Isabel", "Carlos", "Laura", "Miguel"]
-            apellidos = ["González", "Rodríguez", "López", "Martínez", "García", "Fernández", "Sánchez", "Pérez", "Torres", "Ramírez"]
-            organizaciones = ["Universidad de Chile", "Pontificia Universidad Católica", "Hospital Regional", "Ministerio de Salud", 
-                             "Tech Innovators SpA", "Constructora del Sur", "Instituto Nacional", "Clínica Alemana"]
-            dominios = ["gmail.com", "hotmail.com", "outlook.com", "yahoo.com", "uchile.cl", "uc.cl"]
-            
-            # Determinar área para posiciones
-            area = search.area or "General"
-            # Parsear áreas si hay múltiples (separadas por coma)
-            areas_list = [a.strip() for a in area.split(',')] if area else ["General"]
-            
-            posiciones_por_area = {
-                "Salud": ["Médico Especialista", "Enfermero/a", "Director/a Médico", "Jefe de Servicio"],
-                "Educación": ["Profesor/a", "Director/a Académico", "Coordinador/a Pedagógico", "Investigador/a"],
-                "Tecnología": ["Desarrollador Senior", "Arquitecto de Software", "CTO", "Data Scientist"],
-                "Construcción": ["Ingeniero Civil", "Jefe de Obras", "Arquitecto", "Gerente de Proyectos"],
-                "General": ["Gerente", "Especialista", "Coordinador/a", "Director/a"]
-            }
-            # Elegir una área aleatoria si hay múltiples
-            area_seleccionada = random.choice(areas_list)
-            posiciones = posiciones_por_area.get(area_seleccionada, posiciones_por_area["General"])
             
-            # Parsear regiones si hay múltiples (separadas por coma)
-            regiones_seleccionadas = [r.strip() for r in search.region.split(',')] if search.region else ["Santiago"]
-            if not regiones_seleccionadas or regiones_seleccionadas == ['']:
-                regiones_seleccionadas = ["Santiago"]
+            # Áreas y regiones pueden venir separadas por coma
+            areas = [a.strip() for a in (search.area or "").split(',') if a.strip()] or ["General"]
+            regions = [r.strip() for r in (search.region or "").split(',') if r.strip()] or ["Santiago"]
             
-            # Generar entre 8 y 15 contactos de prueba
-            num_contactos = random.randint(8, 15)
-            contactos_creados = []
-            contactos_ids_usados = set()  # Para evitar duplicados
-            intentos = 0
-            max_intentos = num_contactos * 3  # Permitir intentos adicionales
-        
-            while len(contactos_creados) < num_contactos and intentos < max_intentos:
-                intentos += 1
-                nombre = random.choice(nombres)
-                apellido = random.choice(apellidos)
-                nombre_completo = f"{nombre} {apellido}"
-                # Aumentar rango a 1-9999 para reducir colisiones
-                email = f"{nombre.lower()}.{apellido.lower()}{random.randint(1, 9999)}@{random.choice(dominios)}"
-                
-                # Verificar si el email ya existe
-                existing = db.query(Contact).filter(Contact.email == email).first()
-                if existing:
-                    # Solo agregar si no lo hemos usado ya en esta búsqueda
-                    if existing.id not in contactos_ids_usados:
-                        contactos_creados.append(existing)
-                        contactos_ids_usados.add(existing.id)
-                    continue
-                
-                # Generar score de validación (0.1 a 1.0)
-                validation_score = round(random.uniform(0.1, 1.0), 2)
-                # Considerar válido solo si score >= 0.7
-                is_valid = validation_score >= 0.7
-                
-                # Crear contacto
-                contact = Contact(
-                    name=nombre_completo,
-                    organization=random.choice(organizaciones),
-                    position=random.choice(posiciones),
-                    email=email,
-                    phone=f"+569{random.randint(10000000, 99999999)}",
-                    region=random.choice(regiones_seleccionadas),  # Elegir UNA región aleatoria
-                    source_url=f"https://demo-source.com/profile/{len(contactos_creados)}",
-                    source_type="demo",
-                    is_valid=is_valid,
-                    validation_score=validation_score
-                )
-                
-                db.add(contact)
-                db.flush()  # Para obtener el ID
-                contactos_creados.append(contact)
-                contactos_ids_usados.add(contact.id)
+            generator = SyntheticDataGenerator(seed=seed)
+            contacts = generator.contacts(generator.rng.randint(8, 15), areas=areas, regions=regions)
+            ContactService.bulk_create_contacts(
+                db, contacts, search_id=search.id,
+                relevance_score=round(generator.rng.uniform(0.7, 1.0), 2)
+            )
             
-            # Vincular contactos con la búsqueda
-            for contact in contactos_creados:
-                search_result = SearchResult(
-                    search_id=search.id,
-                    contact_id=contact.id,
-                    relevance_score=round(random.uniform(0.7, 1.0), 2)
-                )
-                db.add(search_result)
-        
-            # Actualizar búsqueda como completada
             search.status = "completed"
-            search.results_count = len(contactos_creados)
-            search.valid_results_count = len([c for c in contactos_creados if c.is_valid])
-            
-            print(f"📊 DEBUG: contactos_creados = {len(contactos_creados)}, válidos = {search.valid_results_count}")
-            print(f"📊 DEBUG: Asignando results_count = {search.results_count}, valid_results_count = {search.valid_results_count}")
-            
+            search.finished_at = datetime.now()
+            search.results_count, search.valid_results_count = SearchService._count_results(db, search.id)
             db.commit()
-            db.refresh(search)  # Refrescar para asegurar que tiene los valores actualizados
+            db.refresh(search)
+            SearchService.notify_change(search)
             
             print(f"✅ Búsqueda {search_id} completada: {search.results_count} total, {search.valid_results_count} válidos")
-            print(f"📊 DEBUG después de commit: results_count = {search.results_count}, valid_results_count = {search.valid_results_count}")
         except Exception as e:
             db.rollback()
             print(f"Error procesando búsqueda demo {search_id}: {e}")
@@ -143,17 +127,26 @@ class SearchService:
             db.close()
     
     @staticmethod
-    def create_search(db: Session, search_data: SearchCreate) -> Search:
+    def create_search(db: Session, search_data: SearchCreate, commit: bool = True) -> Search:
         """
         Crear una nueva búsqueda.
         
+        Si existe una búsqueda completada reciente con los mismos criterios
+        normalizados (ver SEARCH_CACHE_TTL_SECONDS), sus resultados se copian
+        a la nueva búsqueda, que queda 'completed' sin necesidad de scraping.
+        search_config["force_refresh"] = true omite esta reutilización.
+        
         Args:
             db: Sesión de base de datos
             search_data: Datos de la búsqueda
+            commit: Si es False solo hace flush; quien llama agrega sus propias
+                escrituras (log, disparo) en la misma transacción, hace commit
+                y luego llama a notify_created
             
         Returns:
-            Búsqueda creada
+            Búsqueda creada ('pending', o 'completed' si se reutilizaron resultados)
         """
+        criteria_hash = search_criteria_hash(search_data.keywords, search_data.area, search_data.region)
         search = Search(
             session_id=search_data.session_id,
             keywords=search_data.keywords,
@@ -162,15 +155,116 @@ class SearchService:
             search_config=search_data.search_config,
             ip_hash=search_data.ip_hash,
             user_agent=search_data.user_agent,
+            criteria_hash=criteria_hash,
             status="pending"
         )
         
         db.add(search)
+        db.flush()
+        
+        config = search_data.search_config or {}
+        source = None
+        if settings.SEARCH_CACHE_ENABLED and not config.get("force_refresh"):
+            source = SearchService.find_cached_search(db, criteria_hash, exclude_id=search.id)
+            if source:
+                SearchService._reuse_results(db, search, source)
+        
+        if not commit:
+            db.flush()
+            return search
+        
         db.commit()
         db.refresh(search)
+        SearchService.notify_created(search)
         
         return search
     
+    @staticmethod
+    async def create_search_async(db: AsyncSession, search_data: SearchCreate, commit: bool = True) -> Search:
+        """
+        Variante async de create_search (rutas async def).
+        
+        Ejecuta la misma lógica con run_sync: la E/S va por el driver
+        asíncrono, sin ocupar un hilo del threadpool ni bloquear el event loop.
+        
+        Args:
+            db: Sesión asíncrona de base de datos
+            search_data: Datos de la búsqueda
+            commit: Ver create_search
+            
+        Returns:
+            Búsqueda creada ('pending', o 'completed' si se reutilizaron resultados)
+        """
+        return await db.run_sync(SearchService.create_search, search_data, commit)
+    
+    @staticmethod
+    def notify_created(search: Search) -> None:
+        """
+        Avisar de una búsqueda recién creada (ya confirmada).
+        
+        Args:
+            search: Búsqueda creada
+        """
+        SearchService.notify_change(search)
+        if search.status == "completed":
+            # Los contactos reutilizados suman una aparición más
+            cache.invalidate("contact")
+    
+    @staticmethod
+    def find_cached_search(db: Session, criteria_hash: str, exclude_id: Optional[int] = None) -> Optional[Search]:
+        """
+        Buscar la búsqueda completada más reciente con los mismos criterios,
+        dentro de la ventana de vigencia y con al menos un resultado.
+        
+        Args:
+            db: Sesión de base de datos
+            criteria_hash: Huella de los criterios (search_criteria_hash)
+            exclude_id: ID de búsqueda a excluir
+            
+        Returns:
+            Búsqueda encontrada o None
+        """
+        cutoff = datetime.now() - timedelta(seconds=settings.SEARCH_CACHE_TTL_SECONDS)
+        query = db.query(Search).filter(
+            Search.criteria_hash == criteria_hash,
+            Search.status == "completed",
+            Search.finished_at >= cutoff,
+            Search.results_count > 0
+        )
+        if exclude_id is not None:
+            query = query.filter(Search.id != exclude_id)
+        return query.order_by(desc(Search.finished_at)).first()
+    
+    @staticmethod
+    def _reuse_results(db: Session, search: Search, source: Search) -> None:
+        """Copiar los resultados de otra búsqueda y marcar la búsqueda como completada (sin commit)."""
+        db.execute(
+            insert(SearchResult).from_select(
+                ["search_id", "contact_id", "relevance_score"],
+                select(
+                    literal(search.id),
+                    SearchResult.contact_id,
+                    SearchResult.relevance_score
+                ).where(SearchResult.search_id == source.id)
+            )
+        )
+        
+        now = datetime.now()
+        search.status = "completed"
+        search.started_at = now
+        search.finished_at = now
+        search.results_count, search.valid_results_count = SearchService._count_results(db, search.id)
+        
+        db.add(SearchLog(
+            search_id=search.id,
+            source_url="search_cache",
+            source_type="search_cache",
+            status="info",
+            contacts_found=search.results_count,
+            error_message=f"Resultados reutilizados de la búsqueda {source.id} (finalizada {source.finished_at})",
+            response_time_ms=0
+        ))
+    
     @staticmethod
     def get_search(db: Session, search_id: int) -> Optional[Search]:
         """
@@ -185,26 +279,105 @@ class SearchService:
         """
         return db.query(Search).filter(Search.id == search_id).first()
     
+    @staticmethod
+    @cache.cached("search", ttl=5, key=lambda db, search_id: (search_id,))
+    def get_search_response(db: Session, search_id: int) -> Optional[SearchResponse]:
+        """
+        Obtener una búsqueda ya serializada (cacheada; para el polling del frontend).
+        
+        Args:
+            db: Sesión de base de datos
+            search_id: ID de la búsqueda
+            
+        Returns:
+            Búsqueda serializada o None
+        """
+        search = SearchService.get_search(db, search_id)
+        return SearchResponse.model_validate(search) if search else None
+    
+    @staticmethod
+    async def get_search_async(db: AsyncSession, search_id: int) -> Optional[Search]:
+        """
+        Variante async de get_search.
+        
+        Args:
+            db: Sesión asíncrona de base de datos
+            search_id: ID de la búsqueda
+            
+        Returns:
+            Búsqueda encontrada o None
+        """
+        result = await db.execute(select(Search).where(Search.id == search_id))
+        return result.scalar_one_or_none()
+    
+    @staticmethod
+    @cache.cached("search", ttl=5, key=lambda db, search_id: (search_id,))
+    async def get_search_response_async(db: AsyncSession, search_id: int) -> Optional[SearchResponse]:
+        """
+        Variante async de get_search_response (comparte la entrada de caché).
+        
+        Args:
+            db: Sesión asíncrona de base de datos
+            search_id: ID de la búsqueda
+            
+        Returns:
+            Búsqueda serializada o None
+        """
+        search = await SearchService.get_search_async(db, search_id)
+        return SearchResponse.model_validate(search) if search else None
+    
+    @staticmethod
+    def invalidate_cache(search: Search) -> None:
+        """
+        Invalidar las lecturas cacheadas que dependen de una búsqueda.
+        Se llama después de cada escritura que la modifica.
+        
+        Args:
+            search: Búsqueda modificada
+        """
+        cache.invalidate("search", search.id)
+        cache.invalidate("session_stats", search.session_id)
+        cache.invalidate("recent_activity")
+    
+    @staticmethod
+    def notify_change(search: Search) -> None:
+        """
+        Avisar de una escritura en una búsqueda: invalida la caché y publica
+        el nuevo estado o los nuevos contadores a los streams SSE.
+        
+        Args:
+            search: Búsqueda modificada (ya confirmada)
+        """
+        SearchService.invalidate_cache(search)
+        search_events.publish_search(search)
+    
     @staticmethod
     def get_searches(
         db: Session,
         skip: int = 0,
         limit: int = 100,
         session_id: Optional[str] = None,
-        status: Optional[str] = None
-    ) -> Tuple[List[Search], int]:
+        status: Optional[str] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[Search], Optional[int], Optional[str]]:
         """
         Obtener lista de búsquedas con filtros opcionales.
         
         Args:
             db: Sesión de base de datos
-            skip: Registros a saltar
+            skip: Registros a saltar (se ignora si se indica cursor)
             limit: Límite de registros
             session_id: Filtrar por sesión
             status: Filtrar por estado
+            cursor: Cursor de la página anterior (paginación keyset)
+            total_mode: Cálculo del total ("exact", "estimated" o "none")
             
         Returns:
-            Tupla (lista de búsquedas, total)
+            Tupla (lista de búsquedas, total, cursor de la página siguiente)
+        
+        Raises:
+            ValueError: Si el cursor o total_mode no son válidos
         """
         query = db.query(Search)
         
@@ -214,10 +387,61 @@ class SearchService:
         if status:
             query = query.filter(Search.status == status)
         
-        total = query.count()
-        searches = query.order_by(desc(Search.created_at)).offset(skip).limit(limit).all()
+        total = count_total(
+            db, query, Search.id, total_mode,
+            cache_key=("searches", session_id, status),
+            estimate_table=None if session_id or status else "searches"
+        )
+        searches, next_cursor = paginate(query, SEARCH_ORDER, limit, skip=skip, cursor=cursor)
         
-        return searches, total
+        return searches, total, next_cursor
+    
+    @staticmethod
+    def get_recent_logs(
+        db: Session,
+        skip: int = 0,
+        limit: int = 30,
+        search_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        total_mode: str = "exact"
+    ) -> Tuple[List[Tuple[SearchLog, Search]], Optional[int], Optional[str]]:
+        """
+        Obtener los logs más recientes junto con su búsqueda.
+        
+        Args:
+            db: Sesión de base de datos
+            skip: Registros a saltar (se ignora si se indica cursor)
+            limit: Límite de registros
+            search_id: Filtrar por búsqueda
+            cursor: Cursor de la página anterior (paginación keyset)
+            total_mode: Cálculo del total ("exact", "estimated" o "none")
+            
+        Returns:
+            Tupla (lista de (log, búsqueda), total, cursor de la página siguiente)
+        
+        Raises:
+            ValueError: Si el cursor o total_mode no son válidos
+        """
+        query = db.query(SearchLog, Search).join(Search, Search.id == SearchLog.search_id)
+        
+        if search_id is not None:
+            query = query.filter(SearchLog.search_id == search_id)
+        
+        total = count_total(
+            db, query, SearchLog.id, total_mode,
+            cache_key=("search_logs", search_id),
+            estimate_table="search_logs" if search_id is None else None
+        )
+        rows, next_cursor = paginate(
+            query,
+            LOG_ORDER,
+            limit,
+            skip=skip,
+            cursor=cursor,
+            row_values=lambda row: [row[0].created_at, row[0].id]
+        )
+        
+        return rows, total, next_cursor
     
     @staticmethod
     def update_search(db: Session, search_id: int, search_update: SearchUpdate) -> Optional[Search]:
@@ -244,67 +468,217 @@ class SearchService:
         
         db.commit()
         db.refresh(search)
+        SearchService.notify_change(search)
         
         return search
     
+    @staticmethod
+    async def update_search_async(db: AsyncSession, search_id: int, search_update: SearchUpdate) -> Optional[Search]:
+        """
+        Variante async de update_search (misma lógica vía run_sync).
+        
+        Args:
+            db: Sesión asíncrona de base de datos
+            search_id: ID de la búsqueda
+            search_update: Datos a actualizar
+            
+        Returns:
+            Búsqueda actualizada o None
+        """
+        return await db.run_sync(SearchService.update_search, search_id, search_update)
+    
+    @staticmethod
+    def parse_result_fields(fields: Optional[str]) -> List[str]:
+        """
+        Validar una proyección ?fields= de resultados.
+        
+        Args:
+            fields: Nombres separados por coma (None o vacío = todos)
+            
+        Returns:
+            Campos en el orden de RESULT_FIELDS
+            
+        Raises:
+            ValueError: Si algún campo no existe
+        """
+        if not fields:
+            return list(RESULT_FIELDS)
+        
+        requested = {field.strip() for field in fields.split(",") if field.strip()}
+        unknown = requested - set(RESULT_FIELDS)
+        if unknown:
+            raise ValueError(
+                f"Campos desconocidos: {', '.join(sorted(unknown))}. "
+                f"Disponibles: {', '.join(RESULT_FIELDS)}"
+            )
+        return [field for field in RESULT_FIELDS if field in requested]
+    
     @staticmethod
     def get_search_results(
         db: Session,
         search_id: int,
-        only_valid: bool = True
-    ) -> List[dict]:
+        only_valid: bool = True,
+        since: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Tuple[List[dict], Optional[str]]:
         """
         Obtener resultados de una búsqueda con información de contactos.
         
+        Sin since se devuelven todos, por relevancia. Con since (el next_since
+        de una respuesta anterior) solo los vinculados después, por orden de
+        llegada (seq).
+        
+        Solo se seleccionan las columnas de los campos pedidos (como tuplas,
+        sin instancias ORM), y el JOIN con contacts se omite si ningún campo
+        ni el filtro only_valid lo necesitan.
+        
         Args:
             db: Sesión de base de datos
             search_id: ID de la búsqueda
             only_valid: Si True, solo retorna contactos válidos
+            since: Marca de agua de la última lectura del cliente
+            fields: Campos de cada resultado (ver parse_result_fields; None = todos)
             
         Returns:
-            Lista de resultados con información de contactos
+            Tupla (resultados como diccionarios, next_since)
+            
+        Raises:
+            ValueError: Si since no es válido
         """
-        query = db.query(
-            SearchResult,
-            Contact
-        ).join(
-            Contact, SearchResult.contact_id == Contact.id
-        ).filter(
-            SearchResult.search_id == search_id
-        )
-        
+        fields = fields or list(RESULT_FIELDS)
+        
+        # Columnas distintas a seleccionar: las de la marca de agua y las de los campos
+        columns = [SearchResult.seq]
+        for field in fields:
+            if not any(RESULT_FIELDS[field] is column for column in columns):
+                columns.append(RESULT_FIELDS[field])
+        positions = [
+            next(index for index, column in enumerate(columns) if column is RESULT_FIELDS[field])
+            for field in fields
+        ]
+        scores = {
+            index for index, column in enumerate(columns)
+            if column is SearchResult.relevance_score or column is Contact.validation_score
+        }
+        
+        query = db.query(*columns).filter(SearchResult.search_id == search_id)
+        
+        if only_valid or any(column.class_ is Contact for column in columns):
+            query = query.join(Contact, SearchResult.contact_id == Contact.id)
         if only_valid:
             query = query.filter(Contact.is_valid == 1)
         
-        query = query.order_by(desc(SearchResult.relevance_score))
+        if since:
+            dialect = dialect_name(db)
+            query = query.filter(
+                keyset_filter(RESULTS_WATERMARK, decode_cursor(since, len(RESULTS_WATERMARK)), dialect)
+            ).order_by(*keyset_order_by(RESULTS_WATERMARK, dialect))
+        else:
+            query = query.order_by(desc(SearchResult.relevance_score))
         
         results = []
-        for search_result, contact in query.all():
-            results.append({
-                "contact_id": contact.id,
-                "contact_name": contact.name,
-                "contact_email": contact.email,
-                "contact_organization": contact.organization,
-                "organization": contact.organization,  # Alias para compatibilidad
-                "contact_position": contact.position,
-                "position": contact.position,  # Alias para compatibilidad
-                "contact_region": contact.region,
-                "region": contact.region,  # Alias para compatibilidad
-                "contact_phone": contact.phone,
-                "phone": contact.phone,  # Alias para compatibilidad
-                "source_url": contact.source_url,
-                "source_type": contact.source_type,
-                "relevance_score": float(search_result.relevance_score),
-                "validation_score": float(contact.validation_score),
-                "found_at": search_result.found_at
-            })
-        
-        return results
+        watermark = None
+        for row in query.all():
+            if watermark is None or row[0] > watermark:
+                watermark = row[0]
+            values = [
+                float(value) if index in scores and value is not None else value
+                for index, value in enumerate(row)
+            ]
+            results.append({field: values[position] for field, position in zip(fields, positions)})
+        
+        next_since = encode_cursor([watermark]) if watermark is not None else since
+        return results, next_since
+    
+    @staticmethod
+    def get_results_etag(
+        db: Session,
+        search_id: int,
+        only_valid: bool = True,
+        since: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """
+        ETag de los resultados de una búsqueda, calculado sin el JOIN con contacts.
+        
+        Cambia si cambia la búsqueda, si se vinculan o quitan resultados
+        (cantidad y último seq, desde idx_search_results_search_seq) o
+        si se modifica cualquier contacto (MAX(updated_at), desde
+        idx_contacts_updated_at).
+        
+        Args:
+            db: Sesión de base de datos
+            search_id: ID de la búsqueda
+            only_valid: Filtro de la petición
+            since: Marca de agua de la petición
+            fields: Proyección de la petición
+            
+        Returns:
+            ETag (entre comillas) o None si la búsqueda no existe
+        """
+        row = db.query(
+            *Search.__table__.columns,
+            select(func.count(SearchResult.contact_id)).where(
+                SearchResult.search_id == Search.id
+            ).scalar_subquery(),
+            select(func.max(SearchResult.seq)).where(
+                SearchResult.search_id == Search.id
+            ).scalar_subquery(),
+            select(func.max(Contact.updated_at)).scalar_subquery()
+        ).filter(Search.id == search_id).first()
+        
+        if row is None:
+            return None
+        
+        raw = "|".join(str(value) for value in (*row, only_valid, since or "", ",".join(fields or [])))
+        return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+    
+    @staticmethod
+    def refresh_result_counts(db: Session, search_id: int) -> Optional[Search]:
+        """
+        Recalcular results_count y valid_results_count desde search_results.
+        
+        Args:
+            db: Sesión de base de datos
+            search_id: ID de la búsqueda
+            
+        Returns:
+            Búsqueda actualizada o None
+        """
+        search = db.query(Search).filter(Search.id == search_id).first()
+        
+        if not search:
+            return None
+        
+        search.results_count, search.valid_results_count = SearchService._count_results(db, search_id)
+        
+        db.commit()
+        db.refresh(search)
+        SearchService.notify_change(search)
+        
+        return search
+    
+    @staticmethod
+    def _count_results(db: Session, search_id: int) -> Tuple[int, int]:
+        """Contar los resultados totales y válidos de una búsqueda."""
+        results_count = db.query(func.count(SearchResult.contact_id)).filter(
+            SearchResult.search_id == search_id
+        ).scalar() or 0
+        valid_results_count = db.query(func.count(SearchResult.contact_id)).join(
+            Contact, SearchResult.contact_id == Contact.id
+        ).filter(
+            and_(
+                SearchResult.search_id == search_id,
+                Contact.is_valid == 1
+            )
+        ).scalar() or 0
+        return results_count, valid_results_count
     
     @staticmethod
+    @cache.cached("session_stats", ttl=10, key=lambda db, session_id: (session_id,))
     def get_session_stats(db: Session, session_id: str) -> Optional[SearchStatsResponse]:
         """
-        Obtener estadísticas de una sesión.
+        Obtener estadísticas de una sesión (cacheadas).
         
         Args:
             db: Sesión de base de datos
@@ -379,6 +753,7 @@ class SearchService:
         
         db.commit()
         db.refresh(search)
+        SearchService.notify_change(search)
         
         return search
     
@@ -406,6 +781,7 @@ class SearchService:
         
         db.commit()
         db.refresh(search)
+        SearchService.notify_change(search)
         
         return search
     
@@ -433,5 +809,6 @@ class SearchService:
         
         db.commit()
         db.refresh(search)
+        SearchService.notify_change(search)
         
         return search
@@ -0,0 +1,86 @@
+"""
+Job periódico que recalcula las tablas de resumen de estadísticas.
+
+Los triggers mantienen los resúmenes al escribir; este job corrige las
+desviaciones (escrituras concurrentes con un recálculo, cambios hechos con
+los triggers desactivados, cargas masivas) cada STATS_RECONCILE_INTERVAL_SECONDS.
+
+Con varios workers de uvicorn solo recalcula uno: el que tiene el bloqueo
+con nombre LEADER_LOCK, en una conexión que conserva mientras vive. Los
+demás intentan tomarlo en cada intervalo (si el líder se detiene o su
+conexión se cae, otro lo reemplaza).
+"""
+
+import asyncio
+from typing import Optional
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.config import settings
+from app.database import SessionLocal
+from app.services.stats_service import StatsService
+from app.utils.sql import acquire_advisory_lock, holds_advisory_lock, release_advisory_lock
+
+# Bloqueo con nombre del proceso que ejecuta el job
+LEADER_LOCK = "expert_finder_stats_reconciler"
+
+
+class StatsReconciler:
+    """Tarea asyncio que ejecuta StatsService.reconcile cada cierto intervalo."""
+
+    def __init__(self, session_factory=SessionLocal, interval: Optional[float] = None):
+        self._session_factory = session_factory
+        self._interval = interval or settings.STATS_RECONCILE_INTERVAL_SECONDS
+        self._task: Optional[asyncio.Task] = None
+        self._leader_connection = None
+
+    async def start(self) -> None:
+        """Iniciar el job (el primer recálculo es inmediato)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Detener el job."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        await run_in_threadpool(self._resign)
+
+    def _resign(self) -> None:
+        if self._leader_connection is not None:
+            connection, self._leader_connection = self._leader_connection, None
+            release_advisory_lock(connection, LEADER_LOCK)
+
+    def _reconcile(self) -> Optional[dict]:
+        db = self._session_factory()
+        try:
+            if self._leader_connection is not None and not holds_advisory_lock(self._leader_connection, LEADER_LOCK):
+                # Conexión perdida (y con ella el bloqueo): volver a competir
+                self._leader_connection.invalidate()
+                self._leader_connection = None
+            if self._leader_connection is None:
+                self._leader_connection = acquire_advisory_lock(db, LEADER_LOCK)
+                if self._leader_connection is None:
+                    return None
+            return StatsService.reconcile(db)
+        finally:
+            db.close()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                rows = await run_in_threadpool(self._reconcile)
+                if rows is not None:
+                    print(f"📊 Estadísticas recalculadas: {rows}")
+            except Exception as e:
+                print(f"❌ Error recalculando estadísticas: {e}")
+            await asyncio.sleep(self._interval)
+
+
+# Instancia global (una por proceso/worker de uvicorn; solo el líder recalcula)
+stats_reconciler = StatsReconciler()
@@ -0,0 +1,371 @@
+"""
+Servicio de estadísticas.
+
+Los endpoints /stats leen tablas de resumen (stats_counters y
+stats_region_area) en lugar de agregar las tablas completas en cada
+petición. En MySQL las mantienen los triggers de la HU 2.11, repartidas en
+franjas (shard) que se suman al leer; reconcile() las compara con las
+tablas base (job periódico) y escribe como delta cualquier desviación. En
+motores sin esos triggers (SQLite en pruebas) se recalculan al leer.
+"""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, desc, func
+from sqlalchemy.orm import Session
+
+from app.cache import cache
+from app.models import Contact, Search, SearchResult, StatsCounter, StatsRegionArea
+from app.schemas.contact import ContactByRegionStats
+from app.utils.sql import acquire_advisory_lock, dialect_name, insert_or_increment, release_advisory_lock
+
+# Rangos de calidad (validation_score mínimo, etiqueta); el resto es "Bajo"
+QUALITY_BUCKETS = [
+    (0.9, "Excelente (0.9-1.0)"),
+    (0.7, "Bueno (0.7-0.89)"),
+    (0.5, "Regular (0.5-0.69)"),
+]
+LOW_QUALITY_BUCKET = "Bajo (<0.5)"
+
+# validation_score mínimo de un contacto de alta calidad
+HIGH_QUALITY_SCORE = 0.8
+# validation_score mínimo del listado por defecto de GET /contacts/
+LISTED_MIN_SCORE = 0.6
+
+# Métricas de stats_counters
+SEARCHES_TOTAL = "searches_total"
+SEARCHES_BY_STATUS = "searches_by_status"
+CONTACTS_VALID = "contacts_valid"
+CONTACTS_INVALID = "contacts_invalid"
+CONTACTS_HIGH_QUALITY = "contacts_high_quality"
+# Contactos del listado por defecto (válidos con score >= LISTED_MIN_SCORE)
+CONTACTS_LISTED = "contacts_listed"
+CONTACTS_BY_REGION = "contacts_by_region"
+CONTACTS_BY_QUALITY = "contacts_by_quality"
+RESULTS_TOTAL = "results_total"
+
+# Bloqueo con nombre (GET_LOCK) que serializa los recálculos
+RECONCILE_LOCK = "expert_finder_stats_reconcile"
+RECONCILE_LOCK_TIMEOUT = 30
+
+
+def quality_bucket(score_column):
+    """Expresión SQL con la etiqueta del rango de calidad de un score."""
+    return case(
+        *[(score_column >= threshold, label) for threshold, label in QUALITY_BUCKETS],
+        else_=LOW_QUALITY_BUCKET
+    )
+
+
+class StatsService:
+    """Servicio para las estadísticas del dashboard."""
+
+    @staticmethod
+    def reconcile(db: Session) -> Optional[Dict[str, int]]:
+        """
+        Corregir las tablas de resumen con los agregados de las tablas base.
+
+        Los agregados y las sumas actuales de los resúmenes se leen en la
+        misma transacción (la misma instantánea en REPEATABLE READ, el nivel
+        por defecto de InnoDB), así que cada escritura concurrente está en
+        ambos o en ninguno. Solo se escribe la diferencia, como un delta más
+        en la franja 0: los deltas que los triggers confirmen entretanto se
+        conservan, y sin desviaciones no se toca ninguna fila.
+
+        Un bloqueo con nombre evita que dos recálculos (el job y
+        POST /stats/reconcile) apliquen la misma corrección dos veces.
+
+        Args:
+            db: Sesión de base de datos (se confirma lo pendiente antes de leer)
+
+        Returns:
+            Celdas corregidas en cada tabla de resumen, o None si otro
+            recálculo no terminó en RECONCILE_LOCK_TIMEOUT segundos
+        """
+        lock = acquire_advisory_lock(db, RECONCILE_LOCK, RECONCILE_LOCK_TIMEOUT)
+        if lock is None:
+            return None
+        try:
+            # Instantánea nueva, tomada con el bloqueo (después del recálculo anterior)
+            db.commit()
+            counters = StatsService._expected_counters(db)
+            region_area = StatsService._expected_region_area(db)
+
+            current_counters = {
+                (metric, dimension): int(value or 0)
+                for metric, dimension, value in db.query(
+                    StatsCounter.metric, StatsCounter.dimension, func.sum(StatsCounter.value)
+                ).group_by(StatsCounter.metric, StatsCounter.dimension)
+            }
+            current_region_area = {
+                (region, area): (int(count or 0), Decimal(str(score_sum or 0)), last_updated)
+                for region, area, count, score_sum, last_updated in db.query(
+                    StatsRegionArea.region,
+                    StatsRegionArea.area,
+                    func.sum(StatsRegionArea.total_contacts),
+                    func.sum(StatsRegionArea.score_sum),
+                    func.max(StatsRegionArea.last_updated)
+                ).group_by(StatsRegionArea.region, StatsRegionArea.area)
+            }
+
+            # Los contadores sin fila se crean aunque valgan 0 (_ensure_rollups
+            # distingue así "nunca calculado" de "sin búsquedas")
+            counter_deltas = [
+                {"metric": key[0], "dimension": key[1], "shard": 0, "value": value}
+                for key, value in (
+                    (key, counters.get(key, 0) - current_counters.get(key, 0))
+                    for key in counters.keys() | current_counters.keys()
+                )
+                if value or key not in current_counters
+            ]
+
+            region_area_deltas = []
+            for key in region_area.keys() | current_region_area.keys():
+                count, score_sum, last_updated = region_area.get(key, (0, Decimal(0), None))
+                current_count, current_score_sum, current_last_updated = current_region_area.get(key, (0, Decimal(0), None))
+                # last_updated se lee como MAX entre franjas: solo se corrige hacia adelante
+                if last_updated is not None and current_last_updated is not None and last_updated <= current_last_updated:
+                    last_updated = None
+                if count != current_count or score_sum != current_score_sum or last_updated is not None:
+                    region_area_deltas.append({
+                        "region": key[0],
+                        "area": key[1],
+                        "shard": 0,
+                        "total_contacts": count - current_count,
+                        "score_sum": score_sum - current_score_sum,
+                        "last_updated": last_updated,
+                    })
+
+            if counter_deltas:
+                db.execute(
+                    insert_or_increment(db, StatsCounter.__table__, ["value"]).values(counter_deltas)
+                )
+            if region_area_deltas:
+                db.execute(
+                    insert_or_increment(
+                        db, StatsRegionArea.__table__, ["total_contacts", "score_sum"], ["last_updated"]
+                    ).values(region_area_deltas)
+                )
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            release_advisory_lock(lock, RECONCILE_LOCK)
+
+        return {"stats_counters": len(counter_deltas), "stats_region_area": len(region_area_deltas)}
+
+    @staticmethod
+    def _expected_counters(db: Session) -> Dict[Tuple[str, str], int]:
+        """Valor de cada contador calculado desde las tablas base."""
+        counters: Dict[Tuple[str, str], int] = {}
+
+        counters[(SEARCHES_TOTAL, "")] = db.query(func.count(Search.id)).scalar() or 0
+        for status, count in db.query(Search.status, func.count(Search.id)).group_by(Search.status):
+            counters[(SEARCHES_BY_STATUS, status or "")] = count
+
+        valid = Contact.is_valid == 1
+        counters[(CONTACTS_VALID, "")] = db.query(func.count(Contact.id)).filter(valid).scalar() or 0
+        counters[(CONTACTS_INVALID, "")] = db.query(func.count(Contact.id)).filter(Contact.is_valid == 0).scalar() or 0
+        counters[(CONTACTS_HIGH_QUALITY, "")] = db.query(func.count(Contact.id)).filter(
+            valid, Contact.validation_score >= HIGH_QUALITY_SCORE
+        ).scalar() or 0
+        counters[(CONTACTS_LISTED, "")] = db.query(func.count(Contact.id)).filter(
+            valid, Contact.validation_score >= LISTED_MIN_SCORE
+        ).scalar() or 0
+        for region, count in db.query(Contact.region, func.count(Contact.id)).filter(
+            valid, Contact.region.isnot(None)
+        ).group_by(Contact.region):
+            counters[(CONTACTS_BY_REGION, region)] = count
+        bucket = quality_bucket(Contact.validation_score).label("bucket")
+        for label, count in db.query(bucket, func.count(Contact.id)).filter(valid).group_by(bucket):
+            counters[(CONTACTS_BY_QUALITY, label)] = count
+        counters[(RESULTS_TOTAL, "")] = db.query(func.count(SearchResult.search_id)).scalar() or 0
+
+        return counters
+
+    @staticmethod
+    def _expected_region_area(db: Session) -> Dict[Tuple[str, str], tuple]:
+        """(contactos, suma de scores, última actualización) por región × área desde las tablas base."""
+        region = func.coalesce(Contact.region, "").label("region")
+        area = func.coalesce(Search.area, "").label("area")
+        rows = db.query(
+            region,
+            area,
+            func.count(Contact.id),
+            func.sum(Contact.validation_score),
+            func.max(Contact.updated_at)
+        ).join(
+            SearchResult, Contact.id == SearchResult.contact_id
+        ).join(
+            Search, SearchResult.search_id == Search.id
+        ).filter(Contact.is_valid == 1).group_by(region, area)
+
+        return {
+            (region_value, area_value): (count, Decimal(str(score_sum or 0)), last_updated)
+            for region_value, area_value, count, score_sum, last_updated in rows
+        }
+
+    @staticmethod
+    def _ensure_rollups(db: Session) -> None:
+        """Recalcular si no hay triggers que mantengan los resúmenes o si nunca se calcularon."""
+        if dialect_name(db) != "mysql" or db.query(StatsCounter.metric).filter(
+            StatsCounter.metric == SEARCHES_TOTAL
+        ).first() is None:
+            StatsService.reconcile(db)
+
+    @staticmethod
+    def _counters(db: Session) -> Dict[str, Dict[str, int]]:
+        """Valor de cada métrica y dimensión (suma de sus franjas)."""
+        value = func.sum(StatsCounter.value)
+        counters: Dict[str, Dict[str, int]] = {}
+        for metric, dimension, total in db.query(
+            StatsCounter.metric, StatsCounter.dimension, value
+        ).group_by(StatsCounter.metric, StatsCounter.dimension).having(value > 0):
+            counters.setdefault(metric, {})[dimension] = int(total)
+        return counters
+
+    @staticmethod
+    def get_summary(db: Session) -> dict:
+        """
+        Resumen general del sistema.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Totales, búsquedas por estado y regiones más activas
+        """
+        StatsService._ensure_rollups(db)
+        counters = StatsService._counters(db)
+
+        def total(metric: str) -> int:
+            return counters.get(metric, {}).get("", 0)
+
+        top_regions = sorted(counters.get(CONTACTS_BY_REGION, {}).items(), key=lambda item: -item[1])[:5]
+
+        return {
+            "total_searches": total(SEARCHES_TOTAL),
+            "total_contacts": total(CONTACTS_VALID),
+            "total_results": total(RESULTS_TOTAL),
+            "high_quality_contacts": total(CONTACTS_HIGH_QUALITY),
+            "duplicates_detected": total(CONTACTS_INVALID),
+            "searches_by_status": {
+                status or None: count for status, count in counters.get(SEARCHES_BY_STATUS, {}).items()
+            },
+            "top_regions": [
+                {"region": region, "count": count}
+                for region, count in top_regions
+            ]
+        }
+
+    @staticmethod
+    def get_contacts_by_region(db: Session) -> List[ContactByRegionStats]:
+        """
+        Contactos válidos por región y área, de mayor a menor.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Lista de estadísticas por región
+        """
+        StatsService._ensure_rollups(db)
+        total_contacts = func.sum(StatsRegionArea.total_contacts)
+        rows = db.query(
+            StatsRegionArea.region,
+            StatsRegionArea.area,
+            total_contacts.label("total_contacts"),
+            func.sum(StatsRegionArea.score_sum).label("score_sum"),
+            func.max(StatsRegionArea.last_updated).label("last_updated")
+        ).group_by(
+            StatsRegionArea.region, StatsRegionArea.area
+        ).having(
+            total_contacts > 0
+        ).order_by(
+            total_contacts.desc()
+        ).all()
+
+        return [
+            ContactByRegionStats(
+                region=row.region or None,
+                area=row.area or None,
+                total_contacts=int(row.total_contacts),
+                avg_validation_score=float(Decimal(row.score_sum) / int(row.total_contacts)),
+                last_updated=row.last_updated
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def get_quality_distribution(db: Session) -> dict:
+        """
+        Distribución de contactos válidos por rango de validation_score.
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Cantidad de contactos por rango
+        """
+        StatsService._ensure_rollups(db)
+        buckets = StatsService._counters(db).get(CONTACTS_BY_QUALITY, {})
+        labels = [label for _, label in QUALITY_BUCKETS] + [LOW_QUALITY_BUCKET]
+
+        return {
+            "distribution": [
+                {"quality_range": label, "count": buckets[label]}
+                for label in labels
+                if label in buckets
+            ]
+        }
+
+    @staticmethod
+    @cache.cached("recent_activity", ttl=10, key=lambda db: ())
+    def get_recent_activity(db: Session) -> dict:
+        """
+        Actividad de las últimas 24 horas, última búsqueda y último contacto (cacheada).
+
+        Args:
+            db: Sesión de base de datos
+
+        Returns:
+            Resumen de actividad reciente
+        """
+        last_24h = datetime.now() - timedelta(hours=24)
+
+        recent_searches = db.query(func.count(Search.id)).filter(
+            Search.created_at >= last_24h
+        ).scalar()
+
+        recent_contacts = db.query(func.count(Contact.id)).filter(
+            Contact.created_at >= last_24h,
+            Contact.is_valid == 1
+        ).scalar()
+
+        last_search = db.query(Search).order_by(desc(Search.created_at)).first()
+
+        last_contact = db.query(Contact).filter(
+            Contact.is_valid == 1
+        ).order_by(desc(Contact.created_at)).first()
+
+        return {
+            "last_24_hours": {
+                "searches": recent_searches or 0,
+                "contacts": recent_contacts or 0
+            },
+            "last_search": {
+                "id": last_search.id,
+                "keywords": last_search.keywords,
+                "created_at": last_search.created_at,
+                "status": last_search.status
+            } if last_search else None,
+            "last_contact": {
+                "id": last_contact.id,
+                "name": last_contact.name,
+                "organization": last_contact.organization,
+                "created_at": last_contact.created_at
+            } if last_contact else None
+        }
@@ -0,0 +1,791 @@
+"""
+Generador de datos sintéticos: contactos, búsquedas, resultados y logs.
+
+Las distribuciones son chilenas realistas: nombres con dos apellidos según
+su frecuencia, organizaciones con su región de origen y regiones ponderadas
+por población. La misma semilla genera siempre los mismos datos.
+
+La generación es por columnas: cada lote sortea de una vez (random.choices
+con k=N) nombres, apellidos, organizaciones, regiones y reglas de
+duplicado, y las formas normalizadas (name_norm, org_norm, search_document,
+...) se arman desde tablas precalculadas por valor en lugar de normalizar
+fila por fila. La carga usa el executemany del driver con tuplas (pymysql
+lo convierte en INSERT multi-fila) o LOAD DATA LOCAL INFILE en MySQL.
+
+Duplicados: una fracción configurable de contactos copia datos de un
+contacto anterior según una regla (DUPLICATE_RULES) y recibe el
+validation_score que da score_pair contra ese contacto. Las coincidencias
+casuales con otros contactos no se consideran.
+
+Lo usan el modo demo (SearchService.process_demo_search) y benchmarks/.
+"""
+
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from sqlalchemy import create_engine, delete, func, insert, or_, select, update
+from sqlalchemy.engine import Connection, Engine
+
+from app.models import Contact, Search, SearchDispatch, SearchLog, SearchResult, SystemConfig
+from app.services.contact_search import fold_accents
+from app.services.scoring_engine import MatchKeys, score_pair
+from app.services.search_service import search_criteria_hash
+
+# Tamaños predefinidos (cantidad de contactos)
+SIZES = {"10k": 10_000, "100k": 100_000, "1m": 1_000_000}
+
+# Filas por lote de generación / INSERT
+INSERT_BATCH_SIZE = 5000
+
+# Métodos de carga
+LOAD_METHODS = ("insert", "load_data")
+
+# Clave de system_config que identifica el dataset cargado
+DATASET_CONFIG_KEY = "benchmark_dataset"
+
+# Resultados de la búsqueda grande (respuesta de /searches/{id}/results con 5k filas)
+BIG_SEARCH_RESULTS = 5000
+
+# Contactos recientes entre los que se elige el original de un duplicado
+SOURCE_POOL_SIZE = 100_000
+
+SECONDS_PER_YEAR = 365 * 24 * 3600
+
+# Reglas de duplicado: campos que se copian del contacto original (los demás
+# datos de comparación se fuerzan distintos). Score según score_pair:
+DUPLICATE_RULES = {
+    "url": ("source_url",),  # 0.7: solo URL
+    "phone": ("phone",),  # 0.6: solo teléfono
+    "name": ("name",),  # 0.9: solo nombre
+    "name_org": ("name", "organization", "position"),  # 0.3: nombre + 2 secundarios
+    "url_org": ("source_url", "organization"),  # 0.3: URL + otros datos
+}
+DEFAULT_DUPLICATE_RATES = {"url": 0.03, "phone": 0.02, "name": 0.02, "name_org": 0.01, "url_org": 0.005}
+
+# Habitantes por región (millones, aprox. censo 2017), para ponderar
+REGIONS = {
+    "Santiago": 7.11,
+    "Valparaíso": 1.82,
+    "Biobío": 1.56,
+    "Maule": 1.04,
+    "La Araucanía": 0.96,
+    "O'Higgins": 0.91,
+    "Los Lagos": 0.83,
+    "Coquimbo": 0.76,
+    "Antofagasta": 0.61,
+    "Ñuble": 0.48,
+    "Los Ríos": 0.38,
+    "Tarapacá": 0.33,
+    "Atacama": 0.29,
+    "Arica y Parinacota": 0.23,
+    "Magallanes": 0.17,
+    "Aysén": 0.10,
+}
+
+# Nombres y apellidos más frecuentes (ordenados por frecuencia)
+FIRST_NAMES = [
+    "María", "José", "Juan", "Francisca", "Luis", "Carolina", "Carlos", "Camila",
+    "Jorge", "Javiera", "Cristián", "Daniela", "Francisco", "Constanza", "Felipe",
+    "Catalina", "Sebastián", "Valentina", "Rodrigo", "Fernanda", "Patricio", "Paula",
+    "Claudio", "Andrea", "Pablo", "Macarena", "Diego", "Claudia", "Gonzalo", "Marcela",
+    "Matías", "Paz", "Nicolás", "Verónica", "Alejandro", "Lorena", "Víctor", "Bárbara",
+    "Héctor", "Soledad",
+]
+SURNAMES = [
+    "González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva",
+    "Martínez", "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández",
+    "Torres", "Araya", "Flores", "Espinoza", "Valenzuela", "Castillo", "Tapia", "Reyes",
+    "Gutiérrez", "Castro", "Pizarro", "Álvarez", "Vásquez", "Sánchez", "Fernández",
+    "Ramírez", "Carrasco", "Gómez", "Cortés", "Herrera", "Núñez", "Jara", "Vergara",
+    "Rivera", "Figueroa", "Riquelme", "García", "Miranda", "Bravo", "Vera", "Molina",
+    "Vega", "Campos", "Sandoval", "Orellana",
+]
+TITLES = ["", "", "", "Dr. ", "Dra. ", "Mg. ", "Ing. "]
+
+# Organizaciones: (nombre, dominio, región, área)
+ORGANIZATIONS = [
+    ("Universidad de Chile", "uchile.cl", "Santiago", "Educación"),
+    ("Pontificia Universidad Católica de Chile", "uc.cl", "Santiago", "Educación"),
+    ("Universidad de Santiago de Chile", "usach.cl", "Santiago", "Educación"),
+    ("Universidad de Concepción", "udec.cl", "Biobío", "Educación"),
+    ("Universidad Técnica Federico Santa María", "usm.cl", "Valparaíso", "Tecnología"),
+    ("Pontificia Universidad Católica de Valparaíso", "pucv.cl", "Valparaíso", "Educación"),
+    ("Universidad de Valparaíso", "uv.cl", "Valparaíso", "Salud"),
+    ("Universidad Austral de Chile", "uach.cl", "Los Ríos", "Medio Ambiente"),
+    ("Universidad de La Frontera", "ufro.cl", "La Araucanía", "Salud"),
+    ("Universidad de Talca", "utalca.cl", "Maule", "Agricultura"),
+    ("Universidad Católica del Norte", "ucn.cl", "Antofagasta", "Minería"),
+    ("Universidad de Antofagasta", "uantof.cl", "Antofagasta", "Minería"),
+    ("Universidad de La Serena", "userena.cl", "Coquimbo", "Educación"),
+    ("Universidad del Bío-Bío", "ubiobio.cl", "Ñuble", "Construcción"),
+    ("Universidad de Los Lagos", "ulagos.cl", "Los Lagos", "Medio Ambiente"),
+    ("Universidad de Magallanes", "umag.cl", "Magallanes", "Medio Ambiente"),
+    ("Universidad de Tarapacá", "uta.cl", "Arica y Parinacota", "Educación"),
+    ("Universidad Arturo Prat", "unap.cl", "Tarapacá", "Educación"),
+    ("Universidad de Atacama", "uda.cl", "Atacama", "Minería"),
+    ("Universidad de O'Higgins", "uoh.cl", "O'Higgins", "Agricultura"),
+    ("Universidad de Aysén", "uaysen.cl", "Aysén", "Turismo"),
+    ("Hospital Clínico Universidad de Chile", "redclinica.cl", "Santiago", "Salud"),
+    ("Hospital Regional de Concepción", "hospitalregional.cl", "Biobío", "Salud"),
+    ("Clínica Alemana", "alemana.cl", "Santiago", "Salud"),
+    ("Ministerio de Salud", "minsal.cl", "Santiago", "Salud"),
+    ("Ministerio de Educación", "mineduc.cl", "Santiago", "Educación"),
+    ("CORFO", "corfo.cl", "Santiago", "Finanzas"),
+    ("Codelco", "codelco.cl", "Antofagasta", "Minería"),
+    ("ENAP", "enap.cl", "Magallanes", "Industria"),
+    ("Banco Estado", "bancoestado.cl", "Santiago", "Finanzas"),
+    ("Entel", "entel.cl", "Santiago", "Tecnología"),
+    ("LATAM Airlines", "latam.com", "Santiago", "Transporte"),
+    ("Arauco", "arauco.cl", "Biobío", "Industria"),
+    ("Viña Concha y Toro", "conchaytoro.com", "O'Higgins", "Agricultura"),
+    ("Sernatur", "sernatur.cl", "Santiago", "Turismo"),
+    ("Constructora del Sur", "constructoradelsur.cl", "Los Lagos", "Construcción"),
+]
+
+# Cargos y líneas de investigación por área ("General" para áreas sin organizaciones)
+POSITIONS = {
+    "Salud": ["Médico Especialista", "Enfermero/a", "Director/a Médico", "Jefe de Servicio", "Investigador/a Clínico"],
+    "Educación": ["Profesor/a Titular", "Profesor/a Asociado", "Director/a Académico", "Coordinador/a Pedagógico", "Investigador/a"],
+    "Tecnología": ["Desarrollador Senior", "Arquitecto de Software", "CTO", "Data Scientist", "Ingeniero/a de Datos"],
+    "Construcción": ["Ingeniero Civil", "Jefe de Obras", "Arquitecto", "Gerente de Proyectos"],
+    "Minería": ["Geólogo/a", "Ingeniero/a de Minas", "Jefe de Planta", "Especialista en Procesos"],
+    "Agricultura": ["Ingeniero/a Agrónomo", "Enólogo/a", "Investigador/a", "Jefe de Campo"],
+    "Medio Ambiente": ["Biólogo/a Marino", "Investigador/a", "Especialista Ambiental", "Director/a de Centro"],
+    "Finanzas": ["Economista", "Gerente de Riesgo", "Analista Financiero"],
+    "Industria": ["Ingeniero/a de Procesos", "Gerente de Operaciones", "Jefe de Mantención"],
+    "Transporte": ["Ingeniero/a de Transporte", "Gerente de Operaciones", "Analista de Logística"],
+    "Turismo": ["Director/a de Turismo", "Coordinador/a Regional", "Especialista en Turismo"],
+    "General": ["Gerente", "Especialista", "Coordinador/a", "Director/a"],
+}
+RESEARCH_LINES = {
+    "Salud": ["Salud Pública", "Epidemiología", "Cardiología", "Oncología", "Telemedicina"],
+    "Educación": ["Didáctica", "Políticas Educativas", "Educación Inclusiva", "Evaluación"],
+    "Tecnología": ["Inteligencia Artificial", "Machine Learning", "Ciberseguridad", "Computación en la Nube"],
+    "Construcción": ["Ingeniería Sísmica", "Construcción Sustentable", "BIM"],
+    "Minería": ["Hidrometalurgia", "Geología Económica", "Litio", "Relaves"],
+    "Agricultura": ["Viticultura", "Riego Tecnificado", "Fruticultura", "Suelos"],
+    "Medio Ambiente": ["Cambio Climático", "Oceanografía", "Glaciología", "Biodiversidad"],
+    "Finanzas": ["Econometría", "Mercados Financieros", "Fintech"],
+    "Industria": ["Celulosa", "Energías Renovables", "Hidrógeno Verde"],
+    "Transporte": ["Logística", "Movilidad Urbana"],
+    "Turismo": ["Turismo Sustentable", "Patrimonio"],
+    "General": ["Gestión", "Innovación", "Políticas Públicas"],
+}
+SEARCH_STATUSES = ["completed"] * 8 + ["failed", "pending"]
+
+# Columnas de cada tabla en el orden de las tuplas generadas
+CONTACT_COLUMNS = (
+    "id", "name", "organization", "position", "email", "phone", "region", "source_url",
+    "source_type", "research_lines", "is_valid", "validation_score", "created_at", "updated_at",
+    "search_document", "name_norm", "org_norm", "position_norm", "region_norm", "phone_norm",
+)
+SEARCH_COLUMNS = (
+    "id", "session_id", "keywords", "area", "region", "status", "created_at", "started_at",
+    "finished_at", "results_count", "valid_results_count", "error_message", "search_config",
+    "criteria_hash",
+)
+RESULT_COLUMNS = ("search_id", "contact_id", "relevance_score", "found_at")
+LOG_COLUMNS = (
+    "search_id", "source_url", "source_type", "status", "contacts_found", "error_message",
+    "response_time_ms", "created_at",
+)
+
+
+class _Text(NamedTuple):
+    """Un valor con sus formas precalculadas (original, normalizada y sin tildes)."""
+    display: str
+    lower: str
+    fold: str
+    slug: str
+
+
+def _text(value: str) -> _Text:
+    folded = fold_accents(value)
+    return _Text(value, value.lower(), folded, "-".join(folded.replace(".", "").split()))
+
+
+class _Organization(NamedTuple):
+    index: int
+    text: _Text
+    domain: str
+    region: _Text
+    positions: List[_Text]
+    # Pares de líneas de investigación: (JSON, texto sin tildes, lista)
+    research_lines: List[Tuple[str, str, List[str]]]
+
+
+class _Profile(NamedTuple):
+    """Datos de comparación de un contacto generado (original de posibles duplicados)."""
+    name: str
+    name_norm: str
+    name_fold: str
+    first_slug: str
+    last_slug: str
+    organization: _Organization
+    position: _Text
+    region: _Text
+    phone: str
+    source_url: str
+
+
+def _zipf_cum_weights(count: int, exponent: float = 0.8) -> List[float]:
+    """Pesos acumulados decrecientes por rango (los primeros son los más frecuentes)."""
+    total, result = 0.0, []
+    for rank in range(1, count + 1):
+        total += 1.0 / (rank ** exponent)
+        result.append(total)
+    return result
+
+
+def _research_pairs(area: str) -> List[Tuple[str, str, List[str]]]:
+    lines = RESEARCH_LINES[area]
+    pairs = [[first, second] for first in lines for second in lines if first != second] or [lines]
+    return [(json.dumps(pair), fold_accents(" ".join(pair)), pair) for pair in pairs]
+
+
+def validate_duplicate_rates(rates: Dict[str, float]) -> Dict[str, float]:
+    """
+    Validar las tasas de duplicado por regla.
+
+    Args:
+        rates: Regla -> fracción de contactos (las reglas omitidas usan 0)
+
+    Returns:
+        Tasas de todas las reglas
+
+    Raises:
+        ValueError: Si hay reglas desconocidas o tasas fuera de rango
+    """
+    unknown = set(rates) - set(DUPLICATE_RULES)
+    if unknown:
+        raise ValueError(
+            f"Reglas de duplicado desconocidas: {', '.join(sorted(unknown))}. "
+            f"Disponibles: {', '.join(DUPLICATE_RULES)}"
+        )
+    if any(rate < 0 for rate in rates.values()) or sum(rates.values()) > 1:
+        raise ValueError("Las tasas de duplicado deben ser >= 0 y sumar como máximo 1")
+    return {rule: float(rates.get(rule, 0.0)) for rule in DUPLICATE_RULES}
+
+
+class SyntheticDataGenerator:
+    """
+    Generador de contactos sintéticos por lotes (columnas sorteadas de una vez).
+
+    Args:
+        seed: Semilla (None = aleatoria)
+        duplicate_rates: Fracción de contactos por regla de DUPLICATE_RULES
+            (por defecto DEFAULT_DUPLICATE_RATES)
+    """
+
+    def __init__(self, seed: Optional[int] = None, duplicate_rates: Optional[Dict[str, float]] = None):
+        self.rng = random.Random(seed)
+        self.duplicate_rates = validate_duplicate_rates(
+            DEFAULT_DUPLICATE_RATES if duplicate_rates is None else duplicate_rates
+        )
+        self.now = datetime(2026, 1, 1)
+
+        self._titles = [_text(title) for title in TITLES]
+        self._first_names = [_text(name) for name in FIRST_NAMES]
+        self._first_cum = _zipf_cum_weights(len(FIRST_NAMES))
+        self._surnames = [_text(name) for name in SURNAMES]
+        self._surname_cum = _zipf_cum_weights(len(SURNAMES))
+        self._regions = [_text(region) for region in REGIONS]
+        self._region_cum = list(_cumulative(REGIONS.values()))
+        self._region_by_name = {region.display: region for region in self._regions}
+        self._organizations = [
+            _Organization(
+                index=index,
+                text=_text(name),
+                domain=domain,
+                region=self._region_by_name[region],
+                positions=[_text(position) for position in POSITIONS[area]],
+                research_lines=_research_pairs(area),
+            )
+            for index, (name, domain, region, area) in enumerate(ORGANIZATIONS)
+        ]
+        self._organization_cum = _zipf_cum_weights(len(ORGANIZATIONS), exponent=0.6)
+        self._area_by_organization = [area for _, _, _, area in ORGANIZATIONS]
+
+        # Reglas sorteadas por contacto (None = sin duplicado)
+        self._rules: List[Optional[str]] = [None, *DUPLICATE_RULES]
+        self._rule_cum = list(_cumulative([1.0 - sum(self.duplicate_rates.values()), *self.duplicate_rates.values()]))
+
+        # Originales posibles de los duplicados y valores secundarios ya usados
+        self._pool: List[_Profile] = []
+        self._pool_next = 0
+        self._seen_organizations = set()
+        self._seen_positions = set()
+        self._seen_regions = set()
+
+    def _organizations_for(self, areas: Optional[Sequence[str]]) -> Tuple[List[_Organization], List[float]]:
+        if not areas:
+            return self._organizations, self._organization_cum
+        chosen = [org for org in self._organizations if self._area_by_organization[org.index] in areas]
+        if not chosen:
+            return self._organizations, self._organization_cum
+        return chosen, _zipf_cum_weights(len(chosen), exponent=0.6)
+
+    def _remember(self, profile: _Profile) -> None:
+        if len(self._pool) < SOURCE_POOL_SIZE:
+            self._pool.append(profile)
+        else:
+            self._pool[self._pool_next] = profile
+            self._pool_next = (self._pool_next + 1) % SOURCE_POOL_SIZE
+
+    def _other(self, options: Sequence[_Text], current: _Text, avoid: _Text) -> _Text:
+        """current, o el siguiente de options si coincide con avoid."""
+        if current.lower != avoid.lower:
+            return current
+        index = next((i for i, option in enumerate(options) if option.lower == current.lower), -1)
+        return options[(index + 1) % len(options)] if len(options) > 1 else current
+
+    @staticmethod
+    def _profile_url(org: _Organization, first_slug: str, last_slug: str, contact_id: int) -> str:
+        return f"https://www.{org.domain}/academicos/{first_slug}-{last_slug}-{contact_id}"
+
+    def contact_rows(
+        self,
+        count: int,
+        start_id: int = 1,
+        areas: Optional[Sequence[str]] = None,
+        regions: Optional[Sequence[str]] = None,
+        batch_size: int = INSERT_BATCH_SIZE
+    ) -> Iterator[List[tuple]]:
+        """
+        Generar contactos como tuplas en el orden de CONTACT_COLUMNS.
+
+        Args:
+            count: Cantidad de contactos
+            start_id: ID del primer contacto (los IDs son consecutivos)
+            areas: Limitar las organizaciones y cargos a estas áreas
+            regions: Elegir la región entre estas (por defecto la de la
+                organización o una ponderada por población)
+            batch_size: Contactos por lote
+
+        Returns:
+            Iterador de lotes de tuplas
+        """
+        rng = self.rng
+        organizations, organization_cum = self._organizations_for(areas)
+        region_choices = [self._region_by_name.get(region) or _text(region) for region in regions or ()]
+        area_positions = [_text(position) for area in areas or () for position in POSITIONS.get(area, ())]
+
+        for start in range(0, count, batch_size):
+            size = min(batch_size, count - start)
+            titles = rng.choices(self._titles, k=size)
+            firsts = rng.choices(self._first_names, cum_weights=self._first_cum, k=size)
+            paternals = rng.choices(self._surnames, cum_weights=self._surname_cum, k=size)
+            maternals = rng.choices(self._surnames, cum_weights=self._surname_cum, k=size)
+            orgs = rng.choices(organizations, cum_weights=organization_cum, k=size)
+            if region_choices:
+                drawn_regions = rng.choices(region_choices, k=size)
+            else:
+                drawn_regions = rng.choices(self._regions, cum_weights=self._region_cum, k=size)
+            rules = rng.choices(self._rules, cum_weights=self._rule_cum, k=size)
+            draws = [rng.random() for _ in range(size * 3)]
+            phones = [rng.randrange(10_000_000, 100_000_000) for _ in range(size)]
+            ages = [rng.randrange(SECONDS_PER_YEAR) for _ in range(size)]
+
+            batch = []
+            for i in range(size):
+                contact_id = start_id + start + i
+                first, paternal, maternal, title, org = firsts[i], paternals[i], maternals[i], titles[i], orgs[i]
+                positions = area_positions or org.positions
+                position = positions[int(draws[3 * i] * len(positions))]
+                lines_json, lines_fold, _ = org.research_lines[int(draws[3 * i + 1] * len(org.research_lines))]
+                if region_choices or draws[3 * i + 2] >= 0.85:
+                    region = drawn_regions[i]
+                else:
+                    region = org.region
+
+                name = f"{title.display}{first.display} {paternal.display} {maternal.display}"
+                name_norm = f"{title.lower}{first.lower} {paternal.lower} {maternal.lower}"
+                name_fold = f"{title.fold}{first.fold} {paternal.fold} {maternal.fold}"
+                first_slug, last_slug = first.slug, paternal.slug
+                phone = f"+569{phones[i]}"
+
+                score = 1.0
+                rule = rules[i]
+                if rule is not None and self._pool:
+                    source = self._pool[rng.randrange(len(self._pool))]
+                    copied = DUPLICATE_RULES[rule]
+                    if "name" in copied:
+                        name, name_norm, name_fold = source.name, source.name_norm, source.name_fold
+                        first_slug, last_slug = source.first_slug, source.last_slug
+                    if "organization" in copied:
+                        org = source.organization
+                    elif org.index == source.organization.index:
+                        org = self._organizations[(org.index + 1) % len(self._organizations)]
+                    if "position" in copied:
+                        position = source.position
+                    else:
+                        position = self._other(area_positions or org.positions, position, source.position)
+                    region = self._other(region_choices or self._regions, region, source.region)
+                    if "phone" in copied:
+                        phone = source.phone
+                    if "source_url" in copied:
+                        source_url = source.source_url
+                    else:
+                        source_url = self._profile_url(org, first_slug, last_slug, contact_id)
+                    score = score_pair(
+                        MatchKeys(name_norm, org.text.lower, position.lower, region.lower, phone, source_url),
+                        MatchKeys(
+                            source.name_norm, source.organization.text.lower, source.position.lower,
+                            source.region.lower, source.phone, source.source_url
+                        ),
+                    )
+
+                else:
+                    source_url = self._profile_url(org, first_slug, last_slug, contact_id)
+
+                # Sin una coincidencia peor, compartir organización, cargo o región da 0.9
+                if score > 0.9 and (
+                    org.index in self._seen_organizations
+                    or position.lower in self._seen_positions
+                    or region.lower in self._seen_regions
+                ):
+                    score = 0.9
+                self._seen_organizations.add(org.index)
+                self._seen_positions.add(position.lower)
+                self._seen_regions.add(region.lower)
+                self._remember(_Profile(
+                    name, name_norm, name_fold, first_slug, last_slug, org, position, region, phone, source_url
+                ))
+
+                email = f"{first_slug}.{last_slug}{contact_id}@{org.domain}"
+                created_at = str(self.now - timedelta(seconds=ages[i]))
+                batch.append((
+                    contact_id, name, org.text.display, position.display, email, phone, region.display,
+                    source_url, "web", lines_json, score >= 0.5, score, created_at, created_at,
+                    f"{name_fold} {email} {org.text.fold} {position.fold} {lines_fold}",
+                    name_norm, org.text.lower, position.lower, region.lower, phone,
+                ))
+            yield batch
+
+    def contacts(
+        self,
+        count: int,
+        areas: Optional[Sequence[str]] = None,
+        regions: Optional[Sequence[str]] = None,
+        source_type: str = "demo"
+    ) -> List[dict]:
+        """
+        Generar contactos como diccionarios para ContactService.bulk_create_contacts
+        (que calcula el score real contra la base).
+
+        Args:
+            count: Cantidad de contactos
+            areas: Áreas de la búsqueda
+            regions: Regiones de la búsqueda
+            source_type: Tipo de fuente de los contactos
+
+        Returns:
+            Lista de diccionarios con los campos de ContactCreate
+        """
+        # IDs altos y aleatorios: los emails y URLs no chocan entre llamadas
+        start_id = self.rng.randrange(10_000_000, 1_000_000_000)
+        columns = {column: index for index, column in enumerate(CONTACT_COLUMNS)}
+        result = []
+        for batch in self.contact_rows(count, start_id=start_id, areas=areas, regions=regions):
+            for row in batch:
+                result.append({
+                    "name": row[columns["name"]],
+                    "organization": row[columns["organization"]],
+                    "position": row[columns["position"]],
+                    "email": row[columns["email"]],
+                    "phone": row[columns["phone"]],
+                    "region": row[columns["region"]],
+                    "source_url": row[columns["source_url"]],
+                    "source_type": source_type,
+                    "research_lines": json.loads(row[columns["research_lines"]]),
+                })
+        return result
+
+
+def _cumulative(values) -> Iterator[float]:
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
+
+
+def _tsv_value(value) -> str:
+    """Valor para LOAD DATA (separado por tabs, escapes de MySQL)."""
+    if value is None:
+        return "\\N"
+    if value is True or value is False:
+        return "1" if value else "0"
+    if not isinstance(value, str):
+        return str(value)
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n")
+
+
+class SyntheticDataset:
+    """
+    Dataset completo (contactos, búsquedas, resultados y logs) de un tamaño dado.
+
+    Los IDs se asignan de forma explícita (1..N), por lo que la carga
+    requiere tablas vacías.
+
+    Args:
+        contacts: Cantidad de contactos
+        seed: Semilla
+        duplicate_rates: Tasas por regla de duplicado (ver SyntheticDataGenerator)
+    """
+
+    def __init__(self, contacts: int, seed: int = 42, duplicate_rates: Optional[Dict[str, float]] = None):
+        self.contacts = contacts
+        self.seed = seed
+        self.duplicate_rates = validate_duplicate_rates(
+            DEFAULT_DUPLICATE_RATES if duplicate_rates is None else duplicate_rates
+        )
+        self.searches = max(contacts // 50, 20)
+        # La búsqueda 1 es la "grande"; el resto reparte ~1.5 resultados por contacto
+        self.big_search_results = min(BIG_SEARCH_RESULTS, contacts)
+        self.logs_per_search = 3
+        self.now = datetime(2026, 1, 1)
+
+    @property
+    def signature(self) -> str:
+        """Identificador del dataset (mismos parámetros = mismos datos)."""
+        rates = ",".join(f"{rule}:{rate:g}" for rule, rate in self.duplicate_rates.items())
+        return f"contacts={self.contacts};seed={self.seed};duplicates={rates}"
+
+    # ------------------------------------------------------------------
+    # Generación de filas (tuplas en el orden de *_COLUMNS)
+    # ------------------------------------------------------------------
+
+    def contact_rows(self) -> Iterator[List[tuple]]:
+        """Contactos en lotes de INSERT_BATCH_SIZE."""
+        generator = SyntheticDataGenerator(seed=self.seed, duplicate_rates=self.duplicate_rates)
+        return generator.contact_rows(self.contacts)
+
+    def search_rows(self) -> Iterator[List[tuple]]:
+        """Búsquedas en lotes de INSERT_BATCH_SIZE."""
+        rng = random.Random(self.seed + 1)
+        areas = [area for area in POSITIONS if area != "General"]
+        regions = list(REGIONS)
+        region_cum = list(_cumulative(REGIONS.values()))
+        sessions = max(self.searches // 5, 1)
+        batch = []
+        for index in range(self.searches):
+            area = rng.choice(areas)
+            region = rng.choices(regions, cum_weights=region_cum)[0]
+            keywords = rng.choice(RESEARCH_LINES[area])
+            status = "completed" if index == 0 else rng.choice(SEARCH_STATUSES)
+            created_at = self.now - timedelta(seconds=rng.randrange(SECONDS_PER_YEAR))
+            finished_at = str(created_at + timedelta(seconds=rng.randint(20, 600))) if status != "pending" else None
+            batch.append((
+                index + 1, f"bench-session-{rng.randint(1, sessions)}", keywords, area, region, status,
+                str(created_at), str(created_at) if status != "pending" else None, finished_at, 0, 0,
+                "Timeout del workflow" if status == "failed" else None, '{"max_results": 50}',
+                search_criteria_hash(keywords, area, region),
+            ))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    def result_rows(self) -> Iterator[List[tuple]]:
+        """
+        Resultados: la búsqueda 1 con big_search_results contactos y cada
+        contacto vinculado a una o dos búsquedas más.
+        """
+        rng = random.Random(self.seed + 2)
+        now = self.now
+        batch = []
+        for contact_id in range(1, self.big_search_results + 1):
+            batch.append((1, contact_id, round(rng.uniform(0.5, 1.0), 2), str(now - timedelta(seconds=rng.randrange(SECONDS_PER_YEAR)))))
+
+        for start in range(1, self.contacts + 1, INSERT_BATCH_SIZE):
+            ids = range(start, min(start + INSERT_BATCH_SIZE, self.contacts + 1))
+            size = len(ids)
+            second_link = [rng.random() < 0.5 for _ in range(size)]
+            searches = [rng.randint(2, self.searches) for _ in range(size * 2)]
+            scores = [round(rng.uniform(0.5, 1.0), 2) for _ in range(size * 2)]
+            ages = [rng.randrange(SECONDS_PER_YEAR) for _ in range(size * 2)]
+            for i, contact_id in enumerate(ids):
+                batch.append((searches[2 * i], contact_id, scores[2 * i], str(now - timedelta(seconds=ages[2 * i]))))
+                if second_link[i] and searches[2 * i + 1] != searches[2 * i]:
+                    batch.append((
+                        searches[2 * i + 1], contact_id, scores[2 * i + 1],
+                        str(now - timedelta(seconds=ages[2 * i + 1]))
+                    ))
+            yield batch
+            batch = []
+        if batch:
+            yield batch
+
+    def log_rows(self) -> Iterator[List[tuple]]:
+        """Logs de búsqueda (logs_per_search por búsqueda)."""
+        rng = random.Random(self.seed + 3)
+        statuses = ["info", "success", "success", "error"]
+        batch = []
+        for index in range(self.searches * self.logs_per_search):
+            search_id = index // self.logs_per_search + 1
+            status = rng.choice(statuses)
+            batch.append((
+                search_id, f"https://www.google.com/search?q=bench-{search_id}", "google", status,
+                rng.randint(0, 30) if status == "success" else 0,
+                "HTTP 429" if status == "error" else None,
+                rng.randint(80, 4000), str(self.now - timedelta(seconds=rng.randrange(SECONDS_PER_YEAR))),
+            ))
+            if len(batch) >= INSERT_BATCH_SIZE:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    # ------------------------------------------------------------------
+    # Carga
+    # ------------------------------------------------------------------
+
+    def load(
+        self,
+        engine: Engine,
+        method: str = "insert",
+        progress: Optional[Callable[[str, int], None]] = None
+    ) -> Dict[str, dict]:
+        """
+        Insertar el dataset.
+
+        Args:
+            engine: Motor destino (tablas vacías)
+            method: "insert" (executemany / INSERT multi-fila) o "load_data"
+                (LOAD DATA LOCAL INFILE; solo MySQL con local_infile=ON)
+            progress: Función opcional (tabla, filas insertadas) para informar avance
+
+        Returns:
+            Diccionario tabla -> {rows, seconds}
+
+        Raises:
+            ValueError: Si el método no es válido para el motor
+        """
+        if method not in LOAD_METHODS:
+            raise ValueError(f"Método de carga inválido: {method}. Use uno de: {', '.join(LOAD_METHODS)}")
+        if method == "load_data" and engine.dialect.name != "mysql":
+            raise ValueError("LOAD DATA LOCAL INFILE solo está disponible en MySQL")
+
+        load_engine = engine
+        if method == "load_data":
+            load_engine = create_engine(engine.url, connect_args={"local_infile": True})
+
+        summary = {}
+        try:
+            with load_engine.connect() as connection:
+                _prepare_bulk_session(connection)
+                for table, columns, batches in (
+                    (Contact.__table__, CONTACT_COLUMNS, self.contact_rows()),
+                    (Search.__table__, SEARCH_COLUMNS, self.search_rows()),
+                    (SearchResult.__table__, RESULT_COLUMNS, self.result_rows()),
+                    (SearchLog.__table__, LOG_COLUMNS, self.log_rows()),
+                ):
+                    start = time.perf_counter()
+                    rows = 0
+                    for batch in batches:
+                        if method == "load_data":
+                            _load_data_infile(connection, table.name, columns, batch)
+                        else:
+                            _insert_tuples(connection, table.name, columns, batch)
+                        connection.commit()
+                        rows += len(batch)
+                        if progress:
+                            progress(table.name, rows)
+                    summary[table.name] = {"rows": rows, "seconds": round(time.perf_counter() - start, 3)}
+        finally:
+            if load_engine is not engine:
+                load_engine.dispose()
+
+        self._update_search_counts(engine)
+        with engine.begin() as connection:
+            connection.execute(insert(SystemConfig.__table__).values(
+                config_key=DATASET_CONFIG_KEY,
+                config_value=self.signature,
+                description="Dataset sintético de benchmarks/ (no usar esta base para la aplicación)",
+            ))
+        return summary
+
+    @staticmethod
+    def _update_search_counts(engine: Engine) -> None:
+        """Completar results_count / valid_results_count de las búsquedas."""
+        with engine.begin() as connection:
+            totals = select(
+                func.count(SearchResult.contact_id)
+            ).where(SearchResult.search_id == Search.id).scalar_subquery()
+            valid = select(
+                func.count(SearchResult.contact_id)
+            ).select_from(SearchResult).join(
+                Contact, Contact.id == SearchResult.contact_id
+            ).where(
+                SearchResult.search_id == Search.id,
+                Contact.is_valid == True,  # noqa: E712
+            ).scalar_subquery()
+            connection.execute(update(Search).values(results_count=totals, valid_results_count=valid))
+
+    @staticmethod
+    def loaded_signature(engine: Engine) -> Optional[str]:
+        """Identificador del dataset cargado en la base (None si no hay)."""
+        with engine.connect() as connection:
+            return connection.execute(
+                select(SystemConfig.config_value).where(SystemConfig.config_key == DATASET_CONFIG_KEY)
+            ).scalar()
+
+    def prune(self, engine: Engine) -> None:
+        """
+        Borrar lo que agregaron ejecuciones anteriores (escenario de carga)
+        para volver al dataset original.
+
+        Args:
+            engine: Motor con el dataset cargado
+        """
+        logs = self.searches * self.logs_per_search
+        with engine.begin() as connection:
+            connection.execute(delete(SearchDispatch))
+            connection.execute(delete(SearchResult).where(or_(
+                SearchResult.search_id > self.searches, SearchResult.contact_id > self.contacts
+            )))
+            connection.execute(delete(SearchLog).where(SearchLog.id > logs))
+            connection.execute(delete(Search).where(Search.id > self.searches))
+            connection.execute(delete(Contact).where(Contact.id > self.contacts))
+
+
+def _prepare_bulk_session(connection: Connection) -> None:
+    """Ajustes de la conexión de carga masiva (los datos generados ya son consistentes)."""
+    if connection.dialect.name == "mysql":
+        connection.exec_driver_sql("SET SESSION unique_checks = 0, foreign_key_checks = 0")
+    elif connection.dialect.name == "sqlite":
+        connection.exec_driver_sql("PRAGMA synchronous = OFF")
+
+
+def _insert_tuples(connection: Connection, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+    """executemany del driver con tuplas (pymysql lo reescribe como INSERT multi-fila)."""
+    quote = connection.dialect.identifier_preparer.quote
+    marker = "?" if connection.dialect.paramstyle == "qmark" else "%s"
+    connection.exec_driver_sql(
+        f"INSERT INTO {quote(table)} ({', '.join(quote(column) for column in columns)}) "
+        f"VALUES ({', '.join([marker] * len(columns))})",
+        rows,
+    )
+
+
+def _load_data_infile(connection: Connection, table: str, columns: Sequence[str], rows: List[tuple]) -> None:
+    """Cargar un lote con LOAD DATA LOCAL INFILE desde un archivo temporal."""
+    with tempfile.NamedTemporaryFile("w", suffix=".tsv", encoding="utf-8", newline="", delete=False) as file:
+        for row in rows:
+            file.write("\t".join(_tsv_value(value) for value in row))
+            file.write("\n")
+        path = file.name
+    try:
+        column_list = ", ".join(f"`{column}`" for column in columns)
+        connection.exec_driver_sql(
+            f"LOAD DATA LOCAL INFILE '{path}' INTO TABLE `{table}` CHARACTER SET utf8mb4 "
+            f"FIELDS TERMINATED BY '\\t' ESCAPED BY '\\\\' LINES TERMINATED BY '\\n' ({column_list})"
+        )
+    finally:
+        os.unlink(path)
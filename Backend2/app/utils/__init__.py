@@ -3,9 +3,27 @@ Paquete de utilidades.
 """
 
 from app.utils.validators import validate_email, validate_phone, validate_url
+from app.utils.sql import dialect_name, exact_equals, exact_text, insert_ignore_duplicates, insert_or_increment
+from app.utils.pagination import encode_cursor, decode_cursor, paginate
+from app.utils.counting import TOTAL_MODES, count_total, count_cache, validate_total_mode
+from app.utils.serialization import FastJSONResponse, dumps_json
 
 __all__ = [
     "validate_email",
     "validate_phone",
     "validate_url",
+    "dialect_name",
+    "exact_equals",
+    "exact_text",
+    "insert_ignore_duplicates",
+    "insert_or_increment",
+    "encode_cursor",
+    "decode_cursor",
+    "paginate",
+    "TOTAL_MODES",
+    "count_total",
+    "count_cache",
+    "validate_total_mode",
+    "FastJSONResponse",
+    "dumps_json",
 ]
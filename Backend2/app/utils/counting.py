@@ -0,0 +1,203 @@
+"""
+Totales de los listados paginados.
+
+Contar todas las filas filtradas cuesta un recorrido completo por cada
+página. Los listados aceptan total_mode:
+
+- exact: COUNT(*) de la consulta filtrada (lo que usan las exportaciones)
+- estimated: total cacheado por unos segundos para la misma combinación de
+  filtros; si el listado tiene un contador de stats_counters (mantenido por
+  triggers en MySQL) o no tiene filtros, ese contador o la estimación de
+  filas de information_schema
+- none: no se calcula el total
+
+Las escrituras invalidan los totales cacheados de sus listados
+(count_cache.invalidate).
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional, Tuple
+
+from sqlalchemy import func, text
+from sqlalchemy.orm import Query, Session
+
+from app.config import settings
+from app.utils.sql import dialect_name
+
+TOTAL_MODES = ("exact", "estimated", "none")
+
+
+class CountCache:
+    """Totales recientes por combinación de filtros (TTL corto, tamaño acotado)."""
+
+    def __init__(self, ttl_seconds: int, max_entries: int):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        # clave -> (total, momento en que se calculó)
+        self._entries: "OrderedDict[Hashable, Tuple[int, float]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[int]:
+        """Total cacheado para la clave, o None si no existe o venció."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            total, stored_at = entry
+            if time.monotonic() - stored_at >= self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return total
+
+    def set(self, key: Hashable, total: int) -> None:
+        """Guardar un total recién calculado."""
+        with self._lock:
+            self._entries[key] = (total, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *listings: str) -> None:
+        """
+        Olvidar los totales de unos listados (primer elemento de la clave).
+
+        Args:
+            listings: Listados afectados por una escritura
+        """
+        with self._lock:
+            for key in [key for key in self._entries if key[0] in listings]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Vaciar la caché."""
+        with self._lock:
+            self._entries.clear()
+
+
+# Caché global (una por proceso)
+count_cache = CountCache(
+    ttl_seconds=settings.COUNT_CACHE_TTL_SECONDS,
+    max_entries=settings.COUNT_CACHE_MAX_ENTRIES
+)
+
+
+def validate_total_mode(total_mode: str) -> None:
+    """
+    Verificar que total_mode sea uno de TOTAL_MODES.
+
+    Raises:
+        ValueError: Si total_mode no es válido
+    """
+    if total_mode not in TOTAL_MODES:
+        raise ValueError(f"total_mode inválido: {total_mode} (use {', '.join(TOTAL_MODES)})")
+
+
+def exact_count(query: Query, column: Any) -> int:
+    """
+    COUNT directo de la consulta filtrada (sin envolverla en una subconsulta).
+
+    Args:
+        query: Consulta ya filtrada
+        column: Columna no nula a contar (normalmente la clave primaria)
+
+    Returns:
+        Cantidad de filas
+    """
+    return query.order_by(None).with_entities(func.count(column)).scalar() or 0
+
+
+def table_row_estimate(db: Session, table_name: str) -> Optional[int]:
+    """
+    Estimación de filas de una tabla según information_schema (solo MySQL).
+
+    Args:
+        db: Sesión de base de datos
+        table_name: Nombre de la tabla
+
+    Returns:
+        Filas estimadas, o None si el motor no la ofrece
+    """
+    if dialect_name(db) != "mysql":
+        return None
+    return db.execute(
+        text(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name"
+        ),
+        {"table_name": table_name}
+    ).scalar()
+
+
+def counter_estimate(db: Session, metric: str) -> Optional[int]:
+    """
+    Valor de un contador de stats_counters (suma de sus franjas). Solo en
+    MySQL, donde los triggers lo mantienen al día.
+
+    Args:
+        db: Sesión de base de datos
+        metric: Métrica sin dimensión (p. ej. contacts_listed)
+
+    Returns:
+        Valor del contador, o None si el motor no lo mantiene o no existe
+    """
+    if dialect_name(db) != "mysql":
+        return None
+    total = db.execute(
+        text("SELECT SUM(value) FROM stats_counters WHERE metric = :metric AND dimension = ''"),
+        {"metric": metric}
+    ).scalar()
+    return max(int(total), 0) if total is not None else None
+
+
+def count_total(
+    db: Session,
+    query: Query,
+    column: Any,
+    total_mode: str,
+    cache_key: Hashable,
+    estimate_table: Optional[str] = None,
+    estimate_counter: Optional[str] = None
+) -> Optional[int]:
+    """
+    Calcular el total de un listado según total_mode.
+
+    Args:
+        db: Sesión de base de datos
+        query: Consulta ya filtrada (sin paginar)
+        column: Columna no nula a contar
+        total_mode: "exact", "estimated" o "none"
+        cache_key: Identifica el listado (primer elemento) y sus filtros
+        estimate_table: Tabla cuya estimación de filas vale como total (solo
+            cuando la consulta no tiene filtros)
+        estimate_counter: Contador de stats_counters que cuenta exactamente
+            las filas de la consulta
+
+    Returns:
+        Total (None con total_mode="none")
+
+    Raises:
+        ValueError: Si total_mode no es válido
+    """
+    validate_total_mode(total_mode)
+
+    if total_mode == "none":
+        return None
+
+    if total_mode == "estimated":
+        total = count_cache.get(cache_key)
+        if total is not None:
+            return total
+        if estimate_counter:
+            total = counter_estimate(db, estimate_counter)
+        elif estimate_table:
+            total = table_row_estimate(db, estimate_table)
+        if total is not None:
+            count_cache.set(cache_key, total)
+            return total
+
+    total = exact_count(query, column)
+    count_cache.set(cache_key, total)
+    return total
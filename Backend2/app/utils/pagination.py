@@ -0,0 +1,199 @@
+"""
+Paginación por cursor (keyset).
+
+En lugar de OFFSET (que recorre y descarta todas las filas anteriores), cada
+página continúa después de la última fila de la anterior usando las mismas
+columnas del ORDER BY. El cursor es opaco para el cliente: base64 de los
+valores de esas columnas en la última fila entregada.
+
+En SQLite los DATETIME son texto: CURRENT_TIMESTAMP guarda
+'YYYY-MM-DD HH:MM:SS' y SQLAlchemy 'YYYY-MM-DD HH:MM:SS.ffffff', así que las
+columnas de fecha se comparan y ordenan con un formato de ancho fijo (ver
+_comparable) para que dos filas del mismo segundo no se repitan entre páginas.
+"""
+
+import base64
+import json
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, String, and_, func, or_, type_coerce
+from sqlalchemy.orm import Query
+
+from app.utils.sql import dialect_name
+
+# Orden de paginación: (columna, descendente)
+KeysetOrder = Sequence[Tuple[Any, bool]]
+
+# Formato de SQLAlchemy para DateTime en SQLite (siempre con microsegundos)
+SQLITE_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"dec": str(value)}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "dec" in value:
+            return Decimal(value["dec"])
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Codificar los valores de las columnas de orden en un cursor opaco.
+
+    Args:
+        values: Valores de la última fila de la página
+
+    Returns:
+        Cursor en base64 (URL-safe)
+    """
+    raw = json.dumps([_encode_value(value) for value in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """
+    Decodificar un cursor.
+
+    Args:
+        cursor: Cursor recibido del cliente
+        size: Cantidad de columnas esperadas
+
+    Returns:
+        Valores de las columnas de orden
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError):
+        raise ValueError("Cursor inválido")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Cursor inválido")
+    return [_decode_value(value) for value in values]
+
+
+def _is_sqlite_datetime(column: Any, dialect: Optional[str]) -> bool:
+    return dialect == "sqlite" and isinstance(getattr(column, "type", None), DateTime)
+
+
+def _comparable(column: Any, dialect: Optional[str]) -> Any:
+    """Columna de orden tal como se compara y ordena en el dialecto dado."""
+    if _is_sqlite_datetime(column, dialect):
+        # 'YYYY-MM-DD HH:MM:SS' -> 'YYYY-MM-DD HH:MM:SS.000000'; los valores con
+        # microsegundos ya tienen 26 caracteres y quedan igual
+        return func.substr(type_coerce(column, String) + ".000000", 1, 26)
+    return column
+
+
+def _comparable_value(column: Any, value: Any, dialect: Optional[str]) -> Any:
+    if isinstance(value, datetime) and _is_sqlite_datetime(column, dialect):
+        return value.strftime(SQLITE_DATETIME_FORMAT)
+    return value
+
+
+def keyset_order_by(order: KeysetOrder, dialect: Optional[str] = None) -> list:
+    """
+    Construir el ORDER BY de un orden keyset (consistente con keyset_filter).
+
+    Args:
+        order: Columnas de orden con su dirección
+        dialect: Nombre del dialecto (ver dialect_name)
+
+    Returns:
+        Lista de expresiones para order_by
+    """
+    clauses = []
+    for column, descending in order:
+        comparable = _comparable(column, dialect)
+        clauses.append(comparable.desc() if descending else comparable.asc())
+    return clauses
+
+
+def keyset_filter(order: KeysetOrder, values: Sequence[Any], dialect: Optional[str] = None):
+    """
+    Construir la condición "después de la fila con estos valores" para el orden dado.
+
+    (a, b, c) > (va, vb, vc) se expande a
+    a > va OR (a = va AND b > vb) OR (a = va AND b = vb AND c > vc),
+    respetando la dirección de cada columna.
+
+    Args:
+        order: Columnas de orden con su dirección
+        values: Valores de la última fila entregada
+        dialect: Nombre del dialecto (ver dialect_name); en SQLite las fechas
+            se comparan con un formato de ancho fijo
+
+    Returns:
+        Expresión SQLAlchemy
+    """
+    columns = [_comparable(column, dialect) for column, _ in order]
+    values = [_comparable_value(column, value, dialect) for (column, _), value in zip(order, values)]
+
+    clauses = []
+    for position, (_, descending) in enumerate(order):
+        equals = [columns[i] == values[i] for i in range(position)]
+        after = columns[position] < values[position] if descending else columns[position] > values[position]
+        clauses.append(and_(*equals, after))
+    return or_(*clauses)
+
+
+def paginate(
+    query: Query,
+    order: KeysetOrder,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    row_values: Optional[Callable[[Any], Sequence[Any]]] = None
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Obtener una página de resultados por cursor o, si no hay cursor, por offset.
+
+    En ambos modos se devuelve next_cursor (None en la última página), de modo
+    que un cliente que empieza con skip puede seguir con cursores.
+
+    Args:
+        query: Consulta ya filtrada (sin ORDER BY ni LIMIT)
+        order: Columnas de orden con su dirección; la última debe ser única (id)
+        limit: Tamaño de página
+        skip: Registros a saltar (solo sin cursor)
+        cursor: Cursor de la página anterior
+        row_values: Obtiene los valores de orden de una fila (por defecto, atributos
+            con el nombre de cada columna)
+
+    Returns:
+        Tupla (filas de la página, next_cursor)
+
+    Raises:
+        ValueError: Si el cursor no es válido
+    """
+    if row_values is None:
+        row_values = lambda row: [getattr(row, column.key) for column, _ in order]
+
+    dialect = dialect_name(query.session)
+    if cursor:
+        query = query.filter(keyset_filter(order, decode_cursor(cursor, len(order)), dialect))
+
+    query = query.order_by(*keyset_order_by(order, dialect))
+    if not cursor and skip:
+        query = query.offset(skip)
+
+    rows = query.limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+
+    rows = rows[:limit]
+    return rows, encode_cursor(row_values(rows[-1]))
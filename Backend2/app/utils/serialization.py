@@ -0,0 +1,52 @@
+"""
+Serialización JSON directa a bytes para respuestas grandes.
+
+Las rutas que devuelven miles de filas arman diccionarios simples y los
+serializan aquí, sin pasar por modelos Pydantic. Usa orjson si está
+instalado y json de la biblioteca estándar en caso contrario (misma salida
+salvo espacios).
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+
+from fastapi.responses import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson es opcional
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Serializar a JSON (UTF-8).
+
+    Args:
+        content: Diccionarios, listas y escalares (datetime y Decimal incluidos)
+
+    Returns:
+        JSON en bytes
+    """
+    if orjson is not None:
+        return orjson.dumps(content, default=_default)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """Respuesta JSON serializada con dumps_json (sin validación de response_model)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
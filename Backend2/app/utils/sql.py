@@ -0,0 +1,229 @@
+"""
+Utilidades SQL independientes del dialecto (MySQL en producción, SQLite en pruebas).
+"""
+
+from typing import Optional
+
+from sqlalchemy import TIMESTAMP, DateTime, Table, and_, func, insert, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.dialects import mysql
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.functions import FunctionElement
+
+# TIMESTAMP con microsegundos en MySQL (marcas de agua y ETags que no pueden
+# empatar dentro del mismo segundo)
+PreciseTimestamp = TIMESTAMP().with_variant(mysql.TIMESTAMP(fsp=6), "mysql")
+
+# Collation binaria de MySQL: utf8mb4_unicode_ci iguala variantes de tildes y
+# mayúsculas que en Python (normalize_text) son valores distintos
+BINARY_COLLATION = "utf8mb4_bin"
+
+
+class current_timestamp_precise(FunctionElement):
+    """CURRENT_TIMESTAMP(6) en MySQL; CURRENT_TIMESTAMP en otros motores."""
+
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(current_timestamp_precise)
+def _compile_current_timestamp_precise(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+
+@compiles(current_timestamp_precise, "mysql")
+def _compile_current_timestamp_precise_mysql(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP(6)"
+
+
+def dialect_name(db: Session) -> str:
+    """
+    Obtener el nombre del dialecto de la sesión.
+
+    Args:
+        db: Sesión de base de datos
+
+    Returns:
+        Nombre del dialecto ("mysql", "sqlite", ...)
+    """
+    return db.get_bind().dialect.name
+
+
+def exact_text(db: Session, column):
+    """
+    Columna de texto comparada y agrupada byte a byte, como en Python.
+
+    Args:
+        db: Sesión de base de datos
+        column: Columna de texto
+
+    Returns:
+        La columna con COLLATE utf8mb4_bin en MySQL; sin cambios en otros
+        motores (SQLite ya compara en binario)
+    """
+    if dialect_name(db) == "mysql":
+        return column.collate(BINARY_COLLATION)
+    return column
+
+
+def exact_equals(db: Session, column, value):
+    """
+    Condición de igualdad exacta (ver exact_text) que sigue usando el índice.
+
+    En MySQL se combina la igualdad con la collation de la columna (usa el
+    índice) con la binaria (descarta las variantes), porque una columna con
+    COLLATE explícito no puede usar su índice.
+
+    Args:
+        db: Sesión de base de datos
+        column: Columna de texto
+        value: Valor a comparar
+
+    Returns:
+        Expresión SQLAlchemy
+    """
+    if dialect_name(db) == "mysql":
+        return and_(column == value, exact_text(db, column) == value)
+    return column == value
+
+
+def insert_ignore_duplicates(db: Session, table: Table):
+    """
+    Construir un INSERT multi-fila que ignora las filas que violan una clave
+    única o primaria.
+
+    En MySQL se usa INSERT ... ON DUPLICATE KEY UPDATE con una asignación
+    nula (a diferencia de INSERT IGNORE, no oculta otros errores).
+
+    Args:
+        db: Sesión de base de datos
+        table: Tabla destino
+
+    Returns:
+        Sentencia INSERT lista para .values([...]) o para ejecutarse con una
+        lista de filas (executemany)
+    """
+    dialect = dialect_name(db)
+
+    if dialect == "mysql":
+        pk_column = list(table.primary_key.columns)[0]
+        return mysql_insert(table).on_duplicate_key_update(
+            {pk_column.name: pk_column}
+        )
+
+    if dialect == "sqlite":
+        return sqlite_insert(table).on_conflict_do_nothing()
+
+    return insert(table)
+
+
+def insert_or_increment(db: Session, table: Table, increment_columns, replace_columns=()):
+    """
+    Construir un INSERT multi-fila que, si la clave primaria ya existe, suma
+    los valores a la fila existente en lugar de fallar.
+
+    Args:
+        db: Sesión de base de datos
+        table: Tabla destino
+        increment_columns: Columnas que se suman (valor actual + valor nuevo)
+        replace_columns: Columnas que se reemplazan por el valor nuevo si no es NULL
+
+    Returns:
+        Sentencia INSERT lista para .values([...]) o para ejecutarse con una
+        lista de filas (executemany)
+    """
+    dialect = dialect_name(db)
+
+    if dialect == "mysql":
+        statement = mysql_insert(table)
+        new = statement.inserted
+        return statement.on_duplicate_key_update({
+            **{name: table.c[name] + new[name] for name in increment_columns},
+            **{name: func.coalesce(new[name], table.c[name]) for name in replace_columns},
+        })
+
+    if dialect == "sqlite":
+        statement = sqlite_insert(table)
+        new = statement.excluded
+        return statement.on_conflict_do_update(
+            index_elements=list(table.primary_key.columns),
+            set_={
+                **{name: table.c[name] + new[name] for name in increment_columns},
+                **{name: func.coalesce(new[name], table.c[name]) for name in replace_columns},
+            }
+        )
+
+    return insert(table)
+
+
+def acquire_advisory_lock(db: Session, name: str, timeout: int = 0) -> Optional[Connection]:
+    """
+    Tomar un bloqueo con nombre de MySQL (GET_LOCK) en una conexión propia.
+
+    El bloqueo es de la conexión, no de la transacción: se mantiene mientras
+    la conexión devuelta siga abierta, o hasta release_advisory_lock.
+
+    Args:
+        db: Sesión de base de datos (solo para obtener el motor)
+        name: Nombre del bloqueo
+        timeout: Segundos de espera (0: no esperar)
+
+    Returns:
+        Conexión que tiene el bloqueo, o None si lo tiene otra conexión.
+        En motores sin GET_LOCK devuelve una conexión sin bloqueo (un solo
+        proceso: SQLite en pruebas y benchmarks).
+    """
+    connection = db.get_bind().connect().execution_options(isolation_level="AUTOCOMMIT")
+    if connection.dialect.name != "mysql":
+        return connection
+    try:
+        acquired = connection.execute(
+            text("SELECT GET_LOCK(:name, :timeout)"), {"name": name, "timeout": timeout}
+        ).scalar()
+    except Exception:
+        connection.close()
+        raise
+    if acquired != 1:
+        connection.close()
+        return None
+    return connection
+
+
+def holds_advisory_lock(connection: Connection, name: str) -> bool:
+    """
+    Comprobar que la conexión sigue teniendo el bloqueo (MySQL lo libera si
+    la conexión se cae, p. ej. por wait_timeout).
+
+    Args:
+        connection: Conexión devuelta por acquire_advisory_lock
+        name: Nombre del bloqueo
+
+    Returns:
+        True si la conexión conserva el bloqueo
+    """
+    if connection.dialect.name != "mysql":
+        return not connection.closed
+    try:
+        return connection.execute(
+            text("SELECT IS_USED_LOCK(:name) = CONNECTION_ID()"), {"name": name}
+        ).scalar() == 1
+    except Exception:
+        return False
+
+
+def release_advisory_lock(connection: Connection, name: str) -> None:
+    """
+    Liberar un bloqueo de acquire_advisory_lock y cerrar su conexión.
+
+    Args:
+        connection: Conexión devuelta por acquire_advisory_lock
+        name: Nombre del bloqueo
+    """
+    try:
+        if connection.dialect.name == "mysql" and not connection.closed:
+            connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": name})
+    finally:
+        connection.close()
@@ -0,0 +1,248 @@
+"""
+Línea de comandos de los benchmarks (ver benchmarks/__init__.py).
+
+DATABASE_URL se fija antes de importar app.*: la configuración y los
+motores de la aplicación apuntan así a la base de benchmark.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from typing import Optional
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description="Benchmarks del backend")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_dataset_options(command):
+        command.add_argument("--size", default="10k", help="Tamaño del dataset: 10k, 100k, 1m o un número de contactos")
+        command.add_argument("--database-url", default=None, help="Base de benchmark (por defecto sqlite:///bench-<size>.db)")
+        command.add_argument("--seed", type=int, default=42, help="Semilla del dataset y de las muestras")
+        command.add_argument("--reset", action="store_true", help="Borrar y recrear las tablas antes de cargar")
+        command.add_argument(
+            "--duplicate-rate", action="append", default=[], metavar="REGLA=TASA",
+            help="Tasa de duplicados de una regla (url, phone, name, name_org, url_org); repetible"
+        )
+        command.add_argument(
+            "--method", choices=("insert", "load_data"), default="insert",
+            help="Carga con INSERT multi-fila o LOAD DATA LOCAL INFILE (MySQL)"
+        )
+
+    seed = commands.add_parser("seed", help="Cargar el dataset sintético")
+    add_dataset_options(seed)
+
+    run = commands.add_parser("run", help="Ejecutar los benchmarks y escribir el reporte JSON")
+    add_dataset_options(run)
+    run.add_argument("--suites", default="micro,load", help="Suites a ejecutar: micro, load, webhook, sessions")
+    run.add_argument("--only", default="", help="Micro-benchmarks a ejecutar, separados por coma (por defecto todos)")
+    run.add_argument("--repeat", type=int, default=50, help="Repeticiones por micro-benchmark")
+    run.add_argument("--clients", type=int, default=50, help="Clientes concurrentes del escenario de carga")
+    run.add_argument("--duration", type=float, default=30.0, help="Segundos del escenario de carga")
+    run.add_argument("--workers", type=int, default=1, help="Workers de uvicorn del servidor de benchmark")
+    run.add_argument("--port", type=int, default=8181, help="Puerto del servidor de benchmark")
+    run.add_argument("--url", default=None, help="Servidor ya levantado (no se inicia uno propio)")
+    run.add_argument("--session-clients", type=int, default=500, help="Clientes concurrentes del escenario sessions")
+    run.add_argument("--webhook-requests", type=int, default=200, help="POST /searches/ concurrentes del escenario webhook")
+    run.add_argument("--webhook-latency-ms", type=float, default=20.0, help="Latencia del webhook falso del escenario webhook")
+    run.add_argument("--output", default="benchmark-report.json", help="Archivo del reporte")
+
+    compare = commands.add_parser("compare", help="Comparar dos reportes")
+    compare.add_argument("base", help="Reporte de referencia")
+    compare.add_argument("head", help="Reporte a evaluar")
+    compare.add_argument("--threshold", type=float, default=0.10, help="Variación que se considera regresión (0.10 = 10%%)")
+
+    return parser.parse_args(argv)
+
+
+def _contact_count(size: str) -> int:
+    from app.services.synthetic_data import SIZES
+
+    if size.lower() in SIZES:
+        return SIZES[size.lower()]
+    try:
+        return int(size)
+    except ValueError:
+        raise SystemExit(f"Tamaño inválido: {size}. Use {', '.join(SIZES)} o un número")
+
+
+def _duplicate_rates(values) -> Optional[dict]:
+    from app.services.synthetic_data import DEFAULT_DUPLICATE_RATES, validate_duplicate_rates
+
+    if not values:
+        return None
+    rates = dict(DEFAULT_DUPLICATE_RATES)
+    for value in values:
+        rule, _, rate = value.partition("=")
+        try:
+            rates[rule.strip()] = float(rate)
+        except ValueError:
+            raise SystemExit(f"Tasa de duplicado inválida: {value}. Use REGLA=TASA (ej. url=0.05)")
+    try:
+        return validate_duplicate_rates(rates)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+
+def _prepare_dataset(args) -> dict:
+    """Cargar el dataset si la base está vacía (o con --reset); reutilizarlo si ya coincide."""
+    from sqlalchemy import func, inspect
+
+    from app.database import Base, SessionLocal, engine
+    from app.models import Contact
+    from app.services.synthetic_data import SyntheticDataset
+
+    contacts = _contact_count(args.size)
+    if args.reset:
+        print("🗑️ Recreando las tablas de la base de benchmark")
+        Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+
+    dataset = SyntheticDataset(contacts, seed=args.seed, duplicate_rates=_duplicate_rates(args.duplicate_rate))
+    loaded = SyntheticDataset.loaded_signature(engine)
+    if loaded == dataset.signature:
+        print(f"♻️ Reutilizando el dataset existente ({loaded})")
+        dataset.prune(engine)
+        return {"contacts": contacts, "seed": args.seed, "signature": loaded, "reused": True}
+    with SessionLocal() as db:
+        existing = db.query(func.count(Contact.id)).scalar() or 0
+    if existing or loaded:
+        raise SystemExit(
+            f"La base ya tiene datos ({loaded or f'{existing} contactos'}) distintos de {dataset.signature}. "
+            "Use --reset para recrearla (se borran todas las tablas)."
+        )
+
+    print(f"🌱 Generando {contacts} contactos, {dataset.searches} búsquedas (semilla {args.seed})")
+    reported = {}
+
+    def progress(table: str, rows: int) -> None:
+        if rows - reported.get(table, 0) >= 100_000:
+            reported[table] = rows
+            print(f"   {table}: {rows} filas")
+
+    start = time.perf_counter()
+    try:
+        tables = dataset.load(engine, method=args.method, progress=progress)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    seconds = time.perf_counter() - start
+    # Estadísticas del planificador al día antes de medir
+    with engine.begin() as connection:
+        if engine.dialect.name == "mysql":
+            for table in inspect(engine).get_table_names():
+                connection.exec_driver_sql(f"ANALYZE TABLE `{table}`")
+        elif engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("ANALYZE")
+    print(f"✅ Dataset cargado en {seconds:.1f}s")
+    return {
+        "contacts": contacts,
+        "seed": args.seed,
+        "signature": dataset.signature,
+        "reused": False,
+        "method": args.method,
+        "seconds": round(seconds, 2),
+        "tables": tables,
+    }
+
+
+def main(argv=None) -> int:
+    args = _parse_args(argv if argv is not None else sys.argv[1:])
+
+    if args.command == "compare":
+        from benchmarks.report import compare
+
+        return min(compare(args.base, args.head, args.threshold), 255)
+
+    database_url = args.database_url or f"sqlite:///bench-{args.size.lower()}.db"
+    if database_url.startswith("sqlite:///") and not database_url.startswith("sqlite:////"):
+        # Ruta absoluta: el servidor de benchmark corre desde Backend2/
+        database_url = "sqlite:///" + os.path.abspath(database_url[len("sqlite:///"):])
+    os.environ["DATABASE_URL"] = database_url
+    # El proceso de benchmark no dispara workflows ni corre tareas de fondo
+    os.environ.setdefault("DEMO_MODE", "false")
+
+    dataset = _prepare_dataset(args)
+    if args.command == "seed":
+        return 0
+
+    from app.database import SessionLocal
+    from benchmarks.load import run_load, start_server, stop_server
+    from benchmarks.micro import run_micro
+    from benchmarks.report import environment, write_report
+
+    suites = {suite.strip() for suite in args.suites.split(",") if suite.strip()}
+    sections = {"dataset": dataset}
+
+    if "micro" in suites:
+        only = [name.strip() for name in args.only.split(",") if name.strip()]
+        try:
+            sections["micro"] = run_micro(SessionLocal, only, args.repeat, args.seed)
+        except ValueError as e:
+            raise SystemExit(str(e))
+
+    if "load" in suites:
+        server = None
+        url = args.url
+        if not url:
+            print(f"🚀 Servidor de benchmark en :{args.port} ({args.workers} workers)")
+            server = start_server(database_url, args.port, args.workers)
+            url = f"http://127.0.0.1:{args.port}"
+        try:
+            print(f"🔥 Escenario de carga: {args.clients} clientes durante {args.duration:.0f}s")
+            sections["load"] = asyncio.run(run_load(url, args.clients, args.duration, args.seed))
+        finally:
+            if server is not None:
+                stop_server(server)
+        scenario = sections["load"]["scenario"]
+        print(
+            f"   {scenario['requests_per_second']} req/s, {scenario['scenarios_per_second']} escenarios/s, "
+            f"{scenario['errors']} errores"
+        )
+
+    if "sessions" in suites:
+        from benchmarks.load import run_session_ab
+
+        print(
+            f"⚖️ Escenario sessions: {args.session_clients} clientes durante {args.duration:.0f}s, "
+            f"sesión síncrona vs AsyncSession"
+        )
+        sections["sessions"] = run_session_ab(
+            database_url, args.port, args.workers, args.session_clients, args.duration, args.seed
+        )
+        for name, scenario in sections["sessions"].items():
+            print(
+                f"   {name}: {scenario['requests_per_second']} req/s, p99 {scenario['p99_ms']} ms, "
+                f"{scenario['errors']} errores"
+            )
+
+    if "webhook" in suites:
+        from benchmarks.dispatch import run_webhook_dispatch
+
+        print(f"📨 Escenario webhook: {args.webhook_requests} POST /searches/ concurrentes, cliente compartido vs uno por disparo")
+        sections["webhook"] = asyncio.run(run_webhook_dispatch(args.webhook_requests, args.webhook_latency_ms))
+        for name, result in sections["webhook"].items():
+            print(
+                f"   {name}: {result['webhooks_per_second']} disparos/s, p99 {result['p99_ms']} ms, "
+                f"{result['connections']} conexiones, {result['errors']} errores"
+            )
+
+    parameters = {
+        "size": args.size.lower(),
+        "seed": args.seed,
+        "repeat": args.repeat,
+        "clients": args.clients,
+        "duration": args.duration,
+        "workers": args.workers,
+        "session_clients": args.session_clients,
+        "webhook_requests": args.webhook_requests,
+        "suites": sorted(suites),
+    }
+    write_report(args.output, environment(database_url), parameters, sections)
+    print(f"📄 Reporte escrito en {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Escenario de disparos a n8n: cliente HTTP compartido vs uno por disparo.
+
+N peticiones POST /searches/ concurrentes (en proceso, con ASGITransport)
+encolan sus disparos; un DispatchWorker los envía a un webhook falso local
+(StubWebhook, HTTP/1.1 keep-alive sobre TCP real) que registra cuándo llega
+cada uno. Se mide, para cada modo:
+
+  • webhook_pooled:      send_n8n_webhook con el cliente compartido
+                         (app/http_client.py)
+  • webhook_per_request: un httpx.AsyncClient nuevo por disparo (conexión,
+                         handshake y cierre en cada uno)
+
+Latencia POST → webhook recibido, disparos por segundo y conexiones TCP
+abiertas contra el webhook.
+"""
+
+import asyncio
+import json
+import time
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.http_client import build_http_client, close_http_client, start_http_client
+from app.services.dispatch_worker import DispatchError, DispatchWorker, send_n8n_webhook
+from benchmarks.report import summarize
+
+# Segundos máximos de espera a que lleguen todos los disparos
+DRAIN_TIMEOUT_SECONDS = 120.0
+
+_RESPONSE = b'{"status":"ok"}'
+
+
+class StubWebhook:
+    """Webhook de n8n falso que responde 200 tras una latencia fija."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.received: Dict[int, float] = {}
+        self.connections = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/webhook/search"
+
+    async def start(self) -> None:
+        """Escuchar en un puerto libre de 127.0.0.1."""
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        """Dejar de escuchar."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def reset(self) -> None:
+        """Olvidar los disparos y conexiones registrados."""
+        self.received.clear()
+        self.connections = 0
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode("latin-1").split("\r\n")[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.received[json.loads(body)["search_id"]] = time.perf_counter()
+
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    b"Content-Length: " + str(len(_RESPONSE)).encode() + b"\r\n\r\n" + _RESPONSE
+                )
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def send_n8n_webhook_new_client(payload: dict) -> Optional[str]:
+    """send_n8n_webhook con un cliente nuevo por disparo (comportamiento anterior al cliente compartido)."""
+    async with build_http_client() as client:
+        try:
+            response = await client.post(settings.N8N_WEBHOOK_URL, json=payload)
+        except httpx.HTTPError as e:
+            raise DispatchError(f"{type(e).__name__}: {e}", retryable=True)
+    if response.status_code >= 400:
+        raise DispatchError(f"HTTP {response.status_code}", retryable=response.status_code >= 500)
+    return None
+
+
+async def _run_mode(app, stub: StubWebhook, sender, mode: str, requests: int) -> dict:
+    stub.reset()
+    worker = DispatchWorker(senders={"n8n": sender}, max_in_flight=requests, poll_interval=0.01)
+    created: Dict[int, float] = {}
+    post_ms: List[float] = []
+    errors = 0
+
+    async def create(client: httpx.AsyncClient, index: int) -> None:
+        nonlocal errors
+        start = time.perf_counter()
+        try:
+            response = await client.post("/searches/", json={
+                "session_id": f"webhook-{mode}",
+                "keywords": f"disparo {mode} {index} {time.time_ns()}",
+                "search_config": {"force_refresh": True, "scraper_backend": "n8n"},
+            })
+        except httpx.HTTPError:
+            errors += 1
+            return
+        post_ms.append((time.perf_counter() - start) * 1000)
+        if response.status_code != 201:
+            errors += 1
+            return
+        created[response.json()["id"]] = start
+
+    await worker.start()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url=f"http://bench{settings.API_PREFIX}", timeout=DRAIN_TIMEOUT_SECONDS
+        ) as client:
+            start = time.perf_counter()
+            await asyncio.gather(*(create(client, index) for index in range(requests)))
+            deadline = start + DRAIN_TIMEOUT_SECONDS
+            while time.perf_counter() < deadline and not created.keys() <= stub.received.keys():
+                await asyncio.sleep(0.01)
+            elapsed = time.perf_counter() - start
+    finally:
+        await worker.stop()
+
+    delivered = [search_id for search_id in created if search_id in stub.received]
+    return {
+        **summarize([(stub.received[search_id] - created[search_id]) * 1000 for search_id in delivered]),
+        "requests": requests,
+        "delivered": len(delivered),
+        "errors": errors + len(created) - len(delivered),
+        "seconds": round(elapsed, 2),
+        "webhooks_per_second": round(len(delivered) / elapsed, 2) if elapsed else 0.0,
+        "connections": stub.connections,
+        "post_p99_ms": summarize(post_ms)["p99_ms"],
+    }
+
+
+async def run_webhook_dispatch(requests: int = 200, latency_ms: float = 20.0) -> Dict[str, dict]:
+    """
+    Comparar el cliente HTTP compartido con uno por disparo.
+
+    Args:
+        requests: POST /searches/ concurrentes por modo
+        latency_ms: Latencia de respuesta del webhook falso
+
+    Returns:
+        Diccionario modo -> latencia POST → webhook (ver summarize),
+        disparos por segundo, errores y conexiones abiertas
+    """
+    from app.database import async_engine
+    from app.main import app
+
+    stub = StubWebhook(latency_ms / 1000)
+    await stub.start()
+    overrides = {
+        "N8N_WEBHOOK_URL": stub.url,
+        # Sin límite de tasa efectivo: se mide el cliente, no el token bucket
+        "DISPATCH_DEFAULT_RATE_LIMIT": requests * 60,
+    }
+    previous = {name: getattr(settings, name) for name in overrides}
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+
+    results = {}
+    try:
+        await start_http_client()
+        for mode, sender in (("pooled", send_n8n_webhook), ("per_request", send_n8n_webhook_new_client)):
+            results[f"webhook_{mode}"] = await _run_mode(app, stub, sender, mode, requests)
+    finally:
+        for name, value in previous.items():
+            setattr(settings, name, value)
+        await close_http_client()
+        await stub.stop()
+        # Las conexiones de aiosqlite viven en hilos que impiden terminar el proceso
+        await async_engine.dispose()
+    return results
@@ -0,0 +1,279 @@
+"""
+Escenario de carga HTTP: crear búsqueda → ingesta de contactos → callback
+de n8n → sondeo del estado → lectura de resultados.
+
+Cada cliente virtual repite el escenario completo hasta agotar la duración
+(el paso de ingesta reemplaza al nodo "Insert Valid Contacts" de n8n). Se
+reporta la latencia de cada paso, las peticiones y escenarios por segundo
+y los errores. start_server() levanta un uvicorn local con la configuración
+de benchmark si no se indica --url.
+
+run_session_ab() repite el escenario contra dos servidores, uno con las
+rutas async sobre AsyncSession y otro con la sesión síncrona en el
+threadpool (DB_ASYNC_SESSIONS=false), para comparar req/s y p99.
+"""
+
+import asyncio
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional
+
+import httpx
+
+from app.config import settings
+from app.services.synthetic_data import POSITIONS, REGIONS, RESEARCH_LINES
+from benchmarks.report import summarize
+
+# Contactos por búsqueda en el paso de ingesta
+CONTACTS_PER_SEARCH = 10
+# Sondeos de GET /searches/{id} antes de dar el escenario por fallido
+MAX_POLLS = 20
+POLL_INTERVAL_SECONDS = 0.05
+
+# Variables de entorno del servidor de benchmark: sin workers de fondo ni
+# disparos reales a n8n
+SERVER_ENV = {
+    "DISPATCH_WORKER_ENABLED": "false",
+    "STATS_RECONCILE_ENABLED": "false",
+    "DEMO_MODE": "false",
+    "RELOAD": "false",
+}
+
+# Variantes de run_session_ab: nombre -> variables de entorno del servidor
+SESSION_VARIANTS = {
+    "sync_session": {"DB_ASYNC_SESSIONS": "false"},
+    "async_session": {"DB_ASYNC_SESSIONS": "true"},
+}
+
+
+class LoadRecorder:
+    """Latencias y errores por paso del escenario."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.status_codes: Dict[str, Counter] = defaultdict(Counter)
+        self.requests = 0
+        self.scenarios = 0
+
+    async def call(self, step: str, request) -> Optional[httpx.Response]:
+        start = time.perf_counter()
+        try:
+            response = await request
+        except httpx.HTTPError as e:
+            self.errors[step] += 1
+            self.status_codes[step][type(e).__name__] += 1
+            return None
+        finally:
+            self.requests += 1
+        self.samples[step].append((time.perf_counter() - start) * 1000)
+        if response.status_code >= 400:
+            self.errors[step] += 1
+            self.status_codes[step][str(response.status_code)] += 1
+            return None
+        return response
+
+
+async def _scenario(client: httpx.AsyncClient, recorder: LoadRecorder, rng: random.Random, user: int) -> None:
+    area = rng.choice([area for area in POSITIONS if area != "General"])
+    region = rng.choice(list(REGIONS))
+    keywords = rng.choice(RESEARCH_LINES[area])
+
+    response = await recorder.call("create_search", client.post("/searches/", json={
+        "keywords": keywords,
+        "area": area,
+        "region": region,
+        "session_id": f"load-{user}",
+        "search_config": {"force_refresh": True},
+    }))
+    if response is None:
+        return
+    search_id = response.json()["id"]
+
+    tag = f"{user}-{search_id}"
+    contacts = [
+        {
+            "name": f"Carga {tag} {index}",
+            "organization": f"Organización {rng.randint(1, 500)}",
+            "position": rng.choice(POSITIONS[area]),
+            "email": f"carga.{tag}.{index}@bench.invalid",
+            "phone": f"+569{rng.randint(10000000, 99999999)}",
+            "region": region,
+            "source_url": f"https://bench.invalid/{tag}/{index}",
+            "source_type": "web",
+        }
+        for index in range(CONTACTS_PER_SEARCH)
+    ]
+    if await recorder.call("ingest_contacts", client.post(
+        "/contacts/bulk", json={"search_id": search_id, "contacts": contacts}
+    )) is None:
+        return
+
+    if await recorder.call("n8n_callback", client.post(
+        f"/searches/{search_id}/callback",
+        json={
+            "search_id": search_id,
+            "status": "completed",
+            "results_count": CONTACTS_PER_SEARCH,
+            "failed_searches": 0,
+            "high_quality_contacts": CONTACTS_PER_SEARCH,
+        },
+        headers={"X-N8N-API-KEY": settings.N8N_API_KEY},
+    )) is None:
+        return
+
+    for _ in range(MAX_POLLS):
+        response = await recorder.call("poll_search", client.get(f"/searches/{search_id}"))
+        if response is None:
+            return
+        if response.json()["status"] == "completed":
+            break
+        await asyncio.sleep(POLL_INTERVAL_SECONDS)
+    else:
+        recorder.errors["poll_search"] += 1
+        recorder.status_codes["poll_search"]["not_completed"] += 1
+        return
+
+    if await recorder.call("get_results", client.get(f"/searches/{search_id}/results")) is None:
+        return
+    recorder.scenarios += 1
+
+
+async def _virtual_user(base_url: str, recorder: LoadRecorder, user: int, deadline: float, seed: int) -> None:
+    rng = random.Random(seed + user)
+    async with httpx.AsyncClient(base_url=base_url, timeout=60.0) as client:
+        while time.perf_counter() < deadline:
+            await _scenario(client, recorder, rng, user)
+
+
+async def run_load(url: str, clients: int, duration: float, seed: int) -> Dict[str, dict]:
+    """
+    Ejecutar el escenario con N clientes concurrentes.
+
+    Args:
+        url: URL base del servidor (sin el prefijo /api/v1)
+        clients: Clientes virtuales concurrentes
+        duration: Segundos de carga
+        seed: Semilla de los datos de cada cliente
+
+    Returns:
+        Diccionario paso -> resumen de latencias (más "scenario" con el
+        throughput, los errores y las latencias de todas las peticiones)
+    """
+    recorder = LoadRecorder()
+    base_url = url.rstrip("/") + settings.API_PREFIX
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(
+        _virtual_user(base_url, recorder, user, deadline, seed) for user in range(clients)
+    ))
+    elapsed = time.perf_counter() - start
+
+    results = {}
+    for step, samples in recorder.samples.items():
+        results[step] = {
+            **summarize(samples),
+            "errors": recorder.errors.get(step, 0),
+            "error_codes": dict(recorder.status_codes.get(step, {})),
+        }
+    results["scenario"] = {
+        **summarize([sample for samples in recorder.samples.values() for sample in samples]),
+        "clients": clients,
+        "seconds": round(elapsed, 2),
+        "requests": recorder.requests,
+        "scenarios": recorder.scenarios,
+        "errors": sum(recorder.errors.values()),
+        "requests_per_second": round(recorder.requests / elapsed, 2) if elapsed else 0.0,
+        "scenarios_per_second": round(recorder.scenarios / elapsed, 2) if elapsed else 0.0,
+    }
+    return results
+
+
+def start_server(
+    database_url: str, port: int, workers: int, env: Optional[Dict[str, str]] = None
+) -> subprocess.Popen:
+    """
+    Levantar uvicorn con la aplicación sobre la base de benchmark.
+
+    Args:
+        database_url: DATABASE_URL del servidor
+        port: Puerto local
+        workers: Procesos de uvicorn
+        env: Variables de entorno adicionales del servidor
+
+    Returns:
+        Proceso del servidor (detener con stop_server)
+
+    Raises:
+        RuntimeError: Si el servidor no responde /health en 30 segundos
+    """
+    env = {**os.environ, **SERVER_ENV, **(env or {}), "DATABASE_URL": database_url}
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "app.main:app",
+            "--host", "127.0.0.1", "--port", str(port),
+            "--workers", str(workers), "--log-level", "warning",
+        ],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"El servidor de benchmark terminó con código {process.returncode}")
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    stop_server(process)
+    raise RuntimeError("El servidor de benchmark no respondió /health")
+
+
+def stop_server(process: subprocess.Popen) -> None:
+    """Detener el servidor de benchmark."""
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_session_ab(
+    database_url: str, port: int, workers: int, clients: int, duration: float, seed: int
+) -> Dict[str, dict]:
+    """
+    Comparar AsyncSession con la sesión síncrona en el threadpool.
+
+    Levanta un servidor por variante (SESSION_VARIANTS), uno después del
+    otro y con la misma semilla, y ejecuta el escenario de carga contra cada
+    uno.
+
+    Args:
+        database_url: DATABASE_URL de los servidores
+        port: Puerto local
+        workers: Procesos de uvicorn
+        clients: Clientes virtuales concurrentes
+        duration: Segundos de carga por variante
+        seed: Semilla de los datos de cada cliente
+
+    Returns:
+        Diccionario variante -> req/s, escenarios/s, errores y latencias
+        (ms) de todas las peticiones
+    """
+    results = {}
+    for name, env in SESSION_VARIANTS.items():
+        server = start_server(database_url, port, workers, env)
+        try:
+            results[name] = asyncio.run(
+                run_load(f"http://127.0.0.1:{port}", clients, duration, seed)
+            )["scenario"]
+        finally:
+            stop_server(server)
+    return results
@@ -0,0 +1,452 @@
+"""
+Micro-benchmarks de los servicios sobre el dataset sintético.
+
+Cada benchmark recibe la sesión y el contexto del dataset y devuelve uno o
+más resultados con nombre (ver report.measure). Se registran con
+@benchmark y se ejecutan en el orden de registro.
+"""
+
+import itertools
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.cache import cache
+from app.config import settings
+from app.metrics import Metrics
+from app.models import Contact, Search, SearchResult
+from app.schemas.contact import ContactCreate
+from app.services.contact_service import ContactService
+from app.services.export_service import ExportService
+from app.services.search_service import SearchService
+from app.services.stats_service import StatsService
+from benchmarks.report import measure, summarize
+
+MICRO_BENCHMARKS: Dict[str, Callable] = {}
+
+
+def benchmark(name: str) -> Callable:
+    """Registrar un micro-benchmark."""
+    def decorator(function: Callable) -> Callable:
+        MICRO_BENCHMARKS[name] = function
+        return function
+
+    return decorator
+
+
+class BenchmarkContext:
+    """Datos del dataset que usan los benchmarks (IDs y muestras reproducibles)."""
+
+    def __init__(self, db: Session, repeat: int, seed: int):
+        self.repeat = repeat
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.contact_count = db.query(func.count(Contact.id)).scalar() or 0
+        self.big_search_id = db.query(SearchResult.search_id).group_by(
+            SearchResult.search_id
+        ).order_by(func.count(SearchResult.contact_id).desc()).limit(1).scalar()
+        # Una búsqueda común (~75 resultados; ver SyntheticDataset.result_rows)
+        self.typical_search_id = db.query(Search.id).filter(
+            Search.status == "completed", Search.id != self.big_search_id
+        ).order_by(Search.id).limit(1).scalar()
+        self.sample_contact_ids: List[int] = [
+            self.rng.randint(1, self.contact_count) for _ in range(min(200, self.contact_count))
+        ]
+        # Cargados en la sesión inicial; después del primer benchmark,
+        # volver a leerlos por sample_contact_ids
+        self.sample_contacts: List[Contact] = [db.get(Contact, contact_id) for contact_id in self.sample_contact_ids]
+
+
+def _scoring_candidates(sample_contacts: List[Contact]) -> List[ContactCreate]:
+    """Contactos nuevos: mitad parecidos a uno existente, mitad únicos."""
+    candidates = []
+    for index, contact in enumerate(sample_contacts):
+        if index % 2:
+            candidates.append(ContactCreate(
+                name=contact.name,
+                organization=contact.organization,
+                position=contact.position,
+                region=contact.region,
+                phone=contact.phone,
+                source_url=f"{contact.source_url}/nuevo",
+            ))
+        else:
+            candidates.append(ContactCreate(
+                name=f"Bench Único {index}",
+                organization="Organización Inexistente",
+                source_url=f"https://bench.invalid/{index}",
+            ))
+    return candidates
+
+
+@benchmark("calculate_validation_score")
+def bench_validation_score(db: Session, context: BenchmarkContext) -> dict:
+    """Score de contactos nuevos: mitad parecidos a uno existente, mitad únicos."""
+    iterator = itertools.cycle(_scoring_candidates(context.sample_contacts))
+    return {"calculate_validation_score": measure(
+        lambda: ContactService.calculate_validation_score(db, next(iterator)), context.repeat
+    )}
+
+
+# Tamaños de tabla de bench_validation_score_scaling
+SCORING_TABLE_SIZES = (1_000, 10_000, 100_000)
+
+
+@benchmark("calculate_validation_score_scaling")
+def bench_validation_score_scaling(db: Session, context: BenchmarkContext) -> dict:
+    """
+    Score de un contacto nuevo con tablas de 1k, 10k y 100k contactos: con el
+    motor por bloques el tiempo debe mantenerse plano al crecer la tabla.
+    Cada tamaño es una base SQLite temporal con el dataset sintético (misma
+    semilla); growth es la mediana del tamaño mayor sobre la del menor.
+    """
+    from app.database import Base
+    from app.services.synthetic_data import SyntheticDataset
+
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in SCORING_TABLE_SIZES:
+            engine = create_engine(f"sqlite:///{os.path.join(directory, f'scoring-{size}.db')}")
+            try:
+                Base.metadata.create_all(engine)
+                SyntheticDataset(size, seed=context.seed).load(engine)
+                with Session(engine) as session:
+                    rng = random.Random(context.seed)
+                    sample = [session.get(Contact, rng.randint(1, size)) for _ in range(200)]
+                    iterator = itertools.cycle(_scoring_candidates(sample))
+                    results[f"calculate_validation_score_{size}"] = {
+                        **measure(lambda: ContactService.calculate_validation_score(session, next(iterator)), context.repeat),
+                        "contacts": size,
+                    }
+            finally:
+                engine.dispose()
+
+    smallest = results[f"calculate_validation_score_{SCORING_TABLE_SIZES[0]}"]["median_ms"]
+    largest = results[f"calculate_validation_score_{SCORING_TABLE_SIZES[-1]}"]
+    largest["growth"] = round(largest["median_ms"] / smallest, 2) if smallest else None
+    return results
+
+
+# Contactos por lote de bench_bulk_create
+BULK_BATCH_SIZE = 100
+BULK_SOURCE_URL = "https://bench.invalid/lote/"
+
+
+@benchmark("bulk_create_contacts")
+def bench_bulk_create(db: Session, context: BenchmarkContext) -> dict:
+    """
+    Lote de 100 contactos (mitad parecidos a uno existente): INSERT multi-fila
+    con bulk_create_contacts vs create_contact fila a fila (meta: 20x más
+    contactos/s). Los contactos creados se borran al terminar.
+    """
+    runs = itertools.count()
+    # Copia de las muestras: sus atributos expiran con cada commit
+    similar = [
+        (contact.name, contact.organization, contact.position, contact.region)
+        for contact in (db.get(Contact, contact_id) for contact_id in context.sample_contact_ids)
+    ]
+
+    def batch() -> List[ContactCreate]:
+        run = next(runs)
+        items = []
+        for index in range(BULK_BATCH_SIZE):
+            name, organization, position, region = (
+                similar[index % len(similar)] if index % 2
+                else (f"Bench Lote {run} {index}", "Organización Inexistente", None, None)
+            )
+            items.append(ContactCreate(
+                name=name,
+                organization=organization,
+                position=position,
+                region=region,
+                email=f"bench.lote.{run}.{index}@example.com",
+                source_url=f"{BULK_SOURCE_URL}{run}/{index}",
+            ))
+        return items
+
+    repeat = max(context.repeat // 10, 3)
+    # Los lotes se validan antes de medir (medición + calentamiento de cada modo)
+    batches = iter([batch() for _ in range(2 * (repeat + 1))])
+
+    def per_row():
+        for item in next(batches):
+            ContactService.create_contact(db, item)
+
+    try:
+        results = {
+            "create_contact_per_row": measure(per_row, repeat),
+            "bulk_create_contacts": measure(lambda: ContactService.bulk_create_contacts(db, next(batches)), repeat),
+        }
+    finally:
+        db.query(Contact).filter(Contact.source_url.like(f"{BULK_SOURCE_URL}%")).delete(synchronize_session=False)
+        db.commit()
+
+    for summary in results.values():
+        summary["contacts_per_second"] = round(BULK_BATCH_SIZE / summary["median_ms"] * 1000) if summary["median_ms"] else None
+    per_row_ms, bulk_ms = results["create_contact_per_row"]["median_ms"], results["bulk_create_contacts"]["median_ms"]
+    results["bulk_create_contacts"]["speedup"] = round(per_row_ms / bulk_ms, 1) if bulk_ms else None
+    return results
+
+
+@benchmark("get_search_results")
+def bench_search_results(db: Session, context: BenchmarkContext) -> dict:
+    """Resultados de una búsqueda típica y de la búsqueda de 5k resultados (todos y con ?fields=)."""
+    slim = SearchService.parse_result_fields("contact_id,contact_name,validation_score")
+    return {
+        "get_search_results": measure(
+            lambda: SearchService.get_search_results(db, context.typical_search_id), context.repeat
+        ),
+        "get_search_results_5k": measure(
+            lambda: SearchService.get_search_results(db, context.big_search_id), max(context.repeat // 5, 3)
+        ),
+        "get_search_results_5k_slim": measure(
+            lambda: SearchService.get_search_results(db, context.big_search_id, fields=slim),
+            max(context.repeat // 5, 3)
+        ),
+    }
+
+
+@benchmark("get_contacts_by_region")
+def bench_contacts_by_region(db: Session, context: BenchmarkContext) -> dict:
+    """
+    Agregado por región y área: consulta directa y tablas de resumen de /stats
+    (fuera de MySQL no hay triggers y el resumen se recalcula en cada lectura).
+    """
+    StatsService.reconcile(db)
+    return {
+        "get_contacts_by_region": measure(
+            lambda: ContactService.get_contacts_by_region(db), max(context.repeat // 10, 3)
+        ),
+        "stats_contacts_by_region": measure(
+            lambda: StatsService.get_contacts_by_region(db), context.repeat
+        ),
+    }
+
+
+@benchmark("search_contacts")
+def bench_search_contacts(db: Session, context: BenchmarkContext) -> dict:
+    """Búsqueda de texto: apellido frecuente, organización, prefijo y línea de investigación."""
+    terms = ["gonzález", "universidad concepción", "ingenier", "machine learning", "hidrógeno verde"]
+    iterator = itertools.cycle(terms)
+    return {
+        "search_contacts": measure(
+            lambda: ContactService.search_contacts(db, next(iterator), limit=20), context.repeat
+        ),
+        "search_contacts_no_total": measure(
+            lambda: ContactService.search_contacts(db, next(iterator), limit=20, total_mode="none"),
+            context.repeat
+        ),
+    }
+
+
+@benchmark("get_contacts_pages")
+def bench_contact_pages(db: Session, context: BenchmarkContext) -> dict:
+    """Listado de contactos: página 1, página 500 con offset y con cursor (keyset)."""
+    limit = 20
+    deep_page = min(500, max(context.contact_count // limit - 1, 1))
+    cursor = None
+    for _ in range(deep_page):
+        _, _, cursor = ContactService.get_contacts(db, limit=limit, cursor=cursor, total_mode="none")
+    return {
+        "get_contacts_page_1": measure(
+            lambda: ContactService.get_contacts(db, limit=limit, total_mode="none"), context.repeat
+        ),
+        "get_contacts_page_500_offset": measure(
+            lambda: ContactService.get_contacts(db, skip=deep_page * limit, limit=limit, total_mode="none"),
+            context.repeat
+        ),
+        "get_contacts_page_500_cursor": measure(
+            lambda: ContactService.get_contacts(db, limit=limit, cursor=cursor, total_mode="none"),
+            context.repeat
+        ),
+    }
+
+
+@benchmark("get_search_response_cache")
+def bench_search_cache(db: Session, context: BenchmarkContext) -> dict:
+    """Detalle de búsqueda sin caché (invalidada antes de cada lectura) y desde la caché."""
+    search_id = context.typical_search_id
+
+    def cold():
+        cache.invalidate("search", search_id)
+        return SearchService.get_search_response(db, search_id)
+
+    return {
+        "get_search_response_cold": measure(cold, context.repeat),
+        "get_search_response_cached": measure(
+            lambda: SearchService.get_search_response(db, search_id), context.repeat
+        ),
+    }
+
+
+@benchmark("export_contacts")
+def bench_export(db: Session, context: BenchmarkContext) -> dict:
+    """Exportación CSV de todos los contactos: duración, filas/s y memoria máxima de Python."""
+    session_factory = sessionmaker(bind=db.get_bind(), autoflush=False)
+
+    def run() -> int:
+        total = 0
+        for chunk in ExportService.stream_with_session(
+            ExportService.contact_rows, "csv", session_factory=session_factory
+        ):
+            total += len(chunk)
+        return total
+
+    start = time.perf_counter()
+    size = run()
+    seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    try:
+        run()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"export_contacts_csv": {
+        "runs": 1,
+        "median_ms": round(seconds * 1000, 1),
+        "rows_per_second": round(context.contact_count / seconds) if seconds else None,
+        "bytes": size,
+        "peak_memory_mb": round(peak / 1024 / 1024, 2),
+    }}
+
+
+@benchmark("metrics_overhead")
+def bench_metrics_overhead(db: Session, context: BenchmarkContext) -> dict:
+    """Costo por sentencia de los hooks de app.metrics (motor sin instrumentar vs instrumentado)."""
+    statement = select(Contact.id, Contact.name).where(Contact.id == 1)
+    results = {}
+    for name, instrumented in (("query_plain", False), ("query_instrumented", True)):
+        engine = create_engine(settings.database_url, **_engine_options())
+        if instrumented:
+            Metrics(
+                slow_query_top=settings.METRICS_SLOW_QUERY_TOP,
+                slow_query_min_seconds=settings.METRICS_SLOW_QUERY_MIN_MS / 1000,
+            ).instrument(engine)
+        with engine.connect() as connection:
+            results[name] = measure(lambda: connection.execute(statement).all(), context.repeat * 10)
+        engine.dispose()
+    return results
+
+
+@benchmark("metrics_middleware")
+def bench_metrics_middleware(db: Session, context: BenchmarkContext) -> dict:
+    """
+    Petición completa en proceso (TestClient) con y sin MetricsMiddleware y
+    hooks de consultas: resultados de una búsqueda típica y búsqueda de
+    contactos por texto (meta: < 2% de diferencia en la mediana). Las
+    peticiones de ambos modos se alternan para que la deriva del sistema
+    afecte a los dos por igual.
+    """
+    from fastapi.testclient import TestClient
+
+    from app.database import get_db
+    from app.main import app
+    from app.metrics import MetricsMiddleware
+
+    paths = {
+        "search_results": (f"{settings.API_PREFIX}/searches/{context.typical_search_id}/results", context.repeat * 4),
+        "search_contacts": (f"{settings.API_PREFIX}/contacts/search?q=universidad&limit=20", context.repeat),
+    }
+    user_middleware = list(app.user_middleware)
+    engines, clients = {}, {}
+    current = {}
+
+    def get_bench_db():
+        session = current["factory"]()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    try:
+        # Sin lifespan: no se inician los workers de la aplicación
+        app.dependency_overrides[get_db] = get_bench_db
+        for mode, instrumented in (("plain", False), ("instrumented", True)):
+            engines[mode] = create_engine(settings.database_url, **_engine_options())
+            if instrumented:
+                Metrics(
+                    slow_query_top=settings.METRICS_SLOW_QUERY_TOP,
+                    slow_query_min_seconds=settings.METRICS_SLOW_QUERY_MIN_MS / 1000,
+                ).instrument(engines[mode])
+            app.user_middleware = user_middleware if instrumented else [
+                middleware for middleware in user_middleware if middleware.cls is not MetricsMiddleware
+            ]
+            clients[mode] = (TestClient(app.build_middleware_stack()), sessionmaker(bind=engines[mode], autoflush=False))
+
+        results = {}
+        for name, (path, repeat) in paths.items():
+            samples = {mode: [] for mode in clients}
+            for index in range(repeat + 1):
+                for mode in (("plain", "instrumented") if index % 2 else ("instrumented", "plain")):
+                    client, current["factory"] = clients[mode]
+                    start = time.perf_counter()
+                    client.get(path)
+                    if index:
+                        samples[mode].append((time.perf_counter() - start) * 1000)
+            for mode, values in samples.items():
+                results[f"request_{name}_{mode}"] = summarize(values)
+            plain = results[f"request_{name}_plain"]["median_ms"]
+            instrumented = results[f"request_{name}_instrumented"]
+            instrumented["overhead_pct"] = round((instrumented["median_ms"] - plain) / plain * 100, 2) if plain else None
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        app.user_middleware = user_middleware
+        for engine in engines.values():
+            engine.dispose()
+    return results
+
+
+def _engine_options() -> dict:
+    if settings.database_url.startswith("sqlite"):
+        return {"connect_args": {"check_same_thread": False}}
+    return {}
+
+
+def run_micro(session_factory, names: List[str], repeat: int, seed: int) -> Dict[str, dict]:
+    """
+    Ejecutar los micro-benchmarks.
+
+    Args:
+        session_factory: Fábrica de sesiones sobre la base con el dataset
+        names: Benchmarks a ejecutar (vacío = todos)
+        repeat: Repeticiones por benchmark
+        seed: Semilla de las muestras
+
+    Returns:
+        Diccionario nombre -> resumen de tiempos
+
+    Raises:
+        ValueError: Si un nombre no corresponde a un benchmark
+    """
+    unknown = set(names) - set(MICRO_BENCHMARKS)
+    if unknown:
+        raise ValueError(
+            f"Benchmarks desconocidos: {', '.join(sorted(unknown))}. "
+            f"Disponibles: {', '.join(MICRO_BENCHMARKS)}"
+        )
+
+    results: Dict[str, dict] = {}
+    db = session_factory()
+    try:
+        context = BenchmarkContext(db, repeat, seed)
+        for name, function in MICRO_BENCHMARKS.items():
+            if names and name not in names:
+                continue
+            print(f"⏱️ {name}...")
+            for result_name, summary in function(db, context).items():
+                results[result_name] = summary
+                print(f"   {result_name}: {summary['median_ms']} ms (mediana)")
+            # Cada benchmark parte sin lecturas cacheadas ni objetos en la sesión
+            db.rollback()
+            db.expunge_all()
+    finally:
+        db.close()
+    return results
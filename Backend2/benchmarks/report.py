@@ -0,0 +1,177 @@
+"""
+Estadísticas de tiempos y reporte JSON de los benchmarks.
+
+El reporte guarda el commit, el entorno y los resultados de cada
+benchmark; compare() contrasta dos reportes (p. ej. main vs una rama) y
+marca las regresiones que superan un umbral.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+REPORT_VERSION = 1
+
+# Métricas que se comparan en cada sección y si "más alto es mejor"
+COMPARE_METRICS = {
+    "micro": [("median_ms", False), ("peak_memory_mb", False)],
+    "load": [("p99_ms", False), ("requests_per_second", True)],
+    "webhook": [("p99_ms", False), ("webhooks_per_second", True)],
+    "sessions": [("p99_ms", False), ("requests_per_second", True)],
+}
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Percentil por el método del rango más cercano (values ordenados)."""
+    if not values:
+        return 0.0
+    index = max(int(round(fraction * len(values) + 0.5)) - 1, 0)
+    return values[min(index, len(values) - 1)]
+
+
+def summarize(samples_ms: List[float]) -> dict:
+    """
+    Resumir una lista de tiempos.
+
+    Args:
+        samples_ms: Duraciones en milisegundos
+
+    Returns:
+        runs, min, median, mean, p95, p99 y max (ms)
+    """
+    values = sorted(samples_ms)
+    return {
+        "runs": len(values),
+        "min_ms": round(values[0], 4) if values else 0.0,
+        "median_ms": round(statistics.median(values), 4) if values else 0.0,
+        "mean_ms": round(statistics.fmean(values), 4) if values else 0.0,
+        "p95_ms": round(percentile(values, 0.95), 4),
+        "p99_ms": round(percentile(values, 0.99), 4),
+        "max_ms": round(values[-1], 4) if values else 0.0,
+    }
+
+
+def measure(function: Callable[[], object], repeat: int, warmup: int = 1) -> dict:
+    """
+    Medir una función varias veces.
+
+    Args:
+        function: Función sin argumentos a medir
+        repeat: Ejecuciones medidas
+        warmup: Ejecuciones previas descartadas (caches, planes de consulta)
+
+    Returns:
+        Resumen de tiempos (ver summarize)
+    """
+    for _ in range(warmup):
+        function()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - start) * 1000)
+    return summarize(samples)
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(database_url: str) -> dict:
+    """Commit, plataforma y base de datos de la ejecución."""
+    dirty = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "commit_subject": _git("log", "-1", "--format=%s"),
+        "dirty": bool(dirty) if dirty is not None else None,
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        # Sin credenciales
+        "database": database_url.split("://", 1)[0] + "://" + database_url.rsplit("@", 1)[-1].split("://", 1)[-1],
+    }
+
+
+def write_report(path: str, env: dict, parameters: dict, sections: Dict[str, dict]) -> dict:
+    """
+    Escribir el reporte JSON.
+
+    Args:
+        path: Archivo destino
+        env: Resultado de environment()
+        parameters: Tamaño, semilla, repeticiones, etc.
+        sections: dataset / micro / load
+
+    Returns:
+        Reporte escrito
+    """
+    report = {
+        "version": REPORT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "environment": env,
+        "parameters": parameters,
+        **sections,
+    }
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2, ensure_ascii=False, default=str)
+    return report
+
+
+def compare(base_path: str, head_path: str, threshold: float = 0.10) -> int:
+    """
+    Comparar dos reportes e imprimir la variación de cada benchmark.
+
+    Args:
+        base_path: Reporte de referencia
+        head_path: Reporte a evaluar
+        threshold: Variación relativa desde la que se marca una regresión
+
+    Returns:
+        Cantidad de regresiones (código de salida del comando compare)
+    """
+    with open(base_path, encoding="utf-8") as file:
+        base = json.load(file)
+    with open(head_path, encoding="utf-8") as file:
+        head = json.load(file)
+
+    if base.get("parameters", {}).get("size") != head.get("parameters", {}).get("size"):
+        print("⚠️ Los reportes usan tamaños de dataset distintos; la comparación no es válida")
+
+    print(f"base: {base['environment'].get('commit')}  {base['environment'].get('commit_subject')}")
+    print(f"head: {head['environment'].get('commit')}  {head['environment'].get('commit_subject')}")
+
+    regressions = 0
+    for section, metrics in COMPARE_METRICS.items():
+        base_results = base.get(section) or {}
+        head_results = head.get(section) or {}
+        names = [name for name in head_results if name in base_results]
+        if not names:
+            continue
+        print(f"\n{section}")
+        for name in names:
+            for metric, higher_is_better in metrics:
+                before = base_results[name].get(metric)
+                after = head_results[name].get(metric)
+                if not before or after is None:
+                    continue
+                change = (after - before) / before
+                worse = change < -threshold if higher_is_better else change > threshold
+                better = change > threshold if higher_is_better else change < -threshold
+                mark = "❌" if worse else ("✅" if better else "  ")
+                regressions += worse
+                print(f"{mark} {name + ' ' + metric:<48} {before:>12.3f} → {after:>12.3f}  ({change:+.1%})")
+
+    print(f"\n{regressions} regresiones sobre {threshold:.0%}")
+    return regressions
@@ -17,6 +17,14 @@ SELECT '
 ║    3. HU 2.3 - Prevención de duplicados + Índices + Triggers              ║
 ║    4. HU 2.4 - Vistas para consultas                                      ║
 ║    5. HU 2.5 - Pruebas de integridad                                      ║
+║    6. HU 2.6 - Claves normalizadas para duplicados                        ║
+║    7. HU 2.7 - Cola de disparos hacia n8n                                 ║
+║    8. HU 2.8 - Caché de búsquedas por criterios                           ║
+║    9. HU 2.9 - Índices para paginación por cursor                         ║
+║   10. HU 2.10 - Búsqueda FULLTEXT de contactos                            ║
+║   11. HU 2.11 - Tablas de resumen para estadísticas                       ║
+║   12. HU 2.12 - Resultados incrementales de búsquedas                     ║
+║   13. HU 2.13 - Recálculo masivo de scores                                ║
 ╚════════════════════════════════════════════════════════════════════════════╝
 ' as titulo;
 
@@ -78,6 +86,94 @@ SELECT '
 
 source /docker-entrypoint-initdb.d/2.5SQL.sql;
 
+-- ============================================================================
+-- HU 2.6: CLAVES NORMALIZADAS PARA DETECCIÓN DE DUPLICADOS
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.6 - Claves normalizadas para duplicados                  │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_6;
+
+source /docker-entrypoint-initdb.d/2.6SQL.sql;
+
+-- ============================================================================
+-- HU 2.7: COLA DE DISPAROS HACIA N8N
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.7 - Cola de disparos hacia n8n                           │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_7;
+
+source /docker-entrypoint-initdb.d/2.7SQL.sql;
+
+-- ============================================================================
+-- HU 2.8: CACHÉ DE BÚSQUEDAS POR CRITERIOS
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.8 - Caché de búsquedas por criterios                     │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_8;
+
+source /docker-entrypoint-initdb.d/2.8SQL.sql;
+
+-- ============================================================================
+-- HU 2.9: ÍNDICES PARA PAGINACIÓN POR CURSOR
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.9 - Índices para paginación por cursor                   │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_9;
+
+source /docker-entrypoint-initdb.d/2.9SQL.sql;
+
+-- ============================================================================
+-- HU 2.10: BÚSQUEDA FULLTEXT DE CONTACTOS
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.10 - Búsqueda FULLTEXT de contactos                      │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_10;
+
+source /docker-entrypoint-initdb.d/2.10SQL.sql;
+
+-- ============================================================================
+-- HU 2.11: TABLAS DE RESUMEN PARA ESTADÍSTICAS
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.11 - Tablas de resumen para estadísticas                 │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_11;
+
+source /docker-entrypoint-initdb.d/2.11SQL.sql;
+
+-- ============================================================================
+-- HU 2.12: RESULTADOS INCREMENTALES DE BÚSQUEDAS
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.12 - Resultados incrementales de búsquedas               │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_12;
+
+source /docker-entrypoint-initdb.d/2.12SQL.sql;
+
+-- ============================================================================
+-- HU 2.13: RECÁLCULO MASIVO DE SCORES
+-- ============================================================================
+SELECT '
+┌────────────────────────────────────────────────────────────────────────────┐
+│ EJECUTANDO: HU 2.13 - Recálculo masivo de scores                          │
+└────────────────────────────────────────────────────────────────────────────┘
+' as paso_13;
+
+source /docker-entrypoint-initdb.d/2.13SQL.sql;
+
 -- ============================================================================
 -- RESUMEN FINAL
 -- ============================================================================
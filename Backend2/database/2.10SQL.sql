@@ -0,0 +1,254 @@
+-- ======================================================
+-- HU 2.10: Búsqueda FULLTEXT de contactos
+-- ======================================================
+--
+-- La búsqueda de contactos usaba tres ILIKE '%término%' (nombre, email,
+-- organización), que no pueden usar índices B-tree: cada búsqueda recorría
+-- la tabla completa.
+--
+-- Ahora cada contacto guarda en search_document su nombre, email,
+-- organización, cargo y líneas de investigación en minúsculas y sin tildes,
+-- indexado con un FULLTEXT con parser ngram para coincidir con partes de
+-- palabras. La API lo escribe al crear y actualizar contactos; los triggers
+-- de esta HU lo completan en las escrituras directas (p. ej. desde n8n).
+--
+-- fn_search_document replica build_search_document (contact_search.py):
+-- mismos campos, líneas de investigación unidas con espacios y el mismo
+-- plegado de tildes que NFKD para el alfabeto latino (Latin-1, Latin
+-- Extendido A/B y Latin Extendido Adicional). Letras de otros alfabetos
+-- (griego, cirílico) solo pasan a minúsculas: para esos contactos el
+-- documento de la API y el de SQL pueden diferir.
+--
+-- Los términos de una sola letra no generan n-gramas: la API los filtra con
+-- LIKE sobre search_document junto al MATCH de los demás términos.
+--
+-- Las stopwords se desactivan antes de crear el índice: con ngram se
+-- descartaría todo bigrama que sea stopword ("in", "de", "la"...), y
+-- "martinez" no se encontraría por "tin".
+--
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.10: BÚSQUEDA FULLTEXT DE CONTACTOS ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- 1. COLUMNA search_document
+-- ------------------------------------------------------
+ALTER TABLE contacts
+ADD COLUMN search_document TEXT NULL;
+
+-- ------------------------------------------------------
+-- 2. FUNCIONES DE NORMALIZACIÓN (minúsculas y sin tildes)
+-- ------------------------------------------------------
+DROP FUNCTION IF EXISTS fn_search_document;
+DROP FUNCTION IF EXISTS fn_join_research_lines;
+DROP FUNCTION IF EXISTS fn_fold_accents;
+DROP FUNCTION IF EXISTS fn_replace_chars;
+
+DELIMITER $$
+
+-- Reemplazar cada carácter de chars por replacement
+CREATE FUNCTION fn_replace_chars(txt TEXT, chars VARCHAR(255), replacement VARCHAR(8))
+RETURNS TEXT
+DETERMINISTIC
+BEGIN
+    DECLARE i INT DEFAULT 1;
+    WHILE txt IS NOT NULL AND i <= CHAR_LENGTH(chars) DO
+        SET txt = REPLACE(txt, SUBSTRING(chars, i, 1), replacement);
+        SET i = i + 1;
+    END WHILE;
+    RETURN txt;
+END$$
+
+-- Equivalente de fold_accents (NFKD sin marcas combinantes) para el
+-- alfabeto latino; tabla generada desde unicodedata
+CREATE FUNCTION fn_fold_accents(txt TEXT)
+RETURNS TEXT
+DETERMINISTIC
+BEGIN
+    IF txt IS NULL THEN
+        RETURN NULL;
+    END IF;
+    SET txt = LOWER(txt);
+    -- Solo ASCII: nada que plegar
+    IF CHAR_LENGTH(txt) = LENGTH(txt) THEN
+        RETURN txt;
+    END IF;
+    -- Marcas combinantes sueltas (texto ya descompuesto)
+    SET txt = REGEXP_REPLACE(txt, '[\\x{0300}-\\x{036F}]', '');
+    SET txt = REPLACE(txt, CHAR(0xC2A0 USING utf8mb4), ' ');
+    SET txt = fn_replace_chars(txt, 'ªàáâãäåāăąǎǟǡǻȁȃȧḁạảấầẩẫậắằẳẵặ', 'a');
+    SET txt = fn_replace_chars(txt, 'ḃḅḇ', 'b');
+    SET txt = fn_replace_chars(txt, 'çćĉċčḉ', 'c');
+    SET txt = fn_replace_chars(txt, 'ďḋḍḏḑḓ', 'd');
+    SET txt = fn_replace_chars(txt, 'èéêëēĕėęěȅȇȩḕḗḙḛḝẹẻẽếềểễệ', 'e');
+    SET txt = fn_replace_chars(txt, 'ḟ', 'f');
+    SET txt = fn_replace_chars(txt, 'ĝğġģǧǵḡ', 'g');
+    SET txt = fn_replace_chars(txt, 'ĥȟḣḥḧḩḫẖ', 'h');
+    SET txt = fn_replace_chars(txt, 'ìíîïĩīĭįǐȉȋḭḯỉị', 'i');
+    SET txt = fn_replace_chars(txt, 'ĵǰ', 'j');
+    SET txt = fn_replace_chars(txt, 'ķǩḱḳḵ', 'k');
+    SET txt = fn_replace_chars(txt, 'ĺļľḷḹḻḽ', 'l');
+    SET txt = fn_replace_chars(txt, 'ḿṁṃ', 'm');
+    SET txt = fn_replace_chars(txt, 'ñńņňǹṅṇṉṋ', 'n');
+    SET txt = fn_replace_chars(txt, 'ºòóôõöōŏőơǒǫǭȍȏȫȭȯȱṍṏṑṓọỏốồổỗộớờởỡợ', 'o');
+    SET txt = fn_replace_chars(txt, 'ṕṗ', 'p');
+    SET txt = fn_replace_chars(txt, 'ŕŗřȑȓṙṛṝṟ', 'r');
+    SET txt = fn_replace_chars(txt, 'śŝşšſșṡṣṥṧṩẛ', 's');
+    SET txt = fn_replace_chars(txt, 'ţťțṫṭṯṱẗ', 't');
+    SET txt = fn_replace_chars(txt, 'ùúûüũūŭůűųưǔǖǘǚǜȕȗṳṵṷṹṻụủứừửữự', 'u');
+    SET txt = fn_replace_chars(txt, 'ṽṿ', 'v');
+    SET txt = fn_replace_chars(txt, 'ŵẁẃẅẇẉẘ', 'w');
+    SET txt = fn_replace_chars(txt, 'ẋẍ', 'x');
+    SET txt = fn_replace_chars(txt, 'ýÿŷȳẏẙỳỵỷỹ', 'y');
+    SET txt = fn_replace_chars(txt, 'źżžẑẓẕ', 'z');
+    SET txt = fn_replace_chars(txt, 'ǣǽ', 'æ');
+    SET txt = fn_replace_chars(txt, 'ǿ', 'ø');
+    SET txt = fn_replace_chars(txt, 'ǯ', 'ʒ');
+    SET txt = fn_replace_chars(txt, 'µ', 'μ');
+    SET txt = fn_replace_chars(txt, '¨¯´¸', ' ');
+    SET txt = fn_replace_chars(txt, '¹', '1');
+    SET txt = fn_replace_chars(txt, '½', '1⁄2');
+    SET txt = fn_replace_chars(txt, '¼', '1⁄4');
+    SET txt = fn_replace_chars(txt, '²', '2');
+    SET txt = fn_replace_chars(txt, '³', '3');
+    SET txt = fn_replace_chars(txt, '¾', '3⁄4');
+    SET txt = fn_replace_chars(txt, 'ẚ', 'aʾ');
+    SET txt = fn_replace_chars(txt, 'ǆǳ', 'dz');
+    SET txt = fn_replace_chars(txt, 'ĳ', 'ij');
+    SET txt = fn_replace_chars(txt, 'ǉ', 'lj');
+    SET txt = fn_replace_chars(txt, 'ŀ', 'l·');
+    SET txt = fn_replace_chars(txt, 'ǌ', 'nj');
+    SET txt = fn_replace_chars(txt, 'ŉ', 'ʼn');
+    RETURN txt;
+END$$
+
+-- Líneas de investigación unidas con espacios, sin las vacías
+-- (" ".join(line for line in research_lines if line) en Python)
+CREATE FUNCTION fn_join_research_lines(lines JSON)
+RETURNS TEXT
+DETERMINISTIC
+BEGIN
+    DECLARE i INT DEFAULT 0;
+    DECLARE item JSON;
+    DECLARE joined TEXT DEFAULT NULL;
+
+    IF lines IS NULL OR JSON_TYPE(lines) = 'NULL' THEN
+        RETURN NULL;
+    END IF;
+    IF JSON_TYPE(lines) <> 'ARRAY' THEN
+        RETURN NULLIF(JSON_UNQUOTE(lines), '');
+    END IF;
+
+    WHILE i < JSON_LENGTH(lines) DO
+        SET item = JSON_EXTRACT(lines, CONCAT('$[', i, ']'));
+        IF JSON_TYPE(item) <> 'NULL' AND JSON_UNQUOTE(item) <> '' THEN
+            SET joined = CONCAT_WS(' ', joined, JSON_UNQUOTE(item));
+        END IF;
+        SET i = i + 1;
+    END WHILE;
+    RETURN joined;
+END$$
+
+-- Equivalente de build_search_document
+CREATE FUNCTION fn_search_document(
+    p_name VARCHAR(255),
+    p_email VARCHAR(255),
+    p_organization VARCHAR(255),
+    p_position VARCHAR(255),
+    p_research_lines JSON
+)
+RETURNS TEXT
+DETERMINISTIC
+BEGIN
+    RETURN NULLIF(fn_fold_accents(CONCAT_WS(' ',
+        NULLIF(p_name, ''),
+        NULLIF(p_email, ''),
+        NULLIF(p_organization, ''),
+        NULLIF(p_position, ''),
+        fn_join_research_lines(p_research_lines)
+    )), '');
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Funciones fn_fold_accents y fn_search_document creadas' as resultado;
+
+-- ------------------------------------------------------
+-- 3. TRIGGERS (escrituras que no pasan por la API)
+-- ------------------------------------------------------
+-- Triggers propios en vez de recrear before_contact_insert_validate /
+-- before_contact_update: HU posteriores recrean esos dos sin tener que
+-- repetir este bloque.
+DROP TRIGGER IF EXISTS before_contact_insert_search;
+DROP TRIGGER IF EXISTS before_contact_update_search;
+
+DELIMITER $$
+
+CREATE TRIGGER before_contact_insert_search
+BEFORE INSERT ON contacts
+FOR EACH ROW
+BEGIN
+    IF NEW.search_document IS NULL THEN
+        SET NEW.search_document = fn_search_document(
+            NEW.name, NEW.email, NEW.organization, NEW.position, NEW.research_lines
+        );
+    END IF;
+END$$
+
+CREATE TRIGGER before_contact_update_search
+BEFORE UPDATE ON contacts
+FOR EACH ROW
+BEGIN
+    -- Si la sentencia ya trae el documento (la API), se respeta
+    IF NEW.search_document <=> OLD.search_document
+       AND NOT (NEW.name <=> OLD.name
+                AND NEW.email <=> OLD.email
+                AND NEW.organization <=> OLD.organization
+                AND NEW.position <=> OLD.position
+                AND NEW.research_lines <=> OLD.research_lines) THEN
+        SET NEW.search_document = fn_search_document(
+            NEW.name, NEW.email, NEW.organization, NEW.position, NEW.research_lines
+        );
+    END IF;
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Triggers de search_document creados' as resultado;
+
+-- ------------------------------------------------------
+-- 4. BACKFILL DE CONTACTOS EXISTENTES
+-- ------------------------------------------------------
+-- Sin tocar updated_at (ver HU 2.6)
+SET @skip_contact_touch = 1;
+UPDATE contacts
+SET search_document = fn_search_document(name, email, organization, position, research_lines);
+SET @skip_contact_touch = NULL;
+
+-- ------------------------------------------------------
+-- 5. ÍNDICE FULLTEXT (ngram, sin stopwords)
+-- ------------------------------------------------------
+SET SESSION innodb_ft_enable_stopword = OFF;
+
+ALTER TABLE contacts
+ADD FULLTEXT INDEX ft_contacts_search_document (search_document) WITH PARSER ngram;
+
+SET SESSION innodb_ft_enable_stopword = ON;
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.10 COMPLETADA ===' as mensaje;
+SELECT
+    COUNT(*) AS total_contactos,
+    SUM(search_document IS NOT NULL) AS con_documento
+FROM contacts;
+SELECT INDEX_NAME, INDEX_TYPE, GROUP_CONCAT(COLUMN_NAME) AS columnas
+FROM information_schema.STATISTICS
+WHERE TABLE_SCHEMA = 'expert_finder_db'
+  AND TABLE_NAME = 'contacts'
+  AND INDEX_NAME = 'ft_contacts_search_document'
+GROUP BY INDEX_NAME, INDEX_TYPE;
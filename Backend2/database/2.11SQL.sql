@@ -0,0 +1,409 @@
+-- ======================================================
+-- HU 2.11: Tablas de resumen para /stats
+-- ======================================================
+--
+-- Los endpoints de estadísticas agregaban las tablas completas en cada
+-- petición (siete consultas en /stats/summary, un JOIN contacts ×
+-- search_results × searches con GROUP BY en /stats/by-region). Ahora leen
+-- dos tablas de resumen mantenidas por triggers:
+--
+--   • stats_counters:    métrica + dimensión → valor
+--       searches_total, searches_by_status (estado), contacts_valid,
+--       contacts_invalid, contacts_high_quality (score >= 0.8),
+--       contacts_by_region (región), contacts_by_quality (rango),
+--       results_total
+--   • stats_region_area: contactos válidos por región × área
+--                        (cantidad, suma de scores, última actualización)
+--
+-- Contadores por franjas: cada celda (métrica + dimensión, región × área)
+-- tiene hasta 16 filas (shard = CONNECTION_ID() % 16) y los endpoints leen
+-- la suma. Dos ingestas concurrentes (conexiones distintas) actualizan
+-- filas distintas, en lugar de esperar el bloqueo de la misma fila caliente
+-- (p. ej. contacts_valid o results_total) hasta el commit de la otra, y no
+-- se bloquean en orden cruzado (deadlock) por las celdas de región.
+--
+-- Los borrados en cascada no disparan triggers en MySQL, por eso los
+-- borrados de contactos y búsquedas descuentan sus resultados en un
+-- BEFORE DELETE. El backend recalcula ambas tablas periódicamente
+-- (StatsService.reconcile) para corregir cualquier desviación.
+--
+-- Los rangos de calidad deben coincidir con QUALITY_BUCKETS en
+-- app/services/stats_service.py.
+--
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.11: TABLAS DE RESUMEN DE ESTADÍSTICAS ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- 1. TABLAS
+-- ------------------------------------------------------
+CREATE TABLE IF NOT EXISTS stats_counters (
+    metric VARCHAR(50) NOT NULL,
+    dimension VARCHAR(200) NOT NULL DEFAULT '',
+    shard TINYINT UNSIGNED NOT NULL DEFAULT 0,
+    value BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    PRIMARY KEY (metric, dimension, shard)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS stats_region_area (
+    region VARCHAR(100) NOT NULL DEFAULT '',
+    area VARCHAR(100) NOT NULL DEFAULT '',
+    shard TINYINT UNSIGNED NOT NULL DEFAULT 0,
+    total_contacts BIGINT NOT NULL DEFAULT 0,
+    score_sum DECIMAL(14,2) NOT NULL DEFAULT 0,
+    last_updated TIMESTAMP NULL,
+    PRIMARY KEY (region, area, shard)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+SELECT '   ✅ Tablas stats_counters y stats_region_area creadas' as resultado;
+
+-- ------------------------------------------------------
+-- 2. FUNCIONES Y PROCEDIMIENTOS AUXILIARES
+-- ------------------------------------------------------
+DROP FUNCTION IF EXISTS fn_quality_bucket;
+DROP PROCEDURE IF EXISTS sp_stats_add;
+DROP PROCEDURE IF EXISTS sp_stats_region_area;
+DROP PROCEDURE IF EXISTS sp_stats_contact;
+DROP PROCEDURE IF EXISTS sp_stats_contact_results;
+DROP PROCEDURE IF EXISTS sp_stats_search_results;
+
+DELIMITER $$
+
+CREATE FUNCTION fn_quality_bucket(p_score DECIMAL(3,2))
+RETURNS VARCHAR(50)
+DETERMINISTIC
+BEGIN
+    RETURN CASE
+        WHEN p_score >= 0.9 THEN 'Excelente (0.9-1.0)'
+        WHEN p_score >= 0.7 THEN 'Bueno (0.7-0.89)'
+        WHEN p_score >= 0.5 THEN 'Regular (0.5-0.69)'
+        ELSE 'Bajo (<0.5)'
+    END;
+END$$
+
+-- Sumar p_delta a un contador (en la franja de la conexión)
+CREATE PROCEDURE sp_stats_add(IN p_metric VARCHAR(50), IN p_dimension VARCHAR(200), IN p_delta BIGINT)
+BEGIN
+    IF p_delta <> 0 THEN
+        INSERT INTO stats_counters (metric, dimension, shard, value)
+        VALUES (p_metric, COALESCE(p_dimension, ''), CONNECTION_ID() % 16, p_delta)
+        ON DUPLICATE KEY UPDATE value = value + p_delta;
+    END IF;
+END$$
+
+-- Sumar contactos (y sus scores) a una celda región × área
+CREATE PROCEDURE sp_stats_region_area(
+    IN p_region VARCHAR(100),
+    IN p_area VARCHAR(100),
+    IN p_count BIGINT,
+    IN p_score_sum DECIMAL(14,2),
+    IN p_updated TIMESTAMP
+)
+BEGIN
+    INSERT INTO stats_region_area (region, area, shard, total_contacts, score_sum, last_updated)
+    VALUES (COALESCE(p_region, ''), COALESCE(p_area, ''), CONNECTION_ID() % 16, p_count, COALESCE(p_score_sum, 0), p_updated)
+    ON DUPLICATE KEY UPDATE
+        total_contacts = total_contacts + p_count,
+        score_sum = score_sum + COALESCE(p_score_sum, 0),
+        last_updated = GREATEST(COALESCE(last_updated, p_updated), COALESCE(p_updated, last_updated));
+END$$
+
+-- Contadores de un contacto (p_sign = 1 al agregarlo, -1 al quitarlo)
+CREATE PROCEDURE sp_stats_contact(
+    IN p_is_valid TINYINT,
+    IN p_score DECIMAL(3,2),
+    IN p_region VARCHAR(100),
+    IN p_sign INT
+)
+BEGIN
+    IF p_is_valid = 1 THEN
+        CALL sp_stats_add('contacts_valid', '', p_sign);
+        IF p_score >= 0.8 THEN
+            CALL sp_stats_add('contacts_high_quality', '', p_sign);
+        END IF;
+        IF p_score >= 0.6 THEN
+            -- Listado por defecto de GET /contacts/ (total_mode=estimated)
+            CALL sp_stats_add('contacts_listed', '', p_sign);
+        END IF;
+        IF p_region IS NOT NULL THEN
+            CALL sp_stats_add('contacts_by_region', p_region, p_sign);
+        END IF;
+        CALL sp_stats_add('contacts_by_quality', fn_quality_bucket(p_score), p_sign);
+    ELSEIF p_is_valid = 0 THEN
+        CALL sp_stats_add('contacts_invalid', '', p_sign);
+    END IF;
+END$$
+
+-- Celdas región × área de todos los resultados de un contacto válido
+CREATE PROCEDURE sp_stats_contact_results(
+    IN p_contact_id INT,
+    IN p_region VARCHAR(100),
+    IN p_score DECIMAL(3,2),
+    IN p_updated TIMESTAMP,
+    IN p_sign INT
+)
+BEGIN
+    INSERT INTO stats_region_area (region, area, shard, total_contacts, score_sum, last_updated)
+    SELECT
+        COALESCE(p_region, ''),
+        COALESCE(s.area, ''),
+        CONNECTION_ID() % 16,
+        p_sign * COUNT(*),
+        p_sign * COUNT(*) * COALESCE(p_score, 0),
+        IF(p_sign > 0, p_updated, NULL)
+    FROM search_results sr
+    JOIN searches s ON s.id = sr.search_id
+    WHERE sr.contact_id = p_contact_id
+    GROUP BY COALESCE(s.area, '')
+    ON DUPLICATE KEY UPDATE
+        total_contacts = total_contacts + VALUES(total_contacts),
+        score_sum = score_sum + VALUES(score_sum),
+        last_updated = GREATEST(COALESCE(last_updated, VALUES(last_updated)), COALESCE(VALUES(last_updated), last_updated));
+END$$
+
+-- Celdas región × área de todos los contactos válidos de una búsqueda
+CREATE PROCEDURE sp_stats_search_results(IN p_search_id INT, IN p_area VARCHAR(100), IN p_sign INT)
+BEGIN
+    INSERT INTO stats_region_area (region, area, shard, total_contacts, score_sum, last_updated)
+    SELECT
+        COALESCE(c.region, ''),
+        COALESCE(p_area, ''),
+        CONNECTION_ID() % 16,
+        p_sign * COUNT(*),
+        p_sign * COALESCE(SUM(c.validation_score), 0),
+        IF(p_sign > 0, MAX(c.updated_at), NULL)
+    FROM search_results sr
+    JOIN contacts c ON c.id = sr.contact_id
+    WHERE sr.search_id = p_search_id
+      AND c.is_valid = 1
+    GROUP BY COALESCE(c.region, '')
+    ON DUPLICATE KEY UPDATE
+        total_contacts = total_contacts + VALUES(total_contacts),
+        score_sum = score_sum + VALUES(score_sum),
+        last_updated = GREATEST(COALESCE(last_updated, VALUES(last_updated)), COALESCE(VALUES(last_updated), last_updated));
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Funciones y procedimientos de estadísticas creados' as resultado;
+
+-- ------------------------------------------------------
+-- 3. TRIGGERS: SEARCHES
+-- ------------------------------------------------------
+DROP TRIGGER IF EXISTS after_search_insert_stats;
+DROP TRIGGER IF EXISTS after_search_update_stats;
+DROP TRIGGER IF EXISTS before_search_delete_stats;
+
+DELIMITER $$
+
+CREATE TRIGGER after_search_insert_stats
+AFTER INSERT ON searches
+FOR EACH ROW
+BEGIN
+    CALL sp_stats_add('searches_total', '', 1);
+    CALL sp_stats_add('searches_by_status', NEW.status, 1);
+END$$
+
+CREATE TRIGGER after_search_update_stats
+AFTER UPDATE ON searches
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.status <=> NEW.status) THEN
+        CALL sp_stats_add('searches_by_status', OLD.status, -1);
+        CALL sp_stats_add('searches_by_status', NEW.status, 1);
+    END IF;
+    IF NOT (OLD.area <=> NEW.area) THEN
+        CALL sp_stats_search_results(NEW.id, OLD.area, -1);
+        CALL sp_stats_search_results(NEW.id, NEW.area, 1);
+    END IF;
+END$$
+
+CREATE TRIGGER before_search_delete_stats
+BEFORE DELETE ON searches
+FOR EACH ROW
+BEGIN
+    CALL sp_stats_add('searches_total', '', -1);
+    CALL sp_stats_add('searches_by_status', OLD.status, -1);
+    -- Sus search_results se borran en cascada (sin triggers)
+    CALL sp_stats_search_results(OLD.id, OLD.area, -1);
+    CALL sp_stats_add('results_total', '', -(SELECT COUNT(*) FROM search_results WHERE search_id = OLD.id));
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Triggers de estadísticas en searches creados' as resultado;
+
+-- ------------------------------------------------------
+-- 4. TRIGGERS: CONTACTS
+-- ------------------------------------------------------
+DROP TRIGGER IF EXISTS after_contact_insert_stats;
+DROP TRIGGER IF EXISTS after_contact_update_stats;
+DROP TRIGGER IF EXISTS before_contact_delete_stats;
+
+DELIMITER $$
+
+CREATE TRIGGER after_contact_insert_stats
+AFTER INSERT ON contacts
+FOR EACH ROW
+BEGIN
+    CALL sp_stats_contact(NEW.is_valid, NEW.validation_score, NEW.region, 1);
+END$$
+
+CREATE TRIGGER after_contact_update_stats
+AFTER UPDATE ON contacts
+FOR EACH ROW
+BEGIN
+    IF NOT (OLD.is_valid <=> NEW.is_valid
+            AND OLD.validation_score <=> NEW.validation_score
+            AND OLD.region <=> NEW.region) THEN
+        CALL sp_stats_contact(OLD.is_valid, OLD.validation_score, OLD.region, -1);
+        CALL sp_stats_contact(NEW.is_valid, NEW.validation_score, NEW.region, 1);
+        IF OLD.is_valid = 1 THEN
+            CALL sp_stats_contact_results(OLD.id, OLD.region, OLD.validation_score, NULL, -1);
+        END IF;
+        IF NEW.is_valid = 1 THEN
+            CALL sp_stats_contact_results(NEW.id, NEW.region, NEW.validation_score, NEW.updated_at, 1);
+        END IF;
+    END IF;
+END$$
+
+CREATE TRIGGER before_contact_delete_stats
+BEFORE DELETE ON contacts
+FOR EACH ROW
+BEGIN
+    CALL sp_stats_contact(OLD.is_valid, OLD.validation_score, OLD.region, -1);
+    -- Sus search_results se borran en cascada (sin triggers)
+    IF OLD.is_valid = 1 THEN
+        CALL sp_stats_contact_results(OLD.id, OLD.region, OLD.validation_score, NULL, -1);
+    END IF;
+    CALL sp_stats_add('results_total', '', -(SELECT COUNT(*) FROM search_results WHERE contact_id = OLD.id));
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Triggers de estadísticas en contacts creados' as resultado;
+
+-- ------------------------------------------------------
+-- 5. TRIGGERS: SEARCH_RESULTS
+-- ------------------------------------------------------
+DROP TRIGGER IF EXISTS after_search_result_insert_stats;
+DROP TRIGGER IF EXISTS after_search_result_delete_stats;
+
+DELIMITER $$
+
+CREATE TRIGGER after_search_result_insert_stats
+AFTER INSERT ON search_results
+FOR EACH ROW
+BEGIN
+    DECLARE v_is_valid TINYINT;
+    DECLARE v_score DECIMAL(3,2);
+    DECLARE v_region VARCHAR(100);
+    DECLARE v_updated TIMESTAMP;
+
+    CALL sp_stats_add('results_total', '', 1);
+
+    SELECT is_valid, validation_score, region, updated_at
+    INTO v_is_valid, v_score, v_region, v_updated
+    FROM contacts WHERE id = NEW.contact_id;
+
+    IF v_is_valid = 1 THEN
+        CALL sp_stats_region_area(
+            v_region,
+            (SELECT area FROM searches WHERE id = NEW.search_id),
+            1, v_score, v_updated
+        );
+    END IF;
+END$$
+
+CREATE TRIGGER after_search_result_delete_stats
+AFTER DELETE ON search_results
+FOR EACH ROW
+BEGIN
+    DECLARE v_is_valid TINYINT;
+    DECLARE v_score DECIMAL(3,2);
+    DECLARE v_region VARCHAR(100);
+
+    CALL sp_stats_add('results_total', '', -1);
+
+    SELECT is_valid, validation_score, region
+    INTO v_is_valid, v_score, v_region
+    FROM contacts WHERE id = OLD.contact_id;
+
+    IF v_is_valid = 1 THEN
+        CALL sp_stats_region_area(
+            v_region,
+            (SELECT area FROM searches WHERE id = OLD.search_id),
+            -1, -v_score, NULL
+        );
+    END IF;
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Triggers de estadísticas en search_results creados' as resultado;
+
+-- ------------------------------------------------------
+-- 6. CARGA INICIAL (franja 0)
+-- ------------------------------------------------------
+DELETE FROM stats_counters;
+DELETE FROM stats_region_area;
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'searches_total', '', COUNT(*) FROM searches;
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'searches_by_status', COALESCE(status, ''), COUNT(*) FROM searches GROUP BY COALESCE(status, '');
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'contacts_valid', '', COUNT(*) FROM contacts WHERE is_valid = 1;
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'contacts_invalid', '', COUNT(*) FROM contacts WHERE is_valid = 0;
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'contacts_high_quality', '', COUNT(*) FROM contacts WHERE is_valid = 1 AND validation_score >= 0.8;
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'contacts_listed', '', COUNT(*) FROM contacts WHERE is_valid = 1 AND validation_score >= 0.6;
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'contacts_by_region', region, COUNT(*) FROM contacts
+WHERE is_valid = 1 AND region IS NOT NULL
+GROUP BY region;
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'contacts_by_quality', fn_quality_bucket(validation_score), COUNT(*) FROM contacts
+WHERE is_valid = 1
+GROUP BY fn_quality_bucket(validation_score);
+
+INSERT INTO stats_counters (metric, dimension, value)
+SELECT 'results_total', '', COUNT(*) FROM search_results;
+
+INSERT INTO stats_region_area (region, area, total_contacts, score_sum, last_updated)
+SELECT COALESCE(c.region, ''), COALESCE(s.area, ''), COUNT(*), COALESCE(SUM(c.validation_score), 0), MAX(c.updated_at)
+FROM contacts c
+JOIN search_results sr ON c.id = sr.contact_id
+JOIN searches s ON sr.search_id = s.id
+WHERE c.is_valid = 1
+GROUP BY COALESCE(c.region, ''), COALESCE(s.area, '');
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.11 COMPLETADA ===' as mensaje;
+SELECT metric, COUNT(DISTINCT dimension) AS dimensiones, SUM(value) AS total
+FROM stats_counters
+GROUP BY metric;
+SELECT
+    TRIGGER_NAME as 'Trigger',
+    EVENT_MANIPULATION as 'Evento',
+    EVENT_OBJECT_TABLE as 'Tabla',
+    ACTION_TIMING as 'Momento'
+FROM information_schema.TRIGGERS
+WHERE TRIGGER_SCHEMA = 'expert_finder_db'
+  AND TRIGGER_NAME LIKE '%\_stats'
+ORDER BY EVENT_OBJECT_TABLE, ACTION_TIMING, EVENT_MANIPULATION;
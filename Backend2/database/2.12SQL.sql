@@ -0,0 +1,122 @@
+-- ======================================================
+-- HU 2.12: Resultados incrementales y ETag en /searches/{id}/results
+-- ======================================================
+--
+-- GET /searches/{id}/results acepta ?since= (marca de agua seq de la
+-- última lectura) y responde 304 a If-None-Match si nada cambió. Para eso:
+--
+--   • search_results.seq (AUTO_INCREMENT): orden de llegada de los
+--     resultados. found_at no sirve de marca de agua: una transacción que
+--     inserta antes pero confirma después queda por debajo de lo que el
+--     cliente ya leyó. Para que seq tampoco tenga ese problema,
+--     before_search_result_insert_seq bloquea la búsqueda antes de que
+--     InnoDB asigne el valor: los resultados de una misma búsqueda se
+--     numeran en el orden en que se confirman (after_search_result_insert
+--     ya serializaba esas inserciones al actualizar results_count).
+--   • idx_search_results_search_seq (search_id, seq): cubre el filtro
+--     ?since= y el COUNT/MAX del ETag.
+--   • search_results.found_at y contacts.updated_at pasan a TIMESTAMP(6):
+--     con precisión de segundos, dos escrituras dentro del mismo segundo
+--     tendrían el mismo ETag.
+--   • idx_contacts_updated_at: MAX(updated_at) del ETag sin recorrer contacts.
+--   • El trigger before_contact_update (HU 2.6) se recrea con
+--     CURRENT_TIMESTAMP(6), sin cambios en el resto.
+--
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.12: RESULTADOS INCREMENTALES ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- 1. SEARCH_RESULTS
+-- ------------------------------------------------------
+-- Los resultados existentes se numeran por found_at
+ALTER TABLE search_results
+MODIFY found_at TIMESTAMP(6) NULL DEFAULT CURRENT_TIMESTAMP(6),
+ADD COLUMN seq BIGINT NULL;
+
+SET @seq = 0;
+UPDATE search_results SET seq = (@seq := @seq + 1) ORDER BY found_at, search_id, contact_id;
+
+ALTER TABLE search_results
+MODIFY seq BIGINT NOT NULL AUTO_INCREMENT,
+ADD UNIQUE INDEX uq_search_results_seq (seq),
+ADD INDEX idx_search_results_search_seq (search_id, seq);
+
+DROP TRIGGER IF EXISTS before_search_result_insert_seq;
+
+DELIMITER $$
+
+CREATE TRIGGER before_search_result_insert_seq
+BEFORE INSERT ON search_results
+FOR EACH ROW
+BEGIN
+    DECLARE v_search_id INT;
+    -- Bloqueo de la búsqueda hasta el commit, tomado antes de que se asigne
+    -- seq (en un BEFORE INSERT todavía vale 0)
+    SELECT id INTO v_search_id FROM searches WHERE id = NEW.search_id FOR UPDATE;
+END$$
+
+DELIMITER ;
+
+-- ------------------------------------------------------
+-- 2. CONTACTS
+-- ------------------------------------------------------
+ALTER TABLE contacts
+MODIFY updated_at TIMESTAMP(6) NULL DEFAULT CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6),
+ADD INDEX idx_contacts_updated_at (updated_at);
+
+DROP TRIGGER IF EXISTS before_contact_update;
+
+DELIMITER $$
+
+CREATE TRIGGER before_contact_update
+BEFORE UPDATE ON contacts
+FOR EACH ROW
+BEGIN
+    -- El backfill de claves no debe modificar updated_at
+    IF @skip_contact_touch IS NULL THEN
+        SET NEW.updated_at = CURRENT_TIMESTAMP(6);
+    END IF;
+
+    -- Normalizar email si cambia
+    IF NEW.email IS NOT NULL AND NEW.email != OLD.email THEN
+        SET NEW.email = LOWER(TRIM(NEW.email));
+    END IF;
+
+    -- Recalcular claves normalizadas si cambian los datos originales
+    IF NOT (NEW.name <=> OLD.name) THEN
+        SET NEW.name_norm = NULLIF(fn_normalize_text(NEW.name), '');
+    END IF;
+    IF NOT (NEW.organization <=> OLD.organization) THEN
+        SET NEW.org_norm = NULLIF(fn_normalize_text(NEW.organization), '');
+    END IF;
+    IF NOT (NEW.position <=> OLD.position) THEN
+        SET NEW.position_norm = NULLIF(fn_normalize_text(NEW.position), '');
+    END IF;
+    IF NOT (NEW.region <=> OLD.region) THEN
+        SET NEW.region_norm = NULLIF(fn_normalize_text(NEW.region), '');
+    END IF;
+    IF NOT (NEW.phone <=> OLD.phone) THEN
+        SET NEW.phone_norm = NULLIF(REPLACE(REPLACE(NEW.phone, ' ', ''), '-', ''), '');
+    END IF;
+END$$
+
+DELIMITER ;
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.12 COMPLETADA ===' as mensaje;
+SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, COLUMN_DEFAULT
+FROM information_schema.COLUMNS
+WHERE TABLE_SCHEMA = 'expert_finder_db'
+  AND ((TABLE_NAME = 'search_results' AND COLUMN_NAME IN ('found_at', 'seq'))
+    OR (TABLE_NAME = 'contacts' AND COLUMN_NAME = 'updated_at'));
+SELECT TABLE_NAME, INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) AS columnas
+FROM information_schema.STATISTICS
+WHERE TABLE_SCHEMA = 'expert_finder_db'
+  AND INDEX_NAME IN ('idx_search_results_search_seq', 'uq_search_results_seq', 'idx_contacts_updated_at')
+GROUP BY TABLE_NAME, INDEX_NAME;
@@ -0,0 +1,33 @@
+-- ======================================================
+-- HU 2.13: Recálculo masivo de validation_score
+-- ======================================================
+--
+-- POST /contacts/rescore (app/services/rescoring_service.py) recalcula los
+-- scores con las reglas actuales. No debe pisar los scores que no vienen
+-- del scoring:
+--
+--   • contacts.manual_score: 1 cuando el score se asignó a mano con
+--     PUT /contacts/{id}. Los contactos invalidados (is_valid = 0, score 0.0)
+--     tampoco se recalculan.
+--
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.13: RECÁLCULO DE SCORES ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- 1. CONTACTS
+-- ------------------------------------------------------
+ALTER TABLE contacts
+ADD COLUMN manual_score TINYINT(1) NOT NULL DEFAULT 0 COMMENT 'validation_score asignado a mano (no se recalcula)';
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.13 COMPLETADA ===' as mensaje;
+SELECT TABLE_NAME, COLUMN_NAME, COLUMN_TYPE, COLUMN_DEFAULT
+FROM information_schema.COLUMNS
+WHERE TABLE_SCHEMA = 'expert_finder_db'
+  AND TABLE_NAME = 'contacts' AND COLUMN_NAME = 'manual_score';
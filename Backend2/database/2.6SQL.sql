@@ -0,0 +1,224 @@
+-- ======================================================
+-- HU 2.6: Claves normalizadas para detección de duplicados
+-- Columnas *_norm + índices compuestos + backfill por bloques
+-- ======================================================
+--
+-- El scoring de validación (app/services/scoring_engine.py) compara los
+-- contactos por nombre, organización, cargo, región y teléfono normalizados.
+-- Guardar esas claves en columnas indexadas permite obtener los candidatos
+-- a duplicado con búsquedas por igualdad en lugar de recorrer toda la tabla.
+--
+-- Normalización (debe coincidir con normalize_text / normalize_phone):
+--   • name / organization / position / region → fn_normalize_text(x):
+--     minúsculas y sin espacios, tabulaciones, saltos de línea (\n, \r),
+--     \v, \f ni espacios de no separación (U+00A0) en los extremos. TRIM()
+--     solo quita espacios; str.strip() quita todo el espacio en blanco.
+--     Otros espacios Unicode en los extremos (U+2000-U+200A, U+3000, ...)
+--     no se recortan aquí: el recálculo de scores (rescoring_service)
+--     reescribe las claves que difieren de las de Python.
+--   • phone → sin espacios ni guiones
+--   • Valores vacíos se guardan como NULL
+--
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.6: CLAVES NORMALIZADAS ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- SECCIÓN 1: COLUMNAS NORMALIZADAS E ÍNDICES
+-- ------------------------------------------------------
+SELECT '1. Agregando columnas normalizadas a contacts...' as paso;
+
+ALTER TABLE contacts
+ADD COLUMN name_norm VARCHAR(200) NULL COMMENT 'fn_normalize_text(name)',
+ADD COLUMN org_norm VARCHAR(200) NULL COMMENT 'fn_normalize_text(organization)',
+ADD COLUMN position_norm VARCHAR(200) NULL COMMENT 'fn_normalize_text(position)',
+ADD COLUMN region_norm VARCHAR(100) NULL COMMENT 'fn_normalize_text(region)',
+ADD COLUMN phone_norm VARCHAR(50) NULL COMMENT 'phone sin espacios ni guiones',
+ADD INDEX idx_contacts_name_norm_org (name_norm, org_norm),
+ADD INDEX idx_contacts_org_position_region (org_norm, position_norm, region_norm),
+ADD INDEX idx_contacts_position_norm (position_norm),
+ADD INDEX idx_contacts_region_norm (region_norm),
+ADD INDEX idx_contacts_phone_norm (phone_norm),
+ADD INDEX idx_contacts_source_url (source_url);
+
+-- ------------------------------------------------------
+-- SECCIÓN 2: TRIGGERS QUE MANTIENEN LAS CLAVES
+-- ------------------------------------------------------
+SELECT '2. Actualizando triggers de contacts...' as paso;
+
+DROP FUNCTION IF EXISTS fn_normalize_text;
+
+DELIMITER $$
+
+-- Equivalente a value.lower().strip() (ver encabezado)
+CREATE FUNCTION fn_normalize_text(p_value VARCHAR(500) CHARSET utf8mb4)
+RETURNS VARCHAR(500) CHARSET utf8mb4
+DETERMINISTIC
+BEGIN
+    DECLARE v_length INT;
+
+    IF p_value IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Repetir hasta que no cambie el largo (los caracteres pueden venir
+    -- mezclados, p. ej. ' \t\n '); no se compara con '=' porque la
+    -- collation PAD SPACE iguala cadenas que difieren en espacios finales
+    REPEAT
+        SET v_length = CHAR_LENGTH(p_value);
+        SET p_value = TRIM(BOTH ' ' FROM p_value);
+        SET p_value = TRIM(BOTH '\t' FROM p_value);
+        SET p_value = TRIM(BOTH '\n' FROM p_value);
+        SET p_value = TRIM(BOTH '\r' FROM p_value);
+        SET p_value = TRIM(BOTH CHAR(11 USING utf8mb4) FROM p_value);
+        SET p_value = TRIM(BOTH CHAR(12 USING utf8mb4) FROM p_value);
+        SET p_value = TRIM(BOTH _utf8mb4 X'C2A0' FROM p_value);
+    UNTIL CHAR_LENGTH(p_value) = v_length END REPEAT;
+
+    RETURN LOWER(p_value);
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Función fn_normalize_text creada' as resultado;
+
+DROP TRIGGER IF EXISTS before_contact_insert_validate;
+
+DELIMITER $$
+
+CREATE TRIGGER before_contact_insert_validate
+BEFORE INSERT ON contacts
+FOR EACH ROW
+BEGIN
+    -- Validar que el nombre no esté vacío
+    IF NEW.name IS NULL OR TRIM(NEW.name) = '' THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'El nombre del contacto no puede estar vacío';
+    END IF;
+
+    -- Validar que source_url no esté vacío
+    IF NEW.source_url IS NULL OR TRIM(NEW.source_url) = '' THEN
+        SIGNAL SQLSTATE '45000'
+        SET MESSAGE_TEXT = 'La URL de origen no puede estar vacía';
+    END IF;
+
+    -- Normalizar email a minúsculas
+    IF NEW.email IS NOT NULL THEN
+        SET NEW.email = LOWER(TRIM(NEW.email));
+    END IF;
+
+    -- Completar claves normalizadas (inserciones directas, p. ej. desde n8n)
+    IF NEW.name_norm IS NULL THEN
+        SET NEW.name_norm = NULLIF(fn_normalize_text(NEW.name), '');
+    END IF;
+    IF NEW.org_norm IS NULL THEN
+        SET NEW.org_norm = NULLIF(fn_normalize_text(NEW.organization), '');
+    END IF;
+    IF NEW.position_norm IS NULL THEN
+        SET NEW.position_norm = NULLIF(fn_normalize_text(NEW.position), '');
+    END IF;
+    IF NEW.region_norm IS NULL THEN
+        SET NEW.region_norm = NULLIF(fn_normalize_text(NEW.region), '');
+    END IF;
+    IF NEW.phone_norm IS NULL THEN
+        SET NEW.phone_norm = NULLIF(REPLACE(REPLACE(NEW.phone, ' ', ''), '-', ''), '');
+    END IF;
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Trigger before_contact_insert_validate actualizado' as resultado;
+
+DROP TRIGGER IF EXISTS before_contact_update;
+
+DELIMITER $$
+
+CREATE TRIGGER before_contact_update
+BEFORE UPDATE ON contacts
+FOR EACH ROW
+BEGIN
+    -- El backfill de claves no debe modificar updated_at
+    IF @skip_contact_touch IS NULL THEN
+        SET NEW.updated_at = CURRENT_TIMESTAMP;
+    END IF;
+
+    -- Normalizar email si cambia
+    IF NEW.email IS NOT NULL AND NEW.email != OLD.email THEN
+        SET NEW.email = LOWER(TRIM(NEW.email));
+    END IF;
+
+    -- Recalcular claves normalizadas si cambian los datos originales
+    IF NOT (NEW.name <=> OLD.name) THEN
+        SET NEW.name_norm = NULLIF(fn_normalize_text(NEW.name), '');
+    END IF;
+    IF NOT (NEW.organization <=> OLD.organization) THEN
+        SET NEW.org_norm = NULLIF(fn_normalize_text(NEW.organization), '');
+    END IF;
+    IF NOT (NEW.position <=> OLD.position) THEN
+        SET NEW.position_norm = NULLIF(fn_normalize_text(NEW.position), '');
+    END IF;
+    IF NOT (NEW.region <=> OLD.region) THEN
+        SET NEW.region_norm = NULLIF(fn_normalize_text(NEW.region), '');
+    END IF;
+    IF NOT (NEW.phone <=> OLD.phone) THEN
+        SET NEW.phone_norm = NULLIF(REPLACE(REPLACE(NEW.phone, ' ', ''), '-', ''), '');
+    END IF;
+END$$
+
+DELIMITER ;
+
+SELECT '   ✅ Trigger before_contact_update actualizado' as resultado;
+
+-- ------------------------------------------------------
+-- SECCIÓN 3: BACKFILL POR BLOQUES
+-- Recorre la tabla por rangos de id y confirma cada bloque, de modo que
+-- puede ejecutarse sobre una tabla grande en producción sin bloquearla.
+-- Uso: CALL sp_backfill_contact_match_keys(5000);
+-- ------------------------------------------------------
+SELECT '3. Creando procedimiento de backfill...' as paso;
+
+DROP PROCEDURE IF EXISTS sp_backfill_contact_match_keys;
+
+DELIMITER $$
+
+CREATE PROCEDURE sp_backfill_contact_match_keys(IN p_chunk_size INT)
+BEGIN
+    DECLARE v_start INT;
+    DECLARE v_max_id INT;
+
+    SELECT MIN(id), MAX(id) INTO v_start, v_max_id FROM contacts;
+    SET @skip_contact_touch = 1;
+
+    WHILE v_start IS NOT NULL AND v_start <= v_max_id DO
+        UPDATE contacts
+        SET name_norm = NULLIF(fn_normalize_text(name), ''),
+            org_norm = NULLIF(fn_normalize_text(organization), ''),
+            position_norm = NULLIF(fn_normalize_text(position), ''),
+            region_norm = NULLIF(fn_normalize_text(region), ''),
+            phone_norm = NULLIF(REPLACE(REPLACE(phone, ' ', ''), '-', ''), '')
+        WHERE id >= v_start AND id < v_start + p_chunk_size;
+
+        COMMIT;
+        SET v_start = v_start + p_chunk_size;
+    END WHILE;
+
+    SET @skip_contact_touch = NULL;
+END$$
+
+DELIMITER ;
+
+CALL sp_backfill_contact_match_keys(5000);
+
+SELECT '   ✅ Backfill de claves normalizadas completado' as resultado;
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.6 COMPLETADA ===' as mensaje;
+SELECT
+    COUNT(*) as total_contactos,
+    SUM(name_norm IS NULL) as sin_name_norm
+FROM contacts;
@@ -0,0 +1,57 @@
+-- ======================================================
+-- HU 2.7: Cola persistente de disparos hacia n8n (outbox)
+-- ======================================================
+--
+-- Cada búsqueda nueva deja un registro 'pending' en search_dispatches en la
+-- misma transacción en que se crea. Un worker asyncio del backend drena la
+-- cola con un máximo de disparos concurrentes, rate limit por destino
+-- (api_sources.rate_limit, en peticiones por minuto) y reintentos con
+-- backoff exponencial.
+--
+-- Estados: pending → in_flight → done
+--                              ↘ pending (reintento) → ... → failed
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.7: COLA DE DISPAROS ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- 1. TABLA: search_dispatches
+-- ------------------------------------------------------
+CREATE TABLE IF NOT EXISTS search_dispatches (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    search_id INT NOT NULL,
+    upstream VARCHAR(100) NOT NULL DEFAULT 'n8n',
+    status VARCHAR(20) NOT NULL DEFAULT 'pending',
+    payload JSON,
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL DEFAULT 5,
+    next_attempt_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    locked_at TIMESTAMP NULL,
+    last_error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+    CONSTRAINT fk_search_dispatches_searches
+        FOREIGN KEY (search_id)
+        REFERENCES searches(id)
+        ON DELETE CASCADE,
+    CONSTRAINT chk_dispatch_status CHECK (status IN ('pending', 'in_flight', 'done', 'failed')),
+    CONSTRAINT chk_dispatch_attempts CHECK (attempts >= 0),
+    INDEX idx_dispatches_search (search_id),
+    INDEX idx_dispatches_status_next (status, next_attempt_at)
+);
+
+-- ------------------------------------------------------
+-- 2. RATE LIMIT DEL DESTINO n8n (peticiones por minuto)
+-- ------------------------------------------------------
+INSERT INTO api_sources (name, base_url, auth_type, rate_limit, is_active)
+SELECT 'n8n', 'http://n8n:5678/webhook/search', 'none', 60, 1
+WHERE NOT EXISTS (SELECT 1 FROM api_sources WHERE name = 'n8n');
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.7 COMPLETADA ===' as mensaje;
+SHOW CREATE TABLE search_dispatches;
@@ -0,0 +1,48 @@
+-- ======================================================
+-- HU 2.8: Reutilización de resultados por criterios de búsqueda
+-- ======================================================
+--
+-- Una búsqueda nueva con los mismos keywords/area/region (normalizados) que
+-- una búsqueda completada recientemente copia sus search_results en lugar de
+-- volver a ejecutar el scraping (ver SearchService.create_search).
+--
+-- criteria_hash = SHA2('keywords|area|region', 256) con cada criterio en
+-- minúsculas, sin espacios extremos y con espacios internos colapsados
+-- (debe coincidir con search_criteria_hash en el backend).
+--
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.8: CACHÉ DE BÚSQUEDAS ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- 1. COLUMNA E ÍNDICE
+-- ------------------------------------------------------
+ALTER TABLE searches
+ADD COLUMN criteria_hash CHAR(64) NULL AFTER search_config,
+ADD INDEX idx_searches_criteria (criteria_hash, status, finished_at);
+
+-- ------------------------------------------------------
+-- 2. BACKFILL DE BÚSQUEDAS EXISTENTES
+-- ------------------------------------------------------
+UPDATE searches
+SET criteria_hash = SHA2(
+    CONCAT_WS('|',
+        LOWER(TRIM(REGEXP_REPLACE(keywords, '[[:space:]]+', ' '))),
+        LOWER(TRIM(REGEXP_REPLACE(COALESCE(area, ''), '[[:space:]]+', ' '))),
+        LOWER(TRIM(REGEXP_REPLACE(COALESCE(region, ''), '[[:space:]]+', ' ')))
+    ),
+    256
+)
+WHERE criteria_hash IS NULL;
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.8 COMPLETADA ===' as mensaje;
+SELECT
+    COUNT(*) AS busquedas,
+    COUNT(DISTINCT criteria_hash) AS criterios_distintos
+FROM searches;
@@ -0,0 +1,57 @@
+-- ======================================================
+-- HU 2.9: Índices para paginación por cursor (keyset)
+-- ======================================================
+--
+-- Los listados de contactos, búsquedas y logs aceptan un cursor opaco
+-- (next_cursor) que continúa después de la última fila de la página
+-- anterior. Estos índices cubren el filtro + ORDER BY de cada listado para
+-- que cualquier página cueste lo mismo que la primera:
+--
+--   • contacts:     is_valid + (validation_score, created_at, id) DESC
+--   • searches:     (created_at, id) DESC, opcionalmente por session_id/status
+--   • search_logs:  (created_at, id) DESC, opcionalmente por search_id
+--
+-- ======================================================
+
+USE expert_finder_db;
+
+SELECT '=== INICIANDO HU 2.9: ÍNDICES DE PAGINACIÓN ===' as mensaje_inicio;
+SELECT 'Fecha de ejecución: ' as info, NOW() as timestamp;
+
+-- ------------------------------------------------------
+-- 1. CONTACTS
+-- ------------------------------------------------------
+ALTER TABLE contacts
+ADD INDEX idx_contacts_valid_score_created (is_valid, validation_score, created_at, id);
+
+-- ------------------------------------------------------
+-- 2. SEARCHES
+-- ------------------------------------------------------
+ALTER TABLE searches
+ADD INDEX idx_searches_created_id (created_at, id),
+ADD INDEX idx_searches_session_created (session_id, created_at, id),
+ADD INDEX idx_searches_status_created (status, created_at, id);
+
+-- ------------------------------------------------------
+-- 3. SEARCH_LOGS
+-- ------------------------------------------------------
+ALTER TABLE search_logs
+ADD INDEX idx_logs_created_id (created_at, id),
+ADD INDEX idx_logs_search_created (search_id, created_at, id);
+
+-- ------------------------------------------------------
+-- VERIFICACIÓN
+-- ------------------------------------------------------
+SELECT '=== HU 2.9 COMPLETADA ===' as mensaje;
+SELECT TABLE_NAME, INDEX_NAME, GROUP_CONCAT(COLUMN_NAME ORDER BY SEQ_IN_INDEX) AS columnas
+FROM information_schema.STATISTICS
+WHERE TABLE_SCHEMA = 'expert_finder_db'
+  AND INDEX_NAME IN (
+      'idx_contacts_valid_score_created',
+      'idx_searches_created_id',
+      'idx_searches_session_created',
+      'idx_searches_status_created',
+      'idx_logs_created_id',
+      'idx_logs_search_created'
+  )
+GROUP BY TABLE_NAME, INDEX_NAME;
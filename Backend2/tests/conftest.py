@@ -0,0 +1,127 @@
+"""
+Configuración de las pruebas (desde Backend2/: python -m pytest).
+
+Antes de importar la aplicación activa el presupuesto de consultas
+(QUERY_GUARD_MODE=raise), apunta DATABASE_URL a una base SQLite temporal y
+desactiva las tareas de fondo. Ofrece los fixtures database (tablas
+recreadas), db (sesión), client (TestClient de la aplicación) y
+query_guard:
+
+    def test_get_search(client, query_guard):
+        client.get("/api/v1/searches/1")
+        assert query_guard.requests[-1]["queries"] <= 2
+
+Una ruta que supera su presupuesto (@query_budget o QUERY_BUDGET_DEFAULT)
+hace fallar la prueba, tanto si la excepción llega al cliente como si la
+ruta la atrapó; las formas repetidas (posible N+1) también la hacen fallar
+salvo que la prueba llame a query_guard.allow_repeated().
+"""
+
+import os
+import tempfile
+
+import pytest
+
+# Sin imports de app.* a nivel de módulo: pytest_configure arma el entorno
+# antes de que se importe la aplicación
+API = "/api/v1"
+
+
+def pytest_configure(config):
+    # Antes de importar app.*: la configuración, los motores y el guard se
+    # arman con el entorno
+    os.environ.setdefault("QUERY_GUARD_MODE", "raise")
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='expert-finder-')}/test.db")
+    os.environ.setdefault("DEMO_MODE", "false")
+    os.environ.setdefault("DISPATCH_WORKER_ENABLED", "false")
+    os.environ.setdefault("STATS_RECONCILE_ENABLED", "false")
+
+
+@pytest.fixture
+def database():
+    """Base de pruebas con las tablas recreadas (vacías) y la caché limpia."""
+    import app.models  # noqa: F401  (registra las tablas en Base.metadata)
+    from app.cache import cache
+    from app.database import Base, engine
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    cache.clear()
+    yield engine
+
+
+@pytest.fixture
+def db(database):
+    """Sesión síncrona sobre la base de pruebas."""
+    from app.database import SessionLocal
+
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def client(database):
+    """TestClient de la aplicación (con su lifespan) sobre la base de pruebas."""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def query_guard():
+    """Guard de consultas limpio; al terminar, falla si hubo excesos o N+1."""
+    from app.query_guard import query_guard as guard
+
+    if not guard.enabled:
+        pytest.skip("QUERY_GUARD_MODE=off: el presupuesto de consultas está desactivado")
+
+    guard.reset()
+    yield guard
+
+    problems = [
+        f"{item['route']}: superó {item['budget']} consultas (en: {item['statement'][:120]})"
+        for item in guard.violations
+    ]
+    if not guard.repeated_allowed:
+        problems += [
+            f"{item['route']}: posible N+1 ({item['statement'][:120]})"
+            for item in guard.repeated
+        ]
+    guard.reset()
+    if problems:
+        pytest.fail("Presupuesto de consultas:\n" + "\n".join(problems), pytrace=False)
+
+
+def make_contacts(count: int, prefix: str = "Contacto") -> list:
+    """Contactos válidos y distintos entre sí para ContactService.bulk_create_contacts."""
+    return [
+        {
+            "name": f"{prefix} {index}",
+            "organization": f"Organización {index}",
+            "position": "Investigador/a",
+            "email": f"{prefix.lower()}.{index}@example.com",
+            "phone": f"+5691000{index:04d}",
+            "region": "Santiago",
+            "source_url": f"https://example.com/{prefix.lower()}/{index}",
+            "source_type": "web",
+        }
+        for index in range(count)
+    ]
+
+
+@pytest.fixture
+def search_with_results(db):
+    """Una búsqueda completada con 3 contactos vinculados."""
+    from app.models import Search
+    from app.services.contact_service import ContactService
+
+    search = Search(session_id="test", keywords="machine learning", area="Tecnología", region="Santiago", status="completed")
+    db.add(search)
+    db.commit()
+    ContactService.bulk_create_contacts(db, make_contacts(3), search_id=search.id)
+    db.refresh(search)
+    return search
@@ -0,0 +1,41 @@
+"""Búsqueda de contactos por texto (documento normalizado e índice invertido)."""
+
+import re
+from pathlib import Path
+
+from conftest import API, make_contacts
+
+SQL_FOLD = Path(__file__).resolve().parents[1] / "database" / "2.10SQL.sql"
+
+
+def sql_fold_accents(value: str) -> str:
+    """fn_fold_accents de 2.10SQL.sql, paso a paso en Python."""
+    script = SQL_FOLD.read_text(encoding="utf-8")
+    value = re.sub("[̀-ͯ]", "", value.lower()).replace("\xa0", " ")
+    for chars, replacement in re.findall(r"fn_replace_chars\(txt, '([^']*)', '([^']*)'\)", script):
+        for char in chars:
+            value = value.replace(char, replacement)
+    return value
+
+
+def test_sql_fold_matches_python_for_latin_letters():
+    from app.services.contact_search import fold_accents
+
+    latin = [chr(code) for code in [*range(0x20, 0x250), *range(0x1E00, 0x1F00)]]
+    assert [char for char in latin if sql_fold_accents(char) != fold_accents(char)] == []
+    assert sql_fold_accents("José MARTÍNEZ Ñuñez") == fold_accents("José MARTÍNEZ Ñuñez") == "jose martinez nunez"
+
+
+def test_single_letter_terms_filter_results(client, db):
+    from app.services.contact_service import ContactService
+
+    contacts = make_contacts(3, prefix="Letra")
+    contacts[0]["position"] = "Investigador Q"
+    ContactService.bulk_create_contacts(db, contacts)
+
+    response = client.get(f"{API}/contacts/search", params={"q": "investigador q"})
+    assert response.status_code == 200
+    assert [item["name"] for item in response.json()["items"]] == [contacts[0]["name"]]
+
+    found, total, _ = ContactService.search_contacts(db, "q")
+    assert ([contact.name for contact in found], total) == ([contacts[0]["name"]], 1)
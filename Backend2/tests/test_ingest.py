@@ -0,0 +1,66 @@
+"""Ingesta NDJSON de resultados (POST /searches/{id}/ingest)."""
+
+import asyncio
+import json
+
+import pytest
+
+from conftest import API, make_contacts
+
+
+class ChunkedRequest:
+    """Request con el cuerpo partido en trozos arbitrarios."""
+
+    def __init__(self, chunks: list):
+        self.chunks = chunks
+
+    async def stream(self):
+        for chunk in self.chunks:
+            yield chunk
+
+
+def read_lines(chunks: list, max_line_bytes: int) -> list:
+    from app.routers.searches import _iter_ndjson_lines
+
+    async def collect():
+        return [line async for line in _iter_ndjson_lines(ChunkedRequest(chunks), max_line_bytes)]
+
+    return asyncio.run(collect())
+
+
+def test_lines_are_split_across_chunks():
+    assert read_lines([b"ab", b"c\nde", b"\n\nf\ng", b"h"], 3) == [b"abc", b"de", b"", b"f", b"gh"]
+
+
+def test_every_line_is_checked_against_the_limit():
+    from fastapi import HTTPException
+
+    # Línea larga completa dentro de un solo trozo, seguida de otra corta
+    with pytest.raises(HTTPException) as error:
+        read_lines([b"ok\n" + b"x" * 11 + b"\nok\n"], 10)
+    assert error.value.status_code == 413
+
+    # Línea larga que todavía no termina
+    with pytest.raises(HTTPException):
+        read_lines([b"ok\nxxxxxx", b"xxxxx"], 10)
+    assert read_lines([b"x" * 10 + b"\n", b"y" * 10], 10) == [b"x" * 10, b"y" * 10]
+
+
+def test_ingest_rejects_oversized_lines(client, db, monkeypatch):
+    from app.models import Search
+    from app.routers.searches import settings
+
+    search = Search(session_id="test", keywords="ingesta", status="pending")
+    db.add(search)
+    db.commit()
+    lines = [json.dumps(contact) for contact in make_contacts(2, prefix="Ingesta")]
+    headers = {"Content-Type": "application/x-ndjson", "X-N8N-API-KEY": settings.N8N_API_KEY}
+
+    monkeypatch.setattr(settings, "INGEST_MAX_LINE_BYTES", max(len(line) for line in lines))
+    response = client.post(f"{API}/searches/{search.id}/ingest", content="\n".join(lines), headers=headers)
+    assert response.status_code == 200
+    assert response.json()["created"] == 2
+
+    monkeypatch.setattr(settings, "INGEST_MAX_LINE_BYTES", len(lines[0]) - 1)
+    response = client.post(f"{API}/searches/{search.id}/ingest", content="\n".join(lines) + "\n", headers=headers)
+    assert response.status_code == 413
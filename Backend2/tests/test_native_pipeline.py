@@ -0,0 +1,67 @@
+"""Ejecuciones del pipeline nativo dentro de la cola de disparos."""
+
+import asyncio
+
+import pytest
+
+
+def enqueue_native(db, count: int) -> list:
+    from app.models import Search
+    from app.services.dispatch_service import DispatchService
+
+    searches = [Search(session_id="test", keywords=f"tema {index}", status="pending") for index in range(count)]
+    db.add_all(searches)
+    db.flush()
+    for search in searches:
+        DispatchService.enqueue(db, search, upstream="native")
+    db.commit()
+    return [search.id for search in searches]
+
+
+def test_native_runs_are_bounded_by_max_in_flight(database, db, monkeypatch):
+    from app.models import SearchDispatch
+    from app.pipeline import runner
+    from app.pipeline.engine import PipelineStats
+    from app.services.dispatch_worker import DispatchWorker
+
+    search_ids = enqueue_native(db, 5)
+    running, peak, finished = set(), [0], []
+
+    async def fake_run(payload, pipeline=None):
+        running.add(payload["search_id"])
+        peak[0] = max(peak[0], len(running))
+        await asyncio.sleep(0.05)
+        running.discard(payload["search_id"])
+        finished.append(payload["search_id"])
+        return PipelineStats()
+
+    monkeypatch.setattr(runner, "run_native_search", fake_run)
+
+    async def scenario():
+        worker = DispatchWorker(senders={"native": runner.send_native_pipeline}, max_in_flight=2, poll_interval=0.01)
+        await worker.start()
+        for _ in range(200):
+            if len(finished) == len(search_ids) and worker.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+    assert sorted(finished) == search_ids
+    assert peak[0] == 2
+    db.expire_all()
+    assert {dispatch.status for dispatch in db.query(SearchDispatch)} == {"done"}
+
+
+def test_failed_native_run_is_reported_to_the_queue(monkeypatch):
+    from app.pipeline import runner
+    from app.services.dispatch_worker import DispatchError
+
+    async def failing_run(payload, pipeline=None):
+        return None
+
+    monkeypatch.setattr(runner, "run_native_search", failing_run)
+    with pytest.raises(DispatchError) as error:
+        asyncio.run(runner.send_native_pipeline({"search_id": 1}))
+    assert error.value.retryable is False
@@ -0,0 +1,108 @@
+"""Paginación por cursor sobre filas con la misma fecha y totales de los listados."""
+
+from sqlalchemy import text
+
+from conftest import API, make_contacts
+
+# Mitad con el formato de CURRENT_TIMESTAMP y mitad con el de SQLAlchemy:
+# el mismo instante guardado de dos formas
+TIED_TIMESTAMPS = ("2026-01-15 10:00:00", "2026-01-15 10:00:00.000000")
+
+
+def tie_timestamps(db, table: str) -> None:
+    for parity, stamp in enumerate(TIED_TIMESTAMPS):
+        db.execute(text(f"UPDATE {table} SET created_at = :stamp WHERE id % 2 = :parity"), {"stamp": stamp, "parity": parity})
+    db.commit()
+
+
+def walk(client, path: str, limit: int = 2) -> list:
+    """Recorrer todas las páginas siguiendo next_cursor."""
+    ids, cursor = [], None
+    for _ in range(50):
+        params = {"limit": limit, "total_mode": "none"}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get(path, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        ids.extend(item["id"] for item in body["items"])
+        cursor = body["next_cursor"]
+        if cursor is None:
+            return ids
+    raise AssertionError(f"{path}: el cursor no avanza ({ids[-6:]})")
+
+
+def test_contacts_cursor_with_tied_timestamps(client, db, search_with_results):
+    from app.services.contact_service import ContactService
+
+    ContactService.bulk_create_contacts(db, make_contacts(6, prefix="Empate"), search_id=search_with_results.id)
+    db.execute(text("UPDATE contacts SET validation_score = 0.9"))
+    tie_timestamps(db, "contacts")
+
+    ids = walk(client, f"{API}/contacts/")
+    assert ids == sorted(ids, reverse=True)
+    assert len(ids) == 9
+
+
+def test_searches_and_logs_cursor_with_tied_timestamps(client, db):
+    from app.models import Search, SearchLog
+
+    for index in range(7):
+        search = Search(session_id="test", keywords=f"tema {index}", status="completed")
+        db.add(search)
+        db.flush()
+        db.add(SearchLog(search_id=search.id, source_url="test", source_type="test", status="info", contacts_found=0))
+    db.commit()
+    tie_timestamps(db, "searches")
+    tie_timestamps(db, "search_logs")
+
+    ids = walk(client, f"{API}/searches/")
+    assert ids == list(range(7, 0, -1))
+
+    ids = walk(client, f"{API}/searches/logs/recent")
+    assert ids == list(range(7, 0, -1))
+
+
+def test_results_since_follows_arrival_order(client, db, search_with_results):
+    from app.services.contact_service import ContactService
+
+    path = f"{API}/searches/{search_with_results.id}/results"
+    first = client.get(path).json()
+    assert len(first["results"]) == 3
+
+    # Un resultado que llega después con found_at anterior (transacción que
+    # empezó antes y confirmó después) no queda bajo la marca de agua
+    ContactService.bulk_create_contacts(db, make_contacts(1, prefix="Tardío"), search_id=search_with_results.id)
+    db.execute(text("UPDATE search_results SET found_at = '2000-01-01 00:00:00' WHERE search_id = :id"), {"id": search_with_results.id})
+    db.commit()
+
+    later = client.get(path, params={"since": first["next_since"]}).json()
+    assert [result["contact_name"] for result in later["results"]] == ["Tardío 0"]
+    assert client.get(path, params={"since": later["next_since"]}).json()["results"] == []
+
+
+def test_estimated_contact_totals(client, search_with_results, monkeypatch):
+    from app.services.stats_service import CONTACTS_LISTED
+    from app.utils import counting
+
+    def total(**params) -> int:
+        response = client.get(f"{API}/contacts/", params={"total_mode": "estimated", **params})
+        assert response.status_code == 200, response.text
+        return response.json()["total"]
+
+    # Fuera de MySQL no hay contador: total exacto, cacheado hasta la próxima escritura
+    assert total() == 3
+    contact = {**make_contacts(1, prefix="Nuevo")[0], "organization": "Otra", "phone": None, "region": "Biobío"}
+    response = client.post(f"{API}/contacts/", json=contact)
+    assert response.status_code == 201, response.text
+    assert total() == 4
+
+    # Con el contador mantenido por triggers, el listado por defecto lo usa
+    counters = []
+    monkeypatch.setattr(counting, "counter_estimate", lambda db, metric: counters.append(metric) or 1000)
+    updated = client.put(f"{API}/contacts/{response.json()['id']}", json={"phone": "+56 9 2222 3333"})
+    assert updated.status_code == 200, updated.text
+    assert total() == 1000
+    assert total(region="Santiago") == 3
+    assert counters == [CONTACTS_LISTED]
+
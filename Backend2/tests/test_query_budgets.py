@@ -0,0 +1,57 @@
+"""Presupuesto de consultas de las rutas de cada router (@query_budget)."""
+
+from conftest import API, make_contacts
+
+
+def test_contacts_routes_within_budget(client, query_guard, search_with_results):
+    contact_id = client.get(f"{API}/contacts/").json()["items"][0]["id"]
+
+    for path in (
+        f"{API}/contacts/",
+        f"{API}/contacts/?total_mode=none",
+        f"{API}/contacts/search?q=contacto",
+        f"{API}/contacts/duplicates",
+        f"{API}/contacts/{contact_id}",
+        f"{API}/contacts/rescore",
+    ):
+        assert client.get(path).status_code == 200, path
+
+    response = client.post(f"{API}/contacts/bulk", json={
+        "search_id": search_with_results.id,
+        "contacts": make_contacts(5, prefix="Lote"),
+    })
+    assert response.status_code == 200
+    assert response.json()["created"] == 5
+    assert query_guard.requests[-1]["queries"] <= 12
+
+
+def test_searches_routes_within_budget(client, query_guard, search_with_results):
+    search_id = search_with_results.id
+
+    for path in (
+        f"{API}/searches/",
+        f"{API}/searches/{search_id}",
+        f"{API}/searches/{search_id}/results",
+        f"{API}/searches/{search_id}/results?fields=contact_id,contact_name",
+    ):
+        assert client.get(path).status_code == 200, path
+
+    response = client.post(f"{API}/searches/", json={
+        "keywords": "hidrógeno verde",
+        "area": "Industria",
+        "region": "Magallanes",
+        "session_id": "test",
+        "search_config": {"force_refresh": True},
+    })
+    assert response.status_code == 201
+    assert query_guard.requests[-1]["queries"] <= 10
+
+
+def test_stats_routes_within_default_budget(client, query_guard, search_with_results):
+    for path in (
+        f"{API}/stats/summary",
+        f"{API}/stats/by-region",
+        f"{API}/stats/quality-distribution",
+        f"{API}/stats/by-session/test",
+    ):
+        assert client.get(path).status_code == 200, path
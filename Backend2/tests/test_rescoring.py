@@ -0,0 +1,67 @@
+"""Recálculo masivo de validation_score (RescoringService)."""
+
+from decimal import Decimal
+
+from sqlalchemy import text
+
+from conftest import make_contacts
+
+
+def seed(db) -> list:
+    """Contactos con nombres, teléfonos y organizaciones repetidos."""
+    from app.services.contact_service import ContactService
+
+    contacts = make_contacts(12)
+    for index, contact in enumerate(contacts):
+        contact["name"] = f"Contacto {index % 4}"
+        contact["organization"] = f"Organización {index % 3}"
+        if index % 5 == 0:
+            contact["phone"] = "+56 9 1111 2222"
+    outcomes = ContactService.bulk_create_contacts(db, contacts)
+    return [outcome["contact_id"] for outcome in outcomes]
+
+
+def snapshot(db) -> dict:
+    return {row.id: (row.validation_score, row.updated_at) for row in db.execute(
+        text("SELECT id, validation_score, updated_at FROM contacts")
+    )}
+
+
+def test_rescore_writes_only_changed_scores(db):
+    from app.services.rescoring_service import RescoringService
+
+    ids = seed(db)
+    before = snapshot(db)
+    assert RescoringService.rescore(db, incremental=False)["updated"] == 0
+    assert snapshot(db) == before
+
+    db.execute(text("UPDATE contacts SET validation_score = 0.11 WHERE id = :id"), {"id": ids[5]})
+    db.commit()
+    before = snapshot(db)
+
+    result = RescoringService.rescore(db, incremental=False)
+    assert result["updated"] == 1
+    after = snapshot(db)
+    assert after[ids[5]][0] != Decimal("0.11")
+    assert {key: value for key, value in after.items() if key != ids[5]} == {
+        key: value for key, value in before.items() if key != ids[5]
+    }
+
+
+def test_rescore_skips_invalid_and_manual_scores(db):
+    from app.models import Contact
+    from app.schemas.contact import ContactUpdate
+    from app.services.contact_service import ContactService
+    from app.services.rescoring_service import RescoringService
+
+    ids = seed(db)
+    ContactService.mark_as_invalid(db, ids[1])
+    ContactService.update_contact(db, ids[2], ContactUpdate(validation_score=Decimal("0.55")))
+    assert db.get(Contact, ids[2]).manual_score is True
+
+    for incremental in (False, True):
+        RescoringService.rescore(db, incremental=incremental)
+        db.expire_all()
+        invalid, manual = db.get(Contact, ids[1]), db.get(Contact, ids[2])
+        assert (invalid.is_valid, invalid.validation_score) == (False, Decimal("0.00"))
+        assert manual.validation_score == Decimal("0.55")
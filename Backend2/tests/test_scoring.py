@@ -0,0 +1,128 @@
+"""Paridad entre el scoring por bloques (ScoringEngine) y el bucle original contra todos los contactos."""
+
+import random
+
+from conftest import make_contacts
+
+# Variantes que una collation *_ci considera iguales pero normalize_text no
+ORGANIZATIONS = ["Universidad de Chile", "Universidad de Chíle", "UNIVERSIDAD DE CHÍLE", "Instituto Milenio"]
+POSITIONS = ["Investigador", "Investigadór", "Académico", "Academico"]
+REGIONS = ["Valparaíso", "Valparaiso", "Biobío", "Biobio"]
+NAMES = ["Ana Pérez", "Ana Perez", "José Soto", "Jose Soto", "María Díaz"]
+
+
+def random_contacts(rng: random.Random, count: int, prefix: str) -> list:
+    contacts = make_contacts(count, prefix=prefix)
+    for contact in contacts:
+        contact["name"] = rng.choice(NAMES + [contact["name"]])
+        contact["organization"] = rng.choice(ORGANIZATIONS + [None])
+        contact["position"] = rng.choice(POSITIONS + [None])
+        contact["region"] = rng.choice(REGIONS + [None])
+        contact["phone"] = rng.choice([contact["phone"], "+56 9 1111 2222", "+56-9-1111-2222", None])
+        contact["source_url"] = rng.choice([contact["source_url"], "https://example.com/equipo"])
+    return contacts
+
+
+def baseline_score(new: dict, existing: list) -> float:
+    """
+    Oráculo: el bucle original de calculate_validation_score (comparación
+    contra todos los contactos), copiado sin cambios salvo leer diccionarios.
+    """
+    name_lower = new["name"].lower().strip() if new["name"] else ""
+    org_lower = new["organization"].lower().strip() if new["organization"] else ""
+    position_lower = new["position"].lower().strip() if new["position"] else ""
+    region_lower = new["region"].lower().strip() if new["region"] else ""
+    phone_clean = new["phone"].replace(" ", "").replace("-", "") if new["phone"] else ""
+    url = new["source_url"]
+
+    if not existing:
+        return 1.0
+
+    min_score = 1.0
+
+    for contact in existing:
+        ex_name = contact["name"].lower().strip() if contact["name"] else ""
+        ex_org = contact["organization"].lower().strip() if contact["organization"] else ""
+        ex_position = contact["position"].lower().strip() if contact["position"] else ""
+        ex_region = contact["region"].lower().strip() if contact["region"] else ""
+        ex_phone = contact["phone"].replace(" ", "").replace("-", "") if contact["phone"] else ""
+        ex_url = contact["source_url"]
+
+        name_match = (name_lower == ex_name) if name_lower and ex_name else False
+        org_match = (org_lower == ex_org) if org_lower and ex_org else False
+        position_match = (position_lower == ex_position) if position_lower and ex_position else False
+        region_match = (region_lower == ex_region) if region_lower and ex_region else False
+        phone_match = (phone_clean == ex_phone) if phone_clean and ex_phone else False
+        url_match = (url == ex_url) if url and ex_url else False
+
+        secondary_matches = sum([org_match, position_match, region_match])
+
+        current_score = 1.0
+
+        if url_match and not name_match and not phone_match and secondary_matches == 0:
+            current_score = min(current_score, 0.7)
+        elif url_match and (name_match or phone_match or secondary_matches > 0):
+            current_score = min(current_score, 0.3)
+
+        if name_match and secondary_matches >= 2:
+            current_score = min(current_score, 0.4)
+        elif phone_match and not name_match and secondary_matches == 0 and not url_match:
+            current_score = min(current_score, 0.6)
+        elif not name_match and not url_match:
+            if secondary_matches >= 2:
+                current_score = min(current_score, 0.9)
+            elif secondary_matches == 1:
+                current_score = min(current_score, 0.9)
+        elif name_match and secondary_matches == 0 and not phone_match and not url_match:
+            current_score = min(current_score, 0.9)
+
+        total_matches = sum([name_match, org_match, position_match, region_match, phone_match, url_match])
+        if total_matches >= 4:
+            current_score = min(current_score, 0.2)
+        elif total_matches >= 3 and name_match:
+            current_score = min(current_score, 0.3)
+
+        min_score = min(min_score, current_score)
+
+    return min_score
+
+
+def test_scoring_matches_baseline(db):
+    from app.schemas.contact import ContactCreate
+    from app.services.contact_service import ContactService
+
+    rng = random.Random(2026)
+    existing = random_contacts(rng, 40, "Base")
+    ContactService.bulk_create_contacts(db, existing)
+
+    for contact in random_contacts(rng, 30, "Nuevo"):
+        expected = baseline_score(contact, existing)
+        assert ContactService.calculate_validation_score(db, ContactCreate(**contact)) == expected, contact
+
+    # El lote se compara también con los contactos anteriores del mismo lote
+    batch = random_contacts(rng, 30, "Lote")
+    outcomes = ContactService.bulk_create_contacts(db, batch)
+    for position, (contact, outcome) in enumerate(zip(batch, outcomes)):
+        assert outcome["status"] == "created"
+        expected = baseline_score(contact, existing + batch[:position])
+        assert float(outcome["validation_score"]) == expected, contact
+
+
+def test_bulk_create_resolves_ids_by_unique_key(db):
+    from app.models import Contact
+    from app.services.contact_service import ContactService
+
+    contacts = make_contacts(3, prefix="Clave")
+    for contact in contacts:
+        contact["email"] = None
+        contact["source_url"] = "https://example.com/equipo"
+    (existing,) = ContactService.bulk_create_contacts(db, contacts[:1])
+
+    # La misma identidad sin email, repetida en el lote y ya guardada
+    outcomes = ContactService.bulk_create_contacts(db, [contacts[0], contacts[1], contacts[0], contacts[2]])
+    ids = [outcome["contact_id"] for outcome in outcomes]
+    assert [outcome["status"] for outcome in outcomes] == ["created"] * 4
+    assert existing["contact_id"] not in ids and len(set(ids)) == 4
+    assert [db.get(Contact, contact_id).name for contact_id in ids] == [
+        contacts[0]["name"], contacts[1]["name"], contacts[0]["name"], contacts[2]["name"]
+    ]
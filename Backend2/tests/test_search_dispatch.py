@@ -0,0 +1,275 @@
+"""Creación de búsquedas y cola de disparos (outbox) con un webhook falso."""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from conftest import API
+
+
+class FakeWebhook:
+    """
+    Sender que registra los payloads en vez de llamar a n8n.
+
+    Args:
+        delay: Segundos que tarda cada llamada
+        failures: Llamadas iniciales que fallan (None = todas)
+        retryable: Si los fallos admiten reintento
+    """
+
+    def __init__(self, delay: float = 0.0, failures: Optional[int] = 0, retryable: bool = True):
+        self.delay = delay
+        self.failures = failures
+        self.retryable = retryable
+        self.payloads = []
+        self.calls = 0
+        self.running = 0
+        self.peak = 0
+
+    async def __call__(self, payload: dict):
+        from app.services.dispatch_worker import DispatchError
+
+        self.calls += 1
+        self.running += 1
+        self.peak = max(self.peak, self.running)
+        try:
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.failures is None or self.calls <= self.failures:
+                raise DispatchError(f"HTTP 503 (llamada {self.calls})", retryable=self.retryable)
+        finally:
+            self.running -= 1
+        self.payloads.append(payload)
+        return "ok"
+
+
+def drain_queue(webhook: FakeWebhook) -> int:
+    """Reservar y ejecutar los disparos pendientes con el webhook falso."""
+    from app.database import SessionLocal
+    from app.services.dispatch_service import DispatchService
+    from app.services.dispatch_worker import DispatchWorker
+
+    worker = DispatchWorker(senders={"n8n": webhook, "native": webhook, "demo": webhook})
+    db = SessionLocal()
+    try:
+        claimed = DispatchService.claim_due(db, 100)
+    finally:
+        db.close()
+
+    async def process():
+        for dispatch in claimed:
+            await worker._process(dispatch)
+
+    asyncio.run(process())
+    return len(claimed)
+
+
+def new_search(keywords: str) -> dict:
+    return {"session_id": "test", "keywords": keywords, "region": "Santiago", "search_config": {"force_refresh": True}}
+
+
+def test_create_search_enqueues_dispatch(client, db):
+    from app.models import Search, SearchDispatch, SearchLog
+
+    response = client.post(f"{API}/searches/", json=new_search("hidrógeno verde"))
+    assert response.status_code == 201
+    search_id = response.json()["id"]
+
+    assert db.query(Search).filter(Search.id == search_id).count() == 1
+    assert db.query(SearchLog).filter(SearchLog.search_id == search_id).count() == 1
+    assert db.query(SearchDispatch).filter(SearchDispatch.search_id == search_id).count() == 1
+
+    webhook = FakeWebhook()
+    assert drain_queue(webhook) == 1
+    assert [payload["search_id"] for payload in webhook.payloads] == [search_id]
+
+
+def test_crash_before_enqueue_leaves_no_orphan_search(client, db, monkeypatch):
+    from app.models import Search, SearchDispatch, SearchLog
+    from app.services.dispatch_service import DispatchService
+
+    def crash(*args, **kwargs):
+        raise RuntimeError("caída entre escrituras")
+
+    monkeypatch.setattr(DispatchService, "enqueue", crash)
+    response = client.post(f"{API}/searches/", json=new_search("litio"))
+    assert response.status_code == 500
+
+    # La búsqueda y su log se revierten junto con el disparo: no queda una
+    # búsqueda 'pending' que nunca se va a disparar
+    assert db.query(Search).count() == 0
+    assert db.query(SearchLog).count() == 0
+    assert db.query(SearchDispatch).count() == 0
+
+    webhook = FakeWebhook()
+    assert drain_queue(webhook) == 0
+    assert webhook.payloads == []
+
+
+def enqueue(db, count: int) -> list:
+    """Búsquedas 'pending' con su disparo a n8n."""
+    from app.models import Search
+    from app.services.dispatch_service import DispatchService
+
+    searches = [Search(session_id="test", keywords=f"tema {index}", status="pending") for index in range(count)]
+    db.add_all(searches)
+    db.flush()
+    for search in searches:
+        DispatchService.enqueue(db, search, upstream="n8n")
+    db.commit()
+    return [search.id for search in searches]
+
+
+def test_result_of_a_reclaimed_dispatch_is_discarded(db):
+    from app.models import SearchDispatch
+    from app.services.dispatch_service import DispatchService
+
+    enqueue(db, 1)
+    (first,) = DispatchService.claim_due(db, 10)
+
+    # El bloqueo expira (worker lento) y otro worker reserva el mismo disparo
+    db.query(SearchDispatch).update({"locked_at": datetime.now() - timedelta(days=1)})
+    db.commit()
+    (second,) = DispatchService.claim_due(db, 10)
+    assert (first["id"], second["attempts"]) == (second["id"], first["attempts"] + 1)
+
+    DispatchService.mark_done(db, first["id"], first["attempts"], 10)
+    assert DispatchService.mark_retry(db, first["id"], first["attempts"], "tarde") is None
+    db.expire_all()
+    assert db.get(SearchDispatch, first["id"]).status == "in_flight"
+
+    DispatchService.mark_done(db, second["id"], second["attempts"], 10)
+    db.expire_all()
+    assert db.get(SearchDispatch, first["id"]).status == "done"
+
+
+def test_dispatches_without_a_token_stay_unclaimed(db, monkeypatch):
+    from app.config import settings
+    from app.models import SearchDispatch
+    from app.services.dispatch_worker import DispatchWorker
+
+    # 6 por minuto: ráfaga de un solo token
+    monkeypatch.setattr(settings, "DISPATCH_DEFAULT_RATE_LIMIT", 6)
+    enqueue(db, 3)
+    webhook = FakeWebhook()
+
+    async def scenario():
+        worker = DispatchWorker(senders={"n8n": webhook}, max_in_flight=10, poll_interval=0.01)
+        await worker.start()
+        await asyncio.sleep(0.3)
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+    db.expire_all()
+    assert len(webhook.payloads) == 1
+    assert sorted((dispatch.status, dispatch.attempts) for dispatch in db.query(SearchDispatch)) == [
+        ("done", 1), ("pending", 0), ("pending", 0)
+    ]
+
+
+def make_due(db) -> None:
+    """Adelantar los reintentos programados (en vez de esperar el backoff)."""
+    from app.models import SearchDispatch
+
+    db.query(SearchDispatch).filter(SearchDispatch.status == "pending").update(
+        {"next_attempt_at": datetime.now() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+
+def test_transient_failure_is_retried_with_backoff(db, monkeypatch):
+    from app.config import settings
+    from app.models import Search, SearchDispatch, SearchLog
+
+    monkeypatch.setattr(settings, "DISPATCH_BACKOFF_BASE", 10.0)
+    (search_id,) = enqueue(db, 1)
+    webhook = FakeWebhook(failures=2)
+
+    for attempt in (1, 2):
+        before = datetime.now()
+        assert drain_queue(webhook) == 1
+        db.expire_all()
+        dispatch = db.query(SearchDispatch).one()
+        assert (dispatch.status, dispatch.attempts) == ("pending", attempt)
+        # base * 2^(intento - 1), más hasta base de jitter
+        delay = (dispatch.next_attempt_at - before).total_seconds()
+        assert 10 * 2 ** (attempt - 1) - 1 <= delay <= 10 * 2 ** (attempt - 1) + 11
+        assert drain_queue(webhook) == 0
+        make_due(db)
+
+    assert drain_queue(webhook) == 1
+    db.expire_all()
+    assert (db.query(SearchDispatch).one().status, db.get(Search, search_id).status) == ("done", "running")
+    assert webhook.calls == 3 and len(webhook.payloads) == 1
+    assert db.query(SearchLog).filter(SearchLog.status == "warning").count() == 2
+
+
+def test_exhausted_attempts_mark_the_search_as_error(db, monkeypatch):
+    from app.config import settings
+    from app.models import Search, SearchDispatch
+
+    monkeypatch.setattr(settings, "DISPATCH_MAX_ATTEMPTS", 3)
+    (search_id,) = enqueue(db, 1)
+    webhook = FakeWebhook(failures=None)
+
+    for _ in range(3):
+        assert drain_queue(webhook) == 1
+        make_due(db)
+    assert drain_queue(webhook) == 0
+
+    db.expire_all()
+    dispatch, search = db.query(SearchDispatch).one(), db.get(Search, search_id)
+    assert (dispatch.status, dispatch.attempts, webhook.calls) == ("failed", 3, 3)
+    assert search.status == "error"
+    assert "HTTP 503" in search.error_message
+
+
+def test_permanent_failure_is_not_retried(db):
+    from app.models import Search, SearchDispatch
+
+    (search_id,) = enqueue(db, 1)
+    assert drain_queue(FakeWebhook(failures=None, retryable=False)) == 1
+    db.expire_all()
+    assert (db.query(SearchDispatch).one().status, db.get(Search, search_id).status) == ("failed", "error")
+
+
+def test_worker_respects_max_in_flight(db):
+    from app.models import SearchDispatch
+    from app.services.dispatch_worker import DispatchWorker
+
+    search_ids = enqueue(db, 6)
+    webhook = FakeWebhook(delay=0.05)
+
+    async def scenario():
+        worker = DispatchWorker(senders={"n8n": webhook}, max_in_flight=2, poll_interval=0.01)
+        await worker.start()
+        for _ in range(200):
+            if len(webhook.payloads) == len(search_ids) and worker.in_flight == 0:
+                break
+            await asyncio.sleep(0.01)
+        await worker.stop()
+
+    asyncio.run(scenario())
+
+    assert sorted(payload["search_id"] for payload in webhook.payloads) == search_ids
+    assert webhook.peak == 2
+    db.expire_all()
+    assert {dispatch.status for dispatch in db.query(SearchDispatch)} == {"done"}
+
+
+def test_token_bucket_refills_at_its_rate(monkeypatch):
+    from app.services import dispatch_worker
+
+    now = [1000.0]
+    monkeypatch.setattr(dispatch_worker.time, "monotonic", lambda: now[0])
+    bucket = dispatch_worker.TokenBucket(30)  # 0.5 por segundo, ráfaga de 5
+
+    assert bucket.try_acquire(10) == 5
+    assert bucket.try_acquire() == 0
+    assert bucket.wait_time() == 2.0
+    now[0] += 3
+    assert bucket.try_acquire(10) == 1
+    bucket.refund(1)
+    now[0] += 60
+    assert bucket.try_acquire(10) == 5
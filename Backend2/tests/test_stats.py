@@ -0,0 +1,53 @@
+"""Tablas de resumen de /stats con contadores por franjas."""
+
+from decimal import Decimal
+
+
+def test_striped_counters_are_summed(db, search_with_results, monkeypatch):
+    from app.models import Search, StatsCounter, StatsRegionArea
+    from app.services.stats_service import (
+        CONTACTS_BY_REGION, CONTACTS_VALID, SEARCHES_BY_STATUS, SEARCHES_TOTAL, StatsService
+    )
+
+    summary = StatsService.get_summary(db)
+    (by_region,) = StatsService.get_contacts_by_region(db)
+
+    # Lo que dejarían los triggers de dos conexiones más: una búsqueda y un
+    # contacto nuevos en la franja 3, y ese contacto borrado desde la franja 7
+    db.add_all([
+        StatsCounter(metric=SEARCHES_TOTAL, dimension="", shard=3, value=1),
+        StatsCounter(metric=CONTACTS_VALID, dimension="", shard=3, value=1),
+        StatsCounter(metric=CONTACTS_VALID, dimension="", shard=7, value=-1),
+        StatsCounter(metric=CONTACTS_BY_REGION, dimension="Santiago", shard=3, value=1),
+        StatsCounter(metric=CONTACTS_BY_REGION, dimension="Santiago", shard=7, value=-1),
+        StatsRegionArea(region="Santiago", area="Tecnología", shard=3, total_contacts=1, score_sum=Decimal("0.40")),
+    ])
+    db.commit()
+    # En MySQL los triggers mantienen las tablas y no se recalculan al leer
+    monkeypatch.setattr(StatsService, "_ensure_rollups", staticmethod(lambda db: None))
+
+    striped = StatsService.get_summary(db)
+    assert striped["total_searches"] == summary["total_searches"] + 1
+    assert striped["total_contacts"] == summary["total_contacts"]
+    assert striped["top_regions"] == summary["top_regions"]
+
+    (striped_region,) = StatsService.get_contacts_by_region(db)
+    assert striped_region.total_contacts == by_region.total_contacts + 1
+    assert striped_region.last_updated == by_region.last_updated
+
+    # La corrección se escribe como delta: las franjas de los triggers se conservan
+    assert StatsService.reconcile(db) == {"stats_counters": 1, "stats_region_area": 1}
+    assert db.query(StatsCounter).filter(StatsCounter.shard == 3).count() == 3
+    assert StatsService.get_summary(db) == summary
+    assert StatsService.get_contacts_by_region(db) == [by_region]
+
+    # Un delta de trigger confirmado después del recálculo no se pierde
+    # y el siguiente recálculo, sin desviaciones, no escribe nada
+    db.add(Search(session_id="test", keywords="otra", status="pending"))
+    db.add(StatsCounter(metric=SEARCHES_TOTAL, dimension="", shard=5, value=1))
+    db.add(StatsCounter(metric=SEARCHES_BY_STATUS, dimension="pending", shard=5, value=1))
+    db.commit()
+    assert StatsService.get_summary(db)["total_searches"] == summary["total_searches"] + 1
+    assert StatsService.reconcile(db) == {"stats_counters": 0, "stats_region_area": 0}
+    monkeypatch.undo()
+    assert StatsService.get_summary(db)["total_searches"] == summary["total_searches"] + 1
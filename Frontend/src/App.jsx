@@ -404,63 +404,99 @@ function App() {
     loadStats();
   }, []);
 
-  // Polling para actualizar estado de búsqueda
+  // Seguimiento en vivo de la búsqueda: eventos SSE, con polling si el stream no está disponible
   useEffect(() => {
+    const currentSearchId = searchState.currentSearch?.id;
+    if (!currentSearchId || searchState.status !== 'processing') {
+      return undefined;
+    }
+
     let pollInterval;
-    
-    if (searchState.currentSearch && searchState.status === 'processing') {
-      console.log('🔄 Iniciando polling para búsqueda ID:', searchState.currentSearch.id);
+    let eventSource;
+    let finished = false;
+
+    const handleSearchUpdate = async (updatedSearch) => {
+      if (finished) return;
+      const normalizedStatus = normalizeSearchStatus(updatedSearch.status);
+
+      if (normalizedStatus === 'processing') {
+        // Solo cambiaron los contadores
+        setSearchState(prev => ({ ...prev, currentSearch: updatedSearch }));
+        return;
+      }
+
+      finished = true;
+      console.log('🔔 Cambio de estado detectado: processing ->', normalizedStatus);
+      setSearchState(prev => ({
+        ...prev,
+        status: normalizedStatus,
+        currentSearch: updatedSearch
+      }));
+
+      // Si completó, cargar resultados
+      if (normalizedStatus === 'completed') {
+        console.log('✅ Búsqueda completada, cargando resultados...');
+        await loadSearchResults(updatedSearch.id);
+
+        // Recargar la búsqueda actualizada para obtener contadores correctos
+        const finalSearch = await searchService.getSearchById(updatedSearch.id);
+        console.log('📊 Búsqueda final:', finalSearch);
+
+        setSearchState(prev => ({
+          ...prev,
+          isSearching: false,
+          currentSearch: finalSearch
+        }));
+        await loadStats();
+      } else if (normalizedStatus === 'failed') {
+        console.log('❌ Búsqueda falló');
+        setSearchState(prev => ({
+          ...prev,
+          isSearching: false,
+          error: 'La búsqueda falló. Por favor intenta nuevamente.'
+        }));
+      }
+    };
+
+    const startPolling = () => {
+      console.log('🔄 Iniciando polling para búsqueda ID:', currentSearchId);
       pollInterval = setInterval(async () => {
         try {
-          const updatedSearch = await searchService.getSearchById(searchState.currentSearch.id);
-          const normalizedStatus = normalizeSearchStatus(updatedSearch.status);
-          console.log('📡 Polling - Estado backend:', updatedSearch.status, 'Estado UI:', normalizedStatus, 'Resultados:', updatedSearch.results_count);
-          
-          if (normalizedStatus !== searchState.status) {
-            console.log('🔔 Cambio de estado detectado:', searchState.status, '->', normalizedStatus);
-            setSearchState(prev => ({
-              ...prev,
-              status: normalizedStatus,
-              currentSearch: updatedSearch
-            }));
-
-            // Si completó, cargar resultados
-            if (normalizedStatus === 'completed') {
-              console.log('✅ Búsqueda completada, cargando resultados...');
-              await loadSearchResults(updatedSearch.id);
-              
-              // Recargar la búsqueda actualizada para obtener contadores correctos
-              const finalSearch = await searchService.getSearchById(updatedSearch.id);
-              console.log('📊 Búsqueda final:', finalSearch);
-              
-              setSearchState(prev => ({ 
-                ...prev, 
-                isSearching: false,
-                currentSearch: finalSearch
-              }));
-              await loadStats();
-            } else if (normalizedStatus === 'failed') {
-              console.log('❌ Búsqueda falló');
-              setSearchState(prev => ({
-                ...prev,
-                isSearching: false,
-                error: 'La búsqueda falló. Por favor intenta nuevamente.'
-              }));
-            }
-          }
+          const updatedSearch = await searchService.getSearchById(currentSearchId);
+          console.log('📡 Polling - Estado backend:', updatedSearch.status, 'Resultados:', updatedSearch.results_count);
+          await handleSearchUpdate(updatedSearch);
         } catch (error) {
           console.error('Error polling search status:', error);
         }
       }, 3000); // Poll cada 3 segundos
+    };
+
+    if (typeof EventSource !== 'undefined') {
+      console.log('📡 Escuchando eventos de la búsqueda ID:', currentSearchId);
+      eventSource = searchService.subscribeToSearch(currentSearchId, {
+        onSearch: (updatedSearch) => {
+          console.log('📡 Evento - Estado backend:', updatedSearch.status, 'Resultados:', updatedSearch.results_count);
+          handleSearchUpdate(updatedSearch);
+        },
+        onError: () => {
+          console.warn('⚠️ Stream de eventos no disponible, usando polling');
+          startPolling();
+        }
+      });
+    } else {
+      startPolling();
     }
 
     return () => {
+      if (eventSource) {
+        eventSource.close();
+      }
       if (pollInterval) {
         console.log('🛑 Deteniendo polling');
         clearInterval(pollInterval);
       }
     };
-  }, [searchState.currentSearch, searchState.status]);
+  }, [searchState.currentSearch?.id, searchState.status]);
 
   // Verificar conexión con API
   const checkApiConnection = async () => {
@@ -64,6 +64,32 @@ export const searchService = {
     return response.data;
   },
 
+  // Suscribirse a los eventos en vivo de una búsqueda (SSE).
+  // handlers: onSearch(búsqueda) en 'status'/'progress', onContacts(contactos),
+  // onEnd(datos) al terminar y onError() si el stream no está disponible.
+  subscribeToSearch: (searchId, handlers = {}) => {
+    const source = new EventSource(`${API_BASE_URL}/searches/${searchId}/events`);
+    const parse = (handler) => (event) => {
+      if (handler) handler(JSON.parse(event.data));
+    };
+
+    source.addEventListener('status', parse(handlers.onSearch));
+    source.addEventListener('progress', parse(handlers.onSearch));
+    source.addEventListener('contacts', parse((data) => handlers.onContacts?.(data.contacts)));
+    source.addEventListener('end', (event) => {
+      source.close();
+      handlers.onEnd?.(JSON.parse(event.data));
+    });
+    source.onerror = () => {
+      // EventSource reintenta solo; CLOSED significa que no hay stream (404/503, proxy sin SSE)
+      if (source.readyState === EventSource.CLOSED) {
+        handlers.onError?.();
+      }
+    };
+
+    return source;
+  },
+
   // Obtener resultados de una búsqueda
   getSearchResults: async (searchId, params = {}) => {
     const response = await apiClient.get(`/searches/${searchId}/results`, {